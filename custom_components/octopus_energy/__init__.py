@@ -2,7 +2,7 @@ import logging
 from datetime import timedelta
 
 from homeassistant.exceptions import ConfigEntryNotReady
-from homeassistant.helpers import device_registry as dr
+from homeassistant.helpers import device_registry as dr, storage
 from homeassistant.components.recorder import get_instance
 from homeassistant.util.dt import (utcnow)
 from homeassistant.const import (
@@ -16,6 +16,11 @@ from .coordinators.electricity_rates import async_setup_electricity_rates_coordi
 from .coordinators.saving_sessions import async_setup_saving_sessions_coordinators
 from .coordinators.greenness_forecast import async_setup_greenness_forecast_coordinator
 from .statistics import get_statistic_ids_to_remove
+from .statistics.backfill import BackfillJobManager
+from .statistics.import_tracker import async_setup_statistic_import_tracker, get_statistic_import_tracker
+from .statistics.last_sums import async_setup_statistic_sums_cache, get_statistic_sums_cache
+from .utils.computation import setup_computation_statistics
+from .statistics.refresh import create_refresh_job
 from .intelligent import async_mock_intelligent_data, get_intelligent_features, is_intelligent_tariff, mock_intelligent_device
 
 from .config.main import async_migrate_main_config
@@ -30,6 +35,7 @@ from .const import (
   CONFIG_KIND_TARGET_RATE,
   CONFIG_MAIN_OLD_API_KEY,
   CONFIG_VERSION,
+  DATA_BACKFILL_JOB_MANAGER,
   DATA_INTELLIGENT_DEVICE,
   DATA_INTELLIGENT_MPAN,
   DATA_INTELLIGENT_SERIAL_NUMBER,
@@ -42,7 +48,8 @@ from .const import (
 
   DATA_CLIENT,
   DATA_ELECTRICITY_RATES_COORDINATOR_KEY,
-  DATA_ACCOUNT
+  DATA_ACCOUNT,
+  STORAGE_BACKFILL_JOBS_NAME
 )
 
 ACCOUNT_PLATFORMS = ["sensor", "binary_sensor", "text", "number", "switch", "time", "event"]
@@ -85,6 +92,11 @@ async def _async_close_client(hass, account_id: str):
     await client.async_close()
     _LOGGER.debug('Client closed.')
 
+async def _async_close_backfill_job_manager(hass, account_id: str):
+  if account_id in hass.data[DOMAIN] and DATA_BACKFILL_JOB_MANAGER in hass.data[DOMAIN][account_id]:
+    manager: BackfillJobManager = hass.data[DOMAIN][account_id][DATA_BACKFILL_JOB_MANAGER]
+    await manager.async_close()
+
 async def async_setup_entry(hass, entry):
   """This is called from the config flow."""
   hass.data.setdefault(DOMAIN, {})
@@ -191,6 +203,22 @@ async def async_setup_dependencies(hass, config):
 
   hass.data[DOMAIN][account_id][DATA_ACCOUNT] = AccountCoordinatorResult(utcnow(), 1, account_info)
 
+  await async_setup_statistic_sums_cache(hass)
+  await async_setup_statistic_import_tracker(hass)
+  setup_computation_statistics(hass)
+
+  # Any refreshes that were running before we were last setup (e.g. before a restart) will carry on from their last checkpoint
+  await _async_close_backfill_job_manager(hass, account_id)
+  backfill_job_manager = BackfillJobManager(
+    hass,
+    account_id,
+    client,
+    storage.Store(hass, "1", STORAGE_BACKFILL_JOBS_NAME.format(account_id)),
+    create_refresh_job
+  )
+  hass.data[DOMAIN][account_id][DATA_BACKFILL_JOB_MANAGER] = backfill_job_manager
+  await backfill_job_manager.async_load()
+
   device_registry = dr.async_get(hass)
   now = utcnow()
 
@@ -291,6 +319,12 @@ async def async_unload_entry(hass, entry):
     unload_ok = False
     if entry.data[CONFIG_KIND] == CONFIG_KIND_ACCOUNT:
       unload_ok = await hass.config_entries.async_unload_platforms(entry, ACCOUNT_PLATFORMS)
+      if unload_ok:
+        # Stop any refreshes, which will carry on from their last checkpoint when the account is next setup
+        await _async_close_backfill_job_manager(hass, entry.data[CONFIG_ACCOUNT_ID])
+
+        # Release our connections, so the shared session can be closed once no accounts are using it
+        await _async_close_client(hass, entry.data[CONFIG_ACCOUNT_ID])
     elif entry.data[CONFIG_KIND] == CONFIG_KIND_TARGET_RATE:
       unload_ok = await hass.config_entries.async_unload_platforms(entry, TARGET_RATE_PLATFORMS)
     elif entry.data[CONFIG_KIND] == CONFIG_KIND_COST_TRACKER:
@@ -321,6 +355,15 @@ def setup(hass, config):
       get_instance(hass).async_clear_statistics(external_statistic_ids_to_remove)
       _LOGGER.debug(f'Removing the following external statistics: {external_statistic_ids_to_remove}')
 
+      # Make sure any new statistics don't carry on from, or assume they've been imported into, the removed statistics
+      statistic_sums_cache = get_statistic_sums_cache(hass)
+      if statistic_sums_cache is not None:
+        hass.add_job(statistic_sums_cache.async_remove, external_statistic_ids_to_remove)
+
+      statistic_import_tracker = get_statistic_import_tracker(hass)
+      if statistic_import_tracker is not None:
+        hass.add_job(statistic_import_tracker.async_remove, external_statistic_ids_to_remove)
+
   hass.services.register(DOMAIN, "purge_invalid_external_statistic_ids", purge_invalid_external_statistic_ids)
 
   # Return boolean to indicate that initialization was successful.
@@ -1,11 +1,11 @@
 import logging
-import json
+import heapq
 import aiohttp
+import asyncio
 from asyncio import TimeoutError
-from datetime import (datetime, timedelta, time)
-from threading import RLock
+from datetime import (datetime, timedelta, time, timezone)
 
-from homeassistant.util.dt import (as_utc, now, as_local, parse_datetime)
+from homeassistant.util.dt import (as_utc, as_local, parse_datetime, start_of_local_day)
 
 from ..const import INTEGRATION_VERSION
 
@@ -20,6 +20,14 @@ from .intelligent_dispatches import IntelligentDispatchItem, IntelligentDispatch
 from .saving_sessions import JoinSavingSessionResponse, SavingSession, SavingSessionsResponse
 from .wheel_of_fortune import WheelOfFortuneSpinsResponse
 from .greenness_forecast import GreennessForecast
+from ..utils.timestamps import parse_timestamps
+from ..utils.rate_timeline import FLAG_IS_CAPPED, RATE_PERIOD_IN_SECONDS, RateTimeline
+from .request_cache import ResponseCache, normalise_url
+from .pagination import get_page_url, get_total_pages
+from .graphql_batcher import GraphQLBatcher
+from .token_manager import TokenManager
+from .session_pool import ClientSessionPool, default_session_pool
+from .json_decoder import decode_json, decode_text
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -299,23 +307,40 @@ redeem_octoplus_points_account_credit_mutation = '''mutation {{
 
 user_agent_value = "bottlecapdave-home-assistant-octopus-energy"
 
+PRODUCT_RESPONSE_CACHE_MAX_SIZE = 128
+PRODUCT_RESPONSE_CACHE_TTL_IN_SECONDS = 60
+
+# Product responses are public, so the cache is shared by all clients within the process, so that multiple accounts on the same
+# tariff reuse the same responses
+default_product_response_cache = ResponseCache(PRODUCT_RESPONSE_CACHE_MAX_SIZE, PRODUCT_RESPONSE_CACHE_TTL_IN_SECONDS)
+
+MAX_CONCURRENT_PAGE_REQUESTS = 4
+
+# Queries are sent on the next iteration of the event loop, so a lone query isn't delayed. Our coordinators refresh with up to half
+# a second of jitter, so queries requested while another request is in flight are sent together once it completes
+GRAPHQL_BATCH_WINDOW_IN_SECONDS = 0
+
 def get_valid_from(rate):
   return rate["valid_from"]
 
 def get_start(rate):
   return rate["start"]
     
-def rates_to_thirty_minute_increments(data, period_from: datetime, period_to: datetime, tariff_code: str, price_cap: float = None):
-  """Process the collection of rates to ensure they're in 30 minute periods"""
+def rates_to_rate_timeline(data, period_from: datetime, period_to: datetime, tariff_code: str, price_cap: float = None) -> RateTimeline:
+  """Process the collection of rates into a timeline of 30 minute periods, without expanding each period individually"""
   starting_period_from = period_from
-  results = []
+  builder = RateTimeline.builder()
   if ("results" in data):
-    items = data["results"]
-    items.sort(key=get_valid_from)
+    items = sorted(data["results"], key=get_valid_from)
+    # The end of one rate is usually the start of the next, so parse them together so each timestamp is only parsed once
+    timestamps = parse_timestamps(list(map(lambda item: item["valid_from"] if "valid_from" in item else None, items)) +
+                                  list(map(lambda item: item["valid_to"] if "valid_to" in item else None, items)))
+    valid_froms = timestamps[:len(items)]
+    valid_tos = timestamps[len(items):]
 
     # We need to normalise our data into 30 minute increments so that all of our rates across all tariffs are the same and it's 
     # easier to calculate our target rate sensors
-    for item in items:
+    for index, item in enumerate(items):
       value_inc_vat = float(item["value_inc_vat"])
 
       is_capped = False
@@ -323,8 +348,8 @@ def rates_to_thirty_minute_increments(data, period_from: datetime, period_to: da
         value_inc_vat = price_cap
         is_capped = True
 
-      if "valid_from" in item and item["valid_from"] is not None:
-        valid_from = as_utc(parse_datetime(item["valid_from"]))
+      if valid_froms[index] is not None:
+        valid_from = valid_froms[index]
 
         # If we're on a fixed rate, then our current time could be in the past so we should go from
         # our target period from date otherwise we could be adjusting times quite far in the past
@@ -334,8 +359,8 @@ def rates_to_thirty_minute_increments(data, period_from: datetime, period_to: da
         valid_from = starting_period_from
 
       # Some rates don't have end dates, so we should treat this as our period to target
-      if "valid_to" in item and item["valid_to"] is not None:
-        target_date = as_utc(parse_datetime(item["valid_to"]))
+      if valid_tos[index] is not None:
+        target_date = valid_tos[index]
 
         # Cap our target date to our end period
         if (target_date > period_to):
@@ -343,20 +368,75 @@ def rates_to_thirty_minute_increments(data, period_from: datetime, period_to: da
       else:
         target_date = period_to
       
-      while valid_from < target_date:
-        valid_to = valid_from + timedelta(minutes=30)
-        results.append({
-          "value_inc_vat": value_inc_vat,
-          "start": valid_from,
-          "end": valid_to,
-          "tariff_code": tariff_code,
-          "is_capped": is_capped
-        })
-
-        valid_from = valid_to
-        starting_period_from = valid_to
+      if valid_from < target_date:
+        # Flat rates are added as a single segment, rather than one entry per 30 minute period
+        number_of_rates = -((valid_from - target_date) // timedelta(seconds=RATE_PERIOD_IN_SECONDS))
+        builder.add(int(valid_from.timestamp()),
+                    number_of_rates,
+                    value_inc_vat,
+                    FLAG_IS_CAPPED if is_capped else 0,
+                    tariff_code)
+
+        starting_period_from = valid_from + timedelta(seconds=number_of_rates * RATE_PERIOD_IN_SECONDS)
     
-  return results
+  return builder.build()
+
+def get_economy_seven_night_windows(period_from: datetime, period_to: datetime, is_smart_meter: bool) -> list:
+  """Get the night periods, as (start, end) timestamps, for each day that covers the provided period"""
+  # Normally the economy seven night rate is between 12am and 7am UK time
+  # https://octopus.energy/help-and-faqs/articles/what-is-an-economy-7-meter-and-tariff/
+  # However, if a smart meter is being used then the times are between 12:30am and 7:30am UTC time
+  # https://octopus.energy/help-and-faqs/articles/what-happens-to-my-economy-seven-e7-tariff-when-i-have-a-smart-meter-installed/
+  if is_smart_meter:
+    current_day = as_utc(period_from).date() - timedelta(days=1)
+    last_day = as_utc(period_to).date() + timedelta(days=1)
+  else:
+    current_day = as_local(period_from).date() - timedelta(days=1)
+    last_day = as_local(period_to).date() + timedelta(days=1)
+
+  windows = []
+  while current_day <= last_day:
+    if is_smart_meter:
+      day_start = datetime.combine(current_day, time(), tzinfo=timezone.utc)
+      windows.append((int(day_start.timestamp()) + 1800, int(day_start.timestamp()) + 27000))
+    else:
+      # Our local times are calculated per day so that our night period is correct on days where the clocks change
+      day_start = start_of_local_day(current_day)
+      windows.append((int(day_start.timestamp()), int(day_start.replace(hour=7).timestamp())))
+
+    current_day = current_day + timedelta(days=1)
+
+  return windows
+
+def __get_rates_in_night_windows(rates: RateTimeline, night_windows: list, is_night_rate: bool):
+  window_index = 0
+  total_windows = len(night_windows)
+  for segment in rates.segments():
+    segment_start = int(segment.start.timestamp())
+    flags = FLAG_IS_CAPPED if segment.is_capped else 0
+    for index in range(segment.number_of_rates):
+      start = segment_start + index * RATE_PERIOD_IN_SECONDS
+      while window_index < total_windows and night_windows[window_index][1] <= start:
+        window_index = window_index + 1
+
+      is_in_window = window_index < total_windows and night_windows[window_index][0] <= start
+      if is_in_window == is_night_rate:
+        yield (start, segment.value_inc_vat, flags, segment.tariff_code)
+
+def merge_day_night_rates(day_rates: RateTimeline, night_rates: RateTimeline, night_windows: list) -> RateTimeline:
+  """Combines the day rates outside of the night windows with the night rates inside of the night windows"""
+  # Both sets of rates are already ordered, so they can be merged without needing to sort the combined rates
+  builder = RateTimeline.builder()
+  for (start, value_inc_vat, flags, tariff_code) in heapq.merge(__get_rates_in_night_windows(day_rates, night_windows, False),
+                                                                __get_rates_in_night_windows(night_rates, night_windows, True),
+                                                                key=lambda rate: rate[0]):
+    builder.add(start, 1, value_inc_vat, flags, tariff_code)
+
+  return builder.build()
+
+def rates_to_thirty_minute_increments(data, period_from: datetime, period_to: datetime, tariff_code: str, price_cap: float = None):
+  """Process the collection of rates to ensure they're in 30 minute periods"""
+  return rates_to_rate_timeline(data, period_from, period_to, tariff_code, price_cap).to_dicts()
 
 class ApiException(Exception): ...
 
@@ -372,18 +452,14 @@ class RequestException(ApiException):
     self.errors = errors
 
 class OctopusEnergyApiClient:
-  _refresh_token_lock = RLock()
-  _session_lock = RLock()
-
-  def __init__(self, api_key, electricity_price_cap = None, gas_price_cap = None, timeout_in_seconds = 20):
+  def __init__(self, api_key, electricity_price_cap = None, gas_price_cap = None, timeout_in_seconds = 20, max_concurrent_page_requests = MAX_CONCURRENT_PAGE_REQUESTS, session_pool: ClientSessionPool = None, product_response_cache: ResponseCache = None):
     if (api_key is None):
       raise Exception('API KEY is not set')
 
     self._api_key = api_key
     self._base_url = 'https://api.octopus.energy'
 
-    self._graphql_token = None
-    self._graphql_expiration = None
+    self._token_manager = TokenManager(lambda: self.__async_obtain_token__())
 
     self._product_tracker_cache = dict()
 
@@ -391,133 +467,91 @@ class OctopusEnergyApiClient:
     self._gas_price_cap = gas_price_cap
 
     self._timeout = aiohttp.ClientTimeout(total=None, sock_connect=timeout_in_seconds, sock_read=timeout_in_seconds)
-    self._default_headers = { "user-agent": f'{user_agent_value}/{INTEGRATION_VERSION}' }
+    self._default_headers = { "user-agent": f'{user_agent_value}/{INTEGRATION_VERSION}', "accept-encoding": "gzip, deflate" }
 
+    self._session_pool = session_pool if session_pool is not None else default_session_pool
     self._session = None
 
+    # Public product information is the same for everyone, so identical requests can share the same response
+    self._in_flight_requests = dict()
+    self._product_response_cache = product_response_cache if product_response_cache is not None else default_product_response_cache
+    self._max_concurrent_page_requests = max_concurrent_page_requests
+    self._graphql_batcher = GraphQLBatcher(lambda query: self.__async_send_graphql_query__(query), GRAPHQL_BATCH_WINDOW_IN_SECONDS)
+
   async def async_close(self):
-    with self._session_lock:
-      await self._session.close()
+    if self._session is not None:
+      self._session = None
+      await self._session_pool.async_release(self._base_url, self._timeout)
 
   def _create_client_session(self):
-    if self._session is not None:
-      return self._session
-    
-    with self._session_lock:
-      self._session = aiohttp.ClientSession(timeout=self._timeout, headers=self._default_headers)
-      return self._session
+    if self._session is None:
+      self._session = self._session_pool.acquire(self._base_url, self._timeout, self._default_headers)
+
+    return self._session
 
   async def async_refresh_token(self):
     """Get the user's refresh token"""
-    if (self._graphql_expiration is not None and (self._graphql_expiration - timedelta(minutes=5)) > now()):
-      return
+    await self._token_manager.async_get_token()
 
-    with self._refresh_token_lock:
-      # Check that our token wasn't refreshed while waiting for the lock
-      if (self._graphql_expiration is not None and (self._graphql_expiration - timedelta(minutes=5)) > now()):
-        return
+  async def __async_obtain_token__(self):
+    try:
+      client = self._create_client_session()
+      url = f'{self._base_url}/v1/graphql/'
+      payload = { "query": api_token_query.format(api_key=self._api_key) }
+      async with client.post(url, json=payload) as token_response:
+        token_response_body = await self.__async_read_response__(token_response, url)
+        if (token_response_body is not None and 
+            "data" in token_response_body and
+            "obtainKrakenToken" in token_response_body["data"] and 
+            token_response_body["data"]["obtainKrakenToken"] is not None and
+            "token" in token_response_body["data"]["obtainKrakenToken"]):
+          
+          return token_response_body["data"]["obtainKrakenToken"]["token"]
+        else:
+          _LOGGER.error("Failed to retrieve auth token")
+    except TimeoutError:
+      _LOGGER.warning(f'Failed to connect. Timeout of {self._timeout} exceeded.')
+      raise TimeoutException()
 
-      try:
-        client = self._create_client_session()
-        url = f'{self._base_url}/v1/graphql/'
-        payload = { "query": api_token_query.format(api_key=self._api_key) }
-        async with client.post(url, json=payload) as token_response:
-          token_response_body = await self.__async_read_response__(token_response, url)
-          if (token_response_body is not None and 
-              "data" in token_response_body and
-              "obtainKrakenToken" in token_response_body["data"] and 
-              token_response_body["data"]["obtainKrakenToken"] is not None and
-              "token" in token_response_body["data"]["obtainKrakenToken"]):
-            
-            self._graphql_token = token_response_body["data"]["obtainKrakenToken"]["token"]
-            self._graphql_expiration = now() + timedelta(hours=1)
-          else:
-            _LOGGER.error("Failed to retrieve auth token")
-      except TimeoutError:
-        _LOGGER.warning(f'Failed to connect. Timeout of {self._timeout} exceeded.')
-        raise TimeoutException()
+    return None
     
   async def async_get_account(self, account_id):
     """Get the user's account"""
-    await self.async_refresh_token()
-
     try:
-      client = self._create_client_session()
-      url = f'{self._base_url}/v1/graphql/'
-      # Get account response
-      payload = { "query": account_query.format(account_id=account_id) }
-      headers = { "Authorization": f"JWT {self._graphql_token}" }
-      async with client.post(url, json=payload, headers=headers) as account_response:
-        account_response_body = await self.__async_read_response__(account_response, url)
-
-        _LOGGER.debug(f'account: {account_response_body}')
-
-        if (account_response_body is not None and 
-            "data" in account_response_body and 
-            "account" in account_response_body["data"] and 
-            account_response_body["data"]["account"] is not None):
-          return {
-            "id": account_id,
-            "octoplus_enrolled": account_response_body["data"]["octoplusAccountInfo"]["isOctoplusEnrolled"] == True 
-            if "octoplusAccountInfo" in account_response_body["data"] and "isOctoplusEnrolled" in account_response_body["data"]["octoplusAccountInfo"]
-            else False,
-            "electricity_meter_points": list(map(lambda mp: {
-                "mpan": mp["meterPoint"]["mpan"],
-                "meters": list(map(lambda m: {
-                    "serial_number": m["serialNumber"],
-                    "is_export": m["smartExportElectricityMeter"] is not None,
-                    "is_smart_meter": f'{m["meterType"]}'.startswith("S1") or f'{m["meterType"]}'.startswith("S2"),
-                    "device_id": m["smartImportElectricityMeter"]["deviceId"] if m["smartImportElectricityMeter"] is not None else None,
-                    "manufacturer": m["smartImportElectricityMeter"]["manufacturer"] 
-                      if m["smartImportElectricityMeter"] is not None 
-                      else m["smartExportElectricityMeter"]["manufacturer"] 
-                      if m["smartExportElectricityMeter"] is not None
-                      else m["makeAndType"],
-                    "model": m["smartImportElectricityMeter"]["model"] 
-                      if m["smartImportElectricityMeter"] is not None 
-                      else m["smartExportElectricityMeter"]["model"] 
-                      if m["smartExportElectricityMeter"] is not None
-                      else None,
-                    "firmware": m["smartImportElectricityMeter"]["firmwareVersion"] 
-                      if m["smartImportElectricityMeter"] is not None 
-                      else m["smartExportElectricityMeter"]["firmwareVersion"] 
-                      if m["smartExportElectricityMeter"] is not None
-                      else None
-                  },
-                  mp["meterPoint"]["meters"]
-                  if "meterPoint" in mp and "meters" in mp["meterPoint"] and mp["meterPoint"]["meters"] is not None
-                  else []
-                )),
-                "agreements": list(map(lambda a: {
-                  "start": a["validFrom"],
-                  "end": a["validTo"],
-                  "tariff_code": a["tariff"]["tariffCode"] if "tariff" in a and "tariffCode" in a["tariff"] else None,
-                  "product_code": a["tariff"]["productCode"] if "tariff" in a and "productCode" in a["tariff"] else None,
-                }, 
-                mp["meterPoint"]["agreements"]
-                if "meterPoint" in mp and "agreements" in mp["meterPoint"] and mp["meterPoint"]["agreements"] is not None
-                else []
-              ))
-            }, 
-            account_response_body["data"]["account"]["electricityAgreements"]
-            if "electricityAgreements" in account_response_body["data"]["account"] and account_response_body["data"]["account"]["electricityAgreements"] is not None
-            else []
-          )),
-            "gas_meter_points": list(map(lambda mp: {
-              "mprn": mp["meterPoint"]["mprn"],
+      account_response_body = await self.__async_graphql_query__(account_query.format(account_id=account_id))
+
+      _LOGGER.debug(f'account: {account_response_body}')
+
+      if (account_response_body is not None and 
+          "data" in account_response_body and 
+          "account" in account_response_body["data"] and 
+          account_response_body["data"]["account"] is not None):
+        return {
+          "id": account_id,
+          "octoplus_enrolled": account_response_body["data"]["octoplusAccountInfo"]["isOctoplusEnrolled"] == True 
+          if "octoplusAccountInfo" in account_response_body["data"] and "isOctoplusEnrolled" in account_response_body["data"]["octoplusAccountInfo"]
+          else False,
+          "electricity_meter_points": list(map(lambda mp: {
+              "mpan": mp["meterPoint"]["mpan"],
               "meters": list(map(lambda m: {
                   "serial_number": m["serialNumber"],
-                  "consumption_units": m["consumptionUnits"],
-                  "is_smart_meter": m["mechanism"] == "S1" or m["mechanism"] == "S2",
-                  "device_id": m["smartGasMeter"]["deviceId"] if m["smartGasMeter"] is not None else None,
-                  "manufacturer": m["smartGasMeter"]["manufacturer"] 
-                    if m["smartGasMeter"] is not None 
-                    else m["modelName"],
-                  "model": m["smartGasMeter"]["model"] 
-                    if m["smartGasMeter"] is not None 
+                  "is_export": m["smartExportElectricityMeter"] is not None,
+                  "is_smart_meter": f'{m["meterType"]}'.startswith("S1") or f'{m["meterType"]}'.startswith("S2"),
+                  "device_id": m["smartImportElectricityMeter"]["deviceId"] if m["smartImportElectricityMeter"] is not None else None,
+                  "manufacturer": m["smartImportElectricityMeter"]["manufacturer"] 
+                    if m["smartImportElectricityMeter"] is not None 
+                    else m["smartExportElectricityMeter"]["manufacturer"] 
+                    if m["smartExportElectricityMeter"] is not None
+                    else m["makeAndType"],
+                  "model": m["smartImportElectricityMeter"]["model"] 
+                    if m["smartImportElectricityMeter"] is not None 
+                    else m["smartExportElectricityMeter"]["model"] 
+                    if m["smartExportElectricityMeter"] is not None
                     else None,
-                  "firmware": m["smartGasMeter"]["firmwareVersion"] 
-                    if m["smartGasMeter"] is not None 
+                  "firmware": m["smartImportElectricityMeter"]["firmwareVersion"] 
+                    if m["smartImportElectricityMeter"] is not None 
+                    else m["smartExportElectricityMeter"]["firmwareVersion"] 
+                    if m["smartExportElectricityMeter"] is not None
                     else None
                 },
                 mp["meterPoint"]["meters"]
@@ -525,23 +559,59 @@ class OctopusEnergyApiClient:
                 else []
               )),
               "agreements": list(map(lambda a: {
-                  "start": a["validFrom"],
-                  "end": a["validTo"],
-                  "tariff_code": a["tariff"]["tariffCode"] if "tariff" in a and "tariffCode" in a["tariff"] else None,
-                  "product_code": a["tariff"]["productCode"] if "tariff" in a and "productCode" in a["tariff"] else None,
-                },
-                mp["meterPoint"]["agreements"]
-                if "meterPoint" in mp and "agreements" in mp["meterPoint"] and mp["meterPoint"]["agreements"] is not None
-                else []
-              ))
-            }, 
-            account_response_body["data"]["account"]["gasAgreements"] 
-            if "gasAgreements" in account_response_body["data"]["account"] and account_response_body["data"]["account"]["gasAgreements"] is not None
-            else []
-          )),
-        }
-        else:
-          _LOGGER.error("Failed to retrieve account")
+                "start": a["validFrom"],
+                "end": a["validTo"],
+                "tariff_code": a["tariff"]["tariffCode"] if "tariff" in a and "tariffCode" in a["tariff"] else None,
+                "product_code": a["tariff"]["productCode"] if "tariff" in a and "productCode" in a["tariff"] else None,
+              }, 
+              mp["meterPoint"]["agreements"]
+              if "meterPoint" in mp and "agreements" in mp["meterPoint"] and mp["meterPoint"]["agreements"] is not None
+              else []
+            ))
+          }, 
+          account_response_body["data"]["account"]["electricityAgreements"]
+          if "electricityAgreements" in account_response_body["data"]["account"] and account_response_body["data"]["account"]["electricityAgreements"] is not None
+          else []
+        )),
+          "gas_meter_points": list(map(lambda mp: {
+            "mprn": mp["meterPoint"]["mprn"],
+            "meters": list(map(lambda m: {
+                "serial_number": m["serialNumber"],
+                "consumption_units": m["consumptionUnits"],
+                "is_smart_meter": m["mechanism"] == "S1" or m["mechanism"] == "S2",
+                "device_id": m["smartGasMeter"]["deviceId"] if m["smartGasMeter"] is not None else None,
+                "manufacturer": m["smartGasMeter"]["manufacturer"] 
+                  if m["smartGasMeter"] is not None 
+                  else m["modelName"],
+                "model": m["smartGasMeter"]["model"] 
+                  if m["smartGasMeter"] is not None 
+                  else None,
+                "firmware": m["smartGasMeter"]["firmwareVersion"] 
+                  if m["smartGasMeter"] is not None 
+                  else None
+              },
+              mp["meterPoint"]["meters"]
+              if "meterPoint" in mp and "meters" in mp["meterPoint"] and mp["meterPoint"]["meters"] is not None
+              else []
+            )),
+            "agreements": list(map(lambda a: {
+                "start": a["validFrom"],
+                "end": a["validTo"],
+                "tariff_code": a["tariff"]["tariffCode"] if "tariff" in a and "tariffCode" in a["tariff"] else None,
+                "product_code": a["tariff"]["productCode"] if "tariff" in a and "productCode" in a["tariff"] else None,
+              },
+              mp["meterPoint"]["agreements"]
+              if "meterPoint" in mp and "agreements" in mp["meterPoint"] and mp["meterPoint"]["agreements"] is not None
+              else []
+            ))
+          }, 
+          account_response_body["data"]["account"]["gasAgreements"] 
+          if "gasAgreements" in account_response_body["data"]["account"] and account_response_body["data"]["account"]["gasAgreements"] is not None
+          else []
+        )),
+      }
+      else:
+        _LOGGER.error("Failed to retrieve account")
     
     except TimeoutError:
       _LOGGER.warning(f'Failed to connect. Timeout of {self._timeout} exceeded.')
@@ -551,25 +621,17 @@ class OctopusEnergyApiClient:
   
   async def async_get_greenness_forecast(self) -> list[GreennessForecast]:
     """Get the latest greenness forecast"""
-    await self.async_refresh_token()
-
     try:
-      client = self._create_client_session()
-      url = f'{self._base_url}/v1/graphql/'
-      payload = { "query": greenness_forecast_query }
-      headers = { "Authorization": f"JWT {self._graphql_token}" }
-      async with client.post(url, json=payload, headers=headers) as greenness_forecast_response:
-
-        response_body = await self.__async_read_response__(greenness_forecast_response, url)
-        if (response_body is not None and "data" in response_body and "greennessForecast" in response_body["data"]):
-          forecast = list(map(lambda item: GreennessForecast(as_utc(parse_datetime(item["validFrom"])),
-                                                             as_utc(parse_datetime(item["validTo"])),
-                                                             int(item["greennessScore"]),
-                                                             item["greennessIndex"],
-                                                             item["highlightFlag"]),
-                          response_body["data"]["greennessForecast"]))
-          forecast.sort(key=lambda item: item.start)
-          return forecast
+      response_body = await self.__async_graphql_query__(greenness_forecast_query)
+      if (response_body is not None and "data" in response_body and "greennessForecast" in response_body["data"]):
+        forecast = list(map(lambda item: GreennessForecast(as_utc(parse_datetime(item["validFrom"])),
+                                                           as_utc(parse_datetime(item["validTo"])),
+                                                           int(item["greennessScore"]),
+                                                           item["greennessIndex"],
+                                                           item["highlightFlag"]),
+                        response_body["data"]["greennessForecast"]))
+        forecast.sort(key=lambda item: item.start)
+        return forecast
     
     except TimeoutError:
       _LOGGER.warning(f'Failed to connect. Timeout of {self._timeout} exceeded.')
@@ -577,32 +639,24 @@ class OctopusEnergyApiClient:
 
   async def async_get_saving_sessions(self, account_id: str) -> SavingSessionsResponse:
     """Get the user's seasons savings"""
-    await self.async_refresh_token()
-
     try:
-      client = self._create_client_session()
-      url = f'{self._base_url}/v1/graphql/'
-      # Get account response
-      payload = { "query": octoplus_saving_session_query.format(account_id=account_id) }
-      headers = { "Authorization": f"JWT {self._graphql_token}" }
-      async with client.post(url, json=payload, headers=headers) as account_response:
-        response_body = await self.__async_read_response__(account_response, url)
-
-        if (response_body is not None and "data" in response_body):
-          return SavingSessionsResponse(list(map(lambda ev: SavingSession(ev["id"],
-                                                                          ev["code"],
-                                                                          as_utc(parse_datetime(ev["startAt"])),
-                                                                          as_utc(parse_datetime(ev["endAt"])),
-                                                                          ev["rewardPerKwhInOctoPoints"]),
-                                        response_body["data"]["savingSessions"]["events"])), 
-                                        list(map(lambda ev: SavingSession(ev["eventId"],
-                                                                          None,
-                                                                          as_utc(parse_datetime(ev["startAt"])),
-                                                                          as_utc(parse_datetime(ev["endAt"])),
-                                                                          ev["rewardGivenInOctoPoints"]),
-                                        response_body["data"]["savingSessions"]["account"]["joinedEvents"])))
-        else:
-          _LOGGER.error("Failed to retrieve saving sessions")
+      response_body = await self.__async_graphql_query__(octoplus_saving_session_query.format(account_id=account_id))
+
+      if (response_body is not None and "data" in response_body):
+        return SavingSessionsResponse(list(map(lambda ev: SavingSession(ev["id"],
+                                                                        ev["code"],
+                                                                        as_utc(parse_datetime(ev["startAt"])),
+                                                                        as_utc(parse_datetime(ev["endAt"])),
+                                                                        ev["rewardPerKwhInOctoPoints"]),
+                                      response_body["data"]["savingSessions"]["events"])), 
+                                      list(map(lambda ev: SavingSession(ev["eventId"],
+                                                                        None,
+                                                                        as_utc(parse_datetime(ev["startAt"])),
+                                                                        as_utc(parse_datetime(ev["endAt"])),
+                                                                        ev["rewardGivenInOctoPoints"]),
+                                      response_body["data"]["savingSessions"]["account"]["joinedEvents"])))
+      else:
+        _LOGGER.error("Failed to retrieve saving sessions")
     except TimeoutError:
       _LOGGER.warning(f'Failed to connect. Timeout of {self._timeout} exceeded.')
       raise TimeoutException()
@@ -611,21 +665,13 @@ class OctopusEnergyApiClient:
 
   async def async_get_octoplus_points(self):
     """Get the user's octoplus points"""
-    await self.async_refresh_token()
-
     try:
-      client = self._create_client_session()
-      url = f'{self._base_url}/v1/graphql/'
-      # Get account response
-      payload = { "query": octoplus_points_query }
-      headers = { "Authorization": f"JWT {self._graphql_token}" }
-      async with client.post(url, json=payload, headers=headers) as account_response:
-        response_body = await self.__async_read_response__(account_response, url)
+      response_body = await self.__async_graphql_query__(octoplus_points_query)
 
-        if (response_body is not None and "data" in response_body and "loyaltyPointLedgers" in response_body["data"] and len(response_body["data"]["loyaltyPointLedgers"]) > 0):
-          return int(response_body["data"]["loyaltyPointLedgers"][0]["balanceCarriedForward"])
-        else:
-          _LOGGER.error("Failed to retrieve octopoints")
+      if (response_body is not None and "data" in response_body and "loyaltyPointLedgers" in response_body["data"] and len(response_body["data"]["loyaltyPointLedgers"]) > 0):
+        return int(response_body["data"]["loyaltyPointLedgers"][0]["balanceCarriedForward"])
+      else:
+        _LOGGER.error("Failed to retrieve octopoints")
     
     except TimeoutError:
       _LOGGER.warning(f'Failed to connect. Timeout of {self._timeout} exceeded.')
@@ -635,21 +681,14 @@ class OctopusEnergyApiClient:
   
   async def async_join_octoplus_saving_session(self, account_id: str, event_code: str) -> JoinSavingSessionResponse:
     """Join a saving session"""
-    await self.async_refresh_token()
-
     try:
-      client = self._create_client_session()
-      url = f'{self._base_url}/v1/graphql/'
       # Get account response
       payload = { "query": octoplus_saving_session_join_mutation.format(account_id=account_id, event_code=event_code) }
-      headers = { "Authorization": f"JWT {self._graphql_token}" }
-      async with client.post(url, json=payload, headers=headers) as join_response:
-
-        try:
-          await self.__async_read_response__(join_response, url)
-          return JoinSavingSessionResponse(True, [])
-        except RequestException as e:
-          return JoinSavingSessionResponse(False, e.errors)
+      try:
+        await self.__async_post_graphql__(payload)
+        return JoinSavingSessionResponse(True, [])
+      except RequestException as e:
+        return JoinSavingSessionResponse(False, e.errors)
     
     except TimeoutError:
       _LOGGER.warning(f'Failed to connect. Timeout of {self._timeout} exceeded.')
@@ -657,19 +696,13 @@ class OctopusEnergyApiClient:
     
   async def async_redeem_octoplus_points_into_account_credit(self, account_id: str, points_to_redeem: int) -> RedeemOctoplusPointsResponse:
     """Redeem octoplus points"""
-    await self.async_refresh_token()
-
     try:
-      client = self._create_client_session()
-      url = f'{self._base_url}/v1/graphql/'
       payload = { "query": redeem_octoplus_points_account_credit_mutation.format(account_id=account_id, points=points_to_redeem) }
-      headers = { "Authorization": f"JWT {self._graphql_token}" }
-      async with client.post(url, json=payload, headers=headers) as redemption_response:
-        try:
-          await self.__async_read_response__(redemption_response, url)
-          return RedeemOctoplusPointsResponse(True, [])
-        except RequestException as e:
-          return RedeemOctoplusPointsResponse(False, e.errors)
+      try:
+        await self.__async_post_graphql__(payload)
+        return RedeemOctoplusPointsResponse(True, [])
+      except RequestException as e:
+        return RedeemOctoplusPointsResponse(False, e.errors)
     
     except TimeoutError:
       _LOGGER.warning(f'Failed to connect. Timeout of {self._timeout} exceeded.')
@@ -677,26 +710,18 @@ class OctopusEnergyApiClient:
 
   async def async_get_smart_meter_consumption(self, device_id: str, period_from: datetime, period_to: datetime):
     """Get the user's smart meter consumption"""
-    await self.async_refresh_token()
-
     try:
-      client = self._create_client_session()
-      url = f'{self._base_url}/v1/graphql/'
-
-      payload = { "query": live_consumption_query.format(device_id=device_id, period_from=period_from.strftime("%Y-%m-%dT%H:%M:%S%z"), period_to=period_to.strftime("%Y-%m-%dT%H:%M:%S%z")) }
-      headers = { "Authorization": f"JWT {self._graphql_token}" }
-      async with client.post(url, json=payload, headers=headers) as live_consumption_response:
-        response_body = await self.__async_read_response__(live_consumption_response, url)
-
-        if (response_body is not None and "data" in response_body and "smartMeterTelemetry" in response_body["data"] and response_body["data"]["smartMeterTelemetry"] is not None and len(response_body["data"]["smartMeterTelemetry"]) > 0):
-          return list(map(lambda mp: {
-            "consumption": float(mp["consumptionDelta"]) / 1000 if "consumptionDelta" in mp and mp["consumptionDelta"] is not None else 0,
-            "demand": float(mp["demand"]) if "demand" in mp and mp["demand"] is not None else None,
-            "start": parse_datetime(mp["readAt"]),
-            "end": parse_datetime(mp["readAt"]) + timedelta(minutes=30)
-          }, response_body["data"]["smartMeterTelemetry"]))
-        else:
-          _LOGGER.debug(f"Failed to retrieve smart meter consumption data - device_id: {device_id}; period_from: {period_from}; period_to: {period_to}")
+      response_body = await self.__async_graphql_query__(live_consumption_query.format(device_id=device_id, period_from=period_from.strftime("%Y-%m-%dT%H:%M:%S%z"), period_to=period_to.strftime("%Y-%m-%dT%H:%M:%S%z")))
+
+      if (response_body is not None and "data" in response_body and "smartMeterTelemetry" in response_body["data"] and response_body["data"]["smartMeterTelemetry"] is not None and len(response_body["data"]["smartMeterTelemetry"]) > 0):
+        return list(map(lambda mp: {
+          "consumption": float(mp["consumptionDelta"]) / 1000 if "consumptionDelta" in mp and mp["consumptionDelta"] is not None else 0,
+          "demand": float(mp["demand"]) if "demand" in mp and mp["demand"] is not None else None,
+          "start": parse_datetime(mp["readAt"]),
+          "end": parse_datetime(mp["readAt"]) + timedelta(minutes=30)
+        }, response_body["data"]["smartMeterTelemetry"]))
+      else:
+        _LOGGER.debug(f"Failed to retrieve smart meter consumption data - device_id: {device_id}; period_from: {period_from}; period_to: {period_to}")
     
     except TimeoutError:
       _LOGGER.warning(f'Failed to connect. Timeout of {self._timeout} exceeded.')
@@ -706,70 +731,40 @@ class OctopusEnergyApiClient:
 
   async def async_get_electricity_standard_rates(self, product_code, tariff_code, period_from, period_to): 
     """Get the current standard rates"""
-    results = []
-
     try:
-      client = self._create_client_session()
       auth = aiohttp.BasicAuth(self._api_key, '')
-      page = 1
-      has_more_rates = True
-      while has_more_rates:
-        url = f'{self._base_url}/v1/products/{product_code}/electricity-tariffs/{tariff_code}/standard-unit-rates?period_from={period_from.strftime("%Y-%m-%dT%H:%M:%SZ")}&period_to={period_to.strftime("%Y-%m-%dT%H:%M:%SZ")}&page={page}'
-        async with client.get(url, auth=auth) as response:
-          data = await self.__async_read_response__(response, url)
-          if data is None:
-            return None
-          else:
-            results = results + rates_to_thirty_minute_increments(data, period_from, period_to, tariff_code, self._electricity_price_cap)
-            has_more_rates = "next" in data and data["next"] is not None
-            if has_more_rates:
-              page = page + 1
+      url = f'{self._base_url}/v1/products/{product_code}/electricity-tariffs/{tariff_code}/standard-unit-rates?period_from={period_from.strftime("%Y-%m-%dT%H:%M:%SZ")}&period_to={period_to.strftime("%Y-%m-%dT%H:%M:%SZ")}'
+      items = await self.__async_get_all_results__(url, auth, True)
+      if items is None:
+        return None
     
     except TimeoutError:
       _LOGGER.warning(f'Failed to connect. Timeout of {self._timeout} exceeded.')
       raise TimeoutException()
     
-    results.sort(key=get_start)
-    return results
+    return rates_to_rate_timeline({ "results": items }, period_from, period_to, tariff_code, self._electricity_price_cap)
 
   async def async_get_electricity_day_night_rates(self, product_code, tariff_code, is_smart_meter, period_from, period_to):
     """Get the current day and night rates"""
-    results = []
-
     try:
-      client = self._create_client_session()
       auth = aiohttp.BasicAuth(self._api_key, '')
-      url = f'{self._base_url}/v1/products/{product_code}/electricity-tariffs/{tariff_code}/day-unit-rates?period_from={period_from.strftime("%Y-%m-%dT%H:%M:%SZ")}&period_to={period_to.strftime("%Y-%m-%dT%H:%M:%SZ")}'
-      async with client.get(url, auth=auth) as response:
-        data = await self.__async_read_response__(response, url)
-        if data is None:
-          return None
-        else:
-          # Normalise the rates to be in 30 minute increments and remove any rates that fall outside of our day period 
-          day_rates = rates_to_thirty_minute_increments(data, period_from, period_to, tariff_code, self._electricity_price_cap)
-          for rate in day_rates:
-            if (self.__is_night_rate(rate, is_smart_meter)) == False:
-              results.append(rate)
-
-      url = f'{self._base_url}/v1/products/{product_code}/electricity-tariffs/{tariff_code}/night-unit-rates?period_from={period_from.strftime("%Y-%m-%dT%H:%M:%SZ")}&period_to={period_to.strftime("%Y-%m-%dT%H:%M:%SZ")}'
-      async with client.get(url, auth=auth) as response:
-        data = await self.__async_read_response__(response, url)
-        if data is None:
-          return None
-
-        # Normalise the rates to be in 30 minute increments and remove any rates that fall outside of our night period 
-        night_rates = rates_to_thirty_minute_increments(data, period_from, period_to, tariff_code, self._electricity_price_cap)
-        for rate in night_rates:
-          if (self.__is_night_rate(rate, is_smart_meter)) == True:
-            results.append(rate)
+      day_url = f'{self._base_url}/v1/products/{product_code}/electricity-tariffs/{tariff_code}/day-unit-rates?period_from={period_from.strftime("%Y-%m-%dT%H:%M:%SZ")}&period_to={period_to.strftime("%Y-%m-%dT%H:%M:%SZ")}'
+      night_url = f'{self._base_url}/v1/products/{product_code}/electricity-tariffs/{tariff_code}/night-unit-rates?period_from={period_from.strftime("%Y-%m-%dT%H:%M:%SZ")}&period_to={period_to.strftime("%Y-%m-%dT%H:%M:%SZ")}'
+      (day_data, night_data) = await asyncio.gather(
+        self.__async_get__(day_url, auth, True),
+        self.__async_get__(night_url, auth, True)
+      )
     except TimeoutError:
       _LOGGER.warning(f'Failed to connect. Timeout of {self._timeout} exceeded.')
       raise TimeoutException()
 
-    # Because we retrieve our day and night periods separately over a 2 day period, we need to sort our rates 
-    results.sort(key=get_start)
+    if day_data is None or night_data is None:
+      return None
 
-    return results
+    # Normalise the rates to be in 30 minute increments and only keep the rates that fall within their day/night period
+    day_rates = rates_to_rate_timeline(day_data, period_from, period_to, tariff_code, self._electricity_price_cap)
+    night_rates = rates_to_rate_timeline(night_data, period_from, period_to, tariff_code, self._electricity_price_cap)
+    return merge_day_night_rates(day_rates, night_rates, get_economy_seven_night_windows(period_from, period_to, is_smart_meter))
 
   async def async_get_electricity_rates(self, tariff_code: str, is_smart_meter: bool, period_from: datetime, period_to: datetime):
     """Get the current rates"""
@@ -789,7 +784,6 @@ class OctopusEnergyApiClient:
     """Get the current electricity consumption"""
 
     try:
-      client = self._create_client_session()
       auth = aiohttp.BasicAuth(self._api_key, '')
 
       query_params = []
@@ -805,24 +799,25 @@ class OctopusEnergyApiClient:
       query_string = '&'.join(query_params)
       
       url = f"{self._base_url}/v1/electricity-meter-points/{mpan}/meters/{serial_number}/consumption{f'?{query_string}' if len(query_string) > 0 else ''}"
-      async with client.get(url, auth=auth) as response:
-        
-        data = await self.__async_read_response__(response, url)
-        if (data is not None and "results" in data):
-          data = data["results"]
-          results = []
-          for item in data:
-            item = self.__process_consumption(item)
-
-            # For some reason, the end point returns slightly more data than we requested, so we need to filter out
-            # the results
-            if (period_from is None or as_utc(item["start"]) >= period_from) and (period_to is None or as_utc(item["end"]) <= period_to):
-              results.append(item)
+      if page_size is None:
+        data = await self.__async_get_all_results__(url, auth)
+      else:
+        # The caller has asked for a specific number of items, so only the first page is relevant
+        data = await self.__async_get__(url, auth)
+        data = data["results"] if data is not None and "results" in data else None
+
+      if (data is not None):
+        results = []
+        for item in self.__process_consumption(data):
+          # For some reason, the end point returns slightly more data than we requested, so we need to filter out
+          # the results
+          if (period_from is None or item["start"] >= period_from) and (period_to is None or item["end"] <= period_to):
+            results.append(item)
           
-          results.sort(key=self.__get_interval_end)
-          return results
+        results.sort(key=self.__get_interval_end)
+        return results
         
-        return None
+      return None
         
     except TimeoutError:
       _LOGGER.warning(f'Failed to connect. Timeout of {self._timeout} exceeded.')
@@ -839,15 +834,13 @@ class OctopusEnergyApiClient:
     results = []
 
     try:
-      client = self._create_client_session()
       auth = aiohttp.BasicAuth(self._api_key, '')
       url = f'{self._base_url}/v1/products/{product_code}/gas-tariffs/{tariff_code}/standard-unit-rates?period_from={period_from.strftime("%Y-%m-%dT%H:%M:%SZ")}&period_to={period_to.strftime("%Y-%m-%dT%H:%M:%SZ")}'
-      async with client.get(url, auth=auth) as response:
-        data = await self.__async_read_response__(response, url)
-        if data is None:
-          return None
-        else:
-          results = rates_to_thirty_minute_increments(data, period_from, period_to, tariff_code, self._gas_price_cap)
+      data = await self.__async_get__(url, auth, True)
+      if data is None:
+        return None
+      else:
+        results = rates_to_rate_timeline(data, period_from, period_to, tariff_code, self._gas_price_cap)
 
       return results
     
@@ -859,7 +852,6 @@ class OctopusEnergyApiClient:
     """Get the current gas rates"""
     
     try:
-      client = self._create_client_session()
       auth = aiohttp.BasicAuth(self._api_key, '')
 
       query_params = []
@@ -876,23 +868,25 @@ class OctopusEnergyApiClient:
 
       url = f"{self._base_url}/v1/gas-meter-points/{mprn}/meters/{serial_number}/consumption{f'?{query_string}' if len(query_string) > 0 else ''}"
       print(url)
-      async with client.get(url, auth=auth) as response:
-        data = await self.__async_read_response__(response, url)
-        if (data is not None and "results" in data):
-          data = data["results"]
-          results = []
-          for item in data:
-            item = self.__process_consumption(item)
-
-            # For some reason, the end point returns slightly more data than we requested, so we need to filter out
-            # the results
-            if (period_from is None or as_utc(item["start"]) >= period_from) and (period_to is None or as_utc(item["end"]) <= period_to):
-              results.append(item)
+      if page_size is None:
+        data = await self.__async_get_all_results__(url, auth)
+      else:
+        # The caller has asked for a specific number of items, so only the first page is relevant
+        data = await self.__async_get__(url, auth)
+        data = data["results"] if data is not None and "results" in data else None
+
+      if (data is not None):
+        results = []
+        for item in self.__process_consumption(data):
+          # For some reason, the end point returns slightly more data than we requested, so we need to filter out
+          # the results
+          if (period_from is None or item["start"] >= period_from) and (period_to is None or item["end"] <= period_to):
+            results.append(item)
           
-          results.sort(key=self.__get_interval_end)
-          return results
+        results.sort(key=self.__get_interval_end)
+        return results
         
-        return None
+      return None
     except TimeoutError:
       _LOGGER.warning(f'Failed to connect. Timeout of {self._timeout} exceeded.')
       raise TimeoutException()
@@ -901,11 +895,9 @@ class OctopusEnergyApiClient:
     """Get all products"""
 
     try:
-      client = self._create_client_session()
       auth = aiohttp.BasicAuth(self._api_key, '')
       url = f'{self._base_url}/v1/products/{product_code}'
-      async with client.get(url, auth=auth) as response:
-        return await self.__async_read_response__(response, url)
+      return await self.__async_get__(url, auth, True)
     except TimeoutError:
       _LOGGER.warning(f'Failed to connect. Timeout of {self._timeout} exceeded.')
       raise TimeoutException()
@@ -921,17 +913,15 @@ class OctopusEnergyApiClient:
     result = None
 
     try:
-      client = self._create_client_session()
       auth = aiohttp.BasicAuth(self._api_key, '')
       url = f'{self._base_url}/v1/products/{product_code}/electricity-tariffs/{tariff_code}/standing-charges?period_from={period_from.strftime("%Y-%m-%dT%H:%M:%SZ")}&period_to={period_to.strftime("%Y-%m-%dT%H:%M:%SZ")}'
-      async with client.get(url, auth=auth) as response:
-        data = await self.__async_read_response__(response, url)
-        if (data is not None and "results" in data and len(data["results"]) > 0):
-          result = {
-            "start": parse_datetime(data["results"][0]["valid_from"]) if "valid_from" in data["results"][0] and data["results"][0]["valid_from"] is not None else None,
-            "end": parse_datetime(data["results"][0]["valid_to"]) if "valid_to" in data["results"][0] and data["results"][0]["valid_to"] is not None else None,
-            "value_inc_vat": float(data["results"][0]["value_inc_vat"])
-          }
+      data = await self.__async_get__(url, auth, True)
+      if (data is not None and "results" in data and len(data["results"]) > 0):
+        result = {
+          "start": parse_datetime(data["results"][0]["valid_from"]) if "valid_from" in data["results"][0] and data["results"][0]["valid_from"] is not None else None,
+          "end": parse_datetime(data["results"][0]["valid_to"]) if "valid_to" in data["results"][0] and data["results"][0]["valid_to"] is not None else None,
+          "value_inc_vat": float(data["results"][0]["value_inc_vat"])
+        }
 
       return result
     except TimeoutError:
@@ -949,17 +939,15 @@ class OctopusEnergyApiClient:
     result = None
 
     try:
-      client = self._create_client_session()
       auth = aiohttp.BasicAuth(self._api_key, '')
       url = f'{self._base_url}/v1/products/{product_code}/gas-tariffs/{tariff_code}/standing-charges?period_from={period_from.strftime("%Y-%m-%dT%H:%M:%SZ")}&period_to={period_to.strftime("%Y-%m-%dT%H:%M:%SZ")}'
-      async with client.get(url, auth=auth) as response:
-        data = await self.__async_read_response__(response, url)
-        if (data is not None and "results" in data and len(data["results"]) > 0):
-          result = {
-            "start": parse_datetime(data["results"][0]["valid_from"]) if "valid_from" in data["results"][0] and data["results"][0]["valid_from"] is not None else None,
-            "end": parse_datetime(data["results"][0]["valid_to"]) if "valid_to" in data["results"][0] and data["results"][0]["valid_to"] is not None else None,
-            "value_inc_vat": float(data["results"][0]["value_inc_vat"])
-          }
+      data = await self.__async_get__(url, auth, True)
+      if (data is not None and "results" in data and len(data["results"]) > 0):
+        result = {
+          "start": parse_datetime(data["results"][0]["valid_from"]) if "valid_from" in data["results"][0] and data["results"][0]["valid_from"] is not None else None,
+          "end": parse_datetime(data["results"][0]["valid_to"]) if "valid_to" in data["results"][0] and data["results"][0]["valid_to"] is not None else None,
+          "value_inc_vat": float(data["results"][0]["value_inc_vat"])
+        }
 
       return result
     except TimeoutError:
@@ -968,43 +956,35 @@ class OctopusEnergyApiClient:
   
   async def async_get_intelligent_dispatches(self, account_id: str):
     """Get the user's intelligent dispatches"""
-    await self.async_refresh_token()
-
     try:
-      client = self._create_client_session()
-      url = f'{self._base_url}/v1/graphql/'
-      # Get account response
-      payload = { "query": intelligent_dispatches_query.format(account_id=account_id) }
-      headers = { "Authorization": f"JWT {self._graphql_token}" }
-      async with client.post(url, json=payload, headers=headers) as response:
-        response_body = await self.__async_read_response__(response, url)
-        _LOGGER.debug(f'async_get_intelligent_dispatches: {response_body}')
-
-        if (response_body is not None and "data" in response_body):
-          return IntelligentDispatches(
-            list(map(lambda ev: IntelligentDispatchItem(
-                as_utc(parse_datetime(ev["startDt"])),
-                as_utc(parse_datetime(ev["endDt"])),
-                float(ev["delta"]) if "delta" in ev and ev["delta"] is not None else None,
-                ev["meta"]["source"] if "meta" in ev and "source" in ev["meta"] else None,
-                ev["meta"]["location"] if "meta" in ev and "location" in ev["meta"] else None,
-              ), response_body["data"]["plannedDispatches"]
-              if "plannedDispatches" in response_body["data"] and response_body["data"]["plannedDispatches"] is not None
-              else [])
-            ),
-            list(map(lambda ev: IntelligentDispatchItem(
-                as_utc(parse_datetime(ev["startDt"])),
-                as_utc(parse_datetime(ev["endDt"])),
-                float(ev["delta"]) if "delta" in ev and ev["delta"] is not None else None,
-                ev["meta"]["source"] if "meta" in ev and "source" in ev["meta"] else None,
-                ev["meta"]["location"] if "meta" in ev and "location" in ev["meta"] else None,
-              ), response_body["data"]["completedDispatches"]
-              if "completedDispatches" in response_body["data"] and response_body["data"]["completedDispatches"] is not None
-              else [])
-            )
+      response_body = await self.__async_graphql_query__(intelligent_dispatches_query.format(account_id=account_id))
+      _LOGGER.debug(f'async_get_intelligent_dispatches: {response_body}')
+
+      if (response_body is not None and "data" in response_body):
+        return IntelligentDispatches(
+          list(map(lambda ev: IntelligentDispatchItem(
+              as_utc(parse_datetime(ev["startDt"])),
+              as_utc(parse_datetime(ev["endDt"])),
+              float(ev["delta"]) if "delta" in ev and ev["delta"] is not None else None,
+              ev["meta"]["source"] if "meta" in ev and "source" in ev["meta"] else None,
+              ev["meta"]["location"] if "meta" in ev and "location" in ev["meta"] else None,
+            ), response_body["data"]["plannedDispatches"]
+            if "plannedDispatches" in response_body["data"] and response_body["data"]["plannedDispatches"] is not None
+            else [])
+          ),
+          list(map(lambda ev: IntelligentDispatchItem(
+              as_utc(parse_datetime(ev["startDt"])),
+              as_utc(parse_datetime(ev["endDt"])),
+              float(ev["delta"]) if "delta" in ev and ev["delta"] is not None else None,
+              ev["meta"]["source"] if "meta" in ev and "source" in ev["meta"] else None,
+              ev["meta"]["location"] if "meta" in ev and "location" in ev["meta"] else None,
+            ), response_body["data"]["completedDispatches"]
+            if "completedDispatches" in response_body["data"] and response_body["data"]["completedDispatches"] is not None
+            else [])
           )
-        else:
-          _LOGGER.error("Failed to retrieve intelligent dispatches")
+        )
+      else:
+        _LOGGER.error("Failed to retrieve intelligent dispatches")
       
       return None
     except TimeoutError:
@@ -1013,39 +993,32 @@ class OctopusEnergyApiClient:
   
   async def async_get_intelligent_settings(self, account_id: str):
     """Get the user's intelligent settings"""
-    await self.async_refresh_token()
-
     try:
-      client = self._create_client_session()
-      url = f'{self._base_url}/v1/graphql/'
-      payload = { "query": intelligent_settings_query.format(account_id=account_id) }
-      headers = { "Authorization": f"JWT {self._graphql_token}" }
-      async with client.post(url, json=payload, headers=headers) as response:
-        response_body = await self.__async_read_response__(response, url)
-        _LOGGER.debug(f'async_get_intelligent_settings: {response_body}')
-
-        _LOGGER.debug(f'Intelligent Settings: {response_body}')
-        if (response_body is not None and "data" in response_body):
-
-          return IntelligentSettings(
-            response_body["data"]["registeredKrakenflexDevice"]["suspended"] == False
-            if "registeredKrakenflexDevice" in response_body["data"] and "suspended" in response_body["data"]["registeredKrakenflexDevice"]
-            else None,
-            int(response_body["data"]["vehicleChargingPreferences"]["weekdayTargetSoc"])
-            if "vehicleChargingPreferences" in response_body["data"] and "weekdayTargetSoc" in response_body["data"]["vehicleChargingPreferences"]
-            else None,
-            int(response_body["data"]["vehicleChargingPreferences"]["weekendTargetSoc"])
-            if "vehicleChargingPreferences" in response_body["data"] and "weekendTargetSoc" in response_body["data"]["vehicleChargingPreferences"]
-            else None,
-            self.__ready_time_to_time__(response_body["data"]["vehicleChargingPreferences"]["weekdayTargetTime"])
-            if "vehicleChargingPreferences" in response_body["data"] and "weekdayTargetTime" in response_body["data"]["vehicleChargingPreferences"]
-            else None,
-            self.__ready_time_to_time__(response_body["data"]["vehicleChargingPreferences"]["weekendTargetTime"])
-            if "vehicleChargingPreferences" in response_body["data"] and "weekendTargetTime" in response_body["data"]["vehicleChargingPreferences"]
-            else None
-          )
-        else:
-          _LOGGER.error("Failed to retrieve intelligent settings")
+      response_body = await self.__async_graphql_query__(intelligent_settings_query.format(account_id=account_id))
+      _LOGGER.debug(f'async_get_intelligent_settings: {response_body}')
+
+      _LOGGER.debug(f'Intelligent Settings: {response_body}')
+      if (response_body is not None and "data" in response_body):
+
+        return IntelligentSettings(
+          response_body["data"]["registeredKrakenflexDevice"]["suspended"] == False
+          if "registeredKrakenflexDevice" in response_body["data"] and "suspended" in response_body["data"]["registeredKrakenflexDevice"]
+          else None,
+          int(response_body["data"]["vehicleChargingPreferences"]["weekdayTargetSoc"])
+          if "vehicleChargingPreferences" in response_body["data"] and "weekdayTargetSoc" in response_body["data"]["vehicleChargingPreferences"]
+          else None,
+          int(response_body["data"]["vehicleChargingPreferences"]["weekendTargetSoc"])
+          if "vehicleChargingPreferences" in response_body["data"] and "weekendTargetSoc" in response_body["data"]["vehicleChargingPreferences"]
+          else None,
+          self.__ready_time_to_time__(response_body["data"]["vehicleChargingPreferences"]["weekdayTargetTime"])
+          if "vehicleChargingPreferences" in response_body["data"] and "weekdayTargetTime" in response_body["data"]["vehicleChargingPreferences"]
+          else None,
+          self.__ready_time_to_time__(response_body["data"]["vehicleChargingPreferences"]["weekendTargetTime"])
+          if "vehicleChargingPreferences" in response_body["data"] and "weekendTargetTime" in response_body["data"]["vehicleChargingPreferences"]
+          else None
+        )
+      else:
+        _LOGGER.error("Failed to retrieve intelligent settings")
       
       return None
 
@@ -1069,13 +1042,9 @@ class OctopusEnergyApiClient:
       target_percentage: int
     ):
     """Update a user's intelligent car target percentage"""
-    await self.async_refresh_token()
-
     settings = await self.async_get_intelligent_settings(account_id)
 
     try:
-      client = self._create_client_session()
-      url = f'{self._base_url}/v1/graphql/'
       payload = { "query": intelligent_settings_mutation.format(
         account_id=account_id,
         weekday_target_percentage=target_percentage,
@@ -1084,10 +1053,8 @@ class OctopusEnergyApiClient:
         weekend_target_time=settings.ready_time_weekend.strftime("%H:%M")
       ) }
 
-      headers = { "Authorization": f"JWT {self._graphql_token}" }
-      async with client.post(url, json=payload, headers=headers) as response:
-        response_body = await self.__async_read_response__(response, url)
-        _LOGGER.debug(f'async_update_intelligent_car_target_percentage: {response_body}')
+      response_body = await self.__async_post_graphql__(payload)
+      _LOGGER.debug(f'async_update_intelligent_car_target_percentage: {response_body}')
     except TimeoutError:
       _LOGGER.warning(f'Failed to connect. Timeout of {self._timeout} exceeded.')
       raise TimeoutException()
@@ -1097,13 +1064,9 @@ class OctopusEnergyApiClient:
       target_time: time,
     ):
     """Update a user's intelligent car target time"""
-    await self.async_refresh_token()
-    
     settings = await self.async_get_intelligent_settings(account_id)
 
     try:
-      client = self._create_client_session()
-      url = f'{self._base_url}/v1/graphql/'
       payload = { "query": intelligent_settings_mutation.format(
         account_id=account_id,
         weekday_target_percentage=settings.charge_limit_weekday,
@@ -1112,10 +1075,8 @@ class OctopusEnergyApiClient:
         weekend_target_time=target_time.strftime("%H:%M")
       ) }
 
-      headers = { "Authorization": f"JWT {self._graphql_token}" }
-      async with client.post(url, json=payload, headers=headers) as response:
-        response_body = await self.__async_read_response__(response, url)
-        _LOGGER.debug(f'async_update_intelligent_car_target_time: {response_body}')
+      response_body = await self.__async_post_graphql__(payload)
+      _LOGGER.debug(f'async_update_intelligent_car_target_time: {response_body}')
     except TimeoutError:
       _LOGGER.warning(f'Failed to connect. Timeout of {self._timeout} exceeded.')
       raise TimeoutException()
@@ -1124,19 +1085,13 @@ class OctopusEnergyApiClient:
       self, account_id: str,
     ):
     """Turn on an intelligent bump charge"""
-    await self.async_refresh_token()
-
     try:
-      client = self._create_client_session()
-      url = f'{self._base_url}/v1/graphql/'
       payload = { "query": intelligent_turn_on_bump_charge_mutation.format(
         account_id=account_id,
       ) }
 
-      headers = { "Authorization": f"JWT {self._graphql_token}" }
-      async with client.post(url, json=payload, headers=headers) as response:
-        response_body = await self.__async_read_response__(response, url)
-        _LOGGER.debug(f'async_turn_on_intelligent_bump_charge: {response_body}')
+      response_body = await self.__async_post_graphql__(payload)
+      _LOGGER.debug(f'async_turn_on_intelligent_bump_charge: {response_body}')
     except TimeoutError:
       _LOGGER.warning(f'Failed to connect. Timeout of {self._timeout} exceeded.')
       raise TimeoutException()
@@ -1145,19 +1100,13 @@ class OctopusEnergyApiClient:
       self, account_id: str,
     ):
     """Turn off an intelligent bump charge"""
-    await self.async_refresh_token()
-
     try:
-      client = self._create_client_session()
-      url = f'{self._base_url}/v1/graphql/'
       payload = { "query": intelligent_turn_off_bump_charge_mutation.format(
         account_id=account_id,
       ) }
 
-      headers = { "Authorization": f"JWT {self._graphql_token}" }
-      async with client.post(url, json=payload, headers=headers) as response:
-        response_body = await self.__async_read_response__(response, url)
-        _LOGGER.debug(f'async_turn_off_intelligent_bump_charge: {response_body}')
+      response_body = await self.__async_post_graphql__(payload)
+      _LOGGER.debug(f'async_turn_off_intelligent_bump_charge: {response_body}')
     except TimeoutError:
       _LOGGER.warning(f'Failed to connect. Timeout of {self._timeout} exceeded.')
       raise TimeoutException()
@@ -1166,19 +1115,13 @@ class OctopusEnergyApiClient:
       self, account_id: str,
     ):
     """Turn on an intelligent bump charge"""
-    await self.async_refresh_token()
-
     try:
-      client = self._create_client_session()
-      url = f'{self._base_url}/v1/graphql/'
       payload = { "query": intelligent_turn_on_smart_charge_mutation.format(
         account_id=account_id,
       ) }
 
-      headers = { "Authorization": f"JWT {self._graphql_token}" }
-      async with client.post(url, json=payload, headers=headers) as response:
-        response_body = await self.__async_read_response__(response, url)
-        _LOGGER.debug(f'async_turn_on_intelligent_smart_charge: {response_body}')
+      response_body = await self.__async_post_graphql__(payload)
+      _LOGGER.debug(f'async_turn_on_intelligent_smart_charge: {response_body}')
     except TimeoutError:
       _LOGGER.warning(f'Failed to connect. Timeout of {self._timeout} exceeded.')
       raise TimeoutException()
@@ -1187,52 +1130,39 @@ class OctopusEnergyApiClient:
       self, account_id: str,
     ):
     """Turn off an intelligent bump charge"""
-    await self.async_refresh_token()
-
     try:
-      client = self._create_client_session()
-      url = f'{self._base_url}/v1/graphql/'
       payload = { "query": intelligent_turn_off_smart_charge_mutation.format(
         account_id=account_id,
       ) }
 
-      headers = { "Authorization": f"JWT {self._graphql_token}" }
-      async with client.post(url, json=payload, headers=headers) as response:
-        response_body = await self.__async_read_response__(response, url)
-        _LOGGER.debug(f'async_turn_off_intelligent_smart_charge: {response_body}')
+      response_body = await self.__async_post_graphql__(payload)
+      _LOGGER.debug(f'async_turn_off_intelligent_smart_charge: {response_body}')
     except TimeoutError:
       _LOGGER.warning(f'Failed to connect. Timeout of {self._timeout} exceeded.')
       raise TimeoutException()
   
   async def async_get_intelligent_device(self, account_id: str):
     """Get the user's intelligent dispatches"""
-    await self.async_refresh_token()
-
     try:
-      client = self._create_client_session()
-      url = f'{self._base_url}/v1/graphql/'
-      payload = { "query": intelligent_device_query.format(account_id=account_id) }
-      headers = { "Authorization": f"JWT {self._graphql_token}" }
-      async with client.post(url, json=payload, headers=headers) as response:
-        response_body = await self.__async_read_response__(response, url)
-        _LOGGER.debug(f'async_get_intelligent_device: {response_body}')
-
-        if (response_body is not None and "data" in response_body and
-            "registeredKrakenflexDevice" in response_body["data"]):
-          device = response_body["data"]["registeredKrakenflexDevice"]
-          return {
-            "krakenflexDeviceId": device["krakenflexDeviceId"],
-            "provider": device["provider"],
-            "vehicleMake": device["vehicleMake"],
-            "vehicleModel": device["vehicleModel"],
-            "vehicleBatterySizeInKwh": float(device["vehicleBatterySizeInKwh"]) if "vehicleBatterySizeInKwh" in device and device["vehicleBatterySizeInKwh"] is not None else None,
-            "chargePointMake": device["chargePointMake"],
-            "chargePointModel": device["chargePointModel"],
-            "chargePointPowerInKw": float(device["chargePointPowerInKw"]) if "chargePointPowerInKw" in device and device["chargePointPowerInKw"] is not None else None,
+      response_body = await self.__async_graphql_query__(intelligent_device_query.format(account_id=account_id))
+      _LOGGER.debug(f'async_get_intelligent_device: {response_body}')
+
+      if (response_body is not None and "data" in response_body and
+          "registeredKrakenflexDevice" in response_body["data"]):
+        device = response_body["data"]["registeredKrakenflexDevice"]
+        return {
+          "krakenflexDeviceId": device["krakenflexDeviceId"],
+          "provider": device["provider"],
+          "vehicleMake": device["vehicleMake"],
+          "vehicleModel": device["vehicleModel"],
+          "vehicleBatterySizeInKwh": float(device["vehicleBatterySizeInKwh"]) if "vehicleBatterySizeInKwh" in device and device["vehicleBatterySizeInKwh"] is not None else None,
+          "chargePointMake": device["chargePointMake"],
+          "chargePointModel": device["chargePointModel"],
+          "chargePointPowerInKw": float(device["chargePointPowerInKw"]) if "chargePointPowerInKw" in device and device["chargePointPowerInKw"] is not None else None,
             
-          }
-        else:
-          _LOGGER.error("Failed to retrieve intelligent device")
+        }
+      else:
+        _LOGGER.error("Failed to retrieve intelligent device")
       
       return None
 
@@ -1242,27 +1172,20 @@ class OctopusEnergyApiClient:
   
   async def async_get_wheel_of_fortune_spins(self, account_id: str) -> WheelOfFortuneSpinsResponse:
     """Get the user's wheel of fortune spins"""
-    await self.async_refresh_token()
-
     try:
-      client = self._create_client_session()
-      url = f'{self._base_url}/v1/graphql/'
-      payload = { "query": wheel_of_fortune_query.format(account_id=account_id) }
-      headers = { "Authorization": f"JWT {self._graphql_token}" }
-      async with client.post(url, json=payload, headers=headers) as response:
-        response_body = await self.__async_read_response__(response, url)
-        _LOGGER.debug(f'async_get_wheel_of_fortune_spins: {response_body}')
-
-        if (response_body is not None and "data" in response_body and
-            "wheelOfFortuneSpins" in response_body["data"]):
+      response_body = await self.__async_graphql_query__(wheel_of_fortune_query.format(account_id=account_id))
+      _LOGGER.debug(f'async_get_wheel_of_fortune_spins: {response_body}')
+
+      if (response_body is not None and "data" in response_body and
+          "wheelOfFortuneSpins" in response_body["data"]):
           
-          spins = response_body["data"]["wheelOfFortuneSpins"]
-          return WheelOfFortuneSpinsResponse(
-            int(spins["electricity"]["remainingSpinsThisMonth"]) if "electricity" in spins and "remainingSpinsThisMonth" in spins["electricity"] else 0,
-            int(spins["gas"]["remainingSpinsThisMonth"]) if "gas" in spins and "remainingSpinsThisMonth" in spins["gas"] else 0
-          )
-        else:
-          _LOGGER.error("Failed to retrieve wheel of fortune spins")
+        spins = response_body["data"]["wheelOfFortuneSpins"]
+        return WheelOfFortuneSpinsResponse(
+          int(spins["electricity"]["remainingSpinsThisMonth"]) if "electricity" in spins and "remainingSpinsThisMonth" in spins["electricity"] else 0,
+          int(spins["gas"]["remainingSpinsThisMonth"]) if "gas" in spins and "remainingSpinsThisMonth" in spins["gas"] else 0
+        )
+      else:
+        _LOGGER.error("Failed to retrieve wheel of fortune spins")
       
       return None
 
@@ -1272,26 +1195,20 @@ class OctopusEnergyApiClient:
   
   async def async_spin_wheel_of_fortune(self, account_id: str, is_electricity: bool) -> int:
     """Get the user's wheel of fortune spins"""
-    await self.async_refresh_token()
-
     try:
-      client = self._create_client_session()
-      url = f'{self._base_url}/v1/graphql/'
       payload = { "query": wheel_of_fortune_mutation.format(account_id=account_id, supply_type="ELECTRICITY" if is_electricity == True else "GAS") }
-      headers = { "Authorization": f"JWT {self._graphql_token}" }
-      async with client.post(url, json=payload, headers=headers) as response:
-        response_body = await self.__async_read_response__(response, url)
-        _LOGGER.debug(f'async_spin_wheel_of_fortune: {response_body}')
-
-        if (response_body is not None and 
-            "data" in response_body and
-            "spinWheelOfFortune" in response_body["data"] and
-            "spinResult" in response_body["data"]["spinWheelOfFortune"] and
-            "prizeAmount" in response_body["data"]["spinWheelOfFortune"]["spinResult"]):
+      response_body = await self.__async_post_graphql__(payload)
+      _LOGGER.debug(f'async_spin_wheel_of_fortune: {response_body}')
+
+      if (response_body is not None and 
+          "data" in response_body and
+          "spinWheelOfFortune" in response_body["data"] and
+          "spinResult" in response_body["data"]["spinWheelOfFortune"] and
+          "prizeAmount" in response_body["data"]["spinWheelOfFortune"]["spinResult"]):
           
-          return int(response_body["data"]["spinWheelOfFortune"]["spinResult"]["prizeAmount"])
-        else:
-          _LOGGER.error("Failed to spin wheel of fortune")
+        return int(response_body["data"]["spinWheelOfFortune"]["spinResult"]["prizeAmount"])
+      else:
+        _LOGGER.error("Failed to spin wheel of fortune")
       
       return None
     except TimeoutError:
@@ -1301,56 +1218,144 @@ class OctopusEnergyApiClient:
   def __get_interval_end(self, item):
     return item["end"]
 
-  def __is_night_rate(self, rate, is_smart_meter):
-    # Normally the economy seven night rate is between 12am and 7am UK time
-    # https://octopus.energy/help-and-faqs/articles/what-is-an-economy-7-meter-and-tariff/
-    # However, if a smart meter is being used then the times are between 12:30am and 7:30am UTC time
-    # https://octopus.energy/help-and-faqs/articles/what-happens-to-my-economy-seven-e7-tariff-when-i-have-a-smart-meter-installed/
-    if is_smart_meter:
-        is_night_rate = self.__is_between_times(rate, "00:30:00", "07:30:00", True)
+  def __process_consumption(self, items: list):
+    # The end of one interval is the start of the next, so parse them together so each timestamp is only parsed once
+    timestamps = parse_timestamps(list(map(lambda item: item["interval_start"], items)) + list(map(lambda item: item["interval_end"], items)))
+    starts = timestamps[:len(items)]
+    ends = timestamps[len(items):]
+    return list(map(lambda index: {
+      "consumption": float(items[index]["consumption"]),
+      "start": starts[index],
+      "end": ends[index]
+    }, range(len(items))))
+
+  async def __async_get__(self, url: str, auth: aiohttp.BasicAuth, is_product_request = False):
+    """Sends a GET request, sharing the response with any identical requests that are already in flight.
+
+    Product requests are public, so their responses are additionally cached for a short period. Cached responses
+    are shared between callers, so must not be modified.
+    """
+    key = normalise_url(url)
+    if is_product_request:
+      (is_cached, data) = self._product_response_cache.get(key)
+      if is_cached:
+        _LOGGER.debug(f'Using cached response for {url} (hits: {self._product_response_cache.hits}; misses: {self._product_response_cache.misses}; evictions: {self._product_response_cache.evictions})')
+        return data
+
+    request = self._in_flight_requests.get(key)
+    if request is None:
+      request = asyncio.ensure_future(self.__async_send_get__(url, auth))
+      self._in_flight_requests[key] = request
+      request.add_done_callback(lambda _: self.__remove_in_flight_request(key, request))
     else:
-        is_night_rate = self.__is_between_times(rate, "00:00:00", "07:00:00", False)
-    return is_night_rate
-
-  def __is_between_times(self, rate, target_from_time, target_to_time, use_utc):
-    """Determines if a current rate is between two times"""
-    rate_local_valid_from = as_local(rate["start"])
-    rate_local_valid_to = as_local(rate["end"])
-
-    if use_utc:
-        rate_utc_valid_from = as_utc(rate["start"])
-        # We need to convert our times into local time to account for BST to ensure that our rate is valid between the target times.
-        from_date_time = as_local(parse_datetime(rate_utc_valid_from.strftime(f"%Y-%m-%dT{target_from_time}Z")))
-        to_date_time = as_local(parse_datetime(rate_utc_valid_from.strftime(f"%Y-%m-%dT{target_to_time}Z")))
-    else:
-        local_now = now()
-        # We need to convert our times into local time to account for BST to ensure that our rate is valid between the target times.
-        from_date_time = as_local(parse_datetime(rate_local_valid_from.strftime(f"%Y-%m-%dT{target_from_time}{local_now.strftime('%z')}")))
-        to_date_time = as_local(parse_datetime(rate_local_valid_from.strftime(f"%Y-%m-%dT{target_to_time}{local_now.strftime('%z')}")))
+      _LOGGER.debug(f'Joining in flight request for {url}')
+
+    # Shield our request so that a cancelled caller doesn't cancel the request for everyone else
+    data = await asyncio.shield(request)
+    if is_product_request and data is not None:
+      self._product_response_cache.set(key, data)
+
+    return data
+
+  async def __async_get_all_results__(self, url: str, auth: aiohttp.BasicAuth, is_product_request = False):
+    """Gets the results from all pages of the specified request, or None if any page could not be retrieved.
+
+    The total number of pages is determined from the count of the first page, with the remaining pages retrieved
+    concurrently. If the count is missing, the next links are followed one at a time.
+    """
+    data = await self.__async_get__(url, auth, is_product_request)
+    if data is None or "results" not in data:
+      return None
+
+    results = list(data["results"]) if data["results"] is not None else []
+    if "next" not in data or data["next"] is None:
+      return results
+
+    total_pages = get_total_pages(data["count"] if "count" in data else None, len(results))
+    if total_pages is None:
+      next_url = data["next"]
+      while next_url is not None:
+        data = await self.__async_get__(next_url, auth, is_product_request)
+        if data is None:
+          return None
+
+        results.extend(data["results"] if "results" in data and data["results"] is not None else [])
+        next_url = data["next"] if "next" in data else None
+
+      return results
+
+    semaphore = asyncio.Semaphore(self._max_concurrent_page_requests)
+    async def async_get_page(page: int):
+      async with semaphore:
+        return await self.__async_get__(get_page_url(url, page), auth, is_product_request)
+
+    _LOGGER.debug(f'Retrieving {total_pages - 1} additional pages for {url}')
+    pages = await asyncio.gather(*[async_get_page(page) for page in range(2, total_pages + 1)])
+    for page in pages:
+      if page is None:
+        return None
+
+      results.extend(page["results"] if "results" in page and page["results"] is not None else [])
+
+    return results
+
+  async def __async_send_get__(self, url: str, auth: aiohttp.BasicAuth):
+    client = self._create_client_session()
+    async with client.get(url, auth=auth) as response:
+      return await self.__async_read_response__(response, url)
+
+  def __remove_in_flight_request(self, key: str, request):
+    if self._in_flight_requests.get(key) is request:
+      del self._in_flight_requests[key]
+
+  async def __async_graphql_query__(self, query: str):
+    """Sends the GraphQL query as part of the next batch of queries, raising any errors associated with the query"""
+    response_body = await self._graphql_batcher.async_query(query)
+    if response_body is not None and "errors" in response_body:
+      self.__raise_graphql_errors__(f'{self._base_url}/v1/graphql/', response_body)
+
+    return response_body
+
+  async def __async_send_graphql_query__(self, query: str):
+    # Errors are raised against the individual queries, so that one failing query doesn't fail the whole batch
+    return await self.__async_post_graphql__({ "query": query }, False)
+
+  async def __async_post_graphql__(self, payload: dict, raise_graphql_errors = True):
+    """Posts the payload to the GraphQL endpoint, retrying once with a new token if our token has been rejected"""
+    token = await self._token_manager.async_get_token()
+
+    client = self._create_client_session()
+    url = f'{self._base_url}/v1/graphql/'
+    async with client.post(url, json=payload, headers={ "Authorization": f"JWT {token}" }) as response:
+      if response.status != 401:
+        return await self.__async_read_response__(response, url, raise_graphql_errors)
 
-    _LOGGER.debug('is_valid: %s; from_date_time: %s; to_date_time: %s; rate_local_valid_from: %s; rate_local_valid_to: %s', rate_local_valid_from >= from_date_time and rate_local_valid_from < to_date_time, from_date_time, to_date_time, rate_local_valid_from, rate_local_valid_to)
+    _LOGGER.debug('Token rejected, retrying with a new token')
+    self._token_manager.invalidate(token)
+    token = await self._token_manager.async_get_token()
 
-    return rate_local_valid_from >= from_date_time and rate_local_valid_from < to_date_time
+    async with client.post(url, json=payload, headers={ "Authorization": f"JWT {token}" }) as response:
+      return await self.__async_read_response__(response, url, raise_graphql_errors)
 
-  def __process_consumption(self, item):
-    return {
-      "consumption": float(item["consumption"]),
-      "start": as_utc(parse_datetime(item["interval_start"])),
-      "end": as_utc(parse_datetime(item["interval_end"]))
-    }
+  def __raise_graphql_errors__(self, url: str, response_body: dict):
+    msg = f'Errors in request ({url}): {response_body["errors"]}'
+    errors = list(map(lambda error: error["message"], response_body["errors"]))
+    _LOGGER.warning(msg)
+    raise RequestException(msg, errors)
 
-  async def __async_read_response__(self, response, url):
+  async def __async_read_response__(self, response, url, raise_graphql_errors = True):
     """Reads the response, logging any json errors"""
 
-    text = await response.text()
+    # Only the raw bytes are kept, with the text only being decoded when it's needed for error messages
+    content = await response.read()
 
     if response.status >= 400:
       if response.status >= 500:
-        msg = f'DO NOT REPORT - Octopus Energy server error ({url}): {response.status}; {text}'
+        msg = f'DO NOT REPORT - Octopus Energy server error ({url}): {response.status}; {decode_text(content, response.charset)}'
         _LOGGER.warning(msg)
         raise ServerException(msg)
       elif response.status not in [401, 403, 404]:
-        msg = f'Failed to send request ({url}): {response.status}; {text}'
+        msg = f'Failed to send request ({url}): {response.status}; {decode_text(content, response.charset)}'
         _LOGGER.warning(msg)
         raise RequestException(msg, [])
       
@@ -1359,14 +1364,11 @@ class OctopusEnergyApiClient:
 
     data_as_json = None
     try:
-      data_as_json = json.loads(text)
+      data_as_json = decode_json(content)
     except:
-      raise Exception(f'Failed to extract response json: {url}; {text}')
+      raise Exception(f'Failed to extract response json: {url}; {decode_text(content, response.charset)}')
     
-    if ("graphql" in url and "errors" in data_as_json):
-      msg = f'Errors in request ({url}): {data_as_json["errors"]}'
-      errors = list(map(lambda error: error["message"], data_as_json["errors"]))
-      _LOGGER.warning(msg)
-      raise RequestException(msg, errors)
+    if (raise_graphql_errors and "graphql" in url and "errors" in data_as_json):
+      self.__raise_graphql_errors__(url, data_as_json)
     
     return data_as_json
@@ -0,0 +1,261 @@
+import asyncio
+import logging
+import re
+
+_LOGGER = logging.getLogger(__name__)
+
+__FIELD_NAME_REGEX = re.compile(r"[_A-Za-z][_0-9A-Za-z]*")
+
+class GraphQLSelection:
+  response_key: str
+  field: str
+
+  def __init__(self, response_key: str, field: str):
+    self.response_key = response_key
+    self.field = field
+
+def __skip_whitespace(text: str, index: int) -> int:
+  while index < len(text) and (text[index].isspace() or text[index] == ","):
+    index = index + 1
+
+  return index
+
+def __skip_block(text: str, index: int, open_character: str, close_character: str) -> int:
+  """Returns the index after the block starting at the provided index, ignoring any characters within strings"""
+  depth = 0
+  is_in_string = False
+  while index < len(text):
+    character = text[index]
+    if is_in_string:
+      if character == "\\":
+        index = index + 1
+      elif character == '"':
+        is_in_string = False
+    elif character == '"':
+      is_in_string = True
+    elif character == open_character:
+      depth = depth + 1
+    elif character == close_character:
+      depth = depth - 1
+      if depth == 0:
+        return index + 1
+
+    index = index + 1
+
+  raise Exception(f"Unterminated '{open_character}' in GraphQL document")
+
+def get_graphql_selections(query: str) -> list[GraphQLSelection]:
+  """Gets the top level fields of the provided GraphQL query document"""
+  start = query.index("{")
+  end = __skip_block(query, start, "{", "}")
+  body = query[start + 1:end - 1]
+
+  selections = []
+  index = __skip_whitespace(body, 0)
+  while index < len(body):
+    name_match = __FIELD_NAME_REGEX.match(body, index)
+    if name_match is None:
+      raise Exception(f"Unexpected character '{body[index]}' in GraphQL document")
+
+    response_key = name_match.group(0)
+    field_start = index
+    index = __skip_whitespace(body, name_match.end())
+
+    # Fields that are already aliased keep their alias as their response key
+    if index < len(body) and body[index] == ":":
+      index = __skip_whitespace(body, index + 1)
+      name_match = __FIELD_NAME_REGEX.match(body, index)
+      if name_match is None:
+        raise Exception(f"Missing field name for alias '{response_key}' in GraphQL document")
+      field_start = index
+      index = __skip_whitespace(body, name_match.end())
+
+    if index < len(body) and body[index] == "(":
+      index = __skip_whitespace(body, __skip_block(body, index, "(", ")"))
+
+    if index < len(body) and body[index] == "{":
+      index = __skip_block(body, index, "{", "}")
+
+    selections.append(GraphQLSelection(response_key, body[field_start:index].strip()))
+    index = __skip_whitespace(body, index)
+
+  return selections
+
+def get_graphql_alias(query_index: int, response_key: str) -> str:
+  return f"q{query_index}_{response_key}"
+
+def merge_graphql_queries(queries: list[str]) -> str:
+  """Merges the provided query documents into a single document, where each top level field is aliased by the query it belongs to"""
+  fields = []
+  for query_index, query in enumerate(queries):
+    for selection in get_graphql_selections(query):
+      fields.append(f"{get_graphql_alias(query_index, selection.response_key)}: {selection.field}")
+
+  separator = "\n  "
+  return f"query {{\n  {separator.join(fields)}\n}}"
+
+def __get_error_path(error: dict):
+  return error["path"] if "path" in error and error["path"] is not None and len(error["path"]) > 0 else None
+
+def __get_errors(response_body: dict) -> list:
+  return response_body["errors"] if "errors" in response_body and response_body["errors"] is not None else []
+
+def split_graphql_response(queries: list[str], response_body: dict) -> list[dict]:
+  """Splits the response of a merged query document back into the response of each individual query.
+
+  Errors are assigned to the query that contains the field the error refers to. Errors that aren't associated with a field
+  can't be attributed to a query, so aren't included (see get_unattributed_graphql_errors).
+  """
+  if response_body is None:
+    return [None] * len(queries)
+
+  data = response_body["data"] if "data" in response_body else None
+  errors = __get_errors(response_body)
+
+  results = []
+  for query_index, query in enumerate(queries):
+    query_data = dict() if data is not None else None
+    aliases = dict()
+    for selection in get_graphql_selections(query):
+      alias = get_graphql_alias(query_index, selection.response_key)
+      aliases[alias] = selection.response_key
+      if data is not None and alias in data:
+        query_data[selection.response_key] = data[alias]
+
+    query_errors = []
+    for error in errors:
+      path = __get_error_path(error)
+      if path is not None and path[0] in aliases:
+        query_error = dict(error)
+        query_error["path"] = [aliases[path[0]]] + list(path[1:])
+        query_errors.append(query_error)
+
+    result = { "data": query_data }
+    if len(query_errors) > 0:
+      result["errors"] = query_errors
+
+    results.append(result)
+
+  return results
+
+def get_unattributed_graphql_errors(queries: list[str], response_body: dict) -> list[dict]:
+  """Gets the errors of the response of a merged query document that can't be attributed to any of the individual queries"""
+  if response_body is None:
+    return []
+
+  aliases = set()
+  for query_index, query in enumerate(queries):
+    for selection in get_graphql_selections(query):
+      aliases.add(get_graphql_alias(query_index, selection.response_key))
+
+  return list(filter(lambda error: __get_error_path(error) is None or __get_error_path(error)[0] not in aliases, __get_errors(response_body)))
+
+def is_graphql_result_complete(query: str, result: dict) -> bool:
+  """Determines if the result of an individual query has no errors and data for each of its fields"""
+  if result is None or "errors" in result or result["data"] is None:
+    return False
+
+  for selection in get_graphql_selections(query):
+    if selection.response_key not in result["data"] or result["data"][selection.response_key] is None:
+      return False
+
+  return True
+
+class GraphQLBatcher:
+  """Batches GraphQL queries into a single request.
+
+  Queries are sent as soon as no other request is in flight, waiting the provided window for other queries to join them.
+  Queries that are requested while a request is in flight are sent together once it has completed. Identical pending queries
+  share the same result.
+  """
+
+  def __init__(self, async_send, window_in_seconds: float = 0):
+    self._async_send = async_send
+    self._window_in_seconds = window_in_seconds
+    self._pending_queries: dict[str, asyncio.Future] = dict()
+    self._is_flush_scheduled = False
+    self._is_sending = False
+    self._flush_task: asyncio.Task = None
+
+  async def async_query(self, query: str):
+    """Queues the query to be sent with the next batch, returning the response body for the query"""
+    if query in self._pending_queries:
+      future = self._pending_queries[query]
+    else:
+      loop = asyncio.get_running_loop()
+      future = loop.create_future()
+      self._pending_queries[query] = future
+      self.__schedule_flush(loop)
+
+    return await asyncio.shield(future)
+
+  def __schedule_flush(self, loop: asyncio.AbstractEventLoop):
+    # If a request is in flight, our pending queries are sent once it has completed
+    if self._is_flush_scheduled == False and self._is_sending == False:
+      self._is_flush_scheduled = True
+      loop.call_later(self._window_in_seconds, self.__start_flush, loop)
+
+  def __start_flush(self, loop: asyncio.AbstractEventLoop):
+    # Keep a reference to the task so it isn't garbage collected before it completes
+    self._flush_task = loop.create_task(self.async_flush())
+    self._flush_task.add_done_callback(self.__on_flush_done)
+
+  def __on_flush_done(self, task: asyncio.Task):
+    if self._flush_task is task:
+      self._flush_task = None
+
+    if task.cancelled() == False and task.exception() is not None:
+      _LOGGER.error(f'Failed to send GraphQL queries: {task.exception()}')
+
+  async def async_flush(self):
+    """Sends all pending queries"""
+    self._is_flush_scheduled = False
+    pending_queries = self._pending_queries
+    self._pending_queries = dict()
+    if len(pending_queries) == 0:
+      return
+
+    self._is_sending = True
+    try:
+      await self.__async_send_queries(pending_queries)
+    finally:
+      self._is_sending = False
+      if len(self._pending_queries) > 0:
+        self.__schedule_flush(asyncio.get_running_loop())
+
+  async def __async_send_queries(self, pending_queries: dict[str, asyncio.Future]):
+    queries = list(pending_queries.keys())
+    try:
+      if len(queries) == 1:
+        results = [await self._async_send(queries[0])]
+      else:
+        _LOGGER.debug(f'Sending {len(queries)} GraphQL queries in a single request')
+        response_body = await self._async_send(merge_graphql_queries(queries))
+        results = split_graphql_response(queries, response_body)
+
+        # A query that didn't fully succeed without any errors of its own could have been affected by another query (e.g. an
+        # error in a non-nullable field causes all data to be null), so is sent on its own. If there are errors we can't tell
+        # which queries they belong to, so this applies to any query that didn't fully succeed.
+        has_unattributed_errors = len(get_unattributed_graphql_errors(queries, response_body)) > 0
+        retry_indexes = list(filter(
+          lambda index: is_graphql_result_complete(queries[index], results[index]) == False and (has_unattributed_errors or results[index] is None or "errors" not in results[index]),
+          range(len(queries))
+        ))
+        if len(retry_indexes) > 0:
+          _LOGGER.debug(f'Retrying {len(retry_indexes)} incomplete GraphQL queries individually')
+          retry_results = await asyncio.gather(*map(lambda index: self._async_send(queries[index]), retry_indexes), return_exceptions=True)
+          for retry_index, index in enumerate(retry_indexes):
+            results[index] = retry_results[retry_index]
+    except Exception as e:
+      for future in pending_queries.values():
+        if future.done() == False:
+          future.set_exception(e)
+      return
+
+    for index, query in enumerate(queries):
+      future = pending_queries[query]
+      if future.done() == False:
+        if isinstance(results[index], BaseException):
+          future.set_exception(results[index])
+        else:
+          future.set_result(results[index])
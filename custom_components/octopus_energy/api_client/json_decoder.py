@@ -0,0 +1,28 @@
+import json
+
+try:
+  # orjson is shipped with Home Assistant, but isn't guaranteed to be available in every environment
+  import orjson
+except ImportError:
+  orjson = None
+
+def decode_json(content: bytes):
+  """Decodes the raw bytes of a json document, using the fastest available parser.
+
+  Documents that the fast parser rejects (e.g. those containing NaN) are retried with the standard library, so behaviour
+  matches json.loads regardless of which parser is installed.
+  """
+  if orjson is not None:
+    try:
+      return orjson.loads(content)
+    except orjson.JSONDecodeError:
+      pass
+
+  return json.loads(content)
+
+def decode_text(content: bytes, encoding: str = None) -> str:
+  """Decodes the raw bytes into text, for use within error messages"""
+  if content is None:
+    return None
+
+  return content.decode(encoding if encoding is not None else "utf-8", errors="replace")
@@ -0,0 +1,16 @@
+import math
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+def get_page_url(url: str, page: int) -> str:
+  """Gets the url for the specified page, replacing any existing page parameter"""
+  parts = urlsplit(url)
+  query = list(filter(lambda parameter: parameter[0] != "page", parse_qsl(parts.query, keep_blank_values=True)))
+  query.append(("page", str(page)))
+  return urlunsplit((parts.scheme, parts.netloc, parts.path, urlencode(query, safe=":"), parts.fragment))
+
+def get_total_pages(count: int, page_size: int) -> int:
+  """Gets the total number of pages required to retrieve the specified number of items"""
+  if count is None or page_size is None or page_size < 1:
+    return None
+
+  return max(1, math.ceil(count / page_size))
@@ -0,0 +1,49 @@
+import time
+from collections import OrderedDict
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+def normalise_url(url: str) -> str:
+  """Normalise the url so that equivalent requests share the same key, regardless of casing or query parameter order"""
+  parts = urlsplit(url)
+  query = urlencode(sorted(parse_qsl(parts.query, keep_blank_values=True)), safe=":")
+  return urlunsplit((parts.scheme.lower(), parts.netloc.lower(), parts.path, query, ""))
+
+class ResponseCache:
+  """Bounded least recently used cache of responses, where each response expires after a fixed time to live"""
+
+  def __init__(self, max_size: int, ttl_in_seconds: float, clock = time.monotonic):
+    self._max_size = max_size
+    self._ttl_in_seconds = ttl_in_seconds
+    self._clock = clock
+    self._items = OrderedDict()
+    self.hits = 0
+    self.misses = 0
+    self.evictions = 0
+
+  def __len__(self):
+    return len(self._items)
+
+  def get(self, key: str):
+    """Returns a tuple of whether the key was found, and the cached value"""
+    if key in self._items:
+      (expires_at, value) = self._items[key]
+      if expires_at > self._clock():
+        self._items.move_to_end(key)
+        self.hits = self.hits + 1
+        return (True, value)
+
+      del self._items[key]
+
+    self.misses = self.misses + 1
+    return (False, None)
+
+  def set(self, key: str, value):
+    self._items[key] = (self._clock() + self._ttl_in_seconds, value)
+    self._items.move_to_end(key)
+
+    while len(self._items) > self._max_size:
+      self._items.popitem(last=False)
+      self.evictions = self.evictions + 1
+
+  def clear(self):
+    self._items.clear()
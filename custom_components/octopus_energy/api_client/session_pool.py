@@ -0,0 +1,74 @@
+import logging
+
+import aiohttp
+
+_LOGGER = logging.getLogger(__name__)
+
+CONNECTION_LIMIT = 100
+CONNECTION_LIMIT_PER_HOST = 10
+KEEP_ALIVE_TIMEOUT_IN_SECONDS = 60
+DNS_CACHE_TTL_IN_SECONDS = 300
+
+class ClientSessionPool:
+  """Shares client sessions, and therefore their connections, between all api clients that target the same base url.
+
+  Sessions are reference counted, and closed once the last client using them has been closed.
+  """
+
+  def __init__(self):
+    self._sessions: dict[tuple, aiohttp.ClientSession] = dict()
+    self._references: dict[tuple, int] = dict()
+
+  def acquire(self, base_url: str, timeout: aiohttp.ClientTimeout, headers: dict) -> aiohttp.ClientSession:
+    """Gets the session for the base url, creating it if it doesn't exist"""
+    key = (base_url, timeout)
+    session = self._sessions[key] if key in self._sessions else None
+    if session is None or session.closed:
+      _LOGGER.debug(f'Creating client session for {base_url}')
+      connector = aiohttp.TCPConnector(
+        limit=CONNECTION_LIMIT,
+        limit_per_host=CONNECTION_LIMIT_PER_HOST,
+        keepalive_timeout=KEEP_ALIVE_TIMEOUT_IN_SECONDS,
+        ttl_dns_cache=DNS_CACHE_TTL_IN_SECONDS,
+        enable_cleanup_closed=True
+      )
+
+      # Sessions are shared between accounts, so make sure no state is shared via cookies
+      session = aiohttp.ClientSession(
+        connector=connector,
+        timeout=timeout,
+        headers=headers,
+        cookie_jar=aiohttp.DummyCookieJar(),
+        auto_decompress=True
+      )
+      self._sessions[key] = session
+      self._references[key] = 0
+
+    self._references[key] = self._references[key] + 1
+    return session
+
+  async def async_release(self, base_url: str, timeout: aiohttp.ClientTimeout):
+    """Releases a reference to the session for the base url, closing the session if it's no longer used"""
+    key = (base_url, timeout)
+    if key not in self._references:
+      return
+
+    self._references[key] = self._references[key] - 1
+    if self._references[key] <= 0:
+      session = self._sessions.pop(key)
+      del self._references[key]
+
+      _LOGGER.debug(f'Closing client session for {base_url}')
+      await session.close()
+
+  async def async_close(self):
+    """Closes all sessions"""
+    sessions = list(self._sessions.values())
+    self._sessions.clear()
+    self._references.clear()
+
+    for session in sessions:
+      await session.close()
+
+# The pool is shared by all clients within the process, so that multiple accounts reuse the same connections
+default_session_pool = ClientSessionPool()
@@ -0,0 +1,77 @@
+import asyncio
+import base64
+import json
+from datetime import datetime, timedelta, timezone
+
+from homeassistant.util.dt import utcnow
+
+TOKEN_REFRESH_MARGIN = timedelta(minutes=5)
+
+# Used when the expiry can't be determined from the token itself
+DEFAULT_TOKEN_LIFETIME = timedelta(hours=1)
+
+def get_jwt_expiration(token: str) -> datetime:
+  """Gets the expiry of the provided JWT, or None if the expiry could not be determined"""
+  try:
+    payload = token.split(".")[1]
+    payload = payload + "=" * (-len(payload) % 4)
+    claims = json.loads(base64.urlsafe_b64decode(payload))
+    return datetime.fromtimestamp(int(claims["exp"]), timezone.utc)
+  except Exception:
+    return None
+
+class TokenManager:
+  """Keeps a valid token available, refreshing it when it's requested shortly before it expires.
+
+  Any callers that need a token while a refresh is in progress wait on the same refresh, rather than each requesting a new token.
+  """
+
+  def __init__(self, async_obtain_token, refresh_margin: timedelta = TOKEN_REFRESH_MARGIN):
+    self._async_obtain_token = async_obtain_token
+    self._refresh_margin = refresh_margin
+    self._token = None
+    self._expiration = None
+    self._refresh_task: asyncio.Task = None
+
+  @property
+  def token(self) -> str:
+    return self._token
+
+  @property
+  def expiration(self) -> datetime:
+    return self._expiration
+
+  def is_token_valid(self) -> bool:
+    return self._token is not None and self._expiration is not None and (self._expiration - self._refresh_margin) > utcnow()
+
+  async def async_get_token(self) -> str:
+    """Gets a valid token, refreshing the token if required"""
+    if self.is_token_valid():
+      return self._token
+
+    return await self.async_refresh()
+
+  async def async_refresh(self) -> str:
+    """Refreshes the token, sharing any refresh that is already in progress"""
+    if self._refresh_task is None:
+      self._refresh_task = asyncio.get_running_loop().create_task(self.__async_refresh())
+
+    return await asyncio.shield(self._refresh_task)
+
+  def invalidate(self, token: str):
+    """Marks the provided token as no longer valid, if it's still our current token"""
+    if token is not None and token == self._token:
+      self._token = None
+      self._expiration = None
+
+  async def __async_refresh(self) -> str:
+    try:
+      token = await self._async_obtain_token()
+      if token is not None:
+        expiration = get_jwt_expiration(token)
+        self._token = token
+        self._expiration = expiration if expiration is not None else utcnow() + DEFAULT_TOKEN_LIFETIME
+
+      return token
+    finally:
+      self._refresh_task = None
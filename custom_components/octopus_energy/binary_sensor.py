@@ -8,6 +8,7 @@ from homeassistant.util.dt import (utcnow)
 from .electricity.off_peak import OctopusEnergyElectricityOffPeak
 from .octoplus.saving_sessions import OctopusEnergySavingSessions
 from .target_rates.target_rate import OctopusEnergyTargetRate
+from .target_rates.planner import TargetRatePlanner
 from .intelligent.dispatching import OctopusEnergyIntelligentDispatching
 from .greenness_forecast.highlighted import OctopusEnergyGreennessForecastHighlighted
 from .utils import get_active_tariff_code
@@ -28,6 +29,7 @@ from .const import (
   CONFIG_TARGET_MPAN,
 
   DATA_ELECTRICITY_RATES_COORDINATOR_KEY,
+  DATA_ELECTRICITY_TARGET_RATE_PLANNER_KEY,
   DATA_SAVING_SESSIONS_COORDINATOR,
   DATA_ACCOUNT
 )
@@ -132,6 +134,12 @@ async def async_setup_target_sensors(hass, entry, async_add_entities):
           is_export = meter["is_export"]
           serial_number = meter["serial_number"]
           coordinator = hass.data[DOMAIN][account_id][DATA_ELECTRICITY_RATES_COORDINATOR_KEY.format(mpan, serial_number)]
-          entities = [OctopusEnergyTargetRate(hass, account_id, coordinator, config, is_export)]
+
+          # All target rate sensors for the same meter share a planner, so the rates are only processed once
+          planner_key = DATA_ELECTRICITY_TARGET_RATE_PLANNER_KEY.format(mpan, serial_number)
+          if planner_key not in hass.data[DOMAIN][account_id]:
+            hass.data[DOMAIN][account_id][planner_key] = TargetRatePlanner()
+
+          entities = [OctopusEnergyTargetRate(hass, account_id, coordinator, config, is_export, hass.data[DOMAIN][account_id][planner_key])]
           async_add_entities(entities)
           return
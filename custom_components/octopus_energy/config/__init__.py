@@ -1,11 +1,7 @@
-from ..utils import get_active_tariff_code
+from ..utils.tariff_index import TariffIndex, get_tariff_index
 
-def get_meter_tariffs(account_info, now):
-  meters = {}
-  if account_info is not None and len(account_info["electricity_meter_points"]) > 0:
-    for point in account_info["electricity_meter_points"]:
-      active_tariff_code = get_active_tariff_code(now, point["agreements"])
-      if active_tariff_code is not None:
-        meters[point["mpan"]] = active_tariff_code
+def get_meter_tariffs(account_info, now, tariff_index: TariffIndex = None):
+  if account_info is None:
+    return {}
 
-  return meters
\ No newline at end of file
+  return get_tariff_index(account_info, tariff_index).get_electricity_tariff_codes(now)
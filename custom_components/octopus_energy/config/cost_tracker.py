@@ -1,6 +1,7 @@
 import re
 
 from . import get_meter_tariffs
+from ..utils.tariff_index import TariffIndex
 
 from ..const import (
   CONFIG_COST_MONTH_DAY_RESET,
@@ -25,14 +26,14 @@ def merge_cost_tracker_config(data: dict, options: dict, updated_config: dict =
 
   return config
 
-def validate_cost_tracker_config(data, account_info, now):
+def validate_cost_tracker_config(data, account_info, now, tariff_index: TariffIndex = None):
   errors = {}
 
   matches = re.search(REGEX_ENTITY_NAME, data[CONFIG_COST_NAME])
   if matches is None:
     errors[CONFIG_COST_NAME] = "invalid_target_name"
 
-  meter_tariffs = get_meter_tariffs(account_info, now)
+  meter_tariffs = get_meter_tariffs(account_info, now, tariff_index)
   if (data[CONFIG_COST_MPAN] not in meter_tariffs):
     errors[CONFIG_COST_MPAN] = "invalid_mpan"
 
@@ -75,6 +75,8 @@ async def async_validate_main_config(data, account_ids = []):
     account_info = None
   except ServerException:
     errors[CONFIG_MAIN_API_KEY] = "server_error"
+  finally:
+    await client.async_close()
   
   if (CONFIG_MAIN_API_KEY not in errors and account_info is None):
     errors[CONFIG_MAIN_API_KEY] = "account_not_found"
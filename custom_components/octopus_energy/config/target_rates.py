@@ -28,6 +28,7 @@ from ..const import (
 )
 
 from . import get_meter_tariffs
+from ..utils.tariff_index import TariffIndex
 from ..utils.tariff_check import is_agile_tariff
 
 async def async_migrate_target_config(version: int, data: {}, get_entries):
@@ -103,7 +104,7 @@ def is_in_agile_darkzone(start_time, end_time):
 
   return start_time < agile_start and end_time > agile_end
 
-def validate_target_rate_config(data, account_info, now):
+def validate_target_rate_config(data, account_info, now, tariff_index: TariffIndex = None):
   errors = {}
 
   matches = re.search(REGEX_ENTITY_NAME, data[CONFIG_TARGET_NAME])
@@ -146,7 +147,7 @@ def validate_target_rate_config(data, account_info, now):
     if is_time_frame_long_enough(data[CONFIG_TARGET_HOURS], start_time, end_time) == False:
       errors[CONFIG_TARGET_HOURS] = "invalid_hours_time_frame"
 
-  meter_tariffs = get_meter_tariffs(account_info, now)
+  meter_tariffs = get_meter_tariffs(account_info, now, tariff_index)
   if (data[CONFIG_TARGET_MPAN] not in meter_tariffs):
     errors[CONFIG_TARGET_MPAN] = "invalid_mpan"
   elif is_time_valid:
@@ -223,7 +223,7 @@ class OctopusEnergyConfigFlow(ConfigFlow, domain=DOMAIN):
       return self.async_abort(reason="account_not_found")
 
     now = utcnow()
-    errors = validate_target_rate_config(user_input, account_info.account, now) if user_input is not None else {}
+    errors = validate_target_rate_config(user_input, account_info.account, now, account_info.tariff_index) if user_input is not None else {}
 
     if len(errors) < 1 and user_input is not None:
       user_input[CONFIG_KIND] = CONFIG_KIND_TARGET_RATE
@@ -262,7 +262,7 @@ class OctopusEnergyConfigFlow(ConfigFlow, domain=DOMAIN):
       return self.async_abort(reason="account_not_found")
 
     now = utcnow()
-    errors = validate_cost_tracker_config(user_input, account_info.account, now) if user_input is not None else {}
+    errors = validate_cost_tracker_config(user_input, account_info.account, now, account_info.tariff_index) if user_input is not None else {}
 
     if len(errors) < 1 and user_input is not None:
       user_input[CONFIG_KIND] = CONFIG_KIND_COST_TRACKER
@@ -551,7 +551,7 @@ class OptionsFlowHandler(OptionsFlow):
       errors[CONFIG_TARGET_MPAN] = "account_not_found"
 
     now = utcnow()
-    errors = validate_target_rate_config(config, account_info.account, now)
+    errors = validate_target_rate_config(config, account_info.account, now, account_info.tariff_index)
 
     if (len(errors) > 0):
       return await self.__async_setup_target_rate_schema__(config, errors)
@@ -570,7 +570,7 @@ class OptionsFlowHandler(OptionsFlow):
       return self.async_abort(reason="account_not_found")
 
     now = utcnow()
-    errors = validate_cost_tracker_config(config, account_info.account, now)
+    errors = validate_cost_tracker_config(config, account_info.account, now, account_info.tariff_index)
 
     if (len(errors) > 0):
       return await self.__async_setup_cost_tracker_schema__(config, errors)
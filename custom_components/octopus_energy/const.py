@@ -67,6 +67,7 @@ CONFIG_COST_MONTH_DAY_RESET = "month_day_reset"
 DATA_CONFIG = "CONFIG"
 DATA_ELECTRICITY_RATES_COORDINATOR_KEY = "ELECTRICITY_RATES_COORDINATOR_{}_{}"
 DATA_ELECTRICITY_RATES_KEY = "ELECTRICITY_RATES_{}_{}"
+DATA_ELECTRICITY_TARGET_RATE_PLANNER_KEY = "ELECTRICITY_TARGET_RATE_PLANNER_{}_{}"
 DATA_CLIENT = "CLIENT"
 DATA_GAS_TARIFF_CODE = "GAS_TARIFF_CODE"
 DATA_ACCOUNT = "ACCOUNT"
@@ -92,8 +93,16 @@ DATA_GREENNESS_FORECAST = "GREENNESS_FORECAST"
 
 DATA_SAVING_SESSIONS_FORCE_UPDATE = "SAVING_SESSIONS_FORCE_UPDATE"
 
+DATA_BACKFILL_JOB_MANAGER = "BACKFILL_JOB_MANAGER"
+DATA_STATISTIC_SUMS_CACHE = "STATISTIC_SUMS_CACHE"
+DATA_STATISTIC_IMPORT_TRACKER = "STATISTIC_IMPORT_TRACKER"
+DATA_COMPUTATION_STATISTICS = "COMPUTATION_STATISTICS"
+
 STORAGE_COMPLETED_DISPATCHES_NAME = "octopus_energy.{}-completed-intelligent-dispatches.json"
 STORAGE_ELECTRICITY_TARIFF_OVERRIDE_NAME = "octopus_energy.{}-{}-tariff-override.json"
+STORAGE_BACKFILL_JOBS_NAME = "octopus_energy.{}-backfill-jobs.json"
+STORAGE_STATISTIC_SUMS_NAME = "octopus_energy.statistic-sums.json"
+STORAGE_STATISTIC_IMPORTS_NAME = "octopus_energy.statistic-imports.json"
 
 INTELLIGENT_SOURCE_SMART_CHARGE = "smart-charge"
 INTELLIGENT_SOURCE_BUMP_CHARGE = "bump-charge"
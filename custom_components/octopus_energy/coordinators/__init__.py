@@ -15,9 +15,9 @@ from ..const import (
 from ..api_client import OctopusEnergyApiClient
 
 from ..utils import (
-  get_active_tariff_code,
   get_tariff_parts
 )
+from ..utils.tariff_index import TariffIndex, get_tariff_index
 from ..utils.rate_information import get_min_max_average_rates
 from ..utils.requests import calculate_next_refresh
 
@@ -128,24 +128,8 @@ def raise_rate_events(now: datetime,
   __raise_rate_event(current_event_key, current_rates, additional_attributes, fire_event)
   __raise_rate_event(next_event_key, next_rates, additional_attributes, fire_event)
 
-def get_electricity_meter_tariff_code(current: datetime, account_info, target_mpan: str, target_serial_number: str):
-  if len(account_info["electricity_meter_points"]) > 0:
-    for point in account_info["electricity_meter_points"]:
-      active_tariff_code = get_active_tariff_code(current, point["agreements"])
-      # The type of meter (ie smart vs dumb) can change the tariff behaviour, so we
-      # have to enumerate the different meters being used for each tariff as well.
-      for meter in point["meters"]:
-        if active_tariff_code is not None and point["mpan"] == target_mpan and meter["serial_number"] == target_serial_number:
-          return active_tariff_code
-           
-  return None
-
-def get_gas_meter_tariff_code(current: datetime, account_info, target_mprn: str, target_serial_number: str):
-  if len(account_info["gas_meter_points"]) > 0:
-    for point in account_info["gas_meter_points"]:
-      active_tariff_code = get_active_tariff_code(current, point["agreements"])
-      for meter in point["meters"]:
-        if active_tariff_code is not None and point["mprn"] == target_mprn and meter["serial_number"] == target_serial_number:
-           return active_tariff_code
-           
-  return None
\ No newline at end of file
+def get_electricity_meter_tariff_code(current: datetime, account_info, target_mpan: str, target_serial_number: str, tariff_index: TariffIndex = None):
+  return get_tariff_index(account_info, tariff_index).get_electricity_tariff_code(current, target_mpan, target_serial_number)
+
+def get_gas_meter_tariff_code(current: datetime, account_info, target_mprn: str, target_serial_number: str, tariff_index: TariffIndex = None):
+  return get_tariff_index(account_info, tariff_index).get_gas_tariff_code(current, target_mprn, target_serial_number)
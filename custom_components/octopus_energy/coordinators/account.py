@@ -3,6 +3,7 @@ from datetime import datetime, timedelta
 
 from . import BaseCoordinatorResult, async_check_valid_tariff
 from ..utils import get_active_tariff_code
+from ..utils.tariff_index import TariffIndex
 
 from homeassistant.util.dt import (now)
 from homeassistant.helpers.update_coordinator import (
@@ -27,11 +28,15 @@ _LOGGER = logging.getLogger(__name__)
 
 class AccountCoordinatorResult(BaseCoordinatorResult):
   account: dict
+  tariff_index: TariffIndex
 
-  def __init__(self, last_retrieved: datetime, request_attempts: int, account: dict):
+  def __init__(self, last_retrieved: datetime, request_attempts: int, account: dict, tariff_index: TariffIndex = None):
     super().__init__(last_retrieved, request_attempts, REFRESH_RATE_IN_MINUTES_ACCOUNT)
     self.account = account
 
+    # Agreements only change when the account is refreshed, so they're only parsed once per refresh
+    self.tariff_index = tariff_index if tariff_index is not None else TariffIndex(account) if account is not None else None
+
 async def async_refresh_account(
   hass,
   current: datetime,
@@ -78,7 +83,8 @@ async def async_refresh_account(
       result = AccountCoordinatorResult(
         previous_request.last_retrieved,
         previous_request.request_attempts + 1,
-        previous_request.account
+        previous_request.account,
+        previous_request.tariff_index
       )
       _LOGGER.warning(f'Failed to retrieve account information - using cached version. Next attempt at {result.next_refresh}')
       return result
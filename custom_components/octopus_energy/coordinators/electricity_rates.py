@@ -24,21 +24,29 @@ from ..const import (
 from ..api_client import ApiException, OctopusEnergyApiClient
 from ..coordinators.intelligent_dispatches import IntelligentDispatchesCoordinatorResult
 from ..utils import private_rates_to_public_rates
+from ..utils.rate_index import RateIndex
+from ..utils.tariff_index import TariffIndex
+from ..utils.rate_summary import RateSummary
+from ..utils.rate_timeline import RateTimeline
 from . import BaseCoordinatorResult, get_electricity_meter_tariff_code, raise_rate_events
 from ..intelligent import adjust_intelligent_rates, is_intelligent_tariff
 
 _LOGGER = logging.getLogger(__name__)
 
 class ElectricityRatesCoordinatorResult(BaseCoordinatorResult):
-  rates: list
-  original_rates: list
+  rates: RateTimeline
+  original_rates: RateTimeline
   rates_last_adjusted: datetime
+  rate_index: RateIndex
+  rate_summary: RateSummary
 
   def __init__(self, last_retrieved: datetime, request_attempts: int, rates: list, original_rates: list = None, rates_last_adjusted: datetime = None):
     super().__init__(last_retrieved, request_attempts, REFRESH_RATE_IN_MINUTES_RATES)
     self.rates = rates
     self.original_rates = original_rates if original_rates is not None else rates
     self.rates_last_adjusted = rates_last_adjusted if rates_last_adjusted else last_retrieved
+    self.rate_index = RateIndex(rates) if rates is not None else None
+    self.rate_summary = RateSummary(rates) if rates is not None else None
 
 async def async_refresh_electricity_rates_data(
     current: datetime,
@@ -52,13 +60,14 @@ async def async_refresh_electricity_rates_data(
     dispatches_result: IntelligentDispatchesCoordinatorResult,
     planned_dispatches_supported: bool,
     fire_event: Callable[[str, "dict[str, Any]"], None],
-    tariff_override = None
+    tariff_override = None,
+    tariff_index: TariffIndex = None
   ) -> ElectricityRatesCoordinatorResult: 
   if (account_info is not None):
     period_from = as_utc((current - timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0))
     period_to = as_utc((current + timedelta(days=2)).replace(hour=0, minute=0, second=0, microsecond=0))
 
-    tariff_code = get_electricity_meter_tariff_code(current, account_info, target_mpan, target_serial_number) if tariff_override is None else tariff_override
+    tariff_code = get_electricity_meter_tariff_code(current, account_info, target_mpan, target_serial_number, tariff_index) if tariff_override is None else tariff_override
     if tariff_code is None:
       return None
     
@@ -79,18 +88,15 @@ async def async_refresh_electricity_rates_data(
       if new_rates is not None:
         _LOGGER.debug(f'Electricity rates retrieved for {target_mpan}/{target_serial_number} ({tariff_code});')
         
-        original_rates = new_rates.copy()
-        original_rates.sort(key=lambda rate: rate["start"])
+        original_rates = RateTimeline.from_rates(new_rates)
+        new_rates = original_rates
         
         if dispatches_result is not None and dispatches_result.dispatches is not None and is_export_meter == False:
-          new_rates = adjust_intelligent_rates(new_rates,
-                                               dispatches_result.dispatches.planned if planned_dispatches_supported else [],
-                                               dispatches_result.dispatches.completed)
+          new_rates = RateTimeline.from_rates(adjust_intelligent_rates(original_rates,
+                                                                       dispatches_result.dispatches.planned if planned_dispatches_supported else [],
+                                                                       dispatches_result.dispatches.completed))
           
           _LOGGER.debug(f"Rates adjusted: {new_rates}; dispatches: {dispatches_result.dispatches}")
-
-        # Sort our rates again _just in case_
-        new_rates.sort(key=lambda rate: rate["start"])
         
         raise_rate_events(current,
                           private_rates_to_public_rates(new_rates),
@@ -133,14 +139,11 @@ async def async_refresh_electricity_rates_data(
           dispatches_result is not None and
           dispatches_result.dispatches is not None and
           dispatches_result.last_retrieved > existing_rates_result.rates_last_adjusted):
-      new_rates = adjust_intelligent_rates(existing_rates_result.original_rates,
-                                           dispatches_result.dispatches.planned,
-                                           dispatches_result.dispatches.completed)
+      new_rates = RateTimeline.from_rates(adjust_intelligent_rates(existing_rates_result.original_rates,
+                                                                   dispatches_result.dispatches.planned,
+                                                                   dispatches_result.dispatches.completed))
       
       _LOGGER.debug(f"Rates adjusted: {new_rates}; dispatches: {dispatches_result.dispatches}")
-
-      # Sort our rates again _just in case_
-      new_rates.sort(key=lambda rate: rate["start"])
       
       raise_rate_events(current,
                         private_rates_to_public_rates(new_rates),
@@ -178,6 +181,7 @@ async def async_setup_electricity_rates_coordinator(hass,
     client: OctopusEnergyApiClient = hass.data[DOMAIN][account_id][DATA_CLIENT]
     account_result = hass.data[DOMAIN][account_id][DATA_ACCOUNT] if DATA_ACCOUNT in hass.data[DOMAIN][account_id] else None
     account_info = account_result.account if account_result is not None else None
+    tariff_index = account_result.tariff_index if account_result is not None else None
     dispatches: IntelligentDispatchesCoordinatorResult = hass.data[DOMAIN][account_id][DATA_INTELLIGENT_DISPATCHES] if DATA_INTELLIGENT_DISPATCHES in hass.data[DOMAIN][account_id] else None
     rates = hass.data[DOMAIN][account_id][key] if key in hass.data[DOMAIN][account_id] else None
 
@@ -193,7 +197,8 @@ async def async_setup_electricity_rates_coordinator(hass,
       dispatches,
       planned_dispatches_supported,
       hass.bus.async_fire,
-      tariff_override
+      tariff_override,
+      tariff_index
     )
 
     return hass.data[DOMAIN][account_id][key]
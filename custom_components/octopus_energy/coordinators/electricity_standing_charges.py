@@ -17,6 +17,7 @@ from ..const import (
 
 from ..api_client import ApiException, OctopusEnergyApiClient
 from . import BaseCoordinatorResult, get_electricity_meter_tariff_code
+from ..utils.tariff_index import TariffIndex
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -33,13 +34,14 @@ async def async_refresh_electricity_standing_charges_data(
     account_info,
     target_mpan: str,
     target_serial_number: str,
-    existing_standing_charges_result: ElectricityStandingChargeCoordinatorResult
+    existing_standing_charges_result: ElectricityStandingChargeCoordinatorResult,
+    tariff_index: TariffIndex = None
   ):
   period_from = as_utc(current.replace(hour=0, minute=0, second=0, microsecond=0))
   period_to = period_from + timedelta(days=1)
 
   if (account_info is not None):
-    tariff_code = get_electricity_meter_tariff_code(current, account_info, target_mpan, target_serial_number)
+    tariff_code = get_electricity_meter_tariff_code(current, account_info, target_mpan, target_serial_number, tariff_index)
     if tariff_code is None:
       return None
     
@@ -82,6 +84,7 @@ async def async_setup_electricity_standing_charges_coordinator(hass, account_id:
     client: OctopusEnergyApiClient = hass.data[DOMAIN][account_id][DATA_CLIENT]
     account_result = hass.data[DOMAIN][account_id][DATA_ACCOUNT] if DATA_ACCOUNT in hass.data[DOMAIN][account_id] else None
     account_info = account_result.account if account_result is not None else None
+    tariff_index = account_result.tariff_index if account_result is not None else None
     standing_charges: ElectricityStandingChargeCoordinatorResult = hass.data[DOMAIN][account_id][key] if key in hass.data[DOMAIN][account_id] else None
 
     hass.data[DOMAIN][account_id][key] = await async_refresh_electricity_standing_charges_data(
@@ -91,6 +94,7 @@ async def async_setup_electricity_standing_charges_coordinator(hass, account_id:
       target_mpan,
       target_serial_number,
       standing_charges,
+      tariff_index
     )
 
     return hass.data[DOMAIN][account_id][key]
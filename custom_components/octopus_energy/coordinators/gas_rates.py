@@ -20,16 +20,24 @@ from ..const import (
 
 from ..api_client import ApiException, OctopusEnergyApiClient
 from ..utils import private_rates_to_public_rates
+from ..utils.rate_index import RateIndex
+from ..utils.tariff_index import TariffIndex
+from ..utils.rate_summary import RateSummary
+from ..utils.rate_timeline import RateTimeline
 from . import BaseCoordinatorResult, get_gas_meter_tariff_code, raise_rate_events
 
 _LOGGER = logging.getLogger(__name__)
 
 class GasRatesCoordinatorResult(BaseCoordinatorResult):
-  rates: list
+  rates: RateTimeline
+  rate_index: RateIndex
+  rate_summary: RateSummary
 
   def __init__(self, last_retrieved: datetime, request_attempts: int, rates: list):
     super().__init__(last_retrieved, request_attempts, REFRESH_RATE_IN_MINUTES_RATES)
     self.rates = rates
+    self.rate_index = RateIndex(rates) if rates is not None else None
+    self.rate_summary = RateSummary(rates) if rates is not None else None
 
 async def async_refresh_gas_rates_data(
     current: datetime,
@@ -39,12 +47,13 @@ async def async_refresh_gas_rates_data(
     target_serial_number: str,
     existing_rates_result: GasRatesCoordinatorResult,
     fire_event: Callable[[str, "dict[str, Any]"], None],
+    tariff_index: TariffIndex = None
   ) -> GasRatesCoordinatorResult: 
   if (account_info is not None):
     period_from = as_utc((current - timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0))
     period_to = as_utc((current + timedelta(days=2)).replace(hour=0, minute=0, second=0, microsecond=0))
 
-    tariff_code = get_gas_meter_tariff_code(current, account_info, target_mprn, target_serial_number)
+    tariff_code = get_gas_meter_tariff_code(current, account_info, target_mprn, target_serial_number, tariff_index)
     if tariff_code is None:
       return None
 
@@ -68,6 +77,7 @@ async def async_refresh_gas_rates_data(
         
       if new_rates is not None:
         _LOGGER.debug(f'Gas rates retrieved for {target_mprn}/{target_serial_number} ({tariff_code});')
+        new_rates = RateTimeline.from_rates(new_rates)
 
         raise_rate_events(current,
                           private_rates_to_public_rates(new_rates),
@@ -103,6 +113,7 @@ async def async_setup_gas_rates_coordinator(hass, account_id: str, client: Octop
     current = now()
     account_result = hass.data[DOMAIN][account_id][DATA_ACCOUNT] if DATA_ACCOUNT in hass.data[DOMAIN][account_id] else None
     account_info = account_result.account if account_result is not None else None
+    tariff_index = account_result.tariff_index if account_result is not None else None
     rates = hass.data[DOMAIN][account_id][key] if key in hass.data[DOMAIN][account_id] else None
 
     hass.data[DOMAIN][account_id][key] = await async_refresh_gas_rates_data(
@@ -112,7 +123,8 @@ async def async_setup_gas_rates_coordinator(hass, account_id: str, client: Octop
       target_mprn,
       target_serial_number,
       rates,
-      hass.bus.async_fire
+      hass.bus.async_fire,
+      tariff_index
     )
 
     return hass.data[DOMAIN][account_id][key]
@@ -22,6 +22,9 @@ from ..const import (
 from ..api_client import (ApiException, OctopusEnergyApiClient)
 from ..api_client.intelligent_dispatches import IntelligentDispatches
 from ..utils import private_rates_to_public_rates
+from ..utils.rate_index import RateIndex
+from ..utils.tariff_index import TariffIndex
+from ..utils.rate_timeline import RateTimeline
 
 from ..intelligent import adjust_intelligent_rates, is_intelligent_tariff
 from ..coordinators.intelligent_dispatches import IntelligentDispatchesCoordinatorResult
@@ -40,9 +43,10 @@ def __sort_consumption(consumption_data):
 
 class PreviousConsumptionCoordinatorResult(BaseCoordinatorResult):
   consumption: list
-  rates: list
+  rates: RateTimeline
   latest_available_timestamp: datetime
   standing_charge: float
+  rate_index: RateIndex
 
   def __init__(self, last_retrieved: datetime, request_attempts: int, consumption: list, rates: list, standing_charge, latest_available_timestamp: datetime = None):
     super().__init__(last_retrieved, request_attempts, REFRESH_RATE_IN_MINUTES_PREVIOUS_CONSUMPTION)
@@ -50,6 +54,7 @@ class PreviousConsumptionCoordinatorResult(BaseCoordinatorResult):
     self.rates = rates
     self.standing_charge = standing_charge
     self.latest_available_timestamp = latest_available_timestamp
+    self.rate_index = RateIndex(rates) if rates is not None else None
 
 async def async_fetch_consumption_and_rates(
   previous_data: PreviousConsumptionCoordinatorResult,
@@ -64,8 +69,8 @@ async def async_fetch_consumption_and_rates(
   is_smart_meter: bool,
   fire_event: Callable[[str, "dict[str, Any]"], None],
   intelligent_dispatches: IntelligentDispatches = None,
-  tariff_override = None
-
+  tariff_override = None,
+  tariff_index: TariffIndex = None
 ):
   """Fetch the previous consumption and rates"""
 
@@ -78,7 +83,7 @@ async def async_fetch_consumption_and_rates(
     
     try:
       if (is_electricity == True):
-        tariff_code = get_electricity_meter_tariff_code(period_from, account_info, identifier, serial_number) if tariff_override is None else None
+        tariff_code = get_electricity_meter_tariff_code(period_from, account_info, identifier, serial_number, tariff_index) if tariff_override is None else None
         if tariff_code is None:
           _LOGGER.error(f"Could not determine tariff code for previous consumption for electricity {identifier}/{serial_number}")
           return previous_data
@@ -100,7 +105,7 @@ async def async_fetch_consumption_and_rates(
                                                 intelligent_dispatches.planned,
                                                 intelligent_dispatches.completed)
       else:
-        tariff_code = get_gas_meter_tariff_code(period_from, account_info, identifier, serial_number) if tariff_override is None else None
+        tariff_code = get_gas_meter_tariff_code(period_from, account_info, identifier, serial_number, tariff_index) if tariff_override is None else None
         if tariff_code is None:
           _LOGGER.error(f"Could not determine tariff code for previous consumption for gas {identifier}/{serial_number}")
           return previous_data
@@ -115,6 +120,7 @@ async def async_fetch_consumption_and_rates(
       if consumption_data is not None and len(consumption_data) >= MINIMUM_CONSUMPTION_DATA_LENGTH and rate_data is not None and len(rate_data) > 0 and standing_charge is not None:
         _LOGGER.debug(f"Discovered previous consumption data for {'electricity' if is_electricity else 'gas'} {identifier}/{serial_number}")
         consumption_data = __sort_consumption(consumption_data)
+        rate_data = RateTimeline.from_rates(rate_data)
 
         public_rates = private_rates_to_public_rates(rate_data)
         min_max_average_rates = get_min_max_average_rates(public_rates)
@@ -195,6 +201,7 @@ async def async_create_previous_consumption_and_rates_coordinator(
     period_to = period_from + timedelta(days=1)
     account_result = hass.data[DOMAIN][account_id][DATA_ACCOUNT] if DATA_ACCOUNT in hass.data[DOMAIN][account_id] else None
     account_info = account_result.account if account_result is not None else None
+    tariff_index = account_result.tariff_index if account_result is not None else None
     dispatches: IntelligentDispatchesCoordinatorResult = hass.data[DOMAIN][account_id][DATA_INTELLIGENT_DISPATCHES] if DATA_INTELLIGENT_DISPATCHES in hass.data[DOMAIN][account_id] else None
     
     result = await async_fetch_consumption_and_rates(
@@ -209,7 +216,8 @@ async def async_create_previous_consumption_and_rates_coordinator(
       is_electricity,
       is_smart_meter,
       hass.bus.async_fire,
-      dispatches.dispatches if dispatches is not None else None
+      dispatches.dispatches if dispatches is not None else None,
+      tariff_index=tariff_index
     )
 
     if (result is not None):
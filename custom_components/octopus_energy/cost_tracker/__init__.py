@@ -4,6 +4,10 @@ from homeassistant.components.sensor import (
   SensorStateClass,
 )
 
+from ..utils import get_off_peak_cost
+from ..utils.conversions import value_inc_vat_to_pounds
+from ..utils.rate_index import RateIndex, find_rate, get_rate_index
+
 class CostTrackerResult:
   tracked_consumption_data: list
   untracked_consumption_data: list
@@ -12,67 +16,346 @@ class CostTrackerResult:
     self.tracked_consumption_data = tracked_consumption_data
     self.untracked_consumption_data = untracked_consumption_data
 
-def __add_consumption(consumption_data: list, target_start: datetime, target_end: datetime, value: float):
-  consumption_added = False
-  for consumption in consumption_data:
-    if (consumption["start"] == target_start and consumption["end"] == target_end):
-      consumption_added = True
-      consumption["consumption"] += value
-      break
+class CostTotals:
+  """Running totals of consumption and cost, which are kept up to date as individual items change"""
+  consumption: float
+  cost: float
 
-  if consumption_added == False:
-    consumption_data.append({
-      "start": target_start,
-      "end": target_end,
-      "consumption": value
-    })
+  def __init__(self):
+    self.consumption = 0
+    self.cost = 0
 
-  return consumption_data
+  def add(self, consumption: float, cost: float):
+    self.consumption += consumption
+    self.cost += cost
 
-def add_consumption(current: datetime,
-                    tracked_consumption_data: list,
-                    untracked_consumption_data: list,
-                    new_value: float,
-                    old_value: float,
-                    new_last_reset: datetime,
-                    old_last_reset: datetime,
-                    is_accumulative_value: bool,
-                    is_tracking: bool,
-                    state_class: str = None):
+  def remove(self, consumption: float, cost: float):
+    self.consumption -= consumption
+    self.cost -= cost
+
+  def clear(self):
+    self.consumption = 0
+    self.cost = 0
+
+class ConsumptionSlot:
+  """The consumption of a single 30 minute period, along with its rate and cost once they've been calculated"""
+  start: datetime
+  end: datetime
+  consumption: float
+  value_inc_vat: float
+  is_off_peak: bool
+
+  def __init__(self, start: datetime, end: datetime, consumption: float):
+    self.start = start
+    self.end = end
+    self.consumption = consumption
+    self.value_inc_vat = None
+    self.is_off_peak = False
+
+  @property
+  def cost_in_pence(self) -> float:
+    return self.value_inc_vat * self.consumption
+
+class ConsumptionSlots:
+  """The consumption of a day, indexed by the start of each 30 minute period so that it can be updated in place.
+
+  Once costed against a set of rates, the cost of each slot is kept along with running totals (in pence), so only the slots
+  that change need costing again. Costs need recalculating in full when the rates change.
+
+  Charges restored from to_charges keep their cost, taking whether they're off peak from the provided value as this isn't
+  part of the charge, until they're recalculated against the latest rates.
+  """
+
+  def __init__(self, charges: list = None, is_off_peak: bool = False):
+    self._slots: dict[datetime, ConsumptionSlot] = {}
+    self._rates = None
+    self._rate_index: RateIndex = None
+    self._off_peak_cost: float = None
+    self.total = CostTotals()
+    self.peak = CostTotals()
+    self.off_peak = CostTotals()
+
+    if charges is not None:
+      for charge in charges:
+        slot = ConsumptionSlot(charge["start"], charge["end"], charge["consumption"])
+        self._slots[charge["start"]] = slot
+
+        if "rate" in charge and charge["rate"] is not None:
+          slot.value_inc_vat = round(charge["rate"] * 100, 4)
+          slot.is_off_peak = is_off_peak
+          self.__add_slot_cost(slot)
+
+  def __len__(self):
+    return len(self._slots)
+
+  @property
+  def off_peak_cost(self) -> float:
+    return self._off_peak_cost
+
+  def get(self, start: datetime) -> ConsumptionSlot:
+    return self._slots.get(start)
+
+  def is_for_day(self, current: datetime) -> bool:
+    """Determines if the consumption belongs to the same day as current. No consumption belongs to every day"""
+    for slot in self._slots.values():
+      return slot.start.date() == current.date()
+
+    return True
+
+  def is_costed_with(self, rates) -> bool:
+    return self._rate_index is not None and self._rates is rates
+
+  def add(self, start: datetime, end: datetime, value: float):
+    slot = self._slots.get(start)
+    if slot is not None:
+      self.__remove_cost(slot)
+
+    if slot is None or slot.end != end:
+      slot = ConsumptionSlot(start, end, 0)
+      self._slots[start] = slot
+
+    slot.consumption += value
+
+    if self._rate_index is None:
+      slot.value_inc_vat = None
+      return
+
+    if slot.value_inc_vat is None:
+      rate = self._rate_index.get_rate(start, end)
+      if rate is None:
+        # Our rates don't cover the new consumption, so our costs will need calculating in full against the latest rates
+        self._rates = None
+        self._rate_index = None
+        return
+
+      slot.value_inc_vat = rate["value_inc_vat"]
+
+    self.__add_cost(slot, slot.value_inc_vat)
+
+  def set_consumption(self, start: datetime, consumption: float):
+    """Replaces the consumption of the existing slot, which requires the costs to be recalculated"""
+    self._slots[start].consumption = consumption
+    self._rates = None
+    self._rate_index = None
+
+  def clear(self):
+    self._slots.clear()
+    self._rates = None
+    self._rate_index = None
+    self._off_peak_cost = None
+    self.total.clear()
+    self.peak.clear()
+    self.off_peak.clear()
+
+  def calculate_costs(self, current: datetime, rates, rate_index: RateIndex = None):
+    """Costs all slots against the provided rates, which are used for costing any slots that change afterwards"""
+    rate_index = get_rate_index(rates, rate_index)
+
+    # Determine all of our rates first, so we're left untouched if a rate can't be found
+    values = list(map(lambda slot: find_rate(rate_index, slot.start, slot.end)["value_inc_vat"], self._slots.values()))
+
+    self._rates = rates
+    self._rate_index = rate_index
+    self._off_peak_cost = get_off_peak_cost(current, rates, rate_index.timeline)
+    self.total.clear()
+    self.peak.clear()
+    self.off_peak.clear()
+
+    for slot, value_inc_vat in zip(self._slots.values(), values):
+      self.__add_cost(slot, value_inc_vat)
+
+  def has_charge(self, start: datetime, is_off_peak: bool = None) -> bool:
+    """Determines if the slot starting at the provided time has been costed, optionally only if it's off peak or peak"""
+    slot = self._slots.get(start)
+    return slot is not None and slot.value_inc_vat is not None and (is_off_peak is None or slot.is_off_peak == is_off_peak)
+
+  def to_consumption_data(self) -> list:
+    return list(map(lambda slot: { "start": slot.start, "end": slot.end, "consumption": slot.consumption }, self._slots.values()))
+
+  def to_charges(self, is_off_peak: bool = None) -> list:
+    """Serialises the slots that have been costed into the format they're exposed as in attributes, optionally only including
+    the off peak or peak slots"""
+    charges = []
+    for slot in sorted(self._slots.values(), key=lambda slot: slot.start):
+      if slot.value_inc_vat is not None and (is_off_peak is None or slot.is_off_peak == is_off_peak):
+        charges.append({
+          "start": slot.start,
+          "end": slot.end,
+          "rate": value_inc_vat_to_pounds(slot.value_inc_vat),
+          "consumption": slot.consumption,
+          "cost": slot.cost_in_pence / 100
+        })
+
+    return charges
+
+  def __add_cost(self, slot: ConsumptionSlot, value_inc_vat: float):
+    slot.value_inc_vat = value_inc_vat
+    slot.is_off_peak = value_inc_vat == self._off_peak_cost
+    self.__add_slot_cost(slot)
+
+  def __add_slot_cost(self, slot: ConsumptionSlot):
+    cost_in_pence = slot.cost_in_pence
+    self.total.add(slot.consumption, cost_in_pence)
+    if slot.is_off_peak:
+      self.off_peak.add(slot.consumption, cost_in_pence)
+    else:
+      self.peak.add(slot.consumption, cost_in_pence)
+
+  def __remove_cost(self, slot: ConsumptionSlot):
+    if slot.value_inc_vat is None:
+      return
+
+    cost_in_pence = slot.cost_in_pence
+    self.total.remove(slot.consumption, cost_in_pence)
+    if slot.is_off_peak:
+      self.off_peak.remove(slot.consumption, cost_in_pence)
+    else:
+      self.peak.remove(slot.consumption, cost_in_pence)
+
+def get_consumption_value(new_value: float,
+                          old_value: float,
+                          new_last_reset: datetime,
+                          old_last_reset: datetime,
+                          is_accumulative_value: bool,
+                          state_class: str = None):
+  """Determines the consumption that has occurred between the old and new value, returning None if it can't be determined"""
   if (is_accumulative_value == False or 
       (new_last_reset is not None and old_last_reset is not None and new_last_reset > old_last_reset) or
       # Based on https://developers.home-assistant.io/docs/core/entity/sensor/#available-state-classes, when the new value is less than the old value
       # this represents a reset
       (state_class == SensorStateClass.TOTAL_INCREASING and new_value < old_value)):
-    value = new_value
+    return new_value
   elif old_value is not None:
-    value = new_value - old_value
-  else:
-    # Can't calculate accurately without an old value
-    return
+    return new_value - old_value
+
+  # Can't calculate accurately without an old value
+  return None
+
+def add_consumption_to_slots(current: datetime,
+                             tracked_slots: ConsumptionSlots,
+                             untracked_slots: ConsumptionSlots,
+                             new_value: float,
+                             old_value: float,
+                             new_last_reset: datetime,
+                             old_last_reset: datetime,
+                             is_accumulative_value: bool,
+                             is_tracking: bool,
+                             state_class: str = None) -> bool:
+  """Adds the new consumption to the slot of current, updating the provided slots in place. Returns whether consumption was added"""
+  value = get_consumption_value(new_value, old_value, new_last_reset, old_last_reset, is_accumulative_value, state_class)
+  if value is None:
+    return False
 
-  start_of_day = current.replace(hour=0, minute=0, second=0, microsecond=0)
   target_start = current.replace(minute=(0 if current.minute < 30 else 30), second=0, microsecond=0)
   target_end = target_start + timedelta(minutes=30)
 
-  new_tracked_consumption_data = tracked_consumption_data.copy()
-  new_untracked_consumption_data = untracked_consumption_data.copy()
-  
   # If we've gone into a new day, then reset the consumption result
-  if ((new_tracked_consumption_data is not None and len(new_tracked_consumption_data) > 0 and
-      (new_tracked_consumption_data[0]["start"].year != start_of_day.year or new_tracked_consumption_data[0]["start"].month != start_of_day.month or new_tracked_consumption_data[0]["start"].day != start_of_day.day)) or
-      
-      (new_untracked_consumption_data is not None and len(new_untracked_consumption_data) > 0 and
-      (new_untracked_consumption_data[0]["start"].year != start_of_day.year or new_untracked_consumption_data[0]["start"].month != start_of_day.month or new_untracked_consumption_data[0]["start"].day != start_of_day.day))):
-    new_tracked_consumption_data = []
-    new_untracked_consumption_data = []
+  if tracked_slots.is_for_day(current) == False or untracked_slots.is_for_day(current) == False:
+    tracked_slots.clear()
+    untracked_slots.clear()
 
   if is_tracking:
-    new_tracked_consumption_data = __add_consumption(new_tracked_consumption_data, target_start, target_end, value)
+    tracked_slots.add(target_start, target_end, value)
   else:
-    new_untracked_consumption_data = __add_consumption(new_untracked_consumption_data, target_start, target_end, value)
+    untracked_slots.add(target_start, target_end, value)
 
-  return CostTrackerResult(new_tracked_consumption_data, new_untracked_consumption_data)
+  return True
+
+def add_consumption(current: datetime,
+                    tracked_consumption_data: list,
+                    untracked_consumption_data: list,
+                    new_value: float,
+                    old_value: float,
+                    new_last_reset: datetime,
+                    old_last_reset: datetime,
+                    is_accumulative_value: bool,
+                    is_tracking: bool,
+                    state_class: str = None):
+  tracked_slots = ConsumptionSlots(tracked_consumption_data)
+  untracked_slots = ConsumptionSlots(untracked_consumption_data)
+  if add_consumption_to_slots(current,
+                              tracked_slots,
+                              untracked_slots,
+                              new_value,
+                              old_value,
+                              new_last_reset,
+                              old_last_reset,
+                              is_accumulative_value,
+                              is_tracking,
+                              state_class) == False:
+    return
+
+  return CostTrackerResult(tracked_slots.to_consumption_data(), untracked_slots.to_consumption_data())
+
+class AccumulatedCosts:
+  """The cost and consumption of each day, indexed by the start of the day so that it can be updated in place, along with
+  running totals"""
+
+  def __init__(self, accumulative_data: list = None):
+    self._items: list[dict] = []
+    self._days: dict[datetime, dict] = {}
+    self.totals = CostTotals()
+
+    if accumulative_data is not None:
+      for item in accumulative_data:
+        new_item = item.copy()
+        self._items.append(new_item)
+        if "start" in new_item:
+          self._days[new_item["start"]] = new_item
+
+        self.__add_totals(new_item)
+
+  def __len__(self):
+    return len(self._items)
+
+  @property
+  def total_consumption(self) -> float:
+    return self.totals.consumption
+
+  @property
+  def total_cost(self) -> float:
+    return self.totals.cost
+
+  def get_start(self, date) -> datetime:
+    """Gets the start of the recorded day that falls on the provided date, returning None if the day hasn't been recorded"""
+    for start in self._days:
+      if start.date() == date:
+        return start
+
+    return None
+
+  def set_day(self, current: datetime, new_cost: float, new_consumption: float):
+    """Sets the cost and consumption of the day of current. The totals include the day straight away, even if it's a new day."""
+    start_of_day = current.replace(hour=0, minute=0, second=0, microsecond=0)
+    item = self._days.get(start_of_day)
+    if item is None:
+      item = {
+        "start": start_of_day,
+        "end": start_of_day + timedelta(days=1),
+      }
+      self._items.append(item)
+      self._days[start_of_day] = item
+    else:
+      self.__remove_totals(item)
+
+    item["cost"] = new_cost
+    item["consumption"] = new_consumption
+    self.__add_totals(item)
+
+  def clear(self):
+    self._items.clear()
+    self._days.clear()
+    self.totals.clear()
+
+  def to_accumulative_data(self) -> list:
+    """Serialises the days into the format they're exposed as in attributes"""
+    return list(map(lambda item: item.copy(), self._items))
+
+  def __add_totals(self, item: dict):
+    self.totals.add(item["consumption"] if "consumption" in item else 0, item["cost"] if "cost" in item else 0)
+
+  def __remove_totals(self, item: dict):
+    self.totals.remove(item["consumption"] if "consumption" in item else 0, item["cost"] if "cost" in item else 0)
 
 class AccumulativeCostTrackerResult:
   accumulative_data: list
@@ -85,39 +368,7 @@ class AccumulativeCostTrackerResult:
     self.total_cost = total_cost
 
 def accumulate_cost(current: datetime, accumulative_data: list, new_cost: float, new_consumption: float) -> AccumulativeCostTrackerResult:
-  start_of_day = current.replace(hour=0, minute=0, second=0, microsecond=0)
-  
-  if accumulative_data is None:
-    accumulative_data = []
-
-  total_cost = 0
-  total_consumption = 0
-  is_day_added = False
-  new_accumulative_data = []
-  for item in accumulative_data:
-    new_item = item.copy()
-    
-    if "start" in new_item and new_item["start"] == start_of_day:
-      new_item["cost"] = new_cost
-      new_item["consumption"] = new_consumption
-      is_day_added = True
-
-    if "consumption" in new_item:
-      total_consumption += new_item["consumption"]
-
-    if "cost" in new_item:
-      total_cost += new_item["cost"]
-
-    new_accumulative_data.append(new_item)
-
-  if is_day_added == False:
-    new_accumulative_data.append({
-      "start": start_of_day,
-      "end": start_of_day + timedelta(days=1),
-      "cost": new_cost,
-      "consumption": new_consumption,
-    })
-
-  return AccumulativeCostTrackerResult(new_accumulative_data, total_consumption, total_cost)
-
-  
\ No newline at end of file
+  accumulated_costs = AccumulatedCosts(accumulative_data)
+  accumulated_costs.set_day(current, new_cost, new_consumption)
+
+  return AccumulativeCostTrackerResult(accumulated_costs.to_accumulative_data(), accumulated_costs.total_consumption, accumulated_costs.total_cost)
@@ -31,7 +31,7 @@ from ..const import (
   DOMAIN,
 )
 
-from . import accumulate_cost
+from . import AccumulatedCosts
 
 from ..utils.attributes import dict_to_typed_dict
 
@@ -48,7 +48,7 @@ class OctopusEnergyCostTrackerMonthSensor(RestoreSensor):
     self._config = config
     self._attributes = self._config.copy()
     self._attributes["total_consumption"] = 0
-    self._attributes["accumulated_data"] = []
+    self._accumulated_costs = AccumulatedCosts()
     self._last_reset = None
     self._tracked_entity_id = tracked_entity_id
     self._config_entry = config_entry
@@ -89,7 +89,10 @@ class OctopusEnergyCostTrackerMonthSensor(RestoreSensor):
   @property
   def extra_state_attributes(self):
     """Attributes of the sensor."""
-    return self._attributes
+    # Our accumulated data is only serialised when our state is written
+    attributes = self._attributes.copy()
+    attributes["accumulated_data"] = self._accumulated_costs.to_accumulative_data()
+    return attributes
   
   @property
   def native_value(self):
@@ -113,6 +116,7 @@ class OctopusEnergyCostTrackerMonthSensor(RestoreSensor):
     if state is not None and self._state is None:
       self._state = None if state.state in (STATE_UNAVAILABLE, STATE_UNKNOWN) else state.state
       self._attributes = dict_to_typed_dict(state.attributes)
+      self._accumulated_costs = AccumulatedCosts(self._attributes.pop("accumulated_data", None))
       # Make sure our attributes don't override any changed settings
       self._attributes.update(self._config)
     
@@ -156,7 +160,7 @@ class OctopusEnergyCostTrackerMonthSensor(RestoreSensor):
   async def async_reset_cost_tracker(self):
     """Resets the sensor"""
     self._state = 0
-    self._attributes["accumulated_data"] = []
+    self._accumulated_costs.clear()
     self._attributes["total_consumption"] = 0
 
     self.async_write_ha_state()
@@ -164,29 +168,33 @@ class OctopusEnergyCostTrackerMonthSensor(RestoreSensor):
   @callback
   async def async_adjust_accumulative_cost_tracker(self, date, consumption: float, cost: float):
     """Adjusts the sensor"""
-    selected_date = None
-    for data in self._attributes["accumulated_data"]:
-      if data["start"].date() == date:
-        selected_date = data["start"]
+    selected_date = self._accumulated_costs.get_start(date)
 
     if selected_date is None:
+      accumulated_data = self._accumulated_costs.to_accumulative_data()
+      if len(accumulated_data) < 1:
+        raise ServiceValidationError(
+          translation_domain=DOMAIN,
+          translation_key="cost_tracker_no_charges",
+        )
+
       raise ServiceValidationError(
         translation_domain=DOMAIN,
         translation_key="cost_tracker_invalid_date",
         translation_placeholders={ 
-          "min_date": self._attributes["accumulated_data"][0]["start"].date(),
-          "max_date": self._attributes["accumulated_data"][-1]["start"].date() 
+          "min_date": accumulated_data[0]["start"].date(),
+          "max_date": accumulated_data[-1]["start"].date() 
         },
       )
 
     self._recalculate_cost(selected_date, cost, consumption)
 
   def _recalculate_cost(self, current: datetime, new_cost: float, new_consumption: float):
-    result = accumulate_cost(current, self._attributes["accumulated_data"], new_cost, new_consumption)
+    # Only the day that has changed is updated, with our totals kept up to date as it changes
+    self._accumulated_costs.set_day(current, new_cost, new_consumption)
         
-    self._attributes["total_consumption"] = result.total_consumption
-    self._attributes["accumulated_data"] = result.accumulative_data
-    self._state = result.total_cost
+    self._attributes["total_consumption"] = self._accumulated_costs.total_consumption
+    self._state = self._accumulated_costs.total_cost
 
     self.async_write_ha_state()
 
@@ -200,7 +208,7 @@ class OctopusEnergyCostTrackerMonthSensor(RestoreSensor):
     if self._last_reset.day != current.day and current.day == target_day:
       self._state = 0
       self._attributes["total_consumption"] = 0
-      self._attributes["accumulated_data"] = []
+      self._accumulated_costs.clear()
       self._last_reset = start_of_day
 
       return True
@@ -35,8 +35,8 @@ from ..const import (
 )
 
 from ..coordinators.electricity_rates import ElectricityRatesCoordinatorResult
-from . import add_consumption
-from ..electricity import calculate_electricity_consumption_and_cost
+from . import ConsumptionSlots, add_consumption_to_slots
+from ..utils.rate_index import RateIndex
 
 from ..utils.attributes import dict_to_typed_dict
 
@@ -55,6 +55,8 @@ class OctopusEnergyCostTrackerPeakSensor(CoordinatorEntity, RestoreSensor):
     self._config = config
     self._attributes = self._config.copy()
     self._attributes["is_tracking"] = True
+    self._tracked_slots = ConsumptionSlots()
+    self._untracked_slots = ConsumptionSlots()
     
     self._hass = hass
     self.entity_id = generate_entity_id("sensor.{}", self.unique_id, hass=hass)
@@ -100,7 +102,11 @@ class OctopusEnergyCostTrackerPeakSensor(CoordinatorEntity, RestoreSensor):
   @property
   def extra_state_attributes(self):
     """Attributes of the sensor."""
-    return self._attributes
+    # Our charges are only serialised when our state is written
+    attributes = self._attributes.copy()
+    attributes["tracked_charges"] = self._tracked_slots.to_charges(False)
+    attributes["untracked_charges"] = self._untracked_slots.to_charges(False)
+    return attributes
   
   @property
   def native_value(self):
@@ -124,6 +130,8 @@ class OctopusEnergyCostTrackerPeakSensor(CoordinatorEntity, RestoreSensor):
     if state is not None and self._state is None:
       self._state = None if state.state in (STATE_UNAVAILABLE, STATE_UNKNOWN) else state.state
       self._attributes = dict_to_typed_dict(state.attributes)
+      self._tracked_slots = ConsumptionSlots(self._attributes.pop("tracked_charges", None))
+      self._untracked_slots = ConsumptionSlots(self._attributes.pop("untracked_charges", None))
       # Make sure our attributes don't override any changed settings
       self._attributes.update(self._config)
     
@@ -144,21 +152,22 @@ class OctopusEnergyCostTrackerPeakSensor(CoordinatorEntity, RestoreSensor):
     current = now()
     rates_result: ElectricityRatesCoordinatorResult = self.coordinator.data if self.coordinator is not None and self.coordinator.data is not None else None
 
-    consumption_data = add_consumption(current,
-                                       self._attributes["tracked_charges"],
-                                       self._attributes["untracked_charges"],
-                                       float(new_state.state),
-                                       None if old_state.state is None or old_state.state in (STATE_UNAVAILABLE, STATE_UNKNOWN) else float(old_state.state),
-                                       parse_datetime(new_state.attributes["last_reset"]) if "last_reset" in new_state.attributes and new_state.attributes["last_reset"] is not None else None,
-                                       parse_datetime(old_state.attributes["last_reset"]) if "last_reset" in old_state.attributes and old_state.attributes["last_reset"] is not None else None,
-                                       self._config[CONFIG_COST_ENTITY_ACCUMULATIVE_VALUE],
-                                       self._attributes["is_tracking"],
-                                       new_state.attributes["state_class"] if "state_class" in new_state.attributes else None)
-
-    if (consumption_data is not None and rates_result is not None and rates_result.rates is not None):
-      self._reset_if_new_day(current)
-      
-      self._recalculate_cost(current, consumption_data.tracked_consumption_data, consumption_data.untracked_consumption_data, rates_result.rates)
+    # Reset before our consumption is added, so the new consumption isn't lost
+    self._reset_if_new_day(current)
+
+    is_consumption_added = add_consumption_to_slots(current,
+                                                    self._tracked_slots,
+                                                    self._untracked_slots,
+                                                    float(new_state.state),
+                                                    None if old_state.state is None or old_state.state in (STATE_UNAVAILABLE, STATE_UNKNOWN) else float(old_state.state),
+                                                    parse_datetime(new_state.attributes["last_reset"]) if "last_reset" in new_state.attributes and new_state.attributes["last_reset"] is not None else None,
+                                                    parse_datetime(old_state.attributes["last_reset"]) if "last_reset" in old_state.attributes and old_state.attributes["last_reset"] is not None else None,
+                                                    self._config[CONFIG_COST_ENTITY_ACCUMULATIVE_VALUE],
+                                                    self._attributes["is_tracking"],
+                                                    new_state.attributes["state_class"] if "state_class" in new_state.attributes else None)
+
+    if (is_consumption_added and rates_result is not None and rates_result.rates is not None):
+      self._recalculate_cost(current, rates_result.rates, rates_result.rate_index)
 
   @callback
   async def async_update_cost_tracker_config(self, is_tracking_enabled: bool):
@@ -171,8 +180,8 @@ class OctopusEnergyCostTrackerPeakSensor(CoordinatorEntity, RestoreSensor):
   async def async_reset_cost_tracker(self):
     """Resets the sensor"""
     self._state = 0
-    self._attributes["tracked_charges"] = []
-    self._attributes["untracked_charges"] = []
+    self._tracked_slots.clear()
+    self._untracked_slots.clear()
     self._attributes["total_consumption"] = 0
 
     self.async_write_ha_state()
@@ -181,69 +190,52 @@ class OctopusEnergyCostTrackerPeakSensor(CoordinatorEntity, RestoreSensor):
   async def async_adjust_cost_tracker(self, datetime, consumption: float):
     """Adjusts the sensor"""
     local_datetime = as_local(datetime)
-    selected_datetime = None
-    for data in self._attributes["tracked_charges"]:
-      if local_datetime >= data["start"] and local_datetime < data["end"]:
-        selected_datetime = data["start"]
-        data["consumption"] = consumption
+    start = local_datetime.replace(minute=(0 if local_datetime.minute < 30 else 30), second=0, microsecond=0)
+
+    # Only the charges we're exposing can be adjusted
+    if self._tracked_slots.has_charge(start, False) == False:
+      tracked_charges = self._tracked_slots.to_charges(False)
+      if len(tracked_charges) < 1:
+        raise ServiceValidationError(
+          translation_domain=DOMAIN,
+          translation_key="cost_tracker_no_charges",
+        )
 
-    if selected_datetime is None:
       raise ServiceValidationError(
         translation_domain=DOMAIN,
         translation_key="cost_tracker_invalid_date",
         translation_placeholders={ 
-          "min_date": self._attributes["tracked_charges"][0]["start"].date(),
-          "max_date": self._attributes["tracked_charges"][-1]["end"].date() 
+          "min_date": tracked_charges[0]["start"].date(),
+          "max_date": tracked_charges[-1]["end"].date() 
         },
       )
 
+    self._tracked_slots.set_consumption(start, consumption)
+
     rates_result: ElectricityRatesCoordinatorResult = self.coordinator.data if self.coordinator is not None and self.coordinator.data is not None else None
-    self._recalculate_cost(now(), self._attributes["tracked_charges"], self._attributes["untracked_charges"], rates_result.rates)
-
-  def _recalculate_cost(self, current: datetime, tracked_consumption_data: list, untracked_consumption_data: list, rates: list):
-    tracked_result = calculate_electricity_consumption_and_cost(
-      current,
-      tracked_consumption_data,
-      rates,
-      0,
-      None, # We want to always recalculate
-      0,
-      False
-    )
+    if rates_result is not None and rates_result.rates is not None:
+      self._recalculate_cost(now(), rates_result.rates, rates_result.rate_index)
+    else:
+      # Our costs will be recalculated in full once our rates are available
+      self.async_write_ha_state()
 
-    untracked_result = calculate_electricity_consumption_and_cost(
-      current,
-      untracked_consumption_data,
-      rates,
-      0,
-      None, # We want to always recalculate
-      0,
-      False
-    )
+  def _recalculate_cost(self, current: datetime, rates: list, rate_index: RateIndex = None):
+    if rates is None or len(rates) < 1:
+      return
 
-    if tracked_result is not None and untracked_result is not None:
-      self._attributes["tracked_charges"] = list(map(lambda charge: {
-        "start": charge["start"],
-        "end": charge["end"],
-        "rate": charge["rate"],
-        "consumption": charge["consumption"],
-        "cost": charge["cost"]
-      }, tracked_result["peak_charges"]))
-      
-      self._attributes["untracked_charges"] = list(map(lambda charge: {
-        "start": charge["start"],
-        "end": charge["end"],
-        "rate": charge["rate"],
-        "consumption": charge["consumption"],
-        "cost": charge["cost"]
-      }, untracked_result["peak_charges"]))
-
-      total_tracked_consumption = tracked_result["total_consumption_peak"] if "total_consumption_peak" in tracked_result else 0
-      total_untracked_consumption = untracked_result["total_consumption_peak"] if "total_consumption_peak" in untracked_result else 0
-      self._attributes["total_consumption"] = total_tracked_consumption + total_untracked_consumption
-      self._state = tracked_result["total_cost_peak"] if "total_cost_peak" in tracked_result else 0
+    # The cost of each slot is kept up to date as consumption is added, so we only need to calculate everything again when our
+    # rates have changed or our consumption has been adjusted
+    if self._tracked_slots.is_costed_with(rates) == False or self._untracked_slots.is_costed_with(rates) == False:
+      self._tracked_slots.calculate_costs(current, rates, rate_index)
+      self._untracked_slots.calculate_costs(current, rates, rate_index)
 
-      self.async_write_ha_state()
+    # Peak and off peak can only be determined when there is an off peak rate
+    total_tracked_consumption = self._tracked_slots.peak.consumption if self._tracked_slots.off_peak_cost is not None else 0
+    total_untracked_consumption = self._untracked_slots.peak.consumption if self._untracked_slots.off_peak_cost is not None else 0
+    self._attributes["total_consumption"] = total_tracked_consumption + total_untracked_consumption
+    self._state = self._tracked_slots.peak.cost / 100 if self._tracked_slots.off_peak_cost is not None else 0
+
+    self.async_write_ha_state()
 
   def _reset_if_new_day(self, current: datetime):
     current: datetime = now()
@@ -254,8 +246,8 @@ class OctopusEnergyCostTrackerPeakSensor(CoordinatorEntity, RestoreSensor):
     
     if self._last_reset.date() != current.date():
       self._state = 0
-      self._attributes["tracked_charges"] = []
-      self._attributes["untracked_charges"] = []
+      self._tracked_slots.clear()
+      self._untracked_slots.clear()
       self._attributes["total_consumption"] = 0
       self._last_reset = start_of_day
 
@@ -9,6 +9,7 @@ from .const import (
 
   DATA_CLIENT
 )
+from .utils.computation import get_computation_statistics
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -46,4 +47,8 @@ async def async_get_device_diagnostics(hass, entry, device):
     
     _LOGGER.info(f'Returning diagnostic details; {len(account_info["electricity_meter_points"])} electricity meter point(s), {len(account_info["gas_meter_points"])} gas meter point(s)')
 
+    computation_statistics = get_computation_statistics(hass)
+    if computation_statistics is not None:
+      account_info["computations"] = computation_statistics.to_dict()
+
     return account_info
\ No newline at end of file
@@ -2,14 +2,13 @@ import datetime
 
 from ..utils.conversions import value_inc_vat_to_pounds
 from ..utils import get_off_peak_cost
+from ..utils.rate_index import RateIndex, find_rate, get_rate_index
 
 def __get_to(item):
     return item["end"]
 
 def __sort_consumption(consumption_data):
-  sorted = consumption_data.copy()
-  sorted.sort(key=__get_to)
-  return sorted
+  return sorted(consumption_data, key=__get_to)
 
 def calculate_electricity_consumption_and_cost(
     current: datetime,
@@ -18,7 +17,8 @@ def calculate_electricity_consumption_and_cost(
     standing_charge,
     last_reset,
     minimum_consumption_records = 0,
-    round_cost = True
+    round_cost = True,
+    rate_index: RateIndex = None
   ):
   if (consumption_data is not None and len(consumption_data) >= minimum_consumption_records and rate_data is not None and len(rate_data) > 0 and standing_charge is not None):
 
@@ -31,7 +31,8 @@ def calculate_electricity_consumption_and_cost(
       total_cost_in_pence = 0
       total_consumption = 0
 
-      off_peak_cost = get_off_peak_cost(current, rate_data)
+      rate_index = get_rate_index(rate_data, rate_index)
+      off_peak_cost = get_off_peak_cost(current, rate_data, rate_index.timeline)
       total_cost_off_peak = 0
       total_cost_peak = 0
       total_consumption_off_peak = 0
@@ -45,10 +46,7 @@ def calculate_electricity_consumption_and_cost(
         consumption_to = consumption["end"]
         total_consumption = total_consumption + consumption_value
 
-        try:
-          rate = next(r for r in rate_data if r["start"] == consumption_from and r["end"] == consumption_to)
-        except StopIteration:
-          raise Exception(f"Failed to find rate for consumption between {consumption_from} and {consumption_to}")
+        rate = find_rate(rate_index, consumption_from, consumption_to)
 
         value = rate["value_inc_vat"]
         cost = (value * consumption_value)
@@ -91,6 +91,7 @@ class OctopusEnergyCurrentAccumulativeElectricityConsumption(MultiCoordinatorEnt
     consumption_result: CurrentConsumptionCoordinatorResult = self.coordinator.data if self.coordinator is not None and self.coordinator.data is not None else None
     consumption_data = consumption_result.data if consumption_result is not None else None
     rate_data = self._rates_coordinator.data.rates if self._rates_coordinator is not None and self._rates_coordinator.data is not None else None
+    rate_index = self._rates_coordinator.data.rate_index if self._rates_coordinator is not None and self._rates_coordinator.data is not None else None
     standing_charge = self._standing_charge_coordinator.data.standing_charge["value_inc_vat"] if self._standing_charge_coordinator is not None and self._standing_charge_coordinator.data is not None else None
     
     consumption_and_cost = calculate_electricity_consumption_and_cost(
@@ -98,7 +99,8 @@ class OctopusEnergyCurrentAccumulativeElectricityConsumption(MultiCoordinatorEnt
       consumption_data,
       rate_data,
       standing_charge,
-      None # We want to recalculate
+      None, # We want to recalculate
+      rate_index=rate_index
     )
 
     if (consumption_and_cost is not None):
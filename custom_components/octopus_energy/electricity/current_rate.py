@@ -21,7 +21,6 @@ from .base import (OctopusEnergyElectricitySensor)
 from ..utils.attributes import dict_to_typed_dict
 from ..coordinators.electricity_rates import ElectricityRatesCoordinatorResult
 
-from ..utils.rate_information import (get_current_rate_information)
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -101,7 +100,7 @@ class OctopusEnergyElectricityCurrentRate(CoordinatorEntity, OctopusEnergyElectr
     if (rates_result is not None):
       _LOGGER.debug(f"Updating OctopusEnergyElectricityCurrentRate for '{self._mpan}/{self._serial_number}'")
 
-      rate_information = get_current_rate_information(rates_result.rates, current)
+      rate_information = rates_result.rate_summary.get_current_rate_information(current) if rates_result.rate_summary is not None else None
 
       if rate_information is not None:
         self._attributes = {
@@ -19,7 +19,6 @@ from homeassistant.components.sensor import (
 
 from .base import (OctopusEnergyElectricitySensor)
 from ..utils.attributes import dict_to_typed_dict
-from ..utils.rate_information import (get_next_rate_information)
 from ..coordinators.electricity_rates import ElectricityRatesCoordinatorResult
 
 _LOGGER = logging.getLogger(__name__)
@@ -94,7 +93,7 @@ class OctopusEnergyElectricityNextRate(CoordinatorEntity, OctopusEnergyElectrici
       _LOGGER.debug(f"Updating OctopusEnergyElectricityNextRate for '{self._mpan}/{self._serial_number}'")
 
       target = current
-      rate_information = get_next_rate_information(rates_result.rates, target)
+      rate_information = rates_result.rate_summary.get_next_rate_information(target) if rates_result.rate_summary is not None else None
       
       if rate_information is not None:
         self._attributes = {
@@ -115,6 +115,7 @@ class OctopusEnergyPreviousAccumulativeElectricityConsumption(CoordinatorEntity,
     result: PreviousConsumptionCoordinatorResult = self.coordinator.data if self.coordinator is not None and self.coordinator.data is not None else None
     consumption_data = result.consumption if result is not None else None
     rate_data = result.rates if result is not None else None
+    rate_index = result.rate_index if result is not None else None
     standing_charge = result.standing_charge if result is not None else None
     current = consumption_data[0]["start"] if consumption_data is not None and len(consumption_data) > 0 else None
 
@@ -123,7 +124,8 @@ class OctopusEnergyPreviousAccumulativeElectricityConsumption(CoordinatorEntity,
       consumption_data,
       rate_data,
       standing_charge,
-      self._last_reset
+      self._last_reset,
+      rate_index=rate_index
     )
 
     if (consumption_and_cost is not None):
@@ -137,7 +139,8 @@ class OctopusEnergyPreviousAccumulativeElectricityConsumption(CoordinatorEntity,
         consumption_and_cost["charges"],
         rate_data,
         UnitOfEnergy.KILO_WATT_HOUR,
-        "consumption"
+        "consumption",
+        rate_index=rate_index
       )
 
       self._state = consumption_and_cost["total_consumption"]
@@ -175,16 +178,16 @@ class OctopusEnergyPreviousAccumulativeElectricityConsumption(CoordinatorEntity,
       _LOGGER.debug(f'Restored OctopusEnergyPreviousAccumulativeElectricityConsumption state: {self._state}')
 
   @callback
-  async def async_refresh_previous_consumption_data(self, start_date):
+  async def async_refresh_previous_consumption_data(self, start_date, max_concurrent_ranges = None):
     """Update sensors config"""
 
     await async_refresh_previous_electricity_consumption_data(
       self._hass,
-      self._client,
       self._account_id,
       start_date,
       self._mpan,
       self._serial_number,
       self._is_smart_meter,
-      self._is_export
+      self._is_export,
+      max_concurrent_ranges
     )
\ No newline at end of file
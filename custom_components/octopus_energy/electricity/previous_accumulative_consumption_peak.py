@@ -101,6 +101,7 @@ class OctopusEnergyPreviousAccumulativeElectricityConsumptionPeak(CoordinatorEnt
     result: PreviousConsumptionCoordinatorResult = self.coordinator.data if self.coordinator is not None and self.coordinator.data is not None else None
     consumption_data = result.consumption if result is not None else None
     rate_data = result.rates if result is not None else None
+    rate_index = result.rate_index if result is not None else None
     standing_charge = result.standing_charge if result is not None else None
     current = consumption_data[0]["start"] if consumption_data is not None and len(consumption_data) > 0 else None
 
@@ -109,7 +110,8 @@ class OctopusEnergyPreviousAccumulativeElectricityConsumptionPeak(CoordinatorEnt
       consumption_data,
       rate_data,
       standing_charge,
-      self._last_reset
+      self._last_reset,
+      rate_index=rate_index
     )
 
     if (consumption_and_cost is not None):
@@ -1,12 +1,11 @@
 from ..utils.conversions import value_inc_vat_to_pounds
+from ..utils.rate_index import RateIndex, find_rate, get_rate_index
 
 def __get_to(item):
     return item["end"]
 
 def __sort_consumption(consumption_data):
-  sorted = consumption_data.copy()
-  sorted.sort(key=__get_to)
-  return sorted
+  return sorted(consumption_data, key=__get_to)
 
 # Adapted from https://www.theenergyshop.com/guides/how-to-convert-gas-units-to-kwh
 def convert_m3_to_kwh(value, calorific_value):
@@ -26,7 +25,8 @@ def calculate_gas_consumption_and_cost(
     standing_charge,
     last_reset,
     consumption_units,
-    calorific_value
+    calorific_value,
+    rate_index: RateIndex = None
   ):
   if (consumption_data is not None and len(consumption_data) > 0 and rate_data is not None and len(rate_data) > 0 and standing_charge is not None):
 
@@ -39,6 +39,7 @@ def calculate_gas_consumption_and_cost(
       total_cost_in_pence = 0
       total_consumption_m3 = 0
       total_consumption_kwh = 0
+      rate_index = get_rate_index(rate_data, rate_index)
       for consumption in sorted_consumption_data:
         current_consumption_m3 = 0
         current_consumption_kwh = 0
@@ -58,10 +59,7 @@ def calculate_gas_consumption_and_cost(
         consumption_from = consumption["start"]
         consumption_to = consumption["end"]
 
-        try:
-          rate = next(r for r in rate_data if r["start"] == consumption_from and r["end"] == consumption_to)
-        except StopIteration:
-          raise Exception(f"Failed to find rate for consumption between {consumption_from} and {consumption_to}")
+        rate = find_rate(rate_index, consumption_from, consumption_to)
 
         value = rate["value_inc_vat"]
         cost = (value * current_consumption_kwh)
@@ -116,6 +116,7 @@ class OctopusEnergyPreviousAccumulativeGasConsumptionCubicMeters(CoordinatorEnti
     result: PreviousConsumptionCoordinatorResult = self.coordinator.data if self.coordinator is not None and self.coordinator.data is not None else None
     consumption_data = result.consumption if result is not None else None
     rate_data = result.rates if result is not None else None
+    rate_index = result.rate_index if result is not None else None
     standing_charge = result.standing_charge if result is not None else None
 
     consumption_and_cost = calculate_gas_consumption_and_cost(
@@ -124,7 +125,8 @@ class OctopusEnergyPreviousAccumulativeGasConsumptionCubicMeters(CoordinatorEnti
       standing_charge,
       self._last_reset,
       self._native_consumption_units,
-      self._calorific_value
+      self._calorific_value,
+      rate_index=rate_index
     )
 
     if (consumption_and_cost is not None):
@@ -139,7 +141,8 @@ class OctopusEnergyPreviousAccumulativeGasConsumptionCubicMeters(CoordinatorEnti
         rate_data,
         UnitOfVolume.CUBIC_METERS,
         "consumption_m3",
-        False
+        False,
+        rate_index=rate_index
       )
 
       self._state = consumption_and_cost["total_consumption_m3"]
@@ -181,16 +184,16 @@ class OctopusEnergyPreviousAccumulativeGasConsumptionCubicMeters(CoordinatorEnti
       _LOGGER.debug(f'Restored OctopusEnergyPreviousAccumulativeGasConsumption state: {self._state}')
 
   @callback
-  async def async_refresh_previous_consumption_data(self, start_date):
+  async def async_refresh_previous_consumption_data(self, start_date, max_concurrent_ranges = None):
     """Refresh the underlying consumption data"""
 
     await async_refresh_previous_gas_consumption_data(
       self._hass,
-      self._client,
       self._account_id,
       start_date,
       self._mprn,
       self._serial_number,
       self._native_consumption_units,
       self._calorific_value,
+      max_concurrent_ranges
     )
\ No newline at end of file
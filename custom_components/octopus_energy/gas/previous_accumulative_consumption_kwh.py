@@ -111,6 +111,7 @@ class OctopusEnergyPreviousAccumulativeGasConsumptionKwh(CoordinatorEntity, Octo
     result: PreviousConsumptionCoordinatorResult = self.coordinator.data if self.coordinator is not None and self.coordinator.data is not None else None
     consumption_data = result.consumption if result is not None else None
     rate_data = result.rates if result is not None else None
+    rate_index = result.rate_index if result is not None else None
     standing_charge = result.standing_charge if result is not None else None
 
     consumption_and_cost = calculate_gas_consumption_and_cost(
@@ -119,7 +120,8 @@ class OctopusEnergyPreviousAccumulativeGasConsumptionKwh(CoordinatorEntity, Octo
       standing_charge,
       self._last_reset,
       self._native_consumption_units,
-      self._calorific_value
+      self._calorific_value,
+      rate_index=rate_index
     )
 
     if (consumption_and_cost is not None):
@@ -134,7 +136,8 @@ class OctopusEnergyPreviousAccumulativeGasConsumptionKwh(CoordinatorEntity, Octo
         rate_data,
         UnitOfEnergy.KILO_WATT_HOUR,
         "consumption_kwh",
-        False
+        False,
+        rate_index=rate_index
       )
 
       self._state = consumption_and_cost["total_consumption_kwh"]
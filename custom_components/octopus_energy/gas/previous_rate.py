@@ -19,7 +19,6 @@ from homeassistant.components.sensor import (
 
 from .base import (OctopusEnergyGasSensor)
 from ..utils.attributes import dict_to_typed_dict
-from ..utils.rate_information import get_previous_rate_information
 from ..coordinators.gas_rates import GasRatesCoordinatorResult
 
 _LOGGER = logging.getLogger(__name__)
@@ -90,7 +89,7 @@ class OctopusEnergyGasPreviousRate(CoordinatorEntity, OctopusEnergyGasSensor, Re
     if (rates_result is not None):
       _LOGGER.debug(f"Updating OctopusEnergyGasPreviousRate for '{self._mprn}/{self._serial_number}'")
 
-      rate_information = get_previous_rate_information(rates_result.rates, current)
+      rate_information = rates_result.rate_summary.get_previous_rate_information(current) if rates_result.rate_summary is not None else None
 
       if rate_information is not None:
         self._attributes = {
@@ -2,11 +2,12 @@ import logging
 from datetime import (datetime, timedelta, time)
 import re
 
-from homeassistant.util.dt import (utcnow, parse_datetime)
+from homeassistant.util.dt import (utcnow)
 
 from homeassistant.helpers import storage
 
 from ..utils import OffPeakTime, get_active_tariff_code, get_tariff_parts
+from ..utils.timestamps import parse_timestamps
 
 from ..const import DOMAIN, INTELLIGENT_SOURCE_BUMP_CHARGE, INTELLIGENT_SOURCE_SMART_CHARGE, REFRESH_RATE_IN_MINUTES_INTELLIGENT
 
@@ -184,11 +185,14 @@ def clean_previous_dispatches(time: datetime, dispatches: list[IntelligentDispat
 def dictionary_list_to_dispatches(dispatches: list):
   items = []
   if (dispatches is not None):
-    for dispatch in dispatches:
+    # Dispatches keep the offset they were stored with
+    starts = parse_timestamps(list(map(lambda dispatch: dispatch["start"], dispatches)), False)
+    ends = parse_timestamps(list(map(lambda dispatch: dispatch["end"], dispatches)), False)
+    for index, dispatch in enumerate(dispatches):
       items.append(
         IntelligentDispatchItem(
-          parse_datetime(dispatch["start"]),
-          parse_datetime(dispatch["end"]),
+          starts[index],
+          ends[index],
           float(dispatch["charge_in_kwh"]) if "charge_in_kwh" in dispatch and dispatch["charge_in_kwh"] is not None else None,
           dispatch["source"] if "source" in dispatch else "",
           dispatch["location"] if "location" in dispatch else ""
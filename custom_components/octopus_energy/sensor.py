@@ -50,6 +50,8 @@ from .cost_tracker.cost_tracker_month_off_peak import OctopusEnergyCostTrackerMo
 from .cost_tracker.cost_tracker_month_peak import OctopusEnergyCostTrackerMonthPeakSensor
 from .greenness_forecast.current_index import OctopusEnergyGreennessForecastCurrentIndex
 from .greenness_forecast.next_index import OctopusEnergyGreennessForecastNextIndex
+from .statistics.backfill import MAX_CONCURRENT_RANGES
+from .statistics.backfill_progress import OctopusEnergyBackfillProgress
 
 from .coordinators.current_consumption import async_create_current_consumption_coordinator
 from .coordinators.gas_rates import async_setup_gas_rates_coordinator
@@ -76,6 +78,7 @@ from .const import (
   CONFIG_MAIN_LIVE_GAS_CONSUMPTION_REFRESH_IN_MINUTES,
   CONFIG_MAIN_PREVIOUS_ELECTRICITY_CONSUMPTION_DAYS_OFFSET,
   CONFIG_MAIN_PREVIOUS_GAS_CONSUMPTION_DAYS_OFFSET,
+  DATA_BACKFILL_JOB_MANAGER,
   DATA_GREENNESS_FORECAST_COORDINATOR,
   DOMAIN,
   
@@ -109,6 +112,7 @@ async def async_setup_entry(hass, entry, async_add_entities):
         vol.Schema(
           {
             vol.Optional("start_time"): str,
+            vol.Optional("max_concurrent_ranges"): vol.All(vol.Coerce(int), vol.Range(min=1, max=MAX_CONCURRENT_RANGES)),
           },
           extra=vol.ALLOW_EXTRA,
         ),
@@ -217,7 +221,8 @@ async def async_setup_default_sensors(hass: HomeAssistant, config, async_add_ent
     OctopusEnergyWheelOfFortuneElectricitySpins(hass, wheel_of_fortune_coordinator, client, account_id),
     OctopusEnergyWheelOfFortuneGasSpins(hass, wheel_of_fortune_coordinator, client, account_id),
     OctopusEnergyGreennessForecastCurrentIndex(hass, greenness_forecast_coordinator, account_id),
-    OctopusEnergyGreennessForecastNextIndex(hass, greenness_forecast_coordinator, account_id)
+    OctopusEnergyGreennessForecastNextIndex(hass, greenness_forecast_coordinator, account_id),
+    OctopusEnergyBackfillProgress(hass, hass.data[DOMAIN][account_id][DATA_BACKFILL_JOB_MANAGER], account_id)
   ]
 
   entity_ids_to_migrate = []
@@ -2,175 +2,160 @@ import logging
 from datetime import (datetime, timedelta)
 from homeassistant.core import HomeAssistant
 from homeassistant.components.recorder import get_instance
-from homeassistant.components.recorder.models import StatisticData
+from homeassistant.components.recorder.models import StatisticData, StatisticMetaData
 from homeassistant.components.recorder.statistics import (
+    async_add_external_statistics,
+    get_last_statistics,
     statistics_during_period
 )
 
 from ..const import DOMAIN
 from ..utils import get_active_tariff_code, get_off_peak_cost
+from ..utils.rate_index import RateIndex, find_rate, get_rate_index
+from .import_tracker import get_statistic_import_tracker
+from .last_sums import LAST_SUM_WINDOW, get_statistic_sums_cache
 
 _LOGGER = logging.getLogger(__name__)
 
-def build_consumption_statistics(current: datetime, consumptions, rates, consumption_key: str, latest_total_sum: float, latest_peak_sum: float, latest_off_peak_sum: float):
+class StatisticSeries:
+  """A series of total, peak and off peak statistics to build, carrying on from the provided sums"""
+  consumption_key: str
+  is_cost: bool
+  latest_total_sum: float
+  latest_peak_sum: float
+  latest_off_peak_sum: float
+
+  def __init__(self, consumption_key: str, is_cost: bool, latest_total_sum: float, latest_peak_sum: float, latest_off_peak_sum: float):
+    self.consumption_key = consumption_key
+    self.is_cost = is_cost
+    self.latest_total_sum = latest_total_sum
+    self.latest_peak_sum = latest_peak_sum
+    self.latest_off_peak_sum = latest_off_peak_sum
+
+def build_statistics(current: datetime, consumptions, rates, series: list[StatisticSeries], rate_index: RateIndex = None) -> list:
+  """Builds the hourly total, peak and off peak statistics of each of the provided series in a single pass over the consumption.
+
+  The rate and whether it's off peak is determined once for each consumption and shared between all series. Returns the statistics of
+  each series, in the same order as the provided series.
+  """
   last_reset = consumptions[0]["start"].replace(minute=0, second=0, microsecond=0)
-  sums = {
-    "total": latest_total_sum,
-    "peak": latest_peak_sum,
-    "off_peak": latest_off_peak_sum
-  }
-  states = {
-    "total": 0,
-    "peak": 0,
-    "off_peak": 0
-  }
-  
-  total_statistics = []
-  off_peak_statistics = []
-  peak_statistics = []
-  off_peak_cost = get_off_peak_cost(current, rates)
-
-  _LOGGER.debug(f'total_sum: {latest_total_sum}; latest_peak_sum: {latest_peak_sum}; latest_off_peak_sum: {latest_off_peak_sum}; last_reset: {last_reset}; off_peak_cost: {off_peak_cost}')
-
-  for index in range(len(consumptions)):
-    consumption = consumptions[index]
-    consumption_from = consumption["start"]
-    consumption_to = consumption["end"]
-
-    try:
-      rate = next(r for r in rates if r["start"] == consumption_from and r["end"] == consumption_to)
-    except StopIteration:
-      raise Exception(f"Failed to find rate for consumption between {consumption_from} and {consumption_to}")
-    
-    if rate["value_inc_vat"] == off_peak_cost:
-      sums["off_peak"] += consumption[consumption_key]
-      states["off_peak"] += consumption[consumption_key]
-    else:
-      sums["peak"] += consumption[consumption_key]
-      states["peak"] += consumption[consumption_key]
-    
-    start = consumption["start"].replace(minute=0, second=0, microsecond=0)
-    sums["total"] += consumption[consumption_key]
-    states["total"] += consumption[consumption_key]
-
-    _LOGGER.debug(f'index: {index}; start: {start}; sums: {sums}; states: {states}; added: {(index) % 2 == 1}')
-
+  rate_index = get_rate_index(rates, rate_index)
+  off_peak_cost = get_off_peak_cost(current, rates, rate_index.timeline)
+
+  number_of_series = len(series)
+  consumption_keys = list(map(lambda item: item.consumption_key, series))
+  is_costs = list(map(lambda item: item.is_cost, series))
+  total_sums = list(map(lambda item: item.latest_total_sum, series))
+  peak_sums = list(map(lambda item: item.latest_peak_sum, series))
+  off_peak_sums = list(map(lambda item: item.latest_off_peak_sum, series))
+  total_states = [0] * number_of_series
+  peak_states = [0] * number_of_series
+  off_peak_states = [0] * number_of_series
+  results = list(map(lambda item: { "total": [], "peak": [], "off_peak": [] }, series))
+
+  _LOGGER.debug(f'series: {number_of_series}; total_sums: {total_sums}; peak_sums: {peak_sums}; off_peak_sums: {off_peak_sums}; last_reset: {last_reset}; off_peak_cost: {off_peak_cost}')
+
+  for index, consumption in enumerate(consumptions):
+    rate = find_rate(rate_index, consumption["start"], consumption["end"])
+    value_inc_vat = rate["value_inc_vat"]
+    is_off_peak = value_inc_vat == off_peak_cost
+
+    for series_index in range(number_of_series):
+      if is_costs[series_index]:
+        value = round((consumption[consumption_keys[series_index]] * value_inc_vat) / 100, 2)
+      else:
+        value = consumption[consumption_keys[series_index]]
+
+      if is_off_peak:
+        off_peak_sums[series_index] += value
+        off_peak_states[series_index] += value
+      else:
+        peak_sums[series_index] += value
+        peak_states[series_index] += value
+
+      total_sums[series_index] += value
+      total_states[series_index] += value
+
+    # Our consumption is in 30 minute blocks, so every other block completes the hour that the statistic represents
     if index % 2 == 1:
-      total_statistics.append(
-        StatisticData(
-            start=start,
-            last_reset=last_reset,
-            sum=sums["total"],
-            state=states["total"]
-        )
-      )
-
-      off_peak_statistics.append(
-        StatisticData(
-            start=start,
-            last_reset=last_reset,
-            sum=sums["off_peak"],
-            state=states["off_peak"]
-        )
-      )
-
-      peak_statistics.append(
-        StatisticData(
-            start=start,
-            last_reset=last_reset,
-            sum=sums["peak"],
-            state=states["peak"]
-        )
-      )
-
-  return {
-    "total": total_statistics,
-    "peak": peak_statistics,
-    "off_peak": off_peak_statistics
-  }
-
-def build_cost_statistics(current: datetime, consumptions, rates, consumption_key: str, latest_total_sum: float, latest_peak_sum: float, latest_off_peak_sum: float):
-  last_reset = consumptions[0]["start"].replace(minute=0, second=0, microsecond=0)
-  sums = {
-    "total": latest_total_sum,
-    "peak": latest_peak_sum,
-    "off_peak": latest_off_peak_sum
-  }
-  states = {
-    "total": 0,
-    "peak": 0,
-    "off_peak": 0
-  }
-  
-  total_statistics = []
-  off_peak_statistics = []
-  peak_statistics = []
-  off_peak_cost = get_off_peak_cost(current, rates)
-
-  _LOGGER.debug(f'total_sum: {latest_total_sum}; latest_peak_sum: {latest_peak_sum}; latest_off_peak_sum: {latest_off_peak_sum}; last_reset: {last_reset}; off_peak_cost: {off_peak_cost}')
-
-  for index in range(len(consumptions)):
-    consumption = consumptions[index]
-    consumption_from = consumption["start"]
-    consumption_to = consumption["end"]
-    start = consumption["start"].replace(minute=0, second=0, microsecond=0)
-
-    try:
-      rate = next(r for r in rates if r["start"] == consumption_from and r["end"] == consumption_to)
-    except StopIteration:
-      raise Exception(f"Failed to find rate for consumption between {consumption_from} and {consumption_to}")
-    
-    if rate["value_inc_vat"] == off_peak_cost:
-      sums["off_peak"] += round((consumption[consumption_key] * rate["value_inc_vat"]) / 100, 2)
-      states["off_peak"] += round((consumption[consumption_key] * rate["value_inc_vat"]) / 100, 2)
-    else:
-      sums["peak"] += round((consumption[consumption_key] * rate["value_inc_vat"]) / 100, 2)
-      states["peak"] += round((consumption[consumption_key] * rate["value_inc_vat"]) / 100, 2)
-    
-    sums["total"] += round((consumption[consumption_key] * rate["value_inc_vat"]) / 100, 2)
-    states["total"] += round((consumption[consumption_key] * rate["value_inc_vat"]) / 100, 2)
-
-    _LOGGER.debug(f'index: {index}; start: {start}; sums: {sums}; states: {states}; added: {(index) % 2 == 1}')
+      start = consumption["start"].replace(minute=0, second=0, microsecond=0)
+      for series_index in range(number_of_series):
+        result = results[series_index]
+        result["total"].append(StatisticData(start=start, last_reset=last_reset, sum=total_sums[series_index], state=total_states[series_index]))
+        result["off_peak"].append(StatisticData(start=start, last_reset=last_reset, sum=off_peak_sums[series_index], state=off_peak_states[series_index]))
+        result["peak"].append(StatisticData(start=start, last_reset=last_reset, sum=peak_sums[series_index], state=peak_states[series_index]))
 
-    if index % 2 == 1:
-      total_statistics.append(
-        StatisticData(
-            start=start,
-            last_reset=last_reset,
-            sum=sums["total"],
-            state=states["total"]
-        )
-      )
-
-      off_peak_statistics.append(
-        StatisticData(
-            start=start,
-            last_reset=last_reset,
-            sum=sums["off_peak"],
-            state=states["off_peak"]
-        )
-      )
-
-      peak_statistics.append(
-        StatisticData(
-            start=start,
-            last_reset=last_reset,
-            sum=sums["peak"],
-            state=states["peak"]
-        )
-      )
-
-  return {
-    "total": total_statistics,
-    "peak": peak_statistics,
-    "off_peak": off_peak_statistics
-  }
+  return results
+
+def build_consumption_statistics(current: datetime, consumptions, rates, consumption_key: str, latest_total_sum: float, latest_peak_sum: float, latest_off_peak_sum: float, rate_index: RateIndex = None):
+  return build_statistics(current, consumptions, rates, [StatisticSeries(consumption_key, False, latest_total_sum, latest_peak_sum, latest_off_peak_sum)], rate_index)[0]
+
+def build_cost_statistics(current: datetime, consumptions, rates, consumption_key: str, latest_total_sum: float, latest_peak_sum: float, latest_off_peak_sum: float, rate_index: RateIndex = None):
+  return build_statistics(current, consumptions, rates, [StatisticSeries(consumption_key, True, latest_total_sum, latest_peak_sum, latest_off_peak_sum)], rate_index)[0]
+
+def add_statistics(hass: HomeAssistant, statistic_id: str, name: str, unit_of_measurement: str, statistics, include_peak_off_peak: bool = True):
+  """Submits the total, and optionally the peak and off peak, statistics built by build_consumption_statistics or build_cost_statistics"""
+  if len(statistics["total"]) < 1:
+    return
+
+  __add_external_statistics(hass, statistic_id, name, unit_of_measurement, statistics["total"])
+
+  if include_peak_off_peak:
+    __add_external_statistics(hass, f'{statistic_id}_peak', f'{name} Peak', unit_of_measurement, statistics["peak"])
+    __add_external_statistics(hass, f'{statistic_id}_off_peak', f'{name} Off Peak', unit_of_measurement, statistics["off_peak"])
+
+def __add_external_statistics(hass: HomeAssistant, statistic_id: str, name: str, unit_of_measurement: str, statistics: list):
+  async_add_external_statistics(
+    hass,
+    StatisticMetaData(
+      has_mean=False,
+      has_sum=True,
+      name=name,
+      source=DOMAIN,
+      statistic_id=statistic_id,
+      unit_of_measurement=unit_of_measurement,
+    ),
+    statistics
+  )
+
+  # Keep track of what we've imported, so future imports can carry on from our sums without querying the recorder
+  cache = get_statistic_sums_cache(hass)
+  if cache is not None:
+    cache.add_statistics(statistic_id, statistics)
 
 async def async_get_last_sum(hass: HomeAssistant, latest_date: datetime, statistic_id: str) -> float:
+  """Gets the sum of the last statistic within the week before the provided date"""
+  cache = get_statistic_sums_cache(hass)
+  if cache is not None:
+    (is_cached, total_sum) = cache.try_get_last_sum(latest_date, statistic_id)
+    if is_cached:
+      return total_sum
+
+    # The last statistic is all we need when importing after everything that has previously been imported (e.g. the latest day)
+    last_stat = await get_instance(hass).async_add_executor_job(
+      get_last_statistics,
+      hass,
+      1,
+      statistic_id,
+      False,
+      {"sum"}
+    )
+    (last_start, last_sum) = (last_stat[statistic_id][-1]["start"], last_stat[statistic_id][-1]["sum"]) if statistic_id in last_stat and len(last_stat[statistic_id]) > 0 else (None, None)
+    cache.set_last_statistic(statistic_id, last_start, last_sum)
+
+    # Make sure we don't skip submitting hours that the recorder doesn't have
+    tracker = get_statistic_import_tracker(hass)
+    if tracker is not None:
+      tracker.validate_last_statistic(statistic_id, last_start, last_sum)
+
+    (is_cached, total_sum) = cache.try_get_last_sum(latest_date, statistic_id)
+    if is_cached:
+      return total_sum
+
   last_total_stat = await get_instance(hass).async_add_executor_job(
     statistics_during_period,
     hass,
-    latest_date - timedelta(days=7),
+    latest_date - LAST_SUM_WINDOW,
     latest_date,
     {statistic_id},
     "hour",
@@ -179,6 +164,14 @@ async def async_get_last_sum(hass: HomeAssistant, latest_date: datetime, statist
   )
   total_sum = last_total_stat[statistic_id][-1]["sum"] if statistic_id in last_total_stat and len(last_total_stat[statistic_id]) > 0 else 0
 
+  if cache is not None:
+    cache.add_period(
+      statistic_id,
+      latest_date - LAST_SUM_WINDOW,
+      latest_date,
+      list(map(lambda stat: [stat["start"], stat["sum"]], last_total_stat[statistic_id])) if statistic_id in last_total_stat else []
+    )
+
   return total_sum
 
 def get_statistic_ids_to_remove(now, account_info):
@@ -0,0 +1,366 @@
+from abc import ABC, abstractmethod
+import asyncio
+from collections import deque
+from datetime import datetime, timedelta
+import logging
+from typing import Callable
+
+import voluptuous as vol
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.components import persistent_notification
+from homeassistant.util.dt import (now, parse_datetime)
+
+from ..api_client import ApiException, OctopusEnergyApiClient, RequestException
+from ..const import DATA_ACCOUNT, DATA_BACKFILL_JOB_MANAGER, DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+# The default number of tariff ranges of a job that are retrieved at the same time
+DEFAULT_MAX_CONCURRENT_RANGES = 3
+MAX_CONCURRENT_RANGES = 10
+
+# The number of times the data of a tariff range is requested before the job fails
+MAX_RANGE_ATTEMPTS = 5
+RETRY_DELAY_IN_SECONDS = 5
+MAX_RETRY_DELAY_IN_SECONDS = 300
+
+BACKFILL_JOB_STATUS_RUNNING = "running"
+BACKFILL_JOB_STATUS_COMPLETED = "completed"
+BACKFILL_JOB_STATUS_FAILED = "failed"
+
+class BackfillJob(ABC):
+  """A long running import of statistics for a meter, which records a checkpoint after each tariff range is imported.
+
+  Sub classes provide how tariff ranges are determined, retrieved and imported, while the manager takes care of running,
+  checkpointing and resuming the job.
+  """
+  kind: str
+  identifier: str
+  serial_number: str
+  start_date: str
+  period_from: datetime
+  max_concurrent_ranges: int
+  status: str
+  imported_to: datetime
+  sums: dict
+  days_refreshed: int
+  total_days: int
+  error: str
+
+  def __init__(self, kind: str, identifier: str, serial_number: str, start_date: str, period_from: datetime, max_concurrent_ranges: int = None):
+    self.kind = kind
+    self.identifier = identifier
+    self.serial_number = serial_number
+    self.start_date = start_date
+    self.period_from = period_from
+    self.max_concurrent_ranges = max_concurrent_ranges if max_concurrent_ranges is not None else DEFAULT_MAX_CONCURRENT_RANGES
+    self.status = BACKFILL_JOB_STATUS_RUNNING
+    self.imported_to = None
+    self.sums = {}
+    self.days_refreshed = 0
+    self.total_days = 0
+    self.error = None
+
+    # Throughput is only tracked for the current run, as the time between runs (e.g. restarts) isn't representative
+    self.run_started = None
+    self.run_days_refreshed = 0
+
+  @property
+  def id(self) -> str:
+    return f"{self.kind}_{self.serial_number}_{self.identifier}"
+
+  @property
+  def meter_description(self) -> str:
+    return f"{self.kind} meter {self.serial_number}/{self.identifier}"
+
+  @property
+  def notification_id(self) -> str:
+    return f"{DOMAIN}_refresh_previous_consumption_data_{self.serial_number}_{self.identifier}"
+
+  def get_options(self) -> dict:
+    """The kind specific options of the job, which are persisted alongside the checkpoint"""
+    return {}
+
+  def get_days_per_minute(self, current: datetime) -> float:
+    if self.run_started is None or current <= self.run_started:
+      return None
+
+    return round(self.run_days_refreshed / ((current - self.run_started).total_seconds() / 60), 2)
+
+  def is_same_request(self, job) -> bool:
+    """Determines if the provided job would import the same data as this job, and therefore can continue from this job's checkpoint"""
+    return self.id == job.id and self.start_date == job.start_date and self.get_options() == job.get_options()
+
+  @abstractmethod
+  def get_tariff_ranges(self, account_result, period_from: datetime, period_to: datetime) -> list:
+    """Determines the tariff ranges, in order, to import between the provided period"""
+
+  @abstractmethod
+  def create_imports(self) -> list:
+    """Creates the statistic imports for the job, carrying on from the sums of the checkpoint"""
+
+  @abstractmethod
+  async def async_fetch_range(self, client: OctopusEnergyApiClient, tariff_range):
+    """Retrieves the data required to import the provided tariff range"""
+
+  @abstractmethod
+  async def async_import_range(self, hass: HomeAssistant, imports: list, tariff_range, data):
+    """Imports the statistics for the provided tariff range"""
+
+  def to_dict(self) -> dict:
+    return {
+      "kind": self.kind,
+      "identifier": self.identifier,
+      "serial_number": self.serial_number,
+      "start_date": self.start_date,
+      "period_from": self.period_from.isoformat(),
+      "max_concurrent_ranges": self.max_concurrent_ranges,
+      "options": self.get_options(),
+      "status": self.status,
+      "imported_to": self.imported_to.isoformat() if self.imported_to is not None else None,
+      "sums": self.sums,
+      "days_refreshed": self.days_refreshed,
+      "total_days": self.total_days,
+      "error": self.error
+    }
+
+  def restore_checkpoint(self, data: dict):
+    """Restores the progress of the job from a dictionary previously created by to_dict"""
+    self.status = data["status"]
+    self.imported_to = parse_datetime(data["imported_to"]) if data["imported_to"] is not None else None
+    self.sums = data["sums"] if data["sums"] is not None else {}
+    self.days_refreshed = data["days_refreshed"]
+    self.total_days = data["total_days"]
+    self.error = data["error"]
+
+def get_backfill_job_manager(hass: HomeAssistant, account_id: str):
+  manager = hass.data[DOMAIN][account_id][DATA_BACKFILL_JOB_MANAGER] if account_id in hass.data[DOMAIN] and DATA_BACKFILL_JOB_MANAGER in hass.data[DOMAIN][account_id] else None
+  if manager is None:
+    raise vol.Invalid(f"Failed to find refresh job information")
+
+  return manager
+
+def get_retry_delay(attempt: int, retry_delay_in_seconds: float = RETRY_DELAY_IN_SECONDS) -> float:
+  """The number of seconds to wait after the provided failed attempt, doubling with each attempt"""
+  return min(retry_delay_in_seconds * (2 ** (attempt - 1)), MAX_RETRY_DELAY_IN_SECONDS)
+
+class BackfillJobManager:
+  """Runs the backfill jobs of an account in the background, persisting a checkpoint after each tariff range so jobs can be
+  resumed after a restart or failure"""
+
+  def __init__(
+    self,
+    hass: HomeAssistant,
+    account_id: str,
+    client: OctopusEnergyApiClient,
+    store,
+    create_job: Callable[[dict], BackfillJob],
+    max_range_attempts: int = MAX_RANGE_ATTEMPTS,
+    retry_delay_in_seconds: float = RETRY_DELAY_IN_SECONDS
+  ):
+    self._hass = hass
+    self._account_id = account_id
+    self._client = client
+    self._store = store
+    self._create_job = create_job
+    self._max_range_attempts = max_range_attempts
+    self._retry_delay_in_seconds = retry_delay_in_seconds
+    self._jobs: dict[str, BackfillJob] = {}
+    self._tasks: dict[str, asyncio.Task] = {}
+    self._listeners: list[Callable[[], None]] = []
+
+  def get_jobs(self) -> list[BackfillJob]:
+    return list(self._jobs.values())
+
+  @callback
+  def async_add_listener(self, update_callback: Callable[[], None]) -> Callable[[], None]:
+    """Listen for the progress of jobs changing. Returns a callback to remove the listener"""
+    self._listeners.append(update_callback)
+
+    @callback
+    def remove_listener() -> None:
+      if update_callback in self._listeners:
+        self._listeners.remove(update_callback)
+
+    return remove_listener
+
+  async def async_load(self):
+    """Loads the persisted jobs, resuming any that were running when they were last saved"""
+    data = await self._store.async_load()
+    if data is None or "jobs" not in data:
+      return
+
+    for item in data["jobs"]:
+      try:
+        job = self._create_job(item)
+      except Exception as e:
+        _LOGGER.warning(f"Failed to restore refresh job - {e}")
+        continue
+
+      self._jobs[job.id] = job
+      if job.status == BACKFILL_JOB_STATUS_RUNNING:
+        _LOGGER.info(f"Resuming refresh of {job.meter_description} from {job.imported_to if job.imported_to is not None else job.period_from}")
+        self.__start__(job)
+
+  async def async_start_job(self, job: BackfillJob):
+    """Starts the provided job. If an unfinished job exists for the same request, it is continued from its checkpoint instead"""
+    existing_job = self._jobs.get(job.id)
+    if existing_job is not None and existing_job.status != BACKFILL_JOB_STATUS_COMPLETED and existing_job.is_same_request(job):
+      existing_job.max_concurrent_ranges = job.max_concurrent_ranges
+      if job.id in self._tasks:
+        _LOGGER.info(f"Refresh of {job.meter_description} from {job.start_date} is already running")
+        return
+
+      job = existing_job
+      job.status = BACKFILL_JOB_STATUS_RUNNING
+      job.error = None
+    else:
+      await self.__async_cancel__(job.id)
+      self._jobs[job.id] = job
+
+    await self.__async_save__()
+    self.__start__(job)
+
+  async def async_close(self):
+    """Stops all running jobs. Their checkpoints remain, so they are resumed the next time the jobs are loaded"""
+    for job_id in list(self._tasks.keys()):
+      await self.__async_cancel__(job_id)
+
+  def __start__(self, job: BackfillJob):
+    self._tasks[job.id] = self._hass.async_create_background_task(self.__async_run__(job), f"octopus_energy_backfill_{job.id}")
+    self.__notify_listeners__()
+
+  async def __async_cancel__(self, job_id: str):
+    task = self._tasks.pop(job_id, None)
+    if task is not None and task.done() == False:
+      task.cancel()
+      try:
+        await task
+      except asyncio.CancelledError:
+        pass
+
+  async def __async_save__(self):
+    await self._store.async_save({ "jobs": list(map(lambda job: job.to_dict(), self._jobs.values())) })
+
+  def __notify_listeners__(self):
+    for update_callback in list(self._listeners):
+      update_callback()
+
+  async def __async_run__(self, job: BackfillJob):
+    try:
+      await self.__async_run_job__(job)
+    except asyncio.CancelledError:
+      # Our checkpoint is still marked as running, so the job is picked up the next time it's loaded
+      raise
+    except Exception as e:
+      _LOGGER.error(f"Failed to refresh {job.meter_description} - {e}")
+      job.status = BACKFILL_JOB_STATUS_FAILED
+      job.error = str(e) if str(e) != "" else type(e).__name__
+      await self.__async_save__()
+
+      checkpoint = job.imported_to if job.imported_to is not None else job.period_from
+      persistent_notification.async_create(
+        self._hass,
+        title="Consumption data refreshing failed",
+        message=f"Failed to refresh consumption data for {job.meter_description} from {checkpoint} ({job.error}). Refreshing has stopped. Call the service again with the start date of {job.start_date} to continue from where it stopped.",
+        notification_id=job.notification_id
+      )
+    finally:
+      if self._tasks.get(job.id) is asyncio.current_task():
+        del self._tasks[job.id]
+
+      self.__notify_listeners__()
+
+  async def __async_run_job__(self, job: BackfillJob):
+    account_result = self._hass.data[DOMAIN][self._account_id][DATA_ACCOUNT] if DATA_ACCOUNT in self._hass.data[DOMAIN][self._account_id] else None
+    if account_result is None or account_result.account is None:
+      raise Exception("Failed to find account information")
+
+    period_from = job.imported_to if job.imported_to is not None else job.period_from
+    period_to = now()
+    tariff_ranges = job.get_tariff_ranges(account_result, period_from, period_to)
+    job.total_days = job.days_refreshed + sum(map(lambda tariff_range: tariff_range.get_number_of_days(), tariff_ranges))
+    job.run_started = now()
+    job.run_days_refreshed = 0
+
+    persistent_notification.async_create(
+      self._hass,
+      title="Consumption data refreshing started",
+      message=f"Consumption data from {job.start_date} for {job.meter_description} has {'resumed from ' + str(job.imported_to) if job.imported_to is not None else 'started'}",
+      notification_id=job.notification_id
+    )
+
+    imports = job.create_imports()
+    fetches = deque()
+    next_index = 0
+    try:
+      for tariff_range in tariff_ranges:
+        # Retrieve the next few ranges while the current range is imported, as the api is the bottleneck
+        while next_index < len(tariff_ranges) and len(fetches) < job.max_concurrent_ranges:
+          fetches.append(asyncio.create_task(self.__async_fetch_range__(job, tariff_ranges[next_index])))
+          next_index += 1
+
+        data = await fetches.popleft()
+
+        # Ranges are imported in order, so the sums of each range carry on from the previous range
+        await job.async_import_range(self._hass, imports, tariff_range, data)
+
+        job.imported_to = tariff_range.end
+        job.sums = dict(map(lambda statistics_import: (statistics_import.statistic_id, statistics_import.sums), filter(lambda statistics_import: statistics_import.sums is not None, imports)))
+        job.days_refreshed += tariff_range.get_number_of_days()
+        job.run_days_refreshed += tariff_range.get_number_of_days()
+        await self.__async_save__()
+
+        persistent_notification.async_create(
+          self._hass,
+          title="Consumption data refreshing",
+          message=f"Consumption data from {job.start_date} for {job.meter_description} is refreshing; {job.days_refreshed}/{job.total_days} day(s) refreshed",
+          notification_id=job.notification_id
+        )
+        self.__notify_listeners__()
+    finally:
+      for fetch in fetches:
+        fetch.cancel()
+
+      # Wait for our cancelled fetches to finish, so they don't outlive the job or report unretrieved exceptions
+      await asyncio.gather(*fetches, return_exceptions=True)
+
+    failed_period_from = tariff_ranges[-1].end if len(tariff_ranges) > 0 else period_from
+    if failed_period_from < period_to:
+      job.status = BACKFILL_JOB_STATUS_FAILED
+      job.error = f"Failed to find tariff information for {failed_period_from}-{failed_period_from + timedelta(days=1)}"
+      await self.__async_save__()
+
+      persistent_notification.async_create(
+        self._hass,
+        title="Failed to find tariff information",
+        message=f"Failed to find tariff information for {failed_period_from}-{failed_period_from + timedelta(days=1)} for {job.meter_description}. Refreshing has stopped.",
+        notification_id=job.notification_id
+      )
+      return
+
+    job.status = BACKFILL_JOB_STATUS_COMPLETED
+    await self.__async_save__()
+
+    persistent_notification.async_create(
+      self._hass,
+      title="Consumption data refreshed",
+      message=f"Consumption data from {job.start_date} for {job.meter_description} has finished",
+      notification_id=job.notification_id
+    )
+
+  async def __async_fetch_range__(self, job: BackfillJob, tariff_range):
+    attempt = 1
+    while True:
+      try:
+        return await job.async_fetch_range(self._client, tariff_range)
+      except ApiException as e:
+        # Request exceptions indicate a problem with our request, which won't be fixed by trying again
+        if isinstance(e, RequestException) or attempt >= self._max_range_attempts:
+          raise
+
+        delay = get_retry_delay(attempt, self._retry_delay_in_seconds)
+        _LOGGER.warning(f"Failed to retrieve data for {job.meter_description} between {tariff_range.start} and {tariff_range.end} (attempt {attempt}/{self._max_range_attempts}); retrying in {delay} seconds - {e}")
+        await asyncio.sleep(delay)
+        attempt += 1
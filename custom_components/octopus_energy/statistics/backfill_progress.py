@@ -0,0 +1,99 @@
+import logging
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.entity import generate_entity_id
+from homeassistant.util.dt import (now)
+from homeassistant.components.sensor import (
+  SensorEntity,
+)
+
+from .backfill import BACKFILL_JOB_STATUS_RUNNING, BackfillJob, BackfillJobManager
+
+_LOGGER = logging.getLogger(__name__)
+
+def get_backfill_progress(jobs: list[BackfillJob]):
+  """Determines the percentage of days refreshed across the running jobs, or all jobs if none are running"""
+  running_jobs = list(filter(lambda job: job.status == BACKFILL_JOB_STATUS_RUNNING, jobs))
+  target_jobs = running_jobs if len(running_jobs) > 0 else jobs
+
+  total_days = sum(map(lambda job: job.total_days, target_jobs))
+  if total_days < 1:
+    return None
+
+  return round(sum(map(lambda job: job.days_refreshed, target_jobs)) / total_days * 100, 2)
+
+class OctopusEnergyBackfillProgress(SensorEntity):
+  """Sensor for displaying the progress of refreshing previous consumption data."""
+
+  def __init__(self, hass: HomeAssistant, manager: BackfillJobManager, account_id: str):
+    """Init sensor."""
+    self._manager = manager
+    self._account_id = account_id
+    self._state = None
+    self._attributes = {}
+
+    self.entity_id = generate_entity_id("sensor.{}", self.unique_id, hass=hass)
+
+  @property
+  def unique_id(self):
+    """The id of the sensor."""
+    return f"octopus_energy_{self._account_id}_refresh_previous_consumption_data_progress"
+
+  @property
+  def name(self):
+    """Name of the sensor."""
+    return f"Refresh Previous Consumption Data Progress ({self._account_id})"
+
+  @property
+  def should_poll(self) -> bool:
+    return False
+
+  @property
+  def icon(self):
+    """Icon of the sensor."""
+    return "mdi:database-refresh"
+
+  @property
+  def native_unit_of_measurement(self):
+    """Unit of measurement of the sensor."""
+    return "%"
+
+  @property
+  def extra_state_attributes(self):
+    """Attributes of the sensor."""
+    return self._attributes
+
+  @property
+  def native_value(self):
+    return self._state
+
+  async def async_added_to_hass(self):
+    """Call when entity about to be added to hass."""
+    await super().async_added_to_hass()
+    self.async_on_remove(self._manager.async_add_listener(self._handle_progress_update))
+    self.__update_state__()
+
+  @callback
+  def _handle_progress_update(self) -> None:
+    self.__update_state__()
+    self.async_write_ha_state()
+
+  def __update_state__(self):
+    current = now()
+    jobs = self._manager.get_jobs()
+    self._state = get_backfill_progress(jobs)
+
+    days_per_minute = list(filter(lambda value: value is not None, map(lambda job: job.get_days_per_minute(current), filter(lambda job: job.status == BACKFILL_JOB_STATUS_RUNNING, jobs))))
+    self._attributes = {
+      "days_per_minute": round(sum(days_per_minute), 2) if len(days_per_minute) > 0 else None,
+      "jobs": list(map(lambda job: {
+        "meter": job.meter_description,
+        "start_date": job.start_date,
+        "status": job.status,
+        "imported_to": job.imported_to,
+        "days_refreshed": job.days_refreshed,
+        "total_days": job.total_days,
+        "days_per_minute": job.get_days_per_minute(current),
+        "error": job.error
+      }, jobs))
+    }
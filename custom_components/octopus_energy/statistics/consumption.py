@@ -1,14 +1,13 @@
 import logging
 import datetime
-from . import (build_consumption_statistics, async_get_last_sum)
+from . import (build_consumption_statistics, add_statistics, async_get_last_sum)
+from .import_tracker import add_imported_statistics, get_changed_statistics
 
 from homeassistant.core import HomeAssistant
-from homeassistant.components.recorder.models import StatisticMetaData
-from homeassistant.components.recorder.statistics import (
-    async_add_external_statistics
-)
 
 from ..const import DOMAIN
+from ..utils.computation import async_run_computation
+from ..utils.rate_index import RateIndex
 
 _LOGGER = logging.getLogger(__name__)
 
@@ -44,7 +43,8 @@ async def async_import_external_statistics_from_consumption(
     unit_of_measurement: str, 
     consumption_key: str,
     include_peak_off_peak: bool = True,
-    initial_statistics: ImportConsumptionStatisticsResult = None
+    initial_statistics: ImportConsumptionStatisticsResult = None,
+    rate_index: RateIndex = None
   ):
   if (consumptions is None or len(consumptions) < 1 or rates is None or len(rates) < 1):
     return
@@ -60,47 +60,24 @@ async def async_import_external_statistics_from_consumption(
   off_peak_statistic_id = f'{statistic_id}_off_peak'
   off_peak_sum = initial_statistics.off_peak if initial_statistics is not None else await async_get_last_sum(hass, consumptions[0]["start"], off_peak_statistic_id)
 
-  statistics = build_consumption_statistics(current, consumptions, rates, consumption_key, total_sum, peak_sum, off_peak_sum)
-
-  async_add_external_statistics(
+  statistics = await async_run_computation(
     hass,
-    StatisticMetaData(
-      has_mean=False,
-      has_sum=True,
-      name=name,
-      source=DOMAIN,
-      statistic_id=statistic_id,
-      unit_of_measurement=unit_of_measurement,
-    ),
-    statistics["total"]
+    "build_consumption_statistics",
+    len(consumptions),
+    build_consumption_statistics,
+    current,
+    consumptions,
+    rates,
+    consumption_key,
+    total_sum,
+    peak_sum,
+    off_peak_sum,
+    rate_index
   )
 
-  if include_peak_off_peak:
-    async_add_external_statistics(
-      hass,
-      StatisticMetaData(
-        has_mean=False,
-        has_sum=True,
-        name=f'{name} Peak',
-        source=DOMAIN,
-        statistic_id=peak_statistic_id,
-        unit_of_measurement=unit_of_measurement,
-      ),
-      statistics["peak"]
-    )
-
-    async_add_external_statistics(
-      hass,
-      StatisticMetaData(
-        has_mean=False,
-        has_sum=True,
-        name=f'{name} Off Peak',
-        source=DOMAIN,
-        statistic_id=off_peak_statistic_id,
-        unit_of_measurement=unit_of_measurement,
-      ),
-      statistics["off_peak"]
-    )
+  # Only submit the hours that haven't been imported before, or have changed since they were imported (e.g. corrected consumption)
+  add_statistics(hass, statistic_id, name, unit_of_measurement, get_changed_statistics(hass, statistic_id, statistics), include_peak_off_peak)
+  add_imported_statistics(hass, statistic_id, statistics)
 
   return ImportConsumptionStatisticsResult(statistics["total"][-1]["sum"] if statistics["total"][-1] is not None else 0,
                                            statistics["peak"][-1]["sum"] if statistics["peak"][-1] is not None else 0,
@@ -0,0 +1,205 @@
+from datetime import timedelta
+import math
+import struct
+import zlib
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import storage
+
+from ..const import DATA_STATISTIC_IMPORT_TRACKER, DOMAIN, STORAGE_STATISTIC_IMPORTS_NAME
+
+# The number of days of checksums that are kept for each statistic, which needs to cover the days that are regularly imported
+RETENTION_PERIOD = timedelta(days=8)
+
+# The delay before the tracker is persisted, so multiple imports in quick succession are written together
+SAVE_DELAY_IN_SECONDS = 30
+
+__SECONDS_IN_DAY = 86400
+
+def get_days(statistics) -> dict:
+  """Groups the indexes of the statistics by the (utc) day they start in, keyed by the start of the day as a timestamp"""
+  days = {}
+  for index, statistic in enumerate(statistics["total"]):
+    day = int(statistic["start"].timestamp() // __SECONDS_IN_DAY) * __SECONDS_IN_DAY
+    if day not in days:
+      days[day] = []
+
+    days[day].append(index)
+
+  return days
+
+def get_checksum(statistics, indexes: list[int]) -> int:
+  """Calculates a cheap checksum of the total, peak and off peak statistics at the provided indexes"""
+  values = []
+  for index in indexes:
+    total = statistics["total"][index]
+    peak = statistics["peak"][index]
+    off_peak = statistics["off_peak"][index]
+    values.extend([
+      total["start"].timestamp(),
+      total["last_reset"].timestamp() if total["last_reset"] is not None else 0,
+      total["sum"],
+      total["state"],
+      peak["sum"],
+      peak["state"],
+      off_peak["sum"],
+      off_peak["state"]
+    ])
+
+  return zlib.crc32(struct.pack(f"<{len(values)}d", *values))
+
+class ImportedStatistic:
+  """The last hour (and its total sum) imported for a statistic, along with the last hour and checksum of each recently imported day"""
+
+  def __init__(self, last_start: float = None, days: dict = None, last_sum: float = None):
+    self.last_start = last_start
+    self.last_sum = last_sum
+    self.days: dict[float, list] = days if days is not None else {}
+
+  def get_changed_indexes(self, statistics, day: float, indexes: list[int]) -> list[int]:
+    """Determines which of the day's statistics need importing"""
+    imported_day = self.days.get(day)
+    if imported_day is None:
+      return indexes
+
+    (imported_last_start, imported_checksum) = imported_day
+    imported_indexes = list(filter(lambda index: statistics["total"][index]["start"].timestamp() <= imported_last_start, indexes))
+
+    # If the hours we've already imported haven't changed, then we only need the new hours. Otherwise the whole day is
+    # imported again, as we can't tell which hours have changed
+    if get_checksum(statistics, imported_indexes) == imported_checksum:
+      return indexes[len(imported_indexes):]
+
+    return indexes
+
+  def add_day(self, statistics, day: float, indexes: list[int]) -> bool:
+    """Records the day's statistics as imported, returning whether anything has changed"""
+    last_statistic = statistics["total"][indexes[-1]]
+    day_last_start = last_statistic["start"].timestamp()
+    imported_day = [day_last_start, get_checksum(statistics, indexes)]
+    if self.days.get(day) == imported_day:
+      return False
+
+    self.days[day] = imported_day
+    if self.last_start is None or day_last_start >= self.last_start:
+      self.last_start = day_last_start
+      self.last_sum = last_statistic["sum"]
+
+    return True
+
+  def is_last_statistic(self, start: float, sum: float) -> bool:
+    """Determines if the provided statistic is the last statistic we imported"""
+    return (start is not None and
+            start == self.last_start and
+            sum is not None and
+            self.last_sum is not None and
+            math.isclose(sum, self.last_sum))
+
+  def prune(self):
+    if self.last_start is None:
+      return
+
+    prune_before = self.last_start - RETENTION_PERIOD.total_seconds()
+    for day in list(self.days.keys()):
+      if day < prune_before:
+        del self.days[day]
+
+  def to_dict(self) -> dict:
+    return {
+      "last_start": self.last_start,
+      "last_sum": self.last_sum,
+      "days": list(map(lambda item: [item[0], item[1][0], item[1][1]], self.days.items()))
+    }
+
+class StatisticImportTracker:
+  """Keeps track of which hours of statistics have been imported, so that only new or changed hours are submitted to the recorder"""
+
+  def __init__(self, store = None):
+    self._store = store
+    self._statistics: dict[str, ImportedStatistic] = {}
+
+  async def async_load(self):
+    data = await self._store.async_load() if self._store is not None else None
+    if data is None:
+      return
+
+    for statistic_id, item in data.items():
+      self._statistics[statistic_id] = ImportedStatistic(
+        item["last_start"],
+        dict(map(lambda day: (day[0], [day[1], day[2]]), item["days"])),
+        item["last_sum"] if "last_sum" in item else None
+      )
+
+  def get_changed_statistics(self, statistic_id: str, statistics):
+    """Filters the total, peak and off peak statistics to the hours that haven't been imported, or belong to days that have
+    changed since they were last imported"""
+    imported_statistic = self._statistics.get(statistic_id)
+    if imported_statistic is None:
+      return statistics
+
+    changed_indexes = []
+    for day, indexes in sorted(get_days(statistics).items()):
+      changed_indexes.extend(imported_statistic.get_changed_indexes(statistics, day, indexes))
+
+    if len(changed_indexes) == len(statistics["total"]):
+      return statistics
+
+    return dict(map(lambda item: (item[0], list(map(lambda index: item[1][index], changed_indexes))), statistics.items()))
+
+  def add_imported_statistics(self, statistic_id: str, statistics):
+    """Records the total, peak and off peak statistics as imported. This should only be called once they've been successfully
+    submitted to the recorder"""
+    imported_statistic = self._statistics.get(statistic_id)
+    if imported_statistic is None:
+      imported_statistic = ImportedStatistic()
+      self._statistics[statistic_id] = imported_statistic
+
+    has_changed = False
+    for day, indexes in get_days(statistics).items():
+      has_changed = imported_statistic.add_day(statistics, day, indexes) or has_changed
+
+    if has_changed:
+      imported_statistic.prune()
+      self.__save__()
+
+  def validate_last_statistic(self, statistic_id: str, start: float, sum: float):
+    """Checks the last statistic in the recorder against what we've imported. If they don't match (e.g. the recorder failed to
+    write our import or the statistic was adjusted), then we forget what we've imported so everything is submitted again"""
+    imported_statistic = self._statistics.get(statistic_id)
+    if imported_statistic is not None and imported_statistic.is_last_statistic(start, sum) == False:
+      del self._statistics[statistic_id]
+      self.__save__()
+
+  @callback
+  def async_remove(self, statistic_ids: list[str]):
+    for statistic_id in statistic_ids:
+      self._statistics.pop(statistic_id, None)
+
+    self.__save__()
+
+  def __save__(self):
+    if self._store is not None:
+      self._store.async_delay_save(lambda: dict(map(lambda item: (item[0], item[1].to_dict()), self._statistics.items())), SAVE_DELAY_IN_SECONDS)
+
+def get_statistic_import_tracker(hass: HomeAssistant) -> StatisticImportTracker:
+  return hass.data[DOMAIN][DATA_STATISTIC_IMPORT_TRACKER] if DOMAIN in hass.data and DATA_STATISTIC_IMPORT_TRACKER in hass.data[DOMAIN] else None
+
+def get_changed_statistics(hass: HomeAssistant, statistic_id: str, statistics):
+  """Filters the provided statistics to those that need to be submitted to the recorder"""
+  tracker = get_statistic_import_tracker(hass)
+  return tracker.get_changed_statistics(statistic_id, statistics) if tracker is not None else statistics
+
+def add_imported_statistics(hass: HomeAssistant, statistic_id: str, statistics):
+  """Records the provided statistics as submitted to the recorder"""
+  tracker = get_statistic_import_tracker(hass)
+  if tracker is not None:
+    tracker.add_imported_statistics(statistic_id, statistics)
+
+async def async_setup_statistic_import_tracker(hass: HomeAssistant):
+  """Loads the tracker of imported statistics, which is shared between all accounts"""
+  if get_statistic_import_tracker(hass) is not None:
+    return
+
+  tracker = StatisticImportTracker(storage.Store(hass, "1", STORAGE_STATISTIC_IMPORTS_NAME))
+  await tracker.async_load()
+  hass.data[DOMAIN][DATA_STATISTIC_IMPORT_TRACKER] = tracker
@@ -0,0 +1,181 @@
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timedelta
+import math
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers import storage
+
+from ..const import DATA_STATISTIC_SUMS_CACHE, DOMAIN, STORAGE_STATISTIC_SUMS_NAME
+
+# The window before an import that the last sum is taken from, matching how far back the recorder was originally queried
+LAST_SUM_WINDOW = timedelta(days=7)
+
+# The amount of history that is kept for each statistic, which needs to cover the window of the latest import
+RETENTION_PERIOD = timedelta(days=8)
+
+# The delay before the cache is persisted, so multiple imports in quick succession are written together
+SAVE_DELAY_IN_SECONDS = 30
+
+class StatisticSums:
+  """The (start, sum) of the most recent hourly statistics of a single statistic.
+
+  Every statistic that exists in the recorder with a start at or after complete_from is present in points, as the integration
+  is the only source of these statistics.
+  """
+
+  def __init__(self, complete_from: float, points: list = None):
+    self.complete_from = complete_from
+    self.starts: list[float] = []
+    self.sums: list[float] = []
+
+    if points is not None:
+      for (start, sum) in sorted(points, key=lambda point: point[0]):
+        self.starts.append(start)
+        self.sums.append(sum)
+
+  def try_get_last_sum(self, period_from: float, period_to: float):
+    """Attempts to get the sum of the last statistic that starts between the provided period.
+
+    Returns a tuple of whether the sum could be determined from the cache and the sum
+    """
+    index = bisect_left(self.starts, period_to) - 1
+    if index >= 0 and self.starts[index] >= period_from and self.starts[index] >= self.complete_from:
+      return (True, self.sums[index])
+
+    # We can only be sure there are no statistics within the period if we know about everything within the period
+    if self.complete_from <= period_from and (index < 0 or self.starts[index] < period_from):
+      return (True, 0)
+
+    return (False, None)
+
+  def is_last_statistic(self, start: float, sum: float) -> bool:
+    """Determines if the provided statistic is our last statistic. If start is None, then determines if we have no statistics"""
+    if start is None:
+      return len(self.starts) < 1
+
+    return len(self.starts) > 0 and self.starts[-1] == start and math.isclose(self.sums[-1], sum)
+
+  def add(self, points: list):
+    """Adds the provided (start, sum) points, replacing any existing points that start at the same time"""
+    for (start, sum) in points:
+      index = bisect_left(self.starts, start)
+      if index < len(self.starts) and self.starts[index] == start:
+        self.sums[index] = sum
+      else:
+        self.starts.insert(index, start)
+        self.sums.insert(index, sum)
+
+  def add_period(self, period_from: float, period_to: float, points: list):
+    """Adds all of the (start, sum) points that exist between the provided period.
+
+    If the period joins up with where we're already complete from, then we're now complete from the start of the period
+    """
+    self.add(points)
+    if period_from < self.complete_from and period_to >= self.complete_from:
+      self.complete_from = period_from
+
+  def prune(self):
+    """Removes points that are no longer needed for the window of the latest import"""
+    if len(self.starts) < 1:
+      return
+
+    prune_before = self.starts[-1] - RETENTION_PERIOD.total_seconds()
+    index = bisect_right(self.starts, prune_before)
+    if index > 0:
+      del self.starts[:index]
+      del self.sums[:index]
+      self.complete_from = max(self.complete_from, prune_before)
+
+  def to_dict(self) -> dict:
+    return {
+      "complete_from": self.complete_from,
+      "points": list(map(lambda index: [self.starts[index], self.sums[index]], range(len(self.starts))))
+    }
+
+class StatisticSumsCache:
+  """Keeps the sums of the most recently imported statistics, so the sum new statistics carry on from doesn't require querying the
+  recorder.
+
+  Sums loaded from storage aren't trusted until they've been checked against the last statistic in the recorder, as the recorder
+  can have moved on since they were saved (e.g. we stopped before saving, a write failed or the statistic was adjusted).
+  """
+
+  def __init__(self, store = None):
+    self._store = store
+    self._statistics: dict[str, StatisticSums] = {}
+    self._validated_statistic_ids: set[str] = set()
+
+  async def async_load(self):
+    data = await self._store.async_load() if self._store is not None else None
+    if data is None:
+      return
+
+    for statistic_id, item in data.items():
+      self._statistics[statistic_id] = StatisticSums(item["complete_from"], item["points"])
+
+  def try_get_last_sum(self, latest_date: datetime, statistic_id: str):
+    statistic = self._statistics.get(statistic_id)
+    if statistic is None or statistic_id not in self._validated_statistic_ids:
+      return (False, None)
+
+    latest_timestamp = latest_date.timestamp()
+    return statistic.try_get_last_sum(latest_timestamp - LAST_SUM_WINDOW.total_seconds(), latest_timestamp)
+
+  def set_last_statistic(self, statistic_id: str, start: float, sum: float):
+    """Records the last statistic that exists in the recorder. If start is None, then no statistics exist.
+
+    Our existing sums are kept if they agree with the recorder, otherwise they're discarded
+    """
+    statistic = self._statistics.get(statistic_id)
+    if statistic is None or statistic.is_last_statistic(start, sum) == False:
+      if start is None:
+        self._statistics[statistic_id] = StatisticSums(0)
+      else:
+        self._statistics[statistic_id] = StatisticSums(start, [[start, sum]])
+
+    self._validated_statistic_ids.add(statistic_id)
+
+    self.__save__()
+
+  def add_period(self, statistic_id: str, period_from: datetime, period_to: datetime, points: list):
+    """Records all of the (start, sum) points that exist in the recorder between the provided period"""
+    statistic = self._statistics.get(statistic_id)
+    if statistic is None:
+      return
+
+    statistic.add_period(period_from.timestamp(), period_to.timestamp(), points)
+    self.__save__()
+
+  def add_statistics(self, statistic_id: str, statistics: list):
+    """Records the statistics that have been imported"""
+    statistic = self._statistics.get(statistic_id)
+    if statistic is None or len(statistics) < 1:
+      return
+
+    statistic.add(list(map(lambda statistic_data: [statistic_data["start"].timestamp(), statistic_data["sum"]], statistics)))
+    statistic.prune()
+    self.__save__()
+
+  @callback
+  def async_remove(self, statistic_ids: list[str]):
+    for statistic_id in statistic_ids:
+      self._statistics.pop(statistic_id, None)
+      self._validated_statistic_ids.discard(statistic_id)
+
+    self.__save__()
+
+  def __save__(self):
+    if self._store is not None:
+      self._store.async_delay_save(lambda: dict(map(lambda item: (item[0], item[1].to_dict()), self._statistics.items())), SAVE_DELAY_IN_SECONDS)
+
+def get_statistic_sums_cache(hass: HomeAssistant) -> StatisticSumsCache:
+  return hass.data[DOMAIN][DATA_STATISTIC_SUMS_CACHE] if DOMAIN in hass.data and DATA_STATISTIC_SUMS_CACHE in hass.data[DOMAIN] else None
+
+async def async_setup_statistic_sums_cache(hass: HomeAssistant):
+  """Loads the cache of statistic sums, which is shared between all accounts"""
+  if get_statistic_sums_cache(hass) is not None:
+    return
+
+  cache = StatisticSumsCache(storage.Store(hass, "1", STORAGE_STATISTIC_SUMS_NAME))
+  await cache.async_load()
+  hass.data[DOMAIN][DATA_STATISTIC_SUMS_CACHE] = cache
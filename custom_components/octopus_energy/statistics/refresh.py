@@ -1,210 +1,427 @@
-from datetime import timedelta
+from abc import abstractmethod
+import asyncio
+from datetime import datetime, timedelta
+import logging
 import re
+from typing import Callable
 import voluptuous as vol
 
 from homeassistant.core import HomeAssistant
-from homeassistant.components import persistent_notification
 from homeassistant.const import (
   UnitOfEnergy,
   UnitOfVolume
 )
 
-from homeassistant.util.dt import (now, parse_datetime)
+from homeassistant.util.dt import (parse_datetime)
 
 from ..api_client import OctopusEnergyApiClient
 from ..const import DATA_ACCOUNT, DOMAIN, REGEX_DATE
-from .consumption import async_import_external_statistics_from_consumption, get_electricity_consumption_statistic_name, get_electricity_consumption_statistic_unique_id, get_gas_consumption_statistic_name, get_gas_consumption_statistic_unique_id
-from .cost import async_import_external_statistics_from_cost, get_electricity_cost_statistic_name, get_electricity_cost_statistic_unique_id, get_gas_cost_statistic_name, get_gas_cost_statistic_unique_id
+from .backfill import BackfillJob, get_backfill_job_manager
+from . import StatisticSeries, add_statistics, async_get_last_sum, build_statistics
+from .consumption import get_electricity_consumption_statistic_name, get_electricity_consumption_statistic_unique_id, get_gas_consumption_statistic_name, get_gas_consumption_statistic_unique_id
+from .cost import get_electricity_cost_statistic_name, get_electricity_cost_statistic_unique_id, get_gas_cost_statistic_name, get_gas_cost_statistic_unique_id
 from ..electricity import calculate_electricity_consumption_and_cost
 from ..gas import calculate_gas_consumption_and_cost
 from ..coordinators import get_electricity_meter_tariff_code, get_gas_meter_tariff_code
+from ..utils.computation import async_run_computation
+from ..utils.rate_index import RateIndex
+from ..utils.rate_timeline import RateTimeline
 
-async def async_refresh_previous_electricity_consumption_data(
-  hass: HomeAssistant,
-  client: OctopusEnergyApiClient,
-  account_id: str,
-  start_date: str,
-  mpan: str,
-  serial_number: str,
-  is_smart_meter: bool,
-  is_export: bool
-):
-  # Inputs from automations can include quotes, so remove these
-  trimmed_date = start_date.strip('\"')
-  matches = re.search(REGEX_DATE, trimmed_date)
-  if matches is None:
-    raise vol.Invalid(f"Date '{trimmed_date}' must match format of YYYY-MM-DD.")
-  
-  account_result = hass.data[DOMAIN][account_id][DATA_ACCOUNT] if DATA_ACCOUNT in hass.data[DOMAIN][account_id] else None
-  account_info = account_result.account if account_result is not None else None
-  if account_info is None:
-    raise vol.Invalid(f"Failed to find account information")
-  
-  persistent_notification.async_create(
+_LOGGER = logging.getLogger(__name__)
+
+# The number of days of consumption and rates that are retrieved, and the number of days of statistics that are submitted, at once
+MAX_REFRESH_RANGE_IN_DAYS = 30
+
+BACKFILL_JOB_KIND_ELECTRICITY = "electricity"
+BACKFILL_JOB_KIND_GAS = "gas"
+
+class TariffRange:
+  start: datetime
+  end: datetime
+  tariff_code: str
+
+  def __init__(self, start: datetime, end: datetime, tariff_code: str):
+    self.start = start
+    self.end = end
+    self.tariff_code = tariff_code
+
+  def get_number_of_days(self) -> int:
+    return (self.end - self.start) // timedelta(days=1)
+
+def get_tariff_ranges(period_from: datetime, period_to: datetime, get_tariff_code: Callable[[datetime], str], max_range_in_days: int = MAX_REFRESH_RANGE_IN_DAYS) -> list[TariffRange]:
+  """Groups the days that start before period_to into ranges where the tariff doesn't change.
+
+  Ranges stop at the first day where a tariff can't be found.
+  """
+  ranges: list[TariffRange] = []
+  current = period_from
+  while current < period_to:
+    tariff_code = get_tariff_code(current)
+    if tariff_code is None:
+      break
+
+    next_day = current + timedelta(days=1)
+    if len(ranges) > 0 and ranges[-1].tariff_code == tariff_code and ranges[-1].get_number_of_days() < max_range_in_days:
+      ranges[-1].end = next_day
+    else:
+      ranges.append(TariffRange(current, next_day, tariff_code))
+
+    current = next_day
+
+  return ranges
+
+def get_day_rates(rates: RateTimeline, day_from: datetime) -> RateTimeline:
+  """Gets the rates for the day, so the off peak rate is determined the same way as when the day is retrieved on its own"""
+  return rates.get_rates_between(day_from, day_from + timedelta(days=1)) if rates is not None else None
+
+def split_consumption_by_day(period_from: datetime, period_to: datetime, consumption_data: list) -> list:
+  """Splits the consumption into (day start, consumption) pairs for each day between the provided period that has consumption"""
+  days = {}
+  if consumption_data is not None:
+    for consumption in consumption_data:
+      day = (consumption["start"] - period_from) // timedelta(days=1)
+      day_from = period_from + timedelta(days=day)
+      if consumption["start"] >= period_from and consumption["end"] <= min(day_from + timedelta(days=1), period_to):
+        if day not in days:
+          days[day] = []
+
+        days[day].append(consumption)
+
+  return list(map(lambda day: (period_from + timedelta(days=day), days[day]), sorted(days.keys())))
+
+class StatisticsImport:
+  """Accumulates the statistics of consecutive days for a single statistic, so they can be submitted in batches.
+
+  The sums of each day carry on from the previous day, with the first day carrying on from the provided sums, or the sums
+  already recorded if none are provided.
+  """
+
+  def __init__(self, unique_id: str, name: str, unit_of_measurement: str, consumption_key: str, is_cost: bool, include_peak_off_peak: bool = True, sums: dict = None):
+    self._statistic_id = f"{DOMAIN}:{unique_id}".lower()
+    self._name = name
+    self._unit_of_measurement = unit_of_measurement
+    self._consumption_key = consumption_key
+    self._is_cost = is_cost
+    self._include_peak_off_peak = include_peak_off_peak
+    self._sums = dict(sums) if sums is not None else None
+    self._statistics = { "total": [], "peak": [], "off_peak": [] }
+
+  @property
+  def statistic_id(self) -> str:
+    return self._statistic_id
+
+  @property
+  def sums(self) -> dict:
+    """The sums of the last statistics that have been built"""
+    return self._sums
+
+  async def async_load_sums(self, hass: HomeAssistant, latest_date: datetime):
+    if self._sums is None:
+      # Our sum needs to be based from the last total, so we need to grab the last record from the previous day
+      self._sums = {
+        "total": await async_get_last_sum(hass, latest_date, self._statistic_id),
+        "peak": await async_get_last_sum(hass, latest_date, f'{self._statistic_id}_peak'),
+        "off_peak": await async_get_last_sum(hass, latest_date, f'{self._statistic_id}_off_peak')
+      }
+
+  def get_series(self) -> StatisticSeries:
+    return StatisticSeries(self._consumption_key, self._is_cost, self._sums["total"], self._sums["peak"], self._sums["off_peak"])
+
+  def add(self, statistics):
+    """Adds the statistics built for the series of this import"""
+    for key in self._statistics:
+      if len(statistics[key]) > 0:
+        self._sums[key] = statistics[key][-1]["sum"]
+        self._statistics[key].extend(statistics[key])
+
+  def submit(self, hass: HomeAssistant):
+    """Submits all statistics that have been built since the last submission"""
+    if len(self._statistics["total"]) > 0:
+      add_statistics(hass, self._statistic_id, self._name, self._unit_of_measurement, self._statistics, self._include_peak_off_peak)
+      self._statistics = { "total": [], "peak": [], "off_peak": [] }
+
+def calculate_days_charges(days: list, rates: RateTimeline, calculate_consumption_and_cost: Callable) -> list:
+  """Calculates the charges of each of the provided (day start, consumption) pairs, returning the (day start, charges, rates, rate index)
+  of each day that could be calculated"""
+  days_charges = []
+  for (day_from, day_consumption_data) in days:
+    day_rates = get_day_rates(rates, day_from)
+    rate_index = RateIndex(day_rates)
+    consumption_and_cost = calculate_consumption_and_cost(day_from, day_consumption_data, day_rates, rate_index)
+    if consumption_and_cost is not None and len(consumption_and_cost["charges"]) > 0 and day_rates is not None and len(day_rates) > 0:
+      days_charges.append((day_from, consumption_and_cost["charges"], day_rates, rate_index))
+
+  return days_charges
+
+def build_days_statistics(days_charges: list, series: list[StatisticSeries]) -> list:
+  """Builds the statistics of each series for the provided (day start, charges, rates, rate index) of consecutive days, with each day
+  carrying on from the sums of the previous day"""
+  results = list(map(lambda item: { "total": [], "peak": [], "off_peak": [] }, series))
+  sums = list(map(lambda item: [item.latest_total_sum, item.latest_peak_sum, item.latest_off_peak_sum], series))
+
+  for (day_from, charges, day_rates, rate_index) in days_charges:
+    day_series = list(map(lambda index: StatisticSeries(series[index].consumption_key, series[index].is_cost, *sums[index]), range(len(series))))
+    for index, statistics in enumerate(build_statistics(day_from, charges, day_rates, day_series, rate_index)):
+      for key_index, key in enumerate(["total", "peak", "off_peak"]):
+        if len(statistics[key]) > 0:
+          sums[index][key_index] = statistics[key][-1]["sum"]
+          results[index][key].extend(statistics[key])
+
+  return results
+
+async def async_add_statistics_imports(hass: HomeAssistant, imports: list[StatisticsImport], days_charges: list):
+  """Builds the statistics for all of the provided imports in a single pass over the (day start, charges, rates, rate index) of
+  consecutive days"""
+  if len(days_charges) < 1:
+    return
+
+  for statistics_import in imports:
+    await statistics_import.async_load_sums(hass, days_charges[0][1][0]["start"])
+
+  results = await async_run_computation(
     hass,
-    title="Consumption data refreshing started",
-    message=f"Consumption data from {start_date} for electricity meter {serial_number}/{mpan} has started"
+    "build_statistics",
+    sum(map(lambda day: len(day[1]), days_charges)),
+    build_days_statistics,
+    days_charges,
+    list(map(lambda statistics_import: statistics_import.get_series(), imports))
   )
 
-  period_from = parse_datetime(f'{trimmed_date}T00:00:00Z')
+  for statistics_import, statistics in zip(imports, results):
+    statistics_import.add(statistics)
 
-  previous_consumption_result = None
-  previous_cost_result= None
-  while period_from < now():
-    period_to = period_from + timedelta(days=1)
+class ConsumptionRefreshJob(BackfillJob):
+  """Refreshes the consumption and cost statistics of a meter, one tariff range at a time"""
 
-    tariff_code = get_electricity_meter_tariff_code(period_from, account_info, mpan, serial_number)
-    if tariff_code is None:
-      persistent_notification.async_create(
-        hass,
-        title="Failed to find tariff information",
-        message=f"Failed to find tariff information for {period_from}-{period_to} for electricity meter {serial_number}/{mpan}. Refreshing has stopped."
-      )
-      return
+  @abstractmethod
+  def get_tariff_code(self, account_result, current: datetime) -> str:
+    """Gets the tariff of the meter at the provided time"""
 
-    consumption_data = await client.async_get_electricity_consumption(mpan, serial_number, period_from, period_to)
-    rates = await client.async_get_electricity_rates(tariff_code, is_smart_meter, period_from, period_to)
+  @abstractmethod
+  def calculate_consumption_and_cost(self, day_from: datetime, consumption_data: list, rates: RateTimeline, rate_index: RateIndex):
+    """Calculates the consumption and cost of the provided day of consumption"""
 
-    consumption_and_cost = calculate_electricity_consumption_and_cost(
-      period_from,
-      consumption_data,
+  def get_tariff_ranges(self, account_result, period_from: datetime, period_to: datetime) -> list[TariffRange]:
+    return get_tariff_ranges(period_from, period_to, lambda current: self.get_tariff_code(account_result, current))
+
+  def create_statistics_import(self, unique_id: str, name: str, unit_of_measurement: str, consumption_key: str, is_cost: bool, include_peak_off_peak: bool = True):
+    return StatisticsImport(
+      unique_id,
+      name,
+      unit_of_measurement,
+      consumption_key,
+      is_cost,
+      include_peak_off_peak,
+      self.sums.get(f"{DOMAIN}:{unique_id}".lower())
+    )
+
+  async def async_import_range(self, hass: HomeAssistant, imports: list[StatisticsImport], tariff_range: TariffRange, data):
+    (consumption_data, rates) = data
+    _LOGGER.debug(f'Refreshing {self.meter_description} between {tariff_range.start} and {tariff_range.end} for {tariff_range.tariff_code}')
+
+    days = split_consumption_by_day(tariff_range.start, tariff_range.end, consumption_data)
+    days_charges = await async_run_computation(
+      hass,
+      "calculate_consumption_and_cost",
+      len(consumption_data) if consumption_data is not None else 0,
+      calculate_days_charges,
+      days,
       rates,
-      0,
-      None
+      self.calculate_consumption_and_cost
     )
-  
-    if consumption_and_cost is not None:
-      previous_consumption_result = await async_import_external_statistics_from_consumption(
-        period_from,
-        hass,
-        get_electricity_consumption_statistic_unique_id(serial_number, mpan, is_export),
-        get_electricity_consumption_statistic_name(serial_number, mpan, is_export),
-        consumption_and_cost["charges"],
-        rates,
-        UnitOfEnergy.KILO_WATT_HOUR,
-        "consumption",
-        initial_statistics=previous_consumption_result
-      )
 
-      previous_cost_result = await async_import_external_statistics_from_cost(
-        period_from,
-        hass,
-        get_electricity_cost_statistic_unique_id(serial_number, mpan, is_export),
-        get_electricity_cost_statistic_name(serial_number, mpan, is_export),
-        consumption_and_cost["charges"],
-        rates,
-        "GBP",
-        "consumption",
-        initial_statistics=previous_cost_result
-      )
+    await async_add_statistics_imports(hass, imports, days_charges)
 
-    period_from = period_to
+    for statistics_import in imports:
+      statistics_import.submit(hass)
 
-  persistent_notification.async_create(
-    hass,
-    title="Consumption data refreshed",
-    message=f"Consumption data from {start_date} for electricity meter {serial_number}/{mpan} has finished"
-  )
+class ElectricityConsumptionRefreshJob(ConsumptionRefreshJob):
 
-async def async_refresh_previous_gas_consumption_data(
-  hass: HomeAssistant,
-  client: OctopusEnergyApiClient,
-  account_id: str,
-  start_date: str,
-  mprn: str,
-  serial_number: str,
-  consumption_units: str,
-  calorific_value: float
-):
-  # Inputs from automations can include quotes, so remove these
-  trimmed_date = start_date.strip('\"')
-  matches = re.search(REGEX_DATE, trimmed_date)
-  if matches is None:
-    raise vol.Invalid(f"Date '{trimmed_date}' must match format of YYYY-MM-DD.")
-  
-  account_result = hass.data[DOMAIN][account_id][DATA_ACCOUNT] if DATA_ACCOUNT in hass.data[DOMAIN][account_id] else None
-  account_info = account_result.account if account_result is not None else None
-  if account_info is None:
-    raise vol.Invalid(f"Failed to find account information")
-  
-  persistent_notification.async_create(
-    hass,
-    title="Consumption data refreshing started",
-    message=f"Consumption data from {start_date} for gas meter {serial_number}/{mprn} has started"
-  )
-  
-  period_from = parse_datetime(f'{trimmed_date}T00:00:00Z')
-  previous_m3_consumption_result = None
-  previous_kwh_consumption_result = None
-  previous_cost_result = None
-  while period_from < now():
-    period_to = period_from + timedelta(days=1)
-
-    tariff_code = get_gas_meter_tariff_code(period_from, account_info, mprn, serial_number)
-    if tariff_code is None:
-      persistent_notification.async_create(
-        hass,
-        title="Failed to find tariff information",
-        message=f"Failed to find tariff information for {period_from}-{period_to} for gas meter {serial_number}/{mprn}. Refreshing has stopped."
+  def __init__(self, mpan: str, serial_number: str, start_date: str, period_from: datetime, is_smart_meter: bool, is_export: bool, max_concurrent_ranges: int = None):
+    super().__init__(BACKFILL_JOB_KIND_ELECTRICITY, mpan, serial_number, start_date, period_from, max_concurrent_ranges)
+    self.is_smart_meter = is_smart_meter
+    self.is_export = is_export
+
+  def get_options(self) -> dict:
+    return {
+      "is_smart_meter": self.is_smart_meter,
+      "is_export": self.is_export
+    }
+
+  def get_tariff_code(self, account_result, current: datetime) -> str:
+    return get_electricity_meter_tariff_code(current, account_result.account, self.identifier, self.serial_number, account_result.tariff_index)
+
+  def create_imports(self) -> list[StatisticsImport]:
+    return [
+      self.create_statistics_import(
+        get_electricity_consumption_statistic_unique_id(self.serial_number, self.identifier, self.is_export),
+        get_electricity_consumption_statistic_name(self.serial_number, self.identifier, self.is_export),
+        UnitOfEnergy.KILO_WATT_HOUR,
+        "consumption",
+        False
+      ),
+      self.create_statistics_import(
+        get_electricity_cost_statistic_unique_id(self.serial_number, self.identifier, self.is_export),
+        get_electricity_cost_statistic_name(self.serial_number, self.identifier, self.is_export),
+        "GBP",
+        "consumption",
+        True
       )
-      return
+    ]
 
-    consumption_data = await client.async_get_gas_consumption(mprn, serial_number, period_from, period_to)
-    rates = await client.async_get_gas_rates(tariff_code, period_from, period_to)
+  async def async_fetch_range(self, client: OctopusEnergyApiClient, tariff_range: TariffRange):
+    return await asyncio.gather(
+      client.async_get_electricity_consumption(self.identifier, self.serial_number, tariff_range.start, tariff_range.end),
+      client.async_get_electricity_rates(tariff_range.tariff_code, self.is_smart_meter, tariff_range.start, tariff_range.end)
+    )
 
-    consumption_and_cost = calculate_gas_consumption_and_cost(
+  def calculate_consumption_and_cost(self, day_from: datetime, consumption_data: list, rates: RateTimeline, rate_index: RateIndex):
+    return calculate_electricity_consumption_and_cost(
+      day_from,
       consumption_data,
       rates,
       0,
       None,
-      consumption_units,
-      calorific_value
+      rate_index=rate_index
     )
-  
-    if consumption_and_cost is not None:
-      previous_m3_consumption_result =  await async_import_external_statistics_from_consumption(
-        period_from,
-        hass,
-        get_gas_consumption_statistic_unique_id(serial_number, mprn),
-        get_gas_consumption_statistic_name(serial_number, mprn),
-        consumption_and_cost["charges"],
-        rates,
+
+class GasConsumptionRefreshJob(ConsumptionRefreshJob):
+
+  def __init__(self, mprn: str, serial_number: str, start_date: str, period_from: datetime, consumption_units: str, calorific_value: float, max_concurrent_ranges: int = None):
+    super().__init__(BACKFILL_JOB_KIND_GAS, mprn, serial_number, start_date, period_from, max_concurrent_ranges)
+    self.consumption_units = consumption_units
+    self.calorific_value = calorific_value
+
+  def get_options(self) -> dict:
+    return {
+      "consumption_units": self.consumption_units,
+      "calorific_value": self.calorific_value
+    }
+
+  def get_tariff_code(self, account_result, current: datetime) -> str:
+    return get_gas_meter_tariff_code(current, account_result.account, self.identifier, self.serial_number, account_result.tariff_index)
+
+  def create_imports(self) -> list[StatisticsImport]:
+    return [
+      self.create_statistics_import(
+        get_gas_consumption_statistic_unique_id(self.serial_number, self.identifier),
+        get_gas_consumption_statistic_name(self.serial_number, self.identifier),
         UnitOfVolume.CUBIC_METERS,
         "consumption_m3",
         False,
-        initial_statistics=previous_m3_consumption_result
-      )
-
-      previous_kwh_consumption_result = await async_import_external_statistics_from_consumption(
-        period_from,
-        hass,
-        get_gas_consumption_statistic_unique_id(serial_number, mprn, True),
-        get_gas_consumption_statistic_name(serial_number, mprn, True),
-        consumption_and_cost["charges"],
-        rates,
+        False
+      ),
+      self.create_statistics_import(
+        get_gas_consumption_statistic_unique_id(self.serial_number, self.identifier, True),
+        get_gas_consumption_statistic_name(self.serial_number, self.identifier, True),
         UnitOfEnergy.KILO_WATT_HOUR,
         "consumption_kwh",
         False,
-        initial_statistics=previous_kwh_consumption_result
-      )
-
-      previous_cost_result = await async_import_external_statistics_from_cost(
-        period_from,
-        hass,
-        get_gas_cost_statistic_unique_id(serial_number, mprn),
-        get_gas_cost_statistic_name(serial_number, mprn),
-        consumption_and_cost["charges"],
-        rates,
+        False
+      ),
+      self.create_statistics_import(
+        get_gas_cost_statistic_unique_id(self.serial_number, self.identifier),
+        get_gas_cost_statistic_name(self.serial_number, self.identifier),
         "GBP",
         "consumption_kwh",
-        False,
-        previous_cost_result
+        True,
+        False
       )
+    ]
 
-    period_from = period_to
+  async def async_fetch_range(self, client: OctopusEnergyApiClient, tariff_range: TariffRange):
+    return await asyncio.gather(
+      client.async_get_gas_consumption(self.identifier, self.serial_number, tariff_range.start, tariff_range.end),
+      client.async_get_gas_rates(tariff_range.tariff_code, tariff_range.start, tariff_range.end)
+    )
 
-  persistent_notification.async_create(
-    hass,
-    title="Consumption data refreshed",
-    message=f"Consumption data from {start_date} for gas meter {serial_number}/{mprn} has finished"
-  )
\ No newline at end of file
+  def calculate_consumption_and_cost(self, day_from: datetime, consumption_data: list, rates: RateTimeline, rate_index: RateIndex):
+    return calculate_gas_consumption_and_cost(
+      consumption_data,
+      rates,
+      0,
+      None,
+      self.consumption_units,
+      self.calorific_value,
+      rate_index=rate_index
+    )
+
+def create_refresh_job(data: dict) -> ConsumptionRefreshJob:
+  """Recreates a refresh job from a dictionary previously created by to_dict"""
+  options = data["options"]
+  if data["kind"] == BACKFILL_JOB_KIND_ELECTRICITY:
+    job = ElectricityConsumptionRefreshJob(
+      data["identifier"],
+      data["serial_number"],
+      data["start_date"],
+      parse_datetime(data["period_from"]),
+      options["is_smart_meter"],
+      options["is_export"],
+      data["max_concurrent_ranges"]
+    )
+  elif data["kind"] == BACKFILL_JOB_KIND_GAS:
+    job = GasConsumptionRefreshJob(
+      data["identifier"],
+      data["serial_number"],
+      data["start_date"],
+      parse_datetime(data["period_from"]),
+      options["consumption_units"],
+      options["calorific_value"],
+      data["max_concurrent_ranges"]
+    )
+  else:
+    raise Exception(f"Unsupported refresh job '{data['kind']}'")
+
+  job.restore_checkpoint(data)
+  return job
+
+def __get_period_from(start_date: str) -> datetime:
+  # Inputs from automations can include quotes, so remove these
+  trimmed_date = start_date.strip('\"')
+  matches = re.search(REGEX_DATE, trimmed_date)
+  if matches is None:
+    raise vol.Invalid(f"Date '{trimmed_date}' must match format of YYYY-MM-DD.")
+
+  return parse_datetime(f'{trimmed_date}T00:00:00Z')
+
+def __validate_account(hass: HomeAssistant, account_id: str):
+  account_result = hass.data[DOMAIN][account_id][DATA_ACCOUNT] if DATA_ACCOUNT in hass.data[DOMAIN][account_id] else None
+  account_info = account_result.account if account_result is not None else None
+  if account_info is None:
+    raise vol.Invalid(f"Failed to find account information")
+
+async def async_refresh_previous_electricity_consumption_data(
+  hass: HomeAssistant,
+  account_id: str,
+  start_date: str,
+  mpan: str,
+  serial_number: str,
+  is_smart_meter: bool,
+  is_export: bool,
+  max_concurrent_ranges: int = None
+):
+  """Starts refreshing the consumption and cost statistics of the electricity meter in the background"""
+  period_from = __get_period_from(start_date)
+  __validate_account(hass, account_id)
+
+  await get_backfill_job_manager(hass, account_id).async_start_job(
+    ElectricityConsumptionRefreshJob(mpan, serial_number, start_date, period_from, is_smart_meter, is_export, max_concurrent_ranges)
+  )
+
+async def async_refresh_previous_gas_consumption_data(
+  hass: HomeAssistant,
+  account_id: str,
+  start_date: str,
+  mprn: str,
+  serial_number: str,
+  consumption_units: str,
+  calorific_value: float,
+  max_concurrent_ranges: int = None
+):
+  """Starts refreshing the consumption and cost statistics of the gas meter in the background"""
+  period_from = __get_period_from(start_date)
+  __validate_account(hass, account_id)
+
+  await get_backfill_job_manager(hass, account_id).async_start_job(
+    GasConsumptionRefreshJob(mprn, serial_number, start_date, period_from, consumption_units, calorific_value, max_concurrent_ranges)
+  )
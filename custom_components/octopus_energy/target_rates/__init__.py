@@ -1,11 +1,14 @@
 from datetime import datetime, timedelta
+import heapq
 import math
+from itertools import accumulate
 import re
 import logging
 
 from homeassistant.util.dt import (as_utc, parse_datetime)
 
 from ..utils.conversions import value_inc_vat_to_pounds
+from ..utils.rate_timeline import RateTimeline
 from ..const import REGEX_OFFSET_PARTS
 
 _LOGGER = logging.getLogger(__name__)
@@ -25,7 +28,8 @@ def apply_offset(date_time: datetime, offset: str, inverse = False):
   
   return date_time + timedelta(hours=hours, minutes=minutes, seconds=seconds)
 
-def get_applicable_rates(current_date: datetime, target_start_time: str, target_end_time: str, rates, is_rolling_target = True):
+def get_target_period(current_date: datetime, target_start_time: str, target_end_time: str, is_rolling_target = True):
+  """Get the start and end of the period that target rates should be found within"""
   if (target_start_time is not None):
     target_start = parse_datetime(current_date.strftime(f"%Y-%m-%dT{target_start_time}:00%z"))
   else:
@@ -56,11 +60,26 @@ def get_applicable_rates(current_date: datetime, target_start_time: str, target_
     target_start = target_start + timedelta(days=1)
     target_end = target_end + timedelta(days=1)
 
+  return (target_start, target_end)
+
+def get_required_number_of_periods(target_start: datetime, target_end: datetime):
+  """Get the number of 30 minute periods that should be available between the provided times"""
+  date_diff = target_end - target_start
+  hours = (date_diff.days * 24) + (date_diff.seconds // 3600)
+  return hours * 2
+
+def get_applicable_rates(current_date: datetime, target_start_time: str, target_end_time: str, rates, is_rolling_target = True):
+  (target_start, target_end) = get_target_period(current_date, target_start_time, target_end_time, is_rolling_target)
+
   _LOGGER.debug(f'Finding rates between {target_start} and {target_end}')
 
   # Retrieve the rates that are applicable for our target rate
   applicable_rates = []
   if rates is not None:
+    if isinstance(rates, RateTimeline):
+      # Only materialise the rates within our target period
+      rates = rates.get_rates_between(target_start, target_end)
+
     for rate in rates:
       if rate["start"] >= target_start and (target_end is None or rate["end"] <= target_end):
         new_rate = dict(rate)
@@ -69,9 +88,7 @@ def get_applicable_rates(current_date: datetime, target_start_time: str, target_
         applicable_rates.append(new_rate)
 
   # Make sure that we have enough rates that meet our target period
-  date_diff = target_end - target_start
-  hours = (date_diff.days * 24) + (date_diff.seconds // 3600)
-  periods = hours * 2
+  periods = get_required_number_of_periods(target_start, target_end)
   if len(applicable_rates) < periods:
     _LOGGER.debug(f'Incorrect number of periods discovered. Require {periods}, but only have {len(applicable_rates)}')
     return None
@@ -81,6 +98,44 @@ def get_applicable_rates(current_date: datetime, target_start_time: str, target_
 def __get_valid_to(rate):
   return rate["end"]
 
+def __to_comparable_value(value: float) -> int:
+  # Rates are at most accurate to 6 decimal places (see value_inc_vat_to_pounds), so we can compare them as integers
+  # which avoids floating point errors accumulating when sliding our window
+  return round(value * 1000000)
+
+def get_value_prefix_sums(values) -> list:
+  """Get the running totals of the provided rate values, so that the total of any window of rates can be calculated in constant time"""
+  return list(accumulate(map(__to_comparable_value, values), initial=0))
+
+def get_rate_prefix_sums(rates: list) -> list:
+  """Get the running totals of the provided rates, so that the total of any window of rates can be calculated in constant time"""
+  return get_value_prefix_sums(map(lambda rate: rate["value_inc_vat"], rates))
+
+def find_best_continuous_window(prefix_sums: list, start_index: int, end_index: int, total_required_rates: int, search_for_highest_rate = False, find_last_rates = False):
+  """Find the index of the first rate in the best continuous window of rates between the provided indexes, or None if there isn't enough rates.
+
+  Prefix sums should be from get_rate_prefix_sums for rates ordered by their start. If multiple windows are equally good, the earliest
+  window (or latest if finding the last rates) is picked.
+  """
+  if total_required_rates < 1 or total_required_rates > (end_index - start_index):
+    return None
+
+  window_start_indexes = range(start_index, end_index - total_required_rates + 1)
+  if find_last_rates:
+    window_start_indexes = reversed(window_start_indexes)
+
+  best_continuous_rates_index = None
+  best_continuous_rates_total = None
+  for index in window_start_indexes:
+    continuous_rates_total = prefix_sums[index + total_required_rates] - prefix_sums[index]
+    if (best_continuous_rates_index is None or
+        (search_for_highest_rate == False and continuous_rates_total < best_continuous_rates_total) or
+        (search_for_highest_rate and continuous_rates_total > best_continuous_rates_total)):
+      best_continuous_rates_index = index
+      best_continuous_rates_total = continuous_rates_total
+
+  return best_continuous_rates_index
+
 def calculate_continuous_times(
     applicable_rates: list,
     target_hours: float,
@@ -90,41 +145,24 @@ def calculate_continuous_times(
   if (applicable_rates is None):
     return []
   
-  applicable_rates.sort(key=__get_valid_to, reverse=find_last_rates)
+  applicable_rates.sort(key=__get_valid_to)
   applicable_rates_count = len(applicable_rates)
   total_required_rates = math.ceil(target_hours * 2)
 
-  best_continuous_rates = None
-  best_continuous_rates_total = None
-
   _LOGGER.debug(f'{applicable_rates_count} applicable rates found')
 
-  # Loop through our rates and try and find the block of time that meets our desired
-  # hours and has the lowest combined rates
-  for index, rate in enumerate(applicable_rates):
-    continuous_rates = [rate]
-    continuous_rates_total = rate["value_inc_vat"]
-    
-    for offset in range(1, total_required_rates):
-      if (index + offset) < applicable_rates_count:
-        offset_rate = applicable_rates[(index + offset)]
-        continuous_rates.append(offset_rate)
-        continuous_rates_total += offset_rate["value_inc_vat"]
-      else:
-        break
-    
-    if ((best_continuous_rates is None or (search_for_highest_rate == False and continuous_rates_total < best_continuous_rates_total) or (search_for_highest_rate and continuous_rates_total > best_continuous_rates_total)) and len(continuous_rates) == total_required_rates):
-      best_continuous_rates = continuous_rates
-      best_continuous_rates_total = continuous_rates_total
-    else:
-      _LOGGER.debug(f'Total rates for current block {continuous_rates_total}. Total rates for best block {best_continuous_rates_total}')
+  # Slide a window of our required size over our rates to find the block of time that meets our desired
+  # hours and has the lowest (or highest) combined rates.
+  best_continuous_rates_index = find_best_continuous_window(get_rate_prefix_sums(applicable_rates),
+                                                            0,
+                                                            applicable_rates_count,
+                                                            total_required_rates,
+                                                            search_for_highest_rate,
+                                                            find_last_rates)
+  if best_continuous_rates_index is None:
+    return []
 
-  if best_continuous_rates is not None:
-    # Make sure our rates are in ascending order before returning
-    best_continuous_rates.sort(key=__get_valid_to)
-    return best_continuous_rates
-  
-  return []
+  return applicable_rates[best_continuous_rates_index:best_continuous_rates_index + total_required_rates]
 
 def calculate_intermittent_times(
     applicable_rates: list,
@@ -137,27 +175,30 @@ def calculate_intermittent_times(
   
   total_required_rates = math.ceil(target_hours * 2)
 
+  # Precompute our ordering keys once, using the index as a final tie breaker so that our selection is stable
   if find_last_rates:
     if search_for_highest_rate:
-      applicable_rates.sort(key= lambda rate: (-rate["value_inc_vat"], -rate["end"].timestamp()))
+      keys = [(-rate["value_inc_vat"], -rate["end"].timestamp(), index) for index, rate in enumerate(applicable_rates)]
     else:
-      applicable_rates.sort(key= lambda rate: (rate["value_inc_vat"], -rate["end"].timestamp()))
+      keys = [(rate["value_inc_vat"], -rate["end"].timestamp(), index) for index, rate in enumerate(applicable_rates)]
   else:
     if search_for_highest_rate:
-      applicable_rates.sort(key= lambda rate: (-rate["value_inc_vat"], rate["end"]))
+      keys = [(-rate["value_inc_vat"], rate["end"].timestamp(), index) for index, rate in enumerate(applicable_rates)]
     else:
-      applicable_rates.sort(key= lambda rate: (rate["value_inc_vat"], rate["end"]))
+      keys = [(rate["value_inc_vat"], rate["end"].timestamp(), index) for index, rate in enumerate(applicable_rates)]
 
-  applicable_rates = applicable_rates[:total_required_rates]
+  # We only need to order the rates we're selecting, rather than all applicable rates
+  selected_keys = heapq.nsmallest(total_required_rates, keys)
   
-  _LOGGER.debug(f'{len(applicable_rates)} applicable rates found')
+  _LOGGER.debug(f'{len(selected_keys)} applicable rates found')
   
-  if (len(applicable_rates) < total_required_rates):
+  if (len(selected_keys) < total_required_rates):
     return []
 
   # Make sure our rates are in ascending order before returning
-  applicable_rates.sort(key=__get_valid_to)
-  return applicable_rates
+  selected_rates = list(map(lambda key: applicable_rates[key[2]], selected_keys))
+  selected_rates.sort(key=__get_valid_to)
+  return selected_rates
 
 def get_target_rate_info(current_date: datetime, applicable_rates, offset: str = None):
   is_active = False
@@ -271,4 +312,32 @@ def get_target_rate_info(current_date: datetime, applicable_rates, offset: str =
     "next_average_cost": next_average_cost,
     "next_min_cost": next_min_cost,
     "next_max_cost": next_max_cost,
-  }
\ No newline at end of file
+  }
+
+def get_next_target_rate_transition(current_date: datetime, applicable_rates, offset: str = None):
+  """Get the next time after the current date that the state of the target rates could change, or None if there are no future transitions.
+
+  This is the start or end of the next block of target rates, with the offset applied, or the point that all target
+  rates have passed so that the next set can be calculated.
+  """
+  if applicable_rates is None or len(applicable_rates) == 0:
+    return None
+
+  sorted_rates = sorted(applicable_rates, key=lambda rate: rate["start"])
+  transitions = [sorted_rates[-1]["end"]]
+  block_start = sorted_rates[0]["start"]
+  for index in range(1, len(sorted_rates) + 1):
+    if index == len(sorted_rates) or sorted_rates[index - 1]["end"] != sorted_rates[index]["start"]:
+      block_end = sorted_rates[index - 1]["end"]
+      if offset is not None:
+        transitions.append(apply_offset(block_start, offset))
+        transitions.append(apply_offset(block_end, offset))
+      else:
+        transitions.append(block_start)
+        transitions.append(block_end)
+
+      if index < len(sorted_rates):
+        block_start = sorted_rates[index]["start"]
+
+  future_transitions = [transition for transition in transitions if transition > current_date]
+  return min(future_transitions) if len(future_transitions) > 0 else None
@@ -0,0 +1,148 @@
+import logging
+import math
+from collections import OrderedDict
+from datetime import datetime
+from itertools import chain, repeat
+
+from ..const import (
+  CONFIG_TARGET_END_TIME,
+  CONFIG_TARGET_HOURS,
+  CONFIG_TARGET_INVERT_TARGET_RATES,
+  CONFIG_TARGET_LAST_RATES,
+  CONFIG_TARGET_ROLLING_TARGET,
+  CONFIG_TARGET_START_TIME,
+  CONFIG_TARGET_TYPE,
+)
+from ..utils.conversions import value_inc_vat_to_pounds
+from ..utils.rate_timeline import RateTimeline
+from . import (
+  calculate_intermittent_times,
+  find_best_continuous_window,
+  get_required_number_of_periods,
+  get_target_period,
+  get_value_prefix_sums
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+# The number of target periods we keep results for. Rolling targets move their target period as time passes, so without a limit
+# we'd keep a result for every period seen until new rates are available
+MAX_CACHED_RESULTS = 32
+
+class TargetRateRequest:
+  start_time: str
+  end_time: str
+  is_rolling_target: bool
+  target_type: str
+  target_hours: float
+  find_highest_rates: bool
+  find_last_rates: bool
+
+  def __init__(self, config: dict, is_export: bool):
+    self.start_time = config[CONFIG_TARGET_START_TIME] if CONFIG_TARGET_START_TIME in config else None
+    self.end_time = config[CONFIG_TARGET_END_TIME] if CONFIG_TARGET_END_TIME in config else None
+
+    # True by default for backwards compatibility
+    self.is_rolling_target = config[CONFIG_TARGET_ROLLING_TARGET] if CONFIG_TARGET_ROLLING_TARGET in config else True
+    self.find_last_rates = config[CONFIG_TARGET_LAST_RATES] if CONFIG_TARGET_LAST_RATES in config else False
+    self.target_type = config[CONFIG_TARGET_TYPE]
+    self.target_hours = float(config[CONFIG_TARGET_HOURS])
+
+    invert_target_rates = config[CONFIG_TARGET_INVERT_TARGET_RATES] if CONFIG_TARGET_INVERT_TARGET_RATES in config else False
+    self.find_highest_rates = (is_export and invert_target_rates == False) or (is_export == False and invert_target_rates)
+
+class TargetRatePlanner:
+  """Solves the target rates for all target rate sensors that are bound to the same rates coordinator.
+
+  The prefix sums of the rates are built once per set of rates from the segments of their timeline, with the results for each
+  target period cached so that sensors with the same configuration share the same result. Target periods are looked up against
+  the timeline directly, so only the rates that make up a result are materialised and converted into dictionaries.
+  """
+
+  def __init__(self):
+    self._requests: dict[str, TargetRateRequest] = {}
+    self._source_rates = None
+    self._rates = RateTimeline.from_rates([])
+    self._prefix_sums = [0]
+    self._results = OrderedDict()
+
+  def register(self, key: str, request: TargetRateRequest):
+    """Register a target rate request, which will be solved whenever new rates are available"""
+    self._requests[key] = request
+
+  def unregister(self, key: str):
+    if key in self._requests:
+      del self._requests[key]
+
+  def __update_rates(self, rates, current_date: datetime):
+    if rates is self._source_rates:
+      return
+
+    self._source_rates = rates
+    self._results.clear()
+    self._rates = RateTimeline.from_rates(rates if rates is not None else [])
+
+    # Every rate within a segment shares the same value, so we only need to convert each value once
+    self._prefix_sums = get_value_prefix_sums(chain.from_iterable(map(
+      lambda segment: repeat(value_inc_vat_to_pounds(segment.value_inc_vat), segment.number_of_rates),
+      self._rates.segments()
+    )))
+
+    # Solve all of our registered requests in one go, so that our sensors can pick up their results
+    _LOGGER.debug(f'Solving {len(self._requests)} target rate requests against {len(self._rates)} rates')
+    for request in self._requests.values():
+      self.__solve(request, current_date)
+
+  def __solve(self, request: TargetRateRequest, current_date: datetime):
+    (target_start, target_end) = get_target_period(current_date, request.start_time, request.end_time, request.is_rolling_target)
+
+    key = (target_start, target_end, request.target_type, request.target_hours, request.find_highest_rates, request.find_last_rates)
+    if key in self._results:
+      self._results.move_to_end(key)
+      return self._results[key]
+
+    start_index = self._rates.find_start_index(target_start)
+    end_index = self._rates.find_end_index(target_end)
+
+    result = None
+    periods = get_required_number_of_periods(target_start, target_end)
+    if (end_index - start_index) < periods:
+      _LOGGER.debug(f'Incorrect number of periods discovered. Require {periods}, but only have {max(0, end_index - start_index)}')
+    elif request.target_type == "Continuous":
+      total_required_rates = math.ceil(request.target_hours * 2)
+      index = find_best_continuous_window(self._prefix_sums,
+                                          start_index,
+                                          end_index,
+                                          total_required_rates,
+                                          request.find_highest_rates,
+                                          request.find_last_rates)
+      result = self.__to_target_rates(self._rates[index:index + total_required_rates]) if index is not None else []
+    elif request.target_type == "Intermittent":
+      result = calculate_intermittent_times(self.__to_target_rates(self._rates[start_index:end_index]),
+                                            request.target_hours,
+                                            request.find_highest_rates,
+                                            request.find_last_rates)
+    else:
+      _LOGGER.error(f"Unexpected target type: {request.target_type}")
+      result = []
+
+    self._results[key] = result
+    if len(self._results) > MAX_CACHED_RESULTS:
+      self._results.popitem(last=False)
+
+    return result
+
+  def __to_target_rates(self, rates) -> list:
+    target_rates = []
+    for rate in rates:
+      new_rate = dict(rate)
+      new_rate["value_inc_vat"] = value_inc_vat_to_pounds(rate["value_inc_vat"])
+      target_rates.append(new_rate)
+
+    return target_rates
+
+  def get_target_rates(self, rates, current_date: datetime, request: TargetRateRequest):
+    """Get the target rates for the provided request, or None if there are not enough rates to satisfy the target period"""
+    self.__update_rates(rates, current_date)
+    result = self.__solve(request, current_date)
+    return list(result) if result is not None else None
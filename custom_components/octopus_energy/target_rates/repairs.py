@@ -4,10 +4,11 @@ from homeassistant.helpers import issue_registry as ir
 
 from ..const import CONFIG_TARGET_NAME, DOMAIN
 from ..config.target_rates import validate_target_rate_config
+from ..utils.tariff_index import TariffIndex
 
-def check_for_errors(hass, config, account_info, now: datetime):
+def check_for_errors(hass, config, account_info, now: datetime, tariff_index: TariffIndex = None):
   if account_info is not None:
-    errors = validate_target_rate_config(config, account_info, now)
+    errors = validate_target_rate_config(config, account_info, now, tariff_index)
     keys = list(errors.keys())
     target_rate_name = config[CONFIG_TARGET_NAME]
     repair_key = f"invalid_target_rate_{target_rate_name}"
@@ -1,5 +1,5 @@
 import logging
-from datetime import timedelta
+from datetime import datetime, timedelta
 
 import voluptuous as vol
 
@@ -9,6 +9,7 @@ from homeassistant.const import (
 )
 from homeassistant.core import HomeAssistant, callback
 from homeassistant.helpers.entity import generate_entity_id
+from homeassistant.helpers.event import async_track_point_in_utc_time
 
 from homeassistant.util.dt import (utcnow, now)
 from homeassistant.helpers.update_coordinator import (
@@ -42,11 +43,10 @@ from ..const import (
 )
 
 from . import (
-  calculate_continuous_times,
-  calculate_intermittent_times,
-  get_applicable_rates,
+  get_next_target_rate_transition,
   get_target_rate_info
 )
+from .planner import TargetRatePlanner, TargetRateRequest
 
 from ..config.target_rates import validate_target_rate_config
 from ..target_rates.repairs import check_for_errors
@@ -57,7 +57,7 @@ _LOGGER = logging.getLogger(__name__)
 class OctopusEnergyTargetRate(CoordinatorEntity, BinarySensorEntity, RestoreEntity):
   """Sensor for calculating when a target should be turned on or off."""
 
-  def __init__(self, hass: HomeAssistant, account_id: str, coordinator, config, is_export):
+  def __init__(self, hass: HomeAssistant, account_id: str, coordinator, config, is_export, planner: TargetRatePlanner = None):
     """Init sensor."""
     # Pass coordinator to base class
     CoordinatorEntity.__init__(self, coordinator)
@@ -82,6 +82,9 @@ class OctopusEnergyTargetRate(CoordinatorEntity, BinarySensorEntity, RestoreEnti
     self._attributes[CONFIG_TARGET_LAST_RATES] = find_last_rates
 
     self._target_rates = []
+    self._last_rates = None
+    self._unsub_transition = None
+    self._planner = planner if planner is not None else TargetRatePlanner()
     
     self._hass = hass
     self.entity_id = generate_entity_id("binary_sensor.{}", self.unique_id, hass=hass)
@@ -112,6 +115,41 @@ class OctopusEnergyTargetRate(CoordinatorEntity, BinarySensorEntity, RestoreEnti
   
   @callback
   def _handle_coordinator_update(self) -> None:
+    """Recalculates the target rate sensor when new rate data is available."""
+    rates = self.coordinator.data.rates if self.coordinator is not None and self.coordinator.data is not None else None
+    if self._last_evaluated is not None and rates is self._last_rates:
+      # Our state only changes at the boundaries of our target rates, which are handled by our scheduled transitions
+      return
+
+    self._last_rates = rates
+    self._update_state()
+
+  @callback
+  def _handle_transition(self, _) -> None:
+    """Updates the state of the target rate sensor when a scheduled transition is reached."""
+    self._unsub_transition = None
+    self._update_state()
+
+  def _cancel_transition(self):
+    if self._unsub_transition is not None:
+      self._unsub_transition()
+      self._unsub_transition = None
+
+  def _schedule_next_transition(self, current_date: datetime, offset: str):
+    self._cancel_transition()
+
+    next_transition = get_next_target_rate_transition(current_date, self._target_rates, offset)
+    if next_transition is None:
+      # Without any target rates, our target period can only move on at the next rate boundary
+      next_transition = current_date.replace(minute=30 if current_date.minute < 30 else 0, second=0, microsecond=0)
+      if next_transition <= current_date:
+        next_transition = next_transition + timedelta(hours=1)
+
+    _LOGGER.debug(f'Next transition for OctopusEnergyTargetRate {self._config[CONFIG_TARGET_NAME]}: {next_transition}')
+    self._unsub_transition = async_track_point_in_utc_time(self._hass, self._handle_transition, next_transition)
+
+  @callback
+  def _update_state(self) -> None:
     """Determines if the target rate sensor is active."""
     if CONFIG_TARGET_OFFSET in self._config:
       offset = self._config[CONFIG_TARGET_OFFSET]
@@ -120,88 +158,40 @@ class OctopusEnergyTargetRate(CoordinatorEntity, BinarySensorEntity, RestoreEnti
 
     account_result = self._hass.data[DOMAIN][self._account_id][DATA_ACCOUNT]
     account_info = account_result.account if account_result is not None else None
+    tariff_index = account_result.tariff_index if account_result is not None else None
 
     current_local_date = now()
-    check_for_errors(self._hass, self._config, account_info, current_local_date)
+    check_for_errors(self._hass, self._config, account_info, current_local_date, tariff_index)
 
-    # Find the current rate. Rates change a maximum of once every 30 minutes.
     current_date = utcnow()
 
-    if (current_date.minute % 30) == 0 or len(self._target_rates) == 0 or self._last_evaluated is None or self._last_evaluated + timedelta(minutes=30) < current_date:
-      _LOGGER.debug(f'Updating OctopusEnergyTargetRate {self._config[CONFIG_TARGET_NAME]}')
-      self._last_evaluated = current_date
-
-      # If all of our target times have passed, it's time to recalculate the next set
-      all_rates_in_past = True
-      for rate in self._target_rates:
-        if rate["end"] > current_date:
-          all_rates_in_past = False
-          break
-      
-      if all_rates_in_past:
-        if self.coordinator is not None and self.coordinator.data is not None:
-          all_rates = self.coordinator.data.rates
-        else:
-          _LOGGER.debug(f"Rate data missing. Setting to empty array")
-          all_rates = []
-
-        _LOGGER.debug(f'{len(all_rates) if all_rates is not None else None} rate periods found')
-
-        if len(all_rates) > 0:
-          start_time = None
-          if CONFIG_TARGET_START_TIME in self._config:
-            start_time = self._config[CONFIG_TARGET_START_TIME]
-
-          end_time = None
-          if CONFIG_TARGET_END_TIME in self._config:
-            end_time = self._config[CONFIG_TARGET_END_TIME]
-
-          # True by default for backwards compatibility
-          is_rolling_target = True
-          if CONFIG_TARGET_ROLLING_TARGET in self._config:
-            is_rolling_target = self._config[CONFIG_TARGET_ROLLING_TARGET]
-
-          find_last_rates = False
-          if CONFIG_TARGET_LAST_RATES in self._config:
-            find_last_rates = self._config[CONFIG_TARGET_LAST_RATES]     
-
-          target_hours = float(self._config[CONFIG_TARGET_HOURS])
-
-          invert_target_rates = False
-          if (CONFIG_TARGET_INVERT_TARGET_RATES in self._config):
-            invert_target_rates = self._config[CONFIG_TARGET_INVERT_TARGET_RATES]
-
-          find_highest_rates = (self._is_export and invert_target_rates == False) or (self._is_export == False and invert_target_rates)
-
-          applicable_rates = get_applicable_rates(
-            current_local_date,
-            start_time,
-            end_time,
-            all_rates,
-            is_rolling_target
-          )
-
-          if (self._config[CONFIG_TARGET_TYPE] == "Continuous"):
-            self._target_rates = calculate_continuous_times(
-              applicable_rates,
-              target_hours,
-              find_highest_rates,
-              find_last_rates
-            )
-          elif (self._config[CONFIG_TARGET_TYPE] == "Intermittent"):
-            self._target_rates = calculate_intermittent_times(
-              applicable_rates,
-              target_hours,
-              find_highest_rates,
-              find_last_rates
-            )
-          else:
-            _LOGGER.error(f"Unexpected target type: {self._config[CONFIG_TARGET_TYPE]}")
-
-          self._attributes["rates_incomplete"] = applicable_rates is None
-          self._attributes["target_times"] = self._target_rates
-          self._attributes["target_times_last_evaluated"] = current_date
-          _LOGGER.debug(f"calculated rates: {self._target_rates}")
+    _LOGGER.debug(f'Updating OctopusEnergyTargetRate {self._config[CONFIG_TARGET_NAME]}')
+    self._last_evaluated = current_date
+
+    # If all of our target times have passed, it's time to recalculate the next set
+    all_rates_in_past = True
+    for rate in self._target_rates:
+      if rate["end"] > current_date:
+        all_rates_in_past = False
+        break
+    
+    if all_rates_in_past:
+      if self.coordinator is not None and self.coordinator.data is not None:
+        all_rates = self.coordinator.data.rates
+      else:
+        _LOGGER.debug(f"Rate data missing. Setting to empty array")
+        all_rates = []
+
+      _LOGGER.debug(f'{len(all_rates) if all_rates is not None else None} rate periods found')
+
+      if all_rates is not None and len(all_rates) > 0:
+        target_rates = self._planner.get_target_rates(all_rates, current_local_date, TargetRateRequest(self._config, self._is_export))
+        self._target_rates = target_rates if target_rates is not None else []
+
+        self._attributes["rates_incomplete"] = target_rates is None
+        self._attributes["target_times"] = self._target_rates
+        self._attributes["target_times_last_evaluated"] = current_date
+        _LOGGER.debug(f"calculated rates: {self._target_rates}")
 
     active_result = get_target_rate_info(current_date, self._target_rates, offset)
 
@@ -224,7 +214,8 @@ class OctopusEnergyTargetRate(CoordinatorEntity, BinarySensorEntity, RestoreEnti
     self._state = active_result["is_active"]
 
     _LOGGER.debug(f"calculated: {self._state}")
-    super()._handle_coordinator_update()
+    self._schedule_next_transition(current_date, offset)
+    self.async_write_ha_state()
   
   async def async_added_to_hass(self):
     """Call when entity about to be added to hass."""
@@ -243,6 +234,14 @@ class OctopusEnergyTargetRate(CoordinatorEntity, BinarySensorEntity, RestoreEnti
     
       _LOGGER.debug(f'Restored OctopusEnergyTargetRate state: {self._state}')
 
+    self._planner.register(self.entity_id, TargetRateRequest(self._config, self._is_export))
+
+  async def async_will_remove_from_hass(self):
+    """Call when entity is being removed from hass."""
+    self._cancel_transition()
+    self._planner.unregister(self.entity_id)
+    await super().async_will_remove_from_hass()
+
   @callback
   async def async_update_config(self, target_start_time=None, target_end_time=None, target_hours=None, target_offset=None):
     """Update sensors config"""
@@ -278,8 +277,9 @@ class OctopusEnergyTargetRate(CoordinatorEntity, BinarySensorEntity, RestoreEnti
 
     account_result = self._hass.data[DOMAIN][self._account_id][DATA_ACCOUNT]
     account_info = account_result.account if account_result is not None else None
+    tariff_index = account_result.tariff_index if account_result is not None else None
 
-    errors = validate_target_rate_config(config, account_info, now())
+    errors = validate_target_rate_config(config, account_info, now(), tariff_index)
     keys = list(errors.keys())
     if (len(keys)) > 0:
       translations = await translation.async_get_translations(self._hass, self._hass.config.language, "options", {DOMAIN})
@@ -289,4 +289,5 @@ class OctopusEnergyTargetRate(CoordinatorEntity, BinarySensorEntity, RestoreEnti
     self._attributes = self._config.copy()
     self._attributes["is_target_export"] = self._is_export
     self._target_rates = []
-    self.async_write_ha_state()
\ No newline at end of file
+    self._planner.register(self.entity_id, TargetRateRequest(self._config, self._is_export))
+    self._update_state()
\ No newline at end of file
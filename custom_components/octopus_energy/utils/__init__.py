@@ -10,6 +10,7 @@ from ..const import (
 )
 from ..utils.conversions import value_inc_vat_to_pounds
 from .rate_information import get_current_rate_information
+from .rate_timeline import RateTimeline, get_rate_timeline
 
 class TariffParts:
   energy: str
@@ -63,21 +64,21 @@ def get_active_tariff_code(utcnow: datetime, agreements):
   
   return None
 
-def get_off_peak_cost(current: datetime, rates: list):
+def get_off_peak_cost(current: datetime, rates: list, rate_timeline: RateTimeline = None):
   # Need to use as local to ensure we get the correct from/to periods relative to our local time
   today_start = as_utc(as_local(current).replace(hour=0, minute=0, second=0, microsecond=0))
   today_end = today_start + timedelta(days=1)
   off_peak_cost = None
 
   rate_charges = {}
-  if rates is not None:
-    for rate in rates:
-      if rate["start"] >= today_start and rate["end"] <= today_end:
-        print(rate["start"])
-        value = rate["value_inc_vat"]
+  rate_timeline = get_rate_timeline(rates, rate_timeline)
+  if rate_timeline is not None:
+    for segment in rate_timeline.segments():
+      if segment.get_number_of_rates_between(today_start, today_end) > 0:
+        value = segment.value_inc_vat
         rate_charges[value] = (rate_charges[value] if value in rate_charges else value)
-        if off_peak_cost is None or off_peak_cost > rate["value_inc_vat"]:
-          off_peak_cost = rate["value_inc_vat"]
+        if off_peak_cost is None or off_peak_cost > segment.value_inc_vat:
+          off_peak_cost = segment.value_inc_vat
 
   return off_peak_cost if len(rate_charges) == 2 or len(rate_charges) == 3 else None
 
@@ -99,21 +100,22 @@ class OffPeakTime:
     self.start = start
     self.end = end
 
-def get_off_peak_times(current: datetime, rates: list, include_intelligent_adjusted = False):
-  off_peak_value = get_off_peak_cost(current, rates)
+def get_off_peak_times(current: datetime, rates: list, include_intelligent_adjusted = False, rate_timeline: RateTimeline = None):
+  # Build our timeline once, so it's shared with determining our off peak cost
+  rate_timeline = get_rate_timeline(rates, rate_timeline)
+  off_peak_value = get_off_peak_cost(current, rates, rate_timeline)
   times: list[OffPeakTime] = []
 
-  if rates is not None and off_peak_value is not None:
+  if rate_timeline is not None and off_peak_value is not None:
     start = None
-    rates_length = len(rates)
-    for rate_index in range(rates_length):
-      rate = rates[rate_index]
-      if (rate["value_inc_vat"] == off_peak_value and 
-          ("is_intelligent_adjusted" not in rate or rate["is_intelligent_adjusted"] == False or include_intelligent_adjusted)):
+    end = None
+    for segment in rate_timeline.segments():
+      if (segment.value_inc_vat == off_peak_value and 
+          (segment.is_intelligent_adjusted == False or include_intelligent_adjusted)):
         if start is None:
-          start = rate["start"]
+          start = segment.start
+        end = segment.end
       elif start is not None:
-        end = rates[rate_index - 1]["end"]
         if end >= current:
           times.append(OffPeakTime(start, end))
         start = None
@@ -0,0 +1,118 @@
+import logging
+import time
+from types import MappingProxyType
+from typing import Callable
+
+from homeassistant.core import HomeAssistant
+
+from ..const import DATA_COMPUTATION_STATISTICS, DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+# The number of items (e.g. half hourly consumptions) below which computations run directly on the event loop, as the cost of
+# handing over to the executor outweighs the cost of the computation. A single day of consumption is well below this.
+OFFLOAD_THRESHOLD = 480
+
+def snapshot(value):
+  """Creates a read only copy of the provided value, so it can be handed to the executor without any locking.
+
+  Lists become tuples and dictionaries become read only mappings, with their contents copied the same way. Any other values are
+  handed over as they are, so need to be immutable (e.g. datetimes or rate timelines) or no longer used by the caller.
+  """
+  if isinstance(value, (list, tuple)):
+    return tuple(map(snapshot, value))
+
+  if isinstance(value, (dict, MappingProxyType)):
+    return MappingProxyType(dict(map(lambda item: (item[0], snapshot(item[1])), value.items())))
+
+  return value
+
+class ComputationStatistic:
+  """How often a computation has run, and how long it has taken when it has been offloaded to the executor"""
+  inline_runs: int
+  offloaded_runs: int
+  total_run_time: float
+  max_run_time: float
+  total_queue_time: float
+  max_queue_time: float
+
+  def __init__(self):
+    self.inline_runs = 0
+    self.offloaded_runs = 0
+    self.total_run_time = 0
+    self.max_run_time = 0
+    self.total_queue_time = 0
+    self.max_queue_time = 0
+
+  def add_offloaded_run(self, queue_time: float, run_time: float):
+    self.offloaded_runs += 1
+    self.total_run_time += run_time
+    self.max_run_time = max(self.max_run_time, run_time)
+    self.total_queue_time += queue_time
+    self.max_queue_time = max(self.max_queue_time, queue_time)
+
+  def to_dict(self) -> dict:
+    return {
+      "inline_runs": self.inline_runs,
+      "offloaded_runs": self.offloaded_runs,
+      "total_run_time_in_seconds": round(self.total_run_time, 4),
+      "max_run_time_in_seconds": round(self.max_run_time, 4),
+      "total_queue_time_in_seconds": round(self.total_queue_time, 4),
+      "max_queue_time_in_seconds": round(self.max_queue_time, 4)
+    }
+
+class ComputationStatistics:
+  """The statistics of each named computation, which is shared between all accounts"""
+
+  def __init__(self):
+    self._statistics: dict[str, ComputationStatistic] = {}
+
+  def get(self, name: str) -> ComputationStatistic:
+    statistic = self._statistics.get(name)
+    if statistic is None:
+      statistic = ComputationStatistic()
+      self._statistics[name] = statistic
+
+    return statistic
+
+  def to_dict(self) -> dict:
+    return dict(map(lambda item: (item[0], item[1].to_dict()), self._statistics.items()))
+
+def get_computation_statistics(hass: HomeAssistant) -> ComputationStatistics:
+  return hass.data[DOMAIN][DATA_COMPUTATION_STATISTICS] if DOMAIN in hass.data and DATA_COMPUTATION_STATISTICS in hass.data[DOMAIN] else None
+
+def setup_computation_statistics(hass: HomeAssistant):
+  if get_computation_statistics(hass) is None:
+    hass.data[DOMAIN][DATA_COMPUTATION_STATISTICS] = ComputationStatistics()
+
+def __run_offloaded_computation(target: Callable, args: tuple, queued_at: float):
+  started_at = time.perf_counter()
+  result = target(*args)
+  return (result, started_at - queued_at, time.perf_counter() - started_at)
+
+async def async_run_computation(hass: HomeAssistant, name: str, size: int, target: Callable, *args, threshold: int = OFFLOAD_THRESHOLD):
+  """Runs the provided pure function, offloading it to the executor if the size of its input reaches the threshold.
+
+  When offloaded, the function is provided with snapshots of the arguments, so it must not rely on modifying them.
+  """
+  statistics = get_computation_statistics(hass)
+  statistic = statistics.get(name) if statistics is not None else None
+
+  if size < threshold:
+    if statistic is not None:
+      statistic.inline_runs += 1
+
+    return target(*args)
+
+  (result, queue_time, run_time) = await hass.async_add_executor_job(
+    __run_offloaded_computation,
+    target,
+    tuple(map(snapshot, args)),
+    time.perf_counter()
+  )
+
+  if statistic is not None:
+    statistic.add_offloaded_run(queue_time, run_time)
+
+  _LOGGER.debug(f'Offloaded {name} computation of {size} item(s); queue_time: {queue_time:.4f}s; run_time: {run_time:.4f}s')
+  return result
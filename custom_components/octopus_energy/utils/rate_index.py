@@ -0,0 +1,48 @@
+from datetime import datetime
+
+from .rate_timeline import RateTimeline
+
+class RateIndex:
+  """Lookup of rates keyed by the start of their period"""
+
+  def __init__(self, rates: list):
+    self._rates = {}
+    self._timeline = None
+
+    if isinstance(rates, RateTimeline):
+      # Timelines are already ordered, so we can look up against them directly
+      self._timeline = rates
+    elif rates is not None:
+      for rate in rates:
+        self._rates[rate["start"]] = rate
+
+  @property
+  def timeline(self) -> RateTimeline:
+    """The timeline the index looks up against, or None if the index was built from a list of rates"""
+    return self._timeline
+
+  def __len__(self):
+    return len(self._timeline) if self._timeline is not None else len(self._rates)
+
+  def get_rate(self, start: datetime, end: datetime):
+    """Find the rate that covers exactly the provided period, returning None if one isn't found"""
+    if self._timeline is not None:
+      return self._timeline.get_rate(start, end)
+
+    rate = self._rates.get(start)
+    if rate is not None and rate["end"] == end:
+      return rate
+
+    return None
+
+def get_rate_index(rates: list, rate_index: RateIndex = None) -> RateIndex:
+  """Returns the provided index if available, otherwise builds a new index for the provided rates"""
+  return rate_index if rate_index is not None else RateIndex(rates)
+
+def find_rate(rate_index: RateIndex, start: datetime, end: datetime):
+  """Find the rate for the provided period, raising an exception if one isn't found"""
+  rate = rate_index.get_rate(start, end)
+  if rate is None:
+    raise Exception(f"Failed to find rate for consumption between {start} and {end}")
+
+  return rate
@@ -1,6 +1,7 @@
 from datetime import (datetime, timedelta)
 
 from ..utils.conversions import value_inc_vat_to_pounds
+from ..utils.rate_timeline import RateTimeline
 
 def get_current_rate_information(rates, now: datetime):
   min_target = now.replace(hour=0, minute=0, second=0, microsecond=0)
@@ -12,32 +13,38 @@ def get_current_rate_information(rates, now: datetime):
   total_rates = 0
   current_rate = None
 
-  applicable_rates = []
+  applicable_segments = []
   is_adding_applicable_rates = True
 
   if rates is not None:
-    for period in rates:
-      if current_rate is None and len(applicable_rates) > 0 and applicable_rates[0]["value_inc_vat"] != period["value_inc_vat"]:
-        applicable_rates.clear()
+    rates = RateTimeline.from_rates(rates)
+
+    # Rates within a segment share the same value, so we only need to evaluate each segment rather than each rate
+    for segment in rates.segments():
+      if current_rate is None and len(applicable_segments) > 0 and applicable_segments[0].value_inc_vat != segment.value_inc_vat:
+        applicable_segments.clear()
 
-      if is_adding_applicable_rates and (len(applicable_rates) < 1 or current_rate is None or applicable_rates[0]["value_inc_vat"] == period["value_inc_vat"]):
-        applicable_rates.append(period)
-      elif current_rate is not None and len(applicable_rates) > 0 and applicable_rates[0]["value_inc_vat"] != period["value_inc_vat"]:
+      if is_adding_applicable_rates and (len(applicable_segments) < 1 or current_rate is None or applicable_segments[0].value_inc_vat == segment.value_inc_vat):
+        applicable_segments.append(segment)
+      elif current_rate is not None and len(applicable_segments) > 0 and applicable_segments[0].value_inc_vat != segment.value_inc_vat:
         is_adding_applicable_rates = False
       
-      if now >= period["start"] and now <= period["end"]:
-        current_rate = period
+      if now >= segment.start and now <= segment.end:
+        # If we're on the boundary of two rates, then the later rate is the current one
+        current_rate = rates[rates.find_index(now)]
 
-      if period["start"] >= min_target and period["end"] <= max_target:
-        if min_rate_value is None or period["value_inc_vat"] < min_rate_value:
-          min_rate_value = period["value_inc_vat"]
+      number_of_rates_today = segment.get_number_of_rates_between(min_target, max_target)
+      if number_of_rates_today > 0:
+        if min_rate_value is None or segment.value_inc_vat < min_rate_value:
+          min_rate_value = segment.value_inc_vat
 
-        if max_rate_value is None or period["value_inc_vat"] > max_rate_value:
-          max_rate_value = period["value_inc_vat"]
+        if max_rate_value is None or segment.value_inc_vat > max_rate_value:
+          max_rate_value = segment.value_inc_vat
 
-        total_rate_value = total_rate_value + period["value_inc_vat"]
-        total_rates = total_rates + 1
+        total_rate_value = total_rate_value + (segment.value_inc_vat * number_of_rates_today)
+        total_rates = total_rates + number_of_rates_today
 
+  applicable_rates = [rate for segment in applicable_segments for rate in segment.rates()]
   if len(applicable_rates) > 0 and current_rate is not None:
     return {
       "all_rates": list(map(lambda x: {
@@ -0,0 +1,130 @@
+from array import array
+from bisect import bisect_right
+from datetime import datetime, timedelta
+
+from ..utils.conversions import value_inc_vat_to_pounds
+from ..utils.rate_timeline import RateTimeline
+
+class RateSummary:
+  """Precomputed summary of a set of rates, used to answer current/previous/next rate lookups without scanning all rates.
+
+  Rates are grouped into blocks of consecutive rates which share the same value. Lookups are then a binary search
+  on the rate starts followed by a lookup of the block the rate belongs to.
+  """
+
+  def __init__(self, rates):
+    self._rates = RateTimeline.from_rates(rates)
+    self._block_first_indexes = array("L")
+    self._block_last_indexes = array("L")
+    self._block_values = array("d")
+    self._daily_statistics = {}
+
+    for segment in self._rates.segments():
+      first_index = self._block_last_indexes[-1] + 1 if len(self._block_last_indexes) > 0 else 0
+      last_index = first_index + segment.number_of_rates - 1
+      if len(self._block_values) > 0 and self._block_values[-1] == segment.value_inc_vat:
+        self._block_last_indexes[-1] = last_index
+      else:
+        self._block_first_indexes.append(first_index)
+        self._block_last_indexes.append(last_index)
+        self._block_values.append(segment.value_inc_vat)
+
+  def _find_matching_rate_indexes(self, now: datetime):
+    """Returns the first and last index of the rates that contain the provided time, or None if no rates match"""
+    last_index = self._rates.find_index(now)
+    if last_index < 0 or now > self._rates[last_index]["end"]:
+      return None
+
+    first_index = last_index
+    if first_index > 0 and self._rates[first_index]["start"] == now and self._rates[first_index - 1]["end"] == now:
+      first_index = first_index - 1
+
+    return (first_index, last_index)
+
+  def _get_block(self, rate_index: int) -> int:
+    return bisect_right(self._block_first_indexes, rate_index) - 1
+
+  def _get_block_information(self, block: int):
+    return {
+      "start": self._rates[self._block_first_indexes[block]]["start"],
+      "end": self._rates[self._block_last_indexes[block]]["end"],
+      "value_inc_vat": value_inc_vat_to_pounds(self._block_values[block]),
+    }
+
+  def _get_daily_statistics(self, day_start: datetime, day_end: datetime):
+    key = (day_start, day_end)
+    if key not in self._daily_statistics:
+      min_rate_value = None
+      max_rate_value = None
+      total_rate_value = 0
+      total_rates = 0
+      for segment in self._rates.segments():
+        number_of_rates = segment.get_number_of_rates_between(day_start, day_end)
+        if number_of_rates > 0:
+          if min_rate_value is None or segment.value_inc_vat < min_rate_value:
+            min_rate_value = segment.value_inc_vat
+
+          if max_rate_value is None or segment.value_inc_vat > max_rate_value:
+            max_rate_value = segment.value_inc_vat
+
+          total_rate_value = total_rate_value + (segment.value_inc_vat * number_of_rates)
+          total_rates = total_rates + number_of_rates
+
+      self._daily_statistics[key] = (min_rate_value, max_rate_value, total_rate_value / total_rates if total_rates > 0 else None)
+
+    return self._daily_statistics[key]
+
+  def get_current_rate_information(self, now: datetime):
+    """Equivalent of get_current_rate_information, excluding the all/applicable rate collections"""
+    matching_indexes = self._find_matching_rate_indexes(now)
+    if matching_indexes is None:
+      return None
+
+    (first_index, last_index) = matching_indexes
+    current_rate = self._rates[last_index]
+    block_information = self._get_block_information(self._get_block(first_index))
+
+    day_start = now.replace(hour=0, minute=0, second=0, microsecond=0)
+    (min_rate_value, max_rate_value, average_rate_value) = self._get_daily_statistics(day_start, day_start + timedelta(days=1))
+
+    return {
+      "current_rate": {
+        "start": block_information["start"],
+        "end": block_information["end"],
+        "tariff_code": current_rate["tariff_code"],
+        "value_inc_vat": block_information["value_inc_vat"],
+        "is_capped": current_rate["is_capped"],
+        "is_intelligent_adjusted": current_rate["is_intelligent_adjusted"] if "is_intelligent_adjusted" in current_rate else False
+      },
+      "min_rate_today": value_inc_vat_to_pounds(min_rate_value) if min_rate_value is not None else None,
+      "max_rate_today": value_inc_vat_to_pounds(max_rate_value) if max_rate_value is not None else None,
+      "average_rate_today": value_inc_vat_to_pounds(average_rate_value) if average_rate_value is not None else None
+    }
+
+  def get_previous_rate_information(self, now: datetime):
+    """Equivalent of get_previous_rate_information, excluding the applicable rate collection"""
+    matching_indexes = self._find_matching_rate_indexes(now)
+    if matching_indexes is None:
+      return None
+
+    block = self._get_block(matching_indexes[0]) - 1
+    if block < 0:
+      return None
+
+    return {
+      "previous_rate": self._get_block_information(block)
+    }
+
+  def get_next_rate_information(self, now: datetime):
+    """Equivalent of get_next_rate_information, excluding the applicable rate collection"""
+    matching_indexes = self._find_matching_rate_indexes(now)
+    if matching_indexes is None:
+      return None
+
+    block = self._get_block(matching_indexes[1]) + 1
+    if block >= len(self._block_first_indexes):
+      return None
+
+    return {
+      "next_rate": self._get_block_information(block)
+    }
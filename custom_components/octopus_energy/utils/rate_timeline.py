@@ -0,0 +1,328 @@
+from array import array
+from bisect import bisect_right
+from collections.abc import Mapping, Sequence
+from datetime import datetime, timedelta, timezone
+
+RATE_PERIOD_IN_SECONDS = 30 * 60
+
+FLAG_IS_CAPPED = 1
+FLAG_IS_INTELLIGENT_ADJUSTED = 2
+
+def _to_datetime(timestamp: int) -> datetime:
+  return datetime.fromtimestamp(timestamp, timezone.utc)
+
+class Rate(Mapping):
+  """Read only view of a single 30 minute rate within a rate timeline, behaving like the original rate dictionary"""
+  __slots__ = ("_timeline", "_segment", "_start")
+
+  def __init__(self, timeline: "RateTimeline", segment: int, start: int):
+    self._timeline = timeline
+    self._segment = segment
+    self._start = start
+
+  def __getitem__(self, key: str):
+    timeline = self._timeline
+    segment = self._segment
+    if key == "start":
+      return _to_datetime(self._start)
+    if key == "end":
+      return _to_datetime(self._start + RATE_PERIOD_IN_SECONDS)
+    if key == "value_inc_vat":
+      return timeline._values[segment]
+    if key == "tariff_code":
+      return timeline._tariff_codes[timeline._tariff_code_indexes[segment]]
+    if key == "is_capped":
+      return (timeline._flags[segment] & FLAG_IS_CAPPED) != 0
+    if key == "is_intelligent_adjusted" and (timeline._flags[segment] & FLAG_IS_INTELLIGENT_ADJUSTED) != 0:
+      return True
+
+    raise KeyError(key)
+
+  def __iter__(self):
+    yield "start"
+    yield "end"
+    yield "value_inc_vat"
+    yield "tariff_code"
+    yield "is_capped"
+    if (self._timeline._flags[self._segment] & FLAG_IS_INTELLIGENT_ADJUSTED) != 0:
+      yield "is_intelligent_adjusted"
+
+  def __len__(self):
+    return 6 if (self._timeline._flags[self._segment] & FLAG_IS_INTELLIGENT_ADJUSTED) != 0 else 5
+
+  def __repr__(self):
+    return repr(self.to_dict())
+
+  def to_dict(self) -> dict:
+    """Returns a copy of the rate as a standard dictionary"""
+    return dict(self.items())
+
+class RateSegment:
+  """Run of consecutive 30 minute rates which share the same value, flags and tariff code"""
+  __slots__ = ("_timeline", "_segment")
+
+  def __init__(self, timeline: "RateTimeline", segment: int):
+    self._timeline = timeline
+    self._segment = segment
+
+  @property
+  def start(self) -> datetime:
+    return _to_datetime(self._timeline._starts[self._segment])
+
+  @property
+  def end(self) -> datetime:
+    return _to_datetime(self._timeline._starts[self._segment] + self.number_of_rates * RATE_PERIOD_IN_SECONDS)
+
+  @property
+  def number_of_rates(self) -> int:
+    return self._timeline._get_segment_length(self._segment)
+
+  @property
+  def value_inc_vat(self) -> float:
+    return self._timeline._values[self._segment]
+
+  @property
+  def tariff_code(self) -> str:
+    return self._timeline._tariff_codes[self._timeline._tariff_code_indexes[self._segment]]
+
+  @property
+  def is_capped(self) -> bool:
+    return (self._timeline._flags[self._segment] & FLAG_IS_CAPPED) != 0
+
+  @property
+  def is_intelligent_adjusted(self) -> bool:
+    return (self._timeline._flags[self._segment] & FLAG_IS_INTELLIGENT_ADJUSTED) != 0
+
+  def get_number_of_rates_between(self, start: datetime, end: datetime) -> int:
+    """Returns the number of 30 minute rates within the segment that fall entirely between the provided times"""
+    segment_start = self._timeline._starts[self._segment]
+    first = max(0, -((segment_start - int(start.timestamp())) // RATE_PERIOD_IN_SECONDS))
+    last = min(self.number_of_rates, (int(end.timestamp()) - segment_start) // RATE_PERIOD_IN_SECONDS)
+    return max(0, last - first)
+
+  def rates(self):
+    """Materialises the individual 30 minute rates within the segment"""
+    timeline = self._timeline
+    segment_start = timeline._starts[self._segment]
+    for index in range(self.number_of_rates):
+      yield Rate(timeline, self._segment, segment_start + index * RATE_PERIOD_IN_SECONDS)
+
+class _RateTimelineBuilder:
+  def __init__(self):
+    self.starts = array("q")
+    self.offsets = array("L")
+    self.values = array("d")
+    self.flags = array("B")
+    self.tariff_codes = []
+    self.tariff_code_indexes = array("B")
+    self.length = 0
+
+  def add(self, start: int, number_of_rates: int, value_inc_vat: float, flags: int, tariff_code: str):
+    if number_of_rates < 1:
+      return
+
+    if tariff_code not in self.tariff_codes:
+      self.tariff_codes.append(tariff_code)
+    tariff_code_index = self.tariff_codes.index(tariff_code)
+
+    # Extend the previous segment if we're a continuation of it, so that flat tariffs only ever occupy a single segment
+    last = len(self.starts) - 1
+    if (last >= 0 and
+        self.values[last] == value_inc_vat and
+        self.flags[last] == flags and
+        self.tariff_code_indexes[last] == tariff_code_index and
+        self.starts[last] + (self.length - self.offsets[last]) * RATE_PERIOD_IN_SECONDS == start):
+      self.length += number_of_rates
+      return
+
+    self.starts.append(start)
+    self.offsets.append(self.length)
+    self.values.append(value_inc_vat)
+    self.flags.append(flags)
+    self.tariff_code_indexes.append(tariff_code_index)
+    self.length += number_of_rates
+
+  def build(self) -> "RateTimeline":
+    return RateTimeline(self.starts, self.offsets, self.length, self.values, self.flags, self.tariff_codes, self.tariff_code_indexes)
+
+def get_rate_flags(rate) -> int:
+  flags = 0
+  if rate.get("is_capped", False):
+    flags |= FLAG_IS_CAPPED
+  if rate.get("is_intelligent_adjusted", False):
+    flags |= FLAG_IS_INTELLIGENT_ADJUSTED
+
+  return flags
+
+class RateTimeline(Sequence):
+  """Compact, ordered collection of 30 minute rates.
+
+  Rates are stored as run-length encoded segments of parallel arrays (start timestamps, values and flags), with tariff codes
+  only stored once. This means flat tariffs occupy a single segment regardless of the period they cover. Individual rates
+  are only materialised as read only views when requested, which can be used in place of the original rate dictionaries.
+  """
+  __slots__ = ("_starts", "_offsets", "_length", "_values", "_flags", "_tariff_codes", "_tariff_code_indexes")
+
+  def __init__(self, starts: array, offsets: array, length: int, values: array, flags: array, tariff_codes: list, tariff_code_indexes: array):
+    self._starts = starts
+    self._offsets = offsets
+    self._length = length
+    self._values = values
+    self._flags = flags
+    self._tariff_codes = tariff_codes
+    self._tariff_code_indexes = tariff_code_indexes
+
+  @staticmethod
+  def builder() -> _RateTimelineBuilder:
+    return _RateTimelineBuilder()
+
+  @staticmethod
+  def from_rates(rates) -> "RateTimeline":
+    """Creates a timeline from the provided collection of rate dictionaries, ordering them by their start"""
+    if isinstance(rates, RateTimeline):
+      return rates
+
+    builder = _RateTimelineBuilder()
+    for rate in sorted(rates, key=lambda rate: rate["start"]):
+      start = int(rate["start"].timestamp())
+      if int(rate["end"].timestamp()) - start != RATE_PERIOD_IN_SECONDS:
+        raise ValueError(f"Rate between {rate['start']} and {rate['end']} is not a 30 minute period")
+
+      builder.add(start, 1, rate["value_inc_vat"], get_rate_flags(rate), rate["tariff_code"])
+
+    return builder.build()
+
+  def _get_segment_length(self, segment: int) -> int:
+    next_offset = self._offsets[segment + 1] if segment + 1 < len(self._offsets) else self._length
+    return next_offset - self._offsets[segment]
+
+  def _get_rate(self, index: int) -> Rate:
+    segment = bisect_right(self._offsets, index) - 1
+    return Rate(self, segment, self._starts[segment] + (index - self._offsets[segment]) * RATE_PERIOD_IN_SECONDS)
+
+  def __len__(self):
+    return self._length
+
+  def __getitem__(self, index):
+    if isinstance(index, slice):
+      start, stop, step = index.indices(self._length)
+      if step != 1:
+        return RateTimeline.from_rates(list(map(lambda i: self._get_rate(i), range(start, stop, step))))
+
+      return self.get_range(start, stop)
+
+    if index < 0:
+      index += self._length
+    if index < 0 or index >= self._length:
+      raise IndexError("rate index out of range")
+
+    return self._get_rate(index)
+
+  def __iter__(self):
+    for segment in range(len(self._starts)):
+      yield from RateSegment(self, segment).rates()
+
+  def __reversed__(self):
+    for index in range(self._length - 1, -1, -1):
+      yield self._get_rate(index)
+
+  def __eq__(self, other):
+    if isinstance(other, RateTimeline):
+      # Segments are always merged when built, so equal timelines have equal segments
+      return (self._length == other._length and
+              self._starts == other._starts and
+              self._offsets == other._offsets and
+              self._values == other._values and
+              self._flags == other._flags and
+              list(map(lambda index: self._tariff_codes[index], self._tariff_code_indexes)) == list(map(lambda index: other._tariff_codes[index], other._tariff_code_indexes)))
+
+    if isinstance(other, (list, tuple)):
+      return len(self) == len(other) and all(rate == other_rate for rate, other_rate in zip(self, other))
+
+    return NotImplemented
+
+  def __ne__(self, other):
+    result = self.__eq__(other)
+    return result if result is NotImplemented else not result
+
+  __hash__ = None
+
+  def __repr__(self):
+    return repr(self.to_dicts())
+
+  def segments(self):
+    """Iterates the run-length encoded segments of the timeline"""
+    for segment in range(len(self._starts)):
+      yield RateSegment(self, segment)
+
+  def get_range(self, start_index: int, stop_index: int) -> "RateTimeline":
+    """Returns a new timeline containing the rates between the provided indexes"""
+    builder = _RateTimelineBuilder()
+    start_index = max(0, start_index)
+    stop_index = min(self._length, stop_index)
+    if start_index < stop_index:
+      first_segment = bisect_right(self._offsets, start_index) - 1
+      last_segment = bisect_right(self._offsets, stop_index - 1) - 1
+      for segment in range(first_segment, last_segment + 1):
+        segment_first = max(start_index, self._offsets[segment])
+        segment_stop = min(stop_index, self._offsets[segment] + self._get_segment_length(segment))
+        builder.add(self._starts[segment] + (segment_first - self._offsets[segment]) * RATE_PERIOD_IN_SECONDS,
+                    segment_stop - segment_first,
+                    self._values[segment],
+                    self._flags[segment],
+                    self._tariff_codes[self._tariff_code_indexes[segment]])
+
+    return builder.build()
+
+  def get_rates_between(self, start: datetime, end: datetime) -> "RateTimeline":
+    """Returns a new timeline containing the rates which start on or after the provided start and end on or before the provided end"""
+    return self.get_range(self.find_start_index(start), self.find_end_index(end))
+
+  def find_start_index(self, start: datetime) -> int:
+    """Returns the index of the first rate starting on or after the provided time, or the length of the timeline if there isn't one"""
+    index = self.find_index(start)
+    if index < 0 or self._get_rate(index)._start < int(start.timestamp()):
+      index += 1
+
+    return index
+
+  def find_end_index(self, end: datetime) -> int:
+    """Returns the index after the last rate ending on or before the provided time, or the length of the timeline if the time is None"""
+    return self.find_index(end - timedelta(seconds=RATE_PERIOD_IN_SECONDS)) + 1 if end is not None else self._length
+
+  def find_index(self, time: datetime) -> int:
+    """Returns the index of the last rate starting on or before the provided time, or -1 if there isn't one"""
+    target = int(time.timestamp())
+    segment = bisect_right(self._starts, target) - 1
+    if segment < 0:
+      return -1
+
+    offset = min((target - self._starts[segment]) // RATE_PERIOD_IN_SECONDS, self._get_segment_length(segment) - 1)
+    return self._offsets[segment] + offset
+
+  def get_rate(self, start: datetime, end: datetime):
+    """Find the rate that covers exactly the provided period, returning None if one isn't found"""
+    if end - start != timedelta(seconds=RATE_PERIOD_IN_SECONDS):
+      return None
+
+    target = int(start.timestamp())
+    segment = bisect_right(self._starts, target) - 1
+    if segment < 0:
+      return None
+
+    offset = target - self._starts[segment]
+    if offset % RATE_PERIOD_IN_SECONDS == 0 and offset // RATE_PERIOD_IN_SECONDS < self._get_segment_length(segment):
+      return Rate(self, segment, target)
+
+    return None
+
+  def to_dicts(self) -> list:
+    """Returns a copy of the rates as a list of standard dictionaries"""
+    return list(map(lambda rate: rate.to_dict(), self))
+
+def get_rate_timeline(rates, rate_timeline: RateTimeline = None) -> RateTimeline:
+  """Returns the provided timeline if available, otherwise builds a timeline for the provided rates"""
+  if rate_timeline is not None:
+    return rate_timeline
+
+  return RateTimeline.from_rates(rates) if rates is not None else None
@@ -0,0 +1,94 @@
+from bisect import bisect_right
+from datetime import datetime
+
+from .timestamps import parse_timestamp
+
+class AgreementTimeline:
+  """The agreements of a meter point, ordered by when they start"""
+
+  def __init__(self, agreements: list):
+    intervals = []
+    for index, agreement in enumerate(agreements):
+      if agreement["tariff_code"] is None:
+        continue
+
+      start = parse_timestamp(agreement["start"])
+      end = parse_timestamp(agreement["end"]) if "end" in agreement and agreement["end"] is not None else None
+
+      # Where agreements start at the same time, the first agreement takes priority, so it needs to be ordered last
+      intervals.append((start, -index, end, agreement["tariff_code"]))
+
+    intervals.sort(key=lambda interval: (interval[0], interval[1]))
+    self._starts = list(map(lambda interval: interval[0], intervals))
+    self._intervals = intervals
+
+  def get_active_tariff_code(self, current: datetime):
+    """Gets the tariff of the latest agreement that is active at the provided time, matching get_active_tariff_code"""
+    index = bisect_right(self._starts, current)
+    while index > 0:
+      index = index - 1
+      (start, original_index, end, tariff_code) = self._intervals[index]
+      if end is None or end >= current:
+        return tariff_code
+
+    return None
+
+class TariffIndex:
+  """Lookup of the agreements for each meter of an account, keyed by the meter point and serial number"""
+
+  def __init__(self, account_info):
+    self._electricity_meters: dict[tuple, list[AgreementTimeline]] = {}
+    self._gas_meters: dict[tuple, list[AgreementTimeline]] = {}
+    self._electricity_points: list[tuple[str, AgreementTimeline]] = []
+
+    if account_info is not None:
+      if "electricity_meter_points" in account_info:
+        self.__add_points__(self._electricity_meters, account_info["electricity_meter_points"], "mpan", self._electricity_points)
+
+      if "gas_meter_points" in account_info:
+        self.__add_points__(self._gas_meters, account_info["gas_meter_points"], "mprn")
+
+  def __add_points__(self, meters: dict, points: list, identifier_key: str, point_timelines: list = None):
+    for point in points:
+      timeline = AgreementTimeline(point["agreements"])
+      if point_timelines is not None:
+        point_timelines.append((point[identifier_key], timeline))
+
+      # The type of meter (ie smart vs dumb) can change the tariff behaviour, so each meter of the point is indexed
+      for meter in (point["meters"] if "meters" in point else []):
+        key = (point[identifier_key], meter["serial_number"])
+        if key not in meters:
+          meters[key] = []
+
+        meters[key].append(timeline)
+
+  def __get_tariff_code__(self, meters: dict, key: tuple, current: datetime):
+    timelines = meters.get(key)
+    if timelines is not None:
+      for timeline in timelines:
+        tariff_code = timeline.get_active_tariff_code(current)
+        if tariff_code is not None:
+          return tariff_code
+
+    return None
+
+  def get_electricity_tariff_code(self, current: datetime, mpan: str, serial_number: str):
+    return self.__get_tariff_code__(self._electricity_meters, (mpan, serial_number), current)
+
+  def get_gas_tariff_code(self, current: datetime, mprn: str, serial_number: str):
+    return self.__get_tariff_code__(self._gas_meters, (mprn, serial_number), current)
+
+  def get_electricity_tariff_codes(self, current: datetime) -> dict[str, str]:
+    """Gets the active tariff of each electricity meter point, keyed by the mpan. Points without an active tariff are excluded."""
+    tariff_codes = {}
+    # Where there are multiple points with the same mpan, the last point with an active tariff takes priority
+    for (mpan, timeline) in self._electricity_points:
+      tariff_code = timeline.get_active_tariff_code(current)
+      if tariff_code is not None:
+        tariff_codes[mpan] = tariff_code
+
+    return tariff_codes
+
+def get_tariff_index(account_info, tariff_index: TariffIndex = None) -> TariffIndex:
+  """Returns the provided index if available, otherwise builds a new index for the provided account"""
+  return tariff_index if tariff_index is not None else TariffIndex(account_info)
@@ -0,0 +1,50 @@
+from datetime import datetime, timezone
+
+from homeassistant.util.dt import (parse_datetime)
+
+__UTC = timezone.utc
+
+def parse_timestamp(value: str, to_utc: bool = True) -> datetime:
+  """Parses an Octopus timestamp into an aware datetime, optionally converting it to UTC.
+
+  Octopus returns timestamps in the form YYYY-MM-DDTHH:MM:SSZ or YYYY-MM-DDTHH:MM:SS+01:00, which fromisoformat
+  parses considerably quicker than parse_datetime, with parse_datetime only being used for anything it rejects.
+  """
+  try:
+    parsed_value = datetime.fromisoformat(value)
+  except ValueError:
+    parsed_value = parse_datetime(value)
+    if parsed_value is None:
+      raise ValueError(f"Invalid timestamp '{value}'")
+
+  tzinfo = parsed_value.tzinfo
+  if tzinfo is __UTC:
+    return parsed_value
+
+  if tzinfo is None:
+    # Naive timestamps are assumed to be UTC, consistent with as_utc
+    return parsed_value.replace(tzinfo=__UTC)
+
+  return parsed_value.astimezone(__UTC) if to_utc else parsed_value
+
+def parse_timestamps(values: list[str], to_utc: bool = True) -> list[datetime]:
+  """Parses a batch of Octopus timestamps into aware datetimes, optionally converting them to UTC.
+
+  Timestamps that appear multiple times within the batch (e.g. the end of one period being the start of the next) are
+  only parsed once, with the same datetime being returned for each occurrence. None values are returned as None.
+  """
+  parsed_values = {}
+  results = []
+  for value in values:
+    if value is None:
+      results.append(None)
+      continue
+
+    parsed_value = parsed_values.get(value)
+    if parsed_value is None:
+      parsed_value = parse_timestamp(value, to_utc)
+      parsed_values[value] = parsed_value
+
+    results.append(parsed_value)
+
+  return results
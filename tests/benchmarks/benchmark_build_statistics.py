@@ -0,0 +1,216 @@
+"""Compares building the consumption and cost statistics of each series separately, as originally done, against building every
+series in a single pass.
+
+Run from the root of the repository with
+
+  python -m tests.benchmarks.benchmark_build_statistics
+"""
+from datetime import datetime, timedelta, timezone
+import logging
+import random
+import timeit
+
+from homeassistant.components.recorder.models import StatisticData
+
+from custom_components.octopus_energy.statistics import StatisticSeries, build_statistics
+from custom_components.octopus_energy.utils import get_off_peak_cost
+from custom_components.octopus_energy.utils.rate_index import RateIndex, find_rate, get_rate_index
+from custom_components.octopus_energy.utils.rate_timeline import RateTimeline
+
+_LOGGER = logging.getLogger(__name__)
+
+def legacy_build_consumption_statistics(current: datetime, consumptions, rates, consumption_key: str, latest_total_sum: float, latest_peak_sum: float, latest_off_peak_sum: float, rate_index: RateIndex = None):
+  last_reset = consumptions[0]["start"].replace(minute=0, second=0, microsecond=0)
+  sums = {
+    "total": latest_total_sum,
+    "peak": latest_peak_sum,
+    "off_peak": latest_off_peak_sum
+  }
+  states = {
+    "total": 0,
+    "peak": 0,
+    "off_peak": 0
+  }
+  
+  total_statistics = []
+  off_peak_statistics = []
+  peak_statistics = []
+  off_peak_cost = get_off_peak_cost(current, rates)
+  rate_index = get_rate_index(rates, rate_index)
+
+  _LOGGER.debug(f'total_sum: {latest_total_sum}; latest_peak_sum: {latest_peak_sum}; latest_off_peak_sum: {latest_off_peak_sum}; last_reset: {last_reset}; off_peak_cost: {off_peak_cost}')
+
+  for index in range(len(consumptions)):
+    consumption = consumptions[index]
+    consumption_from = consumption["start"]
+    consumption_to = consumption["end"]
+
+    rate = find_rate(rate_index, consumption_from, consumption_to)
+    
+    if rate["value_inc_vat"] == off_peak_cost:
+      sums["off_peak"] += consumption[consumption_key]
+      states["off_peak"] += consumption[consumption_key]
+    else:
+      sums["peak"] += consumption[consumption_key]
+      states["peak"] += consumption[consumption_key]
+    
+    start = consumption["start"].replace(minute=0, second=0, microsecond=0)
+    sums["total"] += consumption[consumption_key]
+    states["total"] += consumption[consumption_key]
+
+    _LOGGER.debug(f'index: {index}; start: {start}; sums: {sums}; states: {states}; added: {(index) % 2 == 1}')
+
+    if index % 2 == 1:
+      total_statistics.append(
+        StatisticData(
+            start=start,
+            last_reset=last_reset,
+            sum=sums["total"],
+            state=states["total"]
+        )
+      )
+
+      off_peak_statistics.append(
+        StatisticData(
+            start=start,
+            last_reset=last_reset,
+            sum=sums["off_peak"],
+            state=states["off_peak"]
+        )
+      )
+
+      peak_statistics.append(
+        StatisticData(
+            start=start,
+            last_reset=last_reset,
+            sum=sums["peak"],
+            state=states["peak"]
+        )
+      )
+
+  return {
+    "total": total_statistics,
+    "peak": peak_statistics,
+    "off_peak": off_peak_statistics
+  }
+
+def legacy_build_cost_statistics(current: datetime, consumptions, rates, consumption_key: str, latest_total_sum: float, latest_peak_sum: float, latest_off_peak_sum: float, rate_index: RateIndex = None):
+  last_reset = consumptions[0]["start"].replace(minute=0, second=0, microsecond=0)
+  sums = {
+    "total": latest_total_sum,
+    "peak": latest_peak_sum,
+    "off_peak": latest_off_peak_sum
+  }
+  states = {
+    "total": 0,
+    "peak": 0,
+    "off_peak": 0
+  }
+  
+  total_statistics = []
+  off_peak_statistics = []
+  peak_statistics = []
+  off_peak_cost = get_off_peak_cost(current, rates)
+  rate_index = get_rate_index(rates, rate_index)
+
+  _LOGGER.debug(f'total_sum: {latest_total_sum}; latest_peak_sum: {latest_peak_sum}; latest_off_peak_sum: {latest_off_peak_sum}; last_reset: {last_reset}; off_peak_cost: {off_peak_cost}')
+
+  for index in range(len(consumptions)):
+    consumption = consumptions[index]
+    consumption_from = consumption["start"]
+    consumption_to = consumption["end"]
+    start = consumption["start"].replace(minute=0, second=0, microsecond=0)
+
+    rate = find_rate(rate_index, consumption_from, consumption_to)
+    
+    if rate["value_inc_vat"] == off_peak_cost:
+      sums["off_peak"] += round((consumption[consumption_key] * rate["value_inc_vat"]) / 100, 2)
+      states["off_peak"] += round((consumption[consumption_key] * rate["value_inc_vat"]) / 100, 2)
+    else:
+      sums["peak"] += round((consumption[consumption_key] * rate["value_inc_vat"]) / 100, 2)
+      states["peak"] += round((consumption[consumption_key] * rate["value_inc_vat"]) / 100, 2)
+    
+    sums["total"] += round((consumption[consumption_key] * rate["value_inc_vat"]) / 100, 2)
+    states["total"] += round((consumption[consumption_key] * rate["value_inc_vat"]) / 100, 2)
+
+    _LOGGER.debug(f'index: {index}; start: {start}; sums: {sums}; states: {states}; added: {(index) % 2 == 1}')
+
+    if index % 2 == 1:
+      total_statistics.append(
+        StatisticData(
+            start=start,
+            last_reset=last_reset,
+            sum=sums["total"],
+            state=states["total"]
+        )
+      )
+
+      off_peak_statistics.append(
+        StatisticData(
+            start=start,
+            last_reset=last_reset,
+            sum=sums["off_peak"],
+            state=states["off_peak"]
+        )
+      )
+
+      peak_statistics.append(
+        StatisticData(
+            start=start,
+            last_reset=last_reset,
+            sum=sums["peak"],
+            state=states["peak"]
+        )
+      )
+
+  return {
+    "total": total_statistics,
+    "peak": peak_statistics,
+    "off_peak": off_peak_statistics
+  }
+
+def create_day(day_from: datetime, generator: random.Random):
+  """A day of gas consumption, in the shape of the charges calculated for a previous consumption import, along with its rates"""
+  consumptions = []
+  rates = []
+  for index in range(48):
+    start = day_from + timedelta(minutes=30 * index)
+    end = start + timedelta(minutes=30)
+    consumption_m3 = round(generator.uniform(0, 0.5), 3)
+    consumptions.append({ "start": start, "end": end, "consumption_m3": consumption_m3, "consumption_kwh": consumption_m3 * 11.1 })
+    rates.append({ "start": start, "end": end, "value_inc_vat": 7.5 if index < 14 else 30.1, "tariff_code": "G-1R-TEST-A", "is_capped": False })
+
+  rates = RateTimeline.from_rates(rates)
+  return (consumptions, rates, RateIndex(rates))
+
+def legacy_build_day(day_from: datetime, consumptions: list, rates, rate_index):
+  return [
+    legacy_build_consumption_statistics(day_from, consumptions, rates, "consumption_m3", 0, 0, 0, rate_index),
+    legacy_build_consumption_statistics(day_from, consumptions, rates, "consumption_kwh", 0, 0, 0, rate_index),
+    legacy_build_cost_statistics(day_from, consumptions, rates, "consumption_kwh", 0, 0, 0, rate_index)
+  ]
+
+def build_day(day_from: datetime, consumptions: list, rates, rate_index):
+  return build_statistics(day_from, consumptions, rates, [
+    StatisticSeries("consumption_m3", False, 0, 0, 0),
+    StatisticSeries("consumption_kwh", False, 0, 0, 0),
+    StatisticSeries("consumption_kwh", True, 0, 0, 0)
+  ], rate_index)
+
+def run_benchmark(days: int, repeat: int):
+  generator = random.Random(1)
+  period_from = datetime(2023, 1, 1, tzinfo=timezone.utc)
+  data = list(map(lambda day: (period_from + timedelta(days=day),) + create_day(period_from + timedelta(days=day), generator), range(days)))
+
+  for item in data:
+    assert legacy_build_day(*item) == build_day(*item)
+
+  legacy = min(timeit.repeat(lambda: list(map(lambda item: legacy_build_day(*item), data)), number=1, repeat=repeat))
+  current = min(timeit.repeat(lambda: list(map(lambda item: build_day(*item), data)), number=1, repeat=repeat))
+
+  print(f"{days} day(s) of gas (m3, kWh and cost): legacy {legacy * 1000:.1f}ms, current {current * 1000:.1f}ms ({legacy / current:.1f}x)")
+
+if __name__ == "__main__":
+  run_benchmark(1, 50)
+  run_benchmark(30, 10)
+  run_benchmark(365, 3)
@@ -0,0 +1,83 @@
+"""Compares the original O(n*k) continuous target rate search against the current implementation.
+
+Run from the root of the repository with
+
+  python -m tests.benchmarks.benchmark_calculate_continuous_times
+"""
+from datetime import datetime, timedelta, timezone
+import math
+import random
+import timeit
+
+from custom_components.octopus_energy.target_rates import calculate_continuous_times
+
+def legacy_calculate_continuous_times(
+    applicable_rates: list,
+    target_hours: float,
+    search_for_highest_rate = False,
+    find_last_rates = False
+  ):
+  """The original implementation, which re-sums every window of rates"""
+  if (applicable_rates is None):
+    return []
+
+  applicable_rates.sort(key=lambda rate: rate["end"], reverse=find_last_rates)
+  applicable_rates_count = len(applicable_rates)
+  total_required_rates = math.ceil(target_hours * 2)
+
+  best_continuous_rates = None
+  best_continuous_rates_total = None
+
+  for index, rate in enumerate(applicable_rates):
+    continuous_rates = [rate]
+    continuous_rates_total = rate["value_inc_vat"]
+
+    for offset in range(1, total_required_rates):
+      if (index + offset) < applicable_rates_count:
+        offset_rate = applicable_rates[(index + offset)]
+        continuous_rates.append(offset_rate)
+        continuous_rates_total += offset_rate["value_inc_vat"]
+      else:
+        break
+
+    if ((best_continuous_rates is None or (search_for_highest_rate == False and continuous_rates_total < best_continuous_rates_total) or (search_for_highest_rate and continuous_rates_total > best_continuous_rates_total)) and len(continuous_rates) == total_required_rates):
+      best_continuous_rates = continuous_rates
+      best_continuous_rates_total = continuous_rates_total
+
+  if best_continuous_rates is not None:
+    best_continuous_rates.sort(key=lambda rate: rate["end"])
+    return best_continuous_rates
+
+  return []
+
+def create_agile_rates(days: int, seed: int = 1):
+  """Synthetic agile style rates, in pounds, with a cheap overnight period and an expensive evening peak"""
+  generator = random.Random(seed)
+  period_from = datetime(2024, 1, 1, tzinfo=timezone.utc)
+  rates = []
+  for index in range(days * 48):
+    start = period_from + timedelta(minutes=30 * index)
+    hour = start.hour
+    base = 0.12 if hour < 6 else 0.35 if 16 <= hour < 19 else 0.22
+    rates.append({
+      "start": start,
+      "end": start + timedelta(minutes=30),
+      "value_inc_vat": round(base + generator.uniform(-0.05, 0.05), 6),
+      "tariff_code": "E-1R-AGILE-FLEX-22-11-25-C",
+      "is_capped": False
+    })
+
+  return rates
+
+def run_benchmark(days: int, target_hours: float, repeat: int):
+  rates = create_agile_rates(days)
+
+  legacy = min(timeit.repeat(lambda: legacy_calculate_continuous_times(rates.copy(), target_hours), number=1, repeat=repeat))
+  current = min(timeit.repeat(lambda: calculate_continuous_times(rates.copy(), target_hours), number=1, repeat=repeat))
+
+  print(f"{days} day(s), {len(rates)} rates, {target_hours} hour block: legacy {legacy * 1000:.3f}ms, current {current * 1000:.3f}ms ({legacy / current:.1f}x)")
+
+if __name__ == "__main__":
+  run_benchmark(1, 3, 50)
+  run_benchmark(2, 6, 50)
+  run_benchmark(7, 24, 20)
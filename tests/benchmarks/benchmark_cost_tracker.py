@@ -0,0 +1,87 @@
+"""Compares the original cost tracker, which scans and copies the day's consumption and recalculates every charge on each state change,
+against keeping the consumption in slots with running totals.
+
+Run from the root of the repository with
+
+  python -m tests.benchmarks.benchmark_cost_tracker
+"""
+from datetime import datetime, timedelta, timezone
+import timeit
+
+from custom_components.octopus_energy.cost_tracker import ConsumptionSlots, add_consumption_to_slots
+from custom_components.octopus_energy.electricity import calculate_electricity_consumption_and_cost
+from custom_components.octopus_energy.utils.rate_index import RateIndex
+from custom_components.octopus_energy.utils.rate_timeline import RateTimeline
+
+def legacy_add_consumption(consumption_data: list, target_start: datetime, target_end: datetime, value: float):
+  """The original accumulation, which scans the day's consumption for the matching slot"""
+  consumption_added = False
+  for consumption in consumption_data:
+    if (consumption["start"] == target_start and consumption["end"] == target_end):
+      consumption_added = True
+      consumption["consumption"] += value
+      break
+
+  if consumption_added == False:
+    consumption_data.append({
+      "start": target_start,
+      "end": target_end,
+      "consumption": value
+    })
+
+  return consumption_data
+
+def legacy_update(current: datetime, tracked_charges: list, value: float, rates, rate_index: RateIndex):
+  """The original handling of a state change, which copies the charges and recalculates all of them"""
+  target_start = current.replace(minute=(0 if current.minute < 30 else 30), second=0, microsecond=0)
+  new_tracked_consumption_data = legacy_add_consumption(tracked_charges.copy(), target_start, target_start + timedelta(minutes=30), value)
+  result = calculate_electricity_consumption_and_cost(current, new_tracked_consumption_data, rates, 0, None, 0, False, rate_index=rate_index)
+
+  return (list(map(lambda charge: {
+    "start": charge["start"],
+    "end": charge["end"],
+    "rate": charge["rate"],
+    "consumption": charge["consumption"],
+    "cost": charge["cost"]
+  }, result["charges"])), result["total_cost"])
+
+def run_legacy(events: list, rates, rate_index: RateIndex):
+  tracked_charges = []
+  total_cost = 0
+  for current in events:
+    (tracked_charges, total_cost) = legacy_update(current, tracked_charges, 0.01, rates, rate_index)
+
+  return total_cost
+
+def run_current(events: list, rates, rate_index: RateIndex):
+  tracked_slots = ConsumptionSlots()
+  untracked_slots = ConsumptionSlots()
+  for current in events:
+    add_consumption_to_slots(current, tracked_slots, untracked_slots, 0.01, None, None, None, False, True)
+    if tracked_slots.is_costed_with(rates) == False:
+      tracked_slots.calculate_costs(current, rates, rate_index)
+
+  return tracked_slots.total.cost / 100
+
+def run_benchmark(seconds_between_events: int, repeat: int):
+  period_from = datetime(2024, 1, 1, tzinfo=timezone.utc)
+  rates = RateTimeline.from_rates(list(map(lambda index: {
+    "start": period_from + timedelta(minutes=30 * index),
+    "end": period_from + timedelta(minutes=30 * (index + 1)),
+    "value_inc_vat": 7.5 if index < 14 else 30.1,
+    "tariff_code": "E-1R-TEST-A",
+    "is_capped": False
+  }, range(48))))
+  rate_index = RateIndex(rates)
+  events = list(map(lambda index: period_from + timedelta(seconds=index * seconds_between_events), range(86400 // seconds_between_events)))
+
+  assert round(run_legacy(events, rates, rate_index), 6) == round(run_current(events, rates, rate_index), 6)
+
+  legacy = min(timeit.repeat(lambda: run_legacy(events, rates, rate_index), number=1, repeat=repeat))
+  current = min(timeit.repeat(lambda: run_current(events, rates, rate_index), number=1, repeat=repeat))
+
+  print(f"{len(events)} state change(s) over a day: legacy {legacy * 1000:.1f}ms, current {current * 1000:.1f}ms ({legacy / current:.1f}x)")
+
+if __name__ == "__main__":
+  run_benchmark(60, 3)
+  run_benchmark(5, 3)
@@ -0,0 +1,74 @@
+"""Compares decoding api responses via text, as originally done, against decoding the raw bytes.
+
+Run from the root of the repository with
+
+  python -m tests.benchmarks.benchmark_decode_json
+"""
+from datetime import datetime, timedelta, timezone
+import json
+import random
+import timeit
+import tracemalloc
+
+from custom_components.octopus_energy.api_client import json_decoder
+from custom_components.octopus_energy.api_client.json_decoder import decode_json
+
+def legacy_decode_json(content: bytes):
+  """The original implementation, which decodes the text and keeps it around for error messages"""
+  text = content.decode("utf-8")
+  return (json.loads(text), text)
+
+def create_consumption_pages(days: int, page_size: int = 100, seed: int = 1):
+  """Synthetic consumption pages, in the shape returned by the consumption endpoint"""
+  generator = random.Random(seed)
+  period_from = datetime(2024, 1, 1, tzinfo=timezone(timedelta(hours=1)))
+  results = []
+  for index in range(days * 48):
+    start = period_from + timedelta(minutes=30 * index)
+    results.append({
+      "consumption": round(generator.uniform(0, 1.5), 3),
+      "interval_start": start.isoformat(),
+      "interval_end": (start + timedelta(minutes=30)).isoformat()
+    })
+
+  pages = []
+  for page_index, page_start in enumerate(range(0, len(results), page_size)):
+    pages.append(json.dumps({
+      "count": len(results),
+      "next": f"https://api.octopus.energy/v1/electricity-meter-points/123/meters/456/consumption/?page={page_index + 2}",
+      "previous": None,
+      "results": results[page_start:page_start + page_size]
+    }).encode("utf-8"))
+
+  return pages
+
+def measure_peak_allocation(decode, pages: list):
+  tracemalloc.start()
+  try:
+    for page in pages:
+      decode(page)
+
+    return tracemalloc.get_traced_memory()[1]
+  finally:
+    tracemalloc.stop()
+
+def run_benchmark(days: int, repeat: int):
+  pages = create_consumption_pages(days)
+  total_size = sum(map(len, pages))
+
+  def decode_all(decode):
+    for page in pages:
+      decode(page)
+
+  legacy = min(timeit.repeat(lambda: decode_all(legacy_decode_json), number=1, repeat=repeat))
+  current = min(timeit.repeat(lambda: decode_all(decode_json), number=1, repeat=repeat))
+  legacy_peak = measure_peak_allocation(legacy_decode_json, pages)
+  current_peak = measure_peak_allocation(decode_json, pages)
+
+  print(f"{days} day(s), {len(pages)} page(s), {total_size / 1024:.0f}KiB: legacy {legacy * 1000:.3f}ms / {legacy_peak / 1024:.0f}KiB peak, current {current * 1000:.3f}ms / {current_peak / 1024:.0f}KiB peak ({legacy / current:.1f}x)")
+
+if __name__ == "__main__":
+  print(f"Fast parser available: {json_decoder.orjson is not None}")
+  run_benchmark(1, 50)
+  run_benchmark(30, 20)
+  run_benchmark(365, 5)
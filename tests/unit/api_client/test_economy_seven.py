@@ -0,0 +1,72 @@
+from datetime import datetime
+import zoneinfo
+import pytest
+
+from homeassistant.util import dt as dt_util
+
+from custom_components.octopus_energy.api_client import get_economy_seven_night_windows, merge_day_night_rates, rates_to_rate_timeline
+
+def to_timestamp(value: str):
+  return int(datetime.strptime(value, "%Y-%m-%dT%H:%M:%S%z").timestamp())
+
+@pytest.fixture
+def london_time_zone():
+  # Restore the default time zone afterwards, so it doesn't leak into other tests
+  original_time_zone = dt_util.DEFAULT_TIME_ZONE
+  dt_util.set_default_time_zone(zoneinfo.ZoneInfo("Europe/London"))
+  yield
+  dt_util.set_default_time_zone(original_time_zone)
+
+@pytest.mark.asyncio
+async def test_when_smart_meter_then_night_windows_are_in_utc(london_time_zone):
+  # Arrange
+  period_from = datetime.strptime("2024-03-30T00:00:00Z", "%Y-%m-%dT%H:%M:%S%z")
+  period_to = datetime.strptime("2024-03-31T00:00:00Z", "%Y-%m-%dT%H:%M:%S%z")
+
+  # Act
+  result = get_economy_seven_night_windows(period_from, period_to, True)
+
+  # Assert
+  assert result == [
+    (to_timestamp("2024-03-29T00:30:00Z"), to_timestamp("2024-03-29T07:30:00Z")),
+    (to_timestamp("2024-03-30T00:30:00Z"), to_timestamp("2024-03-30T07:30:00Z")),
+    (to_timestamp("2024-03-31T00:30:00Z"), to_timestamp("2024-03-31T07:30:00Z")),
+    (to_timestamp("2024-04-01T00:30:00Z"), to_timestamp("2024-04-01T07:30:00Z")),
+  ]
+
+@pytest.mark.asyncio
+async def test_when_not_smart_meter_then_night_windows_are_in_local_time_including_clock_changes(london_time_zone):
+  # Arrange
+  period_from = datetime.strptime("2024-03-30T00:00:00Z", "%Y-%m-%dT%H:%M:%S%z")
+  period_to = datetime.strptime("2024-03-31T00:00:00Z", "%Y-%m-%dT%H:%M:%S%z")
+
+  # Act
+  result = get_economy_seven_night_windows(period_from, period_to, False)
+
+  # Assert
+  assert result == [
+    (to_timestamp("2024-03-29T00:00:00Z"), to_timestamp("2024-03-29T07:00:00Z")),
+    (to_timestamp("2024-03-30T00:00:00Z"), to_timestamp("2024-03-30T07:00:00Z")),
+    # Clocks go forward at 1am, so our night period ends at 6am UTC
+    (to_timestamp("2024-03-31T00:00:00Z"), to_timestamp("2024-03-31T06:00:00Z")),
+    (to_timestamp("2024-03-31T23:00:00Z"), to_timestamp("2024-04-01T06:00:00Z")),
+  ]
+
+@pytest.mark.asyncio
+async def test_when_day_and_night_rates_merged_then_rates_taken_from_their_period(london_time_zone):
+  # Arrange
+  period_from = datetime.strptime("2024-04-09T23:00:00Z", "%Y-%m-%dT%H:%M:%S%z")
+  period_to = datetime.strptime("2024-04-10T23:00:00Z", "%Y-%m-%dT%H:%M:%S%z")
+  day_rates = rates_to_rate_timeline({ "results": [{ "value_inc_vat": 30, "valid_from": "2024-04-01T00:00:00Z", "valid_to": None }] }, period_from, period_to, "tariff")
+  night_rates = rates_to_rate_timeline({ "results": [{ "value_inc_vat": 10, "valid_from": "2024-04-01T00:00:00Z", "valid_to": None }] }, period_from, period_to, "tariff")
+
+  # Act
+  result = merge_day_night_rates(day_rates, night_rates, get_economy_seven_night_windows(period_from, period_to, False))
+
+  # Assert
+  assert len(result) == 48
+  segments = list(map(lambda segment: (segment.start, segment.end, segment.value_inc_vat), result.segments()))
+  assert segments == [
+    (datetime.strptime("2024-04-09T23:00:00Z", "%Y-%m-%dT%H:%M:%S%z"), datetime.strptime("2024-04-10T06:00:00Z", "%Y-%m-%dT%H:%M:%S%z"), 10),
+    (datetime.strptime("2024-04-10T06:00:00Z", "%Y-%m-%dT%H:%M:%S%z"), datetime.strptime("2024-04-10T23:00:00Z", "%Y-%m-%dT%H:%M:%S%z"), 30),
+  ]
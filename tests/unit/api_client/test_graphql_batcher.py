@@ -0,0 +1,274 @@
+import asyncio
+import pytest
+
+from custom_components.octopus_energy.api_client import OctopusEnergyApiClient, RequestException, intelligent_dispatches_query, octoplus_points_query, wheel_of_fortune_query
+from custom_components.octopus_energy.api_client.graphql_batcher import GraphQLBatcher, get_graphql_selections, get_unattributed_graphql_errors, merge_graphql_queries, split_graphql_response
+
+@pytest.mark.asyncio
+async def test_when_query_has_arguments_and_nested_fields_then_top_level_selections_returned():
+  # Arrange
+  query = intelligent_dispatches_query.format(account_id="A-123")
+
+  # Act
+  result = get_graphql_selections(query)
+
+  # Assert
+  assert list(map(lambda selection: selection.response_key, result)) == ["plannedDispatches", "completedDispatches"]
+  assert result[0].field.startswith('plannedDispatches(accountNumber: "A-123") {')
+  assert result[0].field.endswith('}')
+
+@pytest.mark.asyncio
+async def test_when_queries_merged_then_fields_are_aliased_per_query():
+  # Arrange
+  queries = [octoplus_points_query, wheel_of_fortune_query.format(account_id="A-123")]
+
+  # Act
+  result = merge_graphql_queries(queries)
+
+  # Assert
+  selections = get_graphql_selections(result)
+  assert list(map(lambda selection: selection.response_key, selections)) == ["q0_loyaltyPointLedgers", "q1_wheelOfFortuneSpins"]
+  assert selections[1].field.startswith('wheelOfFortuneSpins(accountNumber: "A-123")')
+
+@pytest.mark.asyncio
+async def test_when_response_split_then_data_and_errors_assigned_to_their_query():
+  # Arrange
+  queries = [octoplus_points_query, wheel_of_fortune_query.format(account_id="A-123")]
+  response_body = {
+    "data": {
+      "q0_loyaltyPointLedgers": [{ "balanceCarriedForward": "10" }],
+      "q1_wheelOfFortuneSpins": None
+    },
+    "errors": [
+      { "message": "Unauthorized", "path": ["q1_wheelOfFortuneSpins"] }
+    ]
+  }
+
+  # Act
+  result = split_graphql_response(queries, response_body)
+
+  # Assert
+  assert result[0] == { "data": { "loyaltyPointLedgers": [{ "balanceCarriedForward": "10" }] } }
+  assert result[1] == {
+    "data": { "wheelOfFortuneSpins": None },
+    "errors": [{ "message": "Unauthorized", "path": ["wheelOfFortuneSpins"] }]
+  }
+
+@pytest.mark.asyncio
+async def test_when_queries_requested_within_window_then_single_request_sent():
+  # Arrange
+  sent_queries = []
+  async def async_send(query):
+    sent_queries.append(query)
+    return {
+      "data": {
+        "q0_loyaltyPointLedgers": [{ "balanceCarriedForward": "10" }],
+        "q1_wheelOfFortuneSpins": { "electricity": { "remainingSpinsThisMonth": 2 }, "gas": { "remainingSpinsThisMonth": 1 } }
+      },
+      "errors": [
+        { "message": "Unknown account", "path": ["q2_plannedDispatches"] }
+      ]
+    }
+
+  client = OctopusEnergyApiClient("test-key")
+  client._graphql_batcher = GraphQLBatcher(async_send, 0.01)
+
+  # Act
+  (points, spins, dispatches) = await asyncio.gather(
+    client.async_get_octoplus_points(),
+    client.async_get_wheel_of_fortune_spins("A-123"),
+    client.async_get_intelligent_dispatches("A-123"),
+    return_exceptions=True
+  )
+
+  # Assert
+  assert len(sent_queries) == 1
+  assert points == 10
+  assert spins.electricity == 2
+  assert spins.gas == 1
+  assert isinstance(dispatches, RequestException)
+  assert dispatches.errors == ["Unknown account"]
+
+@pytest.mark.asyncio
+async def test_when_single_query_requested_then_query_sent_unchanged():
+  # Arrange
+  sent_queries = []
+  async def async_send(query):
+    sent_queries.append(query)
+    return { "data": { "loyaltyPointLedgers": [{ "balanceCarriedForward": "10" }] } }
+
+  batcher = GraphQLBatcher(async_send, 0.01)
+
+  # Act
+  results = await asyncio.gather(batcher.async_query(octoplus_points_query), batcher.async_query(octoplus_points_query))
+
+  # Assert
+  assert sent_queries == [octoplus_points_query]
+  assert results[0] == results[1]
+
+@pytest.mark.asyncio
+async def test_when_lone_query_requested_then_query_sent_without_waiting_for_window():
+  # Arrange
+  sent_queries = []
+  async def async_send(query):
+    sent_queries.append(query)
+    return { "data": { "loyaltyPointLedgers": [{ "balanceCarriedForward": "10" }] } }
+
+  batcher = GraphQLBatcher(async_send)
+
+  # Act
+  result = await asyncio.wait_for(batcher.async_query(octoplus_points_query), 0.1)
+
+  # Assert
+  assert sent_queries == [octoplus_points_query]
+  assert result == { "data": { "loyaltyPointLedgers": [{ "balanceCarriedForward": "10" }] } }
+
+@pytest.mark.asyncio
+async def test_when_queries_requested_while_request_in_flight_then_sent_together_afterwards():
+  # Arrange
+  sent_queries = []
+  first_request_started = asyncio.Event()
+  complete_first_request = asyncio.Event()
+  async def async_send(query):
+    sent_queries.append(query)
+    if len(sent_queries) == 1:
+      first_request_started.set()
+      await complete_first_request.wait()
+      return { "data": { "loyaltyPointLedgers": [] } }
+
+    return {
+      "data": {
+        "q0_wheelOfFortuneSpins": { "electricity": { "remainingSpinsThisMonth": 2 }, "gas": { "remainingSpinsThisMonth": 1 } },
+        "q1_plannedDispatches": [],
+        "q1_completedDispatches": []
+      }
+    }
+
+  batcher = GraphQLBatcher(async_send)
+  first_task = asyncio.ensure_future(batcher.async_query(octoplus_points_query))
+  await first_request_started.wait()
+
+  # Act
+  other_tasks = asyncio.gather(
+    batcher.async_query(wheel_of_fortune_query.format(account_id="A-123")),
+    batcher.async_query(intelligent_dispatches_query.format(account_id="A-123"))
+  )
+  await asyncio.sleep(0.01)
+  sent_queries_while_in_flight = len(sent_queries)
+  complete_first_request.set()
+  await first_task
+  (spins, dispatches) = await other_tasks
+
+  # Assert
+  assert sent_queries_while_in_flight == 1
+  assert len(sent_queries) == 2
+  assert spins["data"]["wheelOfFortuneSpins"]["electricity"]["remainingSpinsThisMonth"] == 2
+  assert dispatches["data"] == { "plannedDispatches": [], "completedDispatches": [] }
+
+@pytest.mark.asyncio
+async def test_when_errors_cannot_be_attributed_then_incomplete_queries_retried_individually():
+  # Arrange
+  wheel_of_fortune_spins_query = wheel_of_fortune_query.format(account_id="A-123")
+  sent_queries = []
+  async def async_send(query):
+    sent_queries.append(query)
+    if query == octoplus_points_query:
+      raise Exception("Failed to retrieve points")
+    elif query == wheel_of_fortune_spins_query:
+      return { "data": { "wheelOfFortuneSpins": None }, "errors": [{ "message": "Unauthorized", "path": ["wheelOfFortuneSpins"] }] }
+
+    return {
+      "data": {
+        "q0_loyaltyPointLedgers": None,
+        "q1_wheelOfFortuneSpins": None,
+        "q2_plannedDispatches": [],
+        "q2_completedDispatches": []
+      },
+      "errors": [{ "message": "Something went wrong" }]
+    }
+
+  batcher = GraphQLBatcher(async_send, 0.01)
+
+  # Act
+  (points, spins, dispatches) = await asyncio.gather(
+    batcher.async_query(octoplus_points_query),
+    batcher.async_query(wheel_of_fortune_spins_query),
+    batcher.async_query(intelligent_dispatches_query.format(account_id="A-123")),
+    return_exceptions=True
+  )
+
+  # Assert
+  assert len(sent_queries) == 3
+  assert sent_queries[1:] == [octoplus_points_query, wheel_of_fortune_spins_query]
+  assert isinstance(points, Exception)
+  assert spins["errors"] == [{ "message": "Unauthorized", "path": ["wheelOfFortuneSpins"] }]
+  assert dispatches == { "data": { "plannedDispatches": [], "completedDispatches": [] } }
+
+@pytest.mark.asyncio
+async def test_when_error_has_no_path_then_error_not_assigned_to_any_query():
+  # Arrange
+  queries = [octoplus_points_query, wheel_of_fortune_query.format(account_id="A-123")]
+  response_body = {
+    "data": { "q0_loyaltyPointLedgers": [], "q1_wheelOfFortuneSpins": None },
+    "errors": [{ "message": "Something went wrong" }]
+  }
+
+  # Act
+  results = split_graphql_response(queries, response_body)
+  unattributed_errors = get_unattributed_graphql_errors(queries, response_body)
+
+  # Assert
+  assert results == [{ "data": { "loyaltyPointLedgers": [] } }, { "data": { "wheelOfFortuneSpins": None } }]
+  assert unattributed_errors == [{ "message": "Something went wrong" }]
+
+@pytest.mark.asyncio
+async def test_when_error_causes_data_to_be_null_then_other_queries_retried_individually():
+  # Arrange
+  wheel_of_fortune_spins_query = wheel_of_fortune_query.format(account_id="A-123")
+  dispatches_query = intelligent_dispatches_query.format(account_id="A-123")
+  sent_queries = []
+  async def async_send(query):
+    sent_queries.append(query)
+    if query == octoplus_points_query:
+      return { "data": { "loyaltyPointLedgers": [{ "balanceCarriedForward": "10" }] } }
+    elif query == dispatches_query:
+      return { "data": { "plannedDispatches": [], "completedDispatches": [] } }
+
+    return {
+      "data": None,
+      "errors": [{ "message": "Cannot return null for non-nullable field", "path": ["q1_wheelOfFortuneSpins", "electricity"] }]
+    }
+
+  batcher = GraphQLBatcher(async_send, 0.01)
+
+  # Act
+  (points, spins, dispatches) = await asyncio.gather(
+    batcher.async_query(octoplus_points_query),
+    batcher.async_query(wheel_of_fortune_spins_query),
+    batcher.async_query(dispatches_query)
+  )
+
+  # Assert
+  assert len(sent_queries) == 3
+  assert sent_queries[1:] == [octoplus_points_query, dispatches_query]
+  assert points == { "data": { "loyaltyPointLedgers": [{ "balanceCarriedForward": "10" }] } }
+  assert spins == {
+    "data": None,
+    "errors": [{ "message": "Cannot return null for non-nullable field", "path": ["wheelOfFortuneSpins", "electricity"] }]
+  }
+  assert dispatches == { "data": { "plannedDispatches": [], "completedDispatches": [] } }
+
+@pytest.mark.asyncio
+async def test_when_queries_sent_then_flush_task_released():
+  # Arrange
+  async def async_send(query):
+    return { "data": { "loyaltyPointLedgers": [] } }
+
+  batcher = GraphQLBatcher(async_send)
+
+  # Act
+  await batcher.async_query(octoplus_points_query)
+  await asyncio.sleep(0)
+
+  # Assert
+  assert batcher._flush_task is None
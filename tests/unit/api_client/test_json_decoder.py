@@ -0,0 +1,66 @@
+import json
+import pytest
+
+from custom_components.octopus_energy.api_client import json_decoder
+from custom_components.octopus_energy.api_client.json_decoder import decode_json, decode_text
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("is_fast_parser_available",[
+  (True),
+  (False),
+])
+async def test_when_content_is_json_then_decoded(monkeypatch, is_fast_parser_available: bool):
+  # Arrange
+  if is_fast_parser_available == False:
+    monkeypatch.setattr(json_decoder, "orjson", None)
+
+  expected_result = {
+    "count": 2,
+    "next": None,
+    "results": [
+      { "consumption": 0.123, "interval_start": "2023-10-01T00:00:00+01:00", "interval_end": "2023-10-01T00:30:00+01:00" },
+      { "consumption": 1.5, "interval_start": "2023-10-01T00:30:00+01:00", "interval_end": "2023-10-01T01:00:00+01:00" }
+    ],
+    "name": "Économie"
+  }
+
+  # Act
+  result = decode_json(json.dumps(expected_result, ensure_ascii=False).encode("utf-8"))
+
+  # Assert
+  assert result == expected_result
+
+@pytest.mark.asyncio
+async def test_when_content_is_not_supported_by_fast_parser_then_standard_library_used():
+  # Act
+  result = decode_json(b'{ "value": NaN }')
+
+  # Assert
+  assert "value" in result
+  assert result["value"] != result["value"]
+
+@pytest.mark.asyncio
+async def test_when_content_is_not_json_then_exception_raised():
+  # Act
+  exception_raised = False
+  try:
+    decode_json(b'<html>Bad Gateway</html>')
+  except ValueError:
+    exception_raised = True
+
+  # Assert
+  assert exception_raised == True
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("content,encoding,expected_result",[
+  (None, None, None),
+  ("Bad Gateway".encode("utf-8"), None, "Bad Gateway"),
+  ("Économie".encode("latin-1"), "latin-1", "Économie"),
+  (b'\xff\xfeinvalid', None, "��invalid"),
+])
+async def test_when_decode_text_called_then_text_returned(content: bytes, encoding: str, expected_result: str):
+  # Act
+  result = decode_text(content, encoding)
+
+  # Assert
+  assert result == expected_result
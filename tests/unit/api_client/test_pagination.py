@@ -0,0 +1,109 @@
+import asyncio
+from datetime import datetime
+import pytest
+
+from custom_components.octopus_energy.api_client import OctopusEnergyApiClient
+from custom_components.octopus_energy.api_client.pagination import get_page_url, get_total_pages
+
+def create_client(pages: dict, include_count = True):
+  client = OctopusEnergyApiClient("test-key", max_concurrent_page_requests=2)
+  requested_pages = []
+  active_requests = []
+  max_active_requests = [0]
+
+  async def async_send_get(url, auth):
+    page = int(url.split("page=")[1]) if "page=" in url else 1
+    requested_pages.append(page)
+    active_requests.append(page)
+    max_active_requests[0] = max(max_active_requests[0], len(active_requests))
+    await asyncio.sleep(0.01)
+    active_requests.remove(page)
+
+    data = {
+      "results": pages[page],
+      "next": get_page_url(url, page + 1) if page < len(pages) else None
+    }
+    if include_count:
+      data["count"] = sum(map(lambda items: len(items), pages.values()))
+
+    return data
+
+  client.__async_send_get__ = async_send_get
+  return (client, requested_pages, max_active_requests)
+
+def create_consumption(day: int, hour: int):
+  return {
+    "consumption": day + hour,
+    "interval_start": f"2024-01-{day:02}T{hour:02}:00:00Z",
+    "interval_end": f"2024-01-{day:02}T{hour:02}:30:00Z"
+  }
+
+@pytest.mark.asyncio
+async def test_when_page_set_then_existing_page_replaced():
+  # Act
+  result = get_page_url("https://api.octopus.energy/v1/products/?page=1&period_from=2024-01-01T00:00:00Z", 3)
+
+  # Assert
+  assert result == "https://api.octopus.energy/v1/products/?period_from=2024-01-01T00:00:00Z&page=3"
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("count,page_size,expected_total_pages",[
+  (0, 0, None),
+  (None, 100, None),
+  (10, 100, 1),
+  (100, 100, 1),
+  (101, 100, 2),
+  (17520, 100, 176),
+])
+async def test_when_count_provided_then_total_pages_returned(count: int, page_size: int, expected_total_pages: int):
+  # Act
+  result = get_total_pages(count, page_size)
+
+  # Assert
+  assert result == expected_total_pages
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("include_count",[
+  (True),
+  (False),
+])
+async def test_when_consumption_has_multiple_pages_then_all_pages_returned_in_order(include_count: bool):
+  # Arrange
+  pages = {
+    1: [create_consumption(1, hour) for hour in range(0, 8)],
+    2: [create_consumption(2, hour) for hour in range(0, 8)],
+    3: [create_consumption(3, hour) for hour in range(0, 8)],
+    4: [create_consumption(4, hour) for hour in range(0, 8)],
+    5: [create_consumption(5, hour) for hour in range(0, 2)],
+  }
+  (client, requested_pages, max_active_requests) = create_client(pages, include_count)
+
+  # Act
+  result = await client.async_get_electricity_consumption("mpan", "serial", None, None)
+
+  # Assert
+  assert result is not None
+  assert len(result) == 34
+  assert list(map(lambda item: item["consumption"], result)) == [day + hour for day in range(1, 5) for hour in range(0, 8)] + [5, 6]
+  assert sorted(requested_pages) == [1, 2, 3, 4, 5]
+  if include_count:
+    assert max_active_requests[0] == 2
+  else:
+    assert max_active_requests[0] == 1
+
+@pytest.mark.asyncio
+async def test_when_page_size_provided_then_only_first_page_returned():
+  # Arrange
+  pages = {
+    1: [create_consumption(1, 0)],
+    2: [create_consumption(1, 1)],
+  }
+  (client, requested_pages, _) = create_client(pages)
+
+  # Act
+  result = await client.async_get_gas_consumption("mprn", "serial", None, None, 1)
+
+  # Assert
+  assert result is not None
+  assert len(result) == 1
+  assert requested_pages == [1]
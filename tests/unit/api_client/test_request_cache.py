@@ -0,0 +1,133 @@
+import asyncio
+import pytest
+
+from custom_components.octopus_energy.api_client import OctopusEnergyApiClient
+from custom_components.octopus_energy.api_client.request_cache import ResponseCache, normalise_url
+
+class FakeClock:
+  def __init__(self):
+    self.value = 0
+
+  def __call__(self):
+    return self.value
+
+@pytest.mark.asyncio
+async def test_when_urls_are_equivalent_then_normalised_urls_match():
+  # Act
+  first_url = normalise_url("https://API.octopus.energy/v1/products/AGILE/?period_to=2024-01-02T00:00:00Z&period_from=2024-01-01T00:00:00Z")
+  second_url = normalise_url("https://api.octopus.energy/v1/products/AGILE/?period_from=2024-01-01T00:00:00Z&period_to=2024-01-02T00:00:00Z")
+
+  # Assert
+  assert first_url == second_url
+  assert first_url == "https://api.octopus.energy/v1/products/AGILE/?period_from=2024-01-01T00:00:00Z&period_to=2024-01-02T00:00:00Z"
+
+@pytest.mark.asyncio
+async def test_when_item_expires_then_miss_returned():
+  # Arrange
+  clock = FakeClock()
+  cache = ResponseCache(2, 60, clock)
+  cache.set("a", { "value": 1 })
+
+  # Act
+  first_result = cache.get("a")
+  clock.value = 60
+  second_result = cache.get("a")
+
+  # Assert
+  assert first_result == (True, { "value": 1 })
+  assert second_result == (False, None)
+  assert cache.hits == 1
+  assert cache.misses == 1
+  assert len(cache) == 0
+
+@pytest.mark.asyncio
+async def test_when_cache_is_full_then_least_recently_used_item_evicted():
+  # Arrange
+  cache = ResponseCache(2, 60, FakeClock())
+  cache.set("a", 1)
+  cache.set("b", 2)
+  cache.get("a")
+
+  # Act
+  cache.set("c", 3)
+
+  # Assert
+  assert cache.get("a") == (True, 1)
+  assert cache.get("b") == (False, None)
+  assert cache.get("c") == (True, 3)
+  assert cache.evictions == 1
+
+@pytest.mark.asyncio
+async def test_when_identical_requests_are_in_flight_then_single_request_sent():
+  # Arrange
+  client = OctopusEnergyApiClient("test-key")
+  requested_urls = []
+  async def async_send_get(url, auth):
+    requested_urls.append(url)
+    await asyncio.sleep(0.01)
+    return { "results": [] }
+  client.__async_send_get__ = async_send_get
+
+  # Act
+  results = await asyncio.gather(
+    client.async_get_electricity_consumption("mpan", "serial", None, None),
+    client.async_get_electricity_consumption("mpan", "serial", None, None),
+    client.async_get_electricity_consumption("mpan", "serial", None, None),
+  )
+
+  # Assert
+  assert len(requested_urls) == 1
+  assert results == [[], [], []]
+
+  # Consumption is private to the account, so isn't cached once the request has completed
+  await client.async_get_electricity_consumption("mpan", "serial", None, None)
+  assert len(requested_urls) == 2
+
+@pytest.mark.asyncio
+async def test_when_product_requested_again_then_cached_response_returned():
+  # Arrange
+  client = OctopusEnergyApiClient("test-key", product_response_cache=ResponseCache(2, 60, FakeClock()))
+  requested_urls = []
+  async def async_send_get(url, auth):
+    requested_urls.append(url)
+    return { "code": "AGILE-FLEX-22-11-25" }
+  client.__async_send_get__ = async_send_get
+
+  # Act
+  first_result = await client.async_get_product("AGILE-FLEX-22-11-25")
+  second_result = await client.async_get_product("AGILE-FLEX-22-11-25")
+
+  # Assert
+  assert len(requested_urls) == 1
+  assert first_result == { "code": "AGILE-FLEX-22-11-25" }
+  assert second_result is first_result
+
+@pytest.mark.asyncio
+async def test_when_product_requested_by_another_client_then_cached_response_returned():
+  # Arrange
+  cache = ResponseCache(2, 60, FakeClock())
+  first_client = OctopusEnergyApiClient("test-key", product_response_cache=cache)
+  second_client = OctopusEnergyApiClient("test-key-2", product_response_cache=cache)
+  requested_urls = []
+  async def async_send_get(url, auth):
+    requested_urls.append(url)
+    return { "code": "AGILE-FLEX-22-11-25" }
+  first_client.__async_send_get__ = async_send_get
+  second_client.__async_send_get__ = async_send_get
+
+  # Act
+  first_result = await first_client.async_get_product("AGILE-FLEX-22-11-25")
+  second_result = await second_client.async_get_product("AGILE-FLEX-22-11-25")
+
+  # Assert
+  assert len(requested_urls) == 1
+  assert second_result is first_result
+
+@pytest.mark.asyncio
+async def test_when_no_cache_provided_then_clients_share_default_cache():
+  # Act
+  first_client = OctopusEnergyApiClient("test-key")
+  second_client = OctopusEnergyApiClient("test-key-2")
+
+  # Assert
+  assert first_client._product_response_cache is second_client._product_response_cache
@@ -0,0 +1,83 @@
+import aiohttp
+import pytest
+
+from custom_components.octopus_energy.api_client import OctopusEnergyApiClient
+from custom_components.octopus_energy.api_client.session_pool import ClientSessionPool
+
+@pytest.mark.asyncio
+async def test_when_same_base_url_acquired_then_session_is_shared():
+  # Arrange
+  pool = ClientSessionPool()
+  timeout = aiohttp.ClientTimeout(total=None, sock_connect=20, sock_read=20)
+
+  # Act
+  first_session = pool.acquire("https://api.octopus.energy", timeout, {})
+  second_session = pool.acquire("https://api.octopus.energy", aiohttp.ClientTimeout(total=None, sock_connect=20, sock_read=20), {})
+
+  # Assert
+  try:
+    assert first_session is second_session
+  finally:
+    await pool.async_close()
+
+  assert first_session.closed == True
+
+@pytest.mark.asyncio
+async def test_when_different_base_url_acquired_then_different_session_returned():
+  # Arrange
+  pool = ClientSessionPool()
+  timeout = aiohttp.ClientTimeout(total=None, sock_connect=20, sock_read=20)
+
+  # Act
+  first_session = pool.acquire("https://api.octopus.energy", timeout, {})
+  second_session = pool.acquire("https://api.backend.octopus.energy", timeout, {})
+
+  # Assert
+  try:
+    assert first_session is not second_session
+  finally:
+    await pool.async_close()
+
+@pytest.mark.asyncio
+async def test_when_session_released_then_closed_once_last_reference_released():
+  # Arrange
+  pool = ClientSessionPool()
+  timeout = aiohttp.ClientTimeout(total=None, sock_connect=20, sock_read=20)
+  session = pool.acquire("https://api.octopus.energy", timeout, {})
+  pool.acquire("https://api.octopus.energy", timeout, {})
+
+  # Act
+  await pool.async_release("https://api.octopus.energy", timeout)
+  is_closed_after_first_release = session.closed
+  await pool.async_release("https://api.octopus.energy", timeout)
+
+  # Assert
+  assert is_closed_after_first_release == False
+  assert session.closed == True
+
+  new_session = pool.acquire("https://api.octopus.energy", timeout, {})
+  try:
+    assert new_session is not session
+  finally:
+    await pool.async_close()
+
+@pytest.mark.asyncio
+async def test_when_clients_closed_then_shared_session_released():
+  # Arrange
+  pool = ClientSessionPool()
+  first_client = OctopusEnergyApiClient("test-key", session_pool=pool)
+  second_client = OctopusEnergyApiClient("test-key-2", session_pool=pool)
+
+  first_session = first_client._create_client_session()
+  second_session = second_client._create_client_session()
+  assert first_session is second_session
+
+  # Act
+  await first_client.async_close()
+  await first_client.async_close()
+  is_closed_after_first_client = first_session.closed
+  await second_client.async_close()
+
+  # Assert
+  assert is_closed_after_first_client == False
+  assert first_session.closed == True
@@ -0,0 +1,122 @@
+import asyncio
+import base64
+import json
+from datetime import datetime, timedelta, timezone
+import pytest
+
+from homeassistant.util.dt import utcnow
+
+from custom_components.octopus_energy.api_client import OctopusEnergyApiClient
+from custom_components.octopus_energy.api_client.token_manager import TokenManager, get_jwt_expiration
+
+def create_token(expiration: datetime, subject = "test"):
+  def encode(value: dict):
+    return base64.urlsafe_b64encode(json.dumps(value).encode()).decode().rstrip("=")
+
+  return f'{encode({ "alg": "HS256", "typ": "JWT" })}.{encode({ "sub": subject, "exp": int(expiration.timestamp()) })}.signature'
+
+class FakeResponse:
+  def __init__(self, status: int, body: dict):
+    self.status = status
+    self.charset = "utf-8"
+    self._body = body
+
+  async def read(self):
+    return json.dumps(self._body).encode()
+
+  async def __aenter__(self):
+    return self
+
+  async def __aexit__(self, *args):
+    return False
+
+class FakeSession:
+  def __init__(self, responses: list):
+    self._responses = responses
+    self.requests = []
+
+  def post(self, url, json = None, headers = None):
+    self.requests.append((json, headers))
+    return self._responses.pop(0)
+
+@pytest.mark.asyncio
+async def test_when_token_is_jwt_then_expiration_returned():
+  # Arrange
+  expiration = datetime(2024, 1, 1, 12, 0, tzinfo=timezone.utc)
+
+  # Act
+  result = get_jwt_expiration(create_token(expiration))
+
+  # Assert
+  assert result == expiration
+
+@pytest.mark.asyncio
+async def test_when_token_is_not_jwt_then_none_returned():
+  # Act
+  result = get_jwt_expiration("not-a-token")
+
+  # Assert
+  assert result is None
+
+@pytest.mark.asyncio
+async def test_when_token_requested_concurrently_then_single_refresh_performed():
+  # Arrange
+  obtained_tokens = []
+  async def async_obtain_token():
+    await asyncio.sleep(0.01)
+    token = create_token(utcnow() + timedelta(hours=1), f"token-{len(obtained_tokens)}")
+    obtained_tokens.append(token)
+    return token
+
+  token_manager = TokenManager(async_obtain_token)
+
+  # Act
+  results = await asyncio.gather(*[token_manager.async_get_token() for _ in range(5)])
+
+  # Assert
+  assert len(obtained_tokens) == 1
+  assert results == [obtained_tokens[0]] * 5
+  assert token_manager.is_token_valid()
+
+@pytest.mark.asyncio
+async def test_when_token_close_to_expiring_then_token_refreshed():
+  # Arrange
+  obtained_tokens = []
+  async def async_obtain_token():
+    token = create_token(utcnow() + timedelta(minutes=2 if len(obtained_tokens) == 0 else 60), f"token-{len(obtained_tokens)}")
+    obtained_tokens.append(token)
+    return token
+
+  token_manager = TokenManager(async_obtain_token)
+
+  # Act
+  first_token = await token_manager.async_get_token()
+  second_token = await token_manager.async_get_token()
+
+  # Assert
+  assert len(obtained_tokens) == 2
+  assert first_token == obtained_tokens[0]
+  assert second_token == obtained_tokens[1]
+
+@pytest.mark.asyncio
+async def test_when_token_rejected_then_request_retried_once_with_new_token():
+  # Arrange
+  client = OctopusEnergyApiClient("test-key")
+  first_token = create_token(utcnow() + timedelta(hours=1), "first")
+  second_token = create_token(utcnow() + timedelta(hours=1), "second")
+  session = FakeSession([
+    FakeResponse(200, { "data": { "obtainKrakenToken": { "token": first_token } } }),
+    FakeResponse(401, { "errors": [{ "message": "Unauthorized" }] }),
+    FakeResponse(200, { "data": { "obtainKrakenToken": { "token": second_token } } }),
+    FakeResponse(200, { "data": { "loyaltyPointLedgers": [{ "balanceCarriedForward": "25" }] } }),
+  ])
+  client._session = session
+
+  # Act
+  result = await client.async_get_octoplus_points()
+
+  # Assert
+  assert result == 25
+  assert len(session.requests) == 4
+  assert session.requests[1][1]["Authorization"] == f"JWT {first_token}"
+  assert session.requests[3][1]["Authorization"] == f"JWT {second_token}"
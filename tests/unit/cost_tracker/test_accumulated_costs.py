@@ -0,0 +1,63 @@
+from datetime import datetime, timedelta
+import pytest
+
+from custom_components.octopus_energy.cost_tracker import AccumulatedCosts, accumulate_cost
+
+@pytest.mark.asyncio
+async def test_when_days_set_then_totals_include_every_day():
+  # Arrange
+  start = datetime.strptime("2022-02-28T00:00:00+00:00", "%Y-%m-%dT%H:%M:%S%z")
+  accumulated_costs = AccumulatedCosts()
+
+  # Act
+  accumulated_costs.set_day(start + timedelta(hours=1), 0.5, 1)
+  first_totals = (accumulated_costs.total_cost, accumulated_costs.total_consumption)
+  accumulated_costs.set_day(start + timedelta(hours=2), 1.5, 3)
+  accumulated_costs.set_day(start + timedelta(days=1, hours=1), 0.25, 0.5)
+
+  # Assert
+  # A new day is included in our totals as soon as it's set
+  assert first_totals == (0.5, 1)
+  assert accumulated_costs.total_cost == 1.75
+  assert accumulated_costs.total_consumption == 3.5
+  assert accumulated_costs.to_accumulative_data() == [
+    { "start": start, "end": start + timedelta(days=1), "cost": 1.5, "consumption": 3 },
+    { "start": start + timedelta(days=1), "end": start + timedelta(days=2), "cost": 0.25, "consumption": 0.5 }
+  ]
+  assert len(accumulated_costs) == 2
+  assert accumulated_costs.get_start((start + timedelta(days=1)).date()) == start + timedelta(days=1)
+  assert accumulated_costs.get_start((start + timedelta(days=10)).date()) is None
+
+@pytest.mark.asyncio
+async def test_when_cost_accumulated_for_new_day_then_totals_include_new_day():
+  # Arrange
+  start = datetime.strptime("2022-02-28T00:00:00+00:00", "%Y-%m-%dT%H:%M:%S%z")
+  accumulative_data = [
+    { "start": start, "end": start + timedelta(days=1), "cost": 1.5, "consumption": 3 }
+  ]
+
+  # Act
+  result = accumulate_cost(start + timedelta(days=1, hours=5), accumulative_data, 0.5, 1)
+
+  # Assert
+  assert result.total_cost == 2
+  assert result.total_consumption == 4
+  assert len(result.accumulative_data) == 2
+
+@pytest.mark.asyncio
+async def test_when_restored_then_totals_include_restored_days():
+  # Arrange
+  start = datetime.strptime("2022-02-28T00:00:00+00:00", "%Y-%m-%dT%H:%M:%S%z")
+  accumulative_data = [
+    { "start": start, "end": start + timedelta(days=1), "cost": 1.5, "consumption": 3 },
+    { "start": start + timedelta(days=1), "end": start + timedelta(days=2), "cost": 2, "consumption": 4 }
+  ]
+
+  # Act
+  accumulated_costs = AccumulatedCosts(accumulative_data)
+  accumulated_costs.set_day(start + timedelta(days=1, hours=5), 3, 5)
+
+  # Assert
+  assert accumulated_costs.total_cost == 4.5
+  assert accumulated_costs.total_consumption == 8
+  assert accumulative_data[1]["cost"] == 2
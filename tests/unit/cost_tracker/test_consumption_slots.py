@@ -0,0 +1,167 @@
+from datetime import datetime, timedelta
+import random
+import pytest
+
+from custom_components.octopus_energy.cost_tracker import ConsumptionSlots, add_consumption_to_slots
+from custom_components.octopus_energy.electricity import calculate_electricity_consumption_and_cost
+from custom_components.octopus_energy.utils.rate_timeline import RateTimeline
+
+def get_date(value: str) -> datetime:
+  return datetime.strptime(value, "%Y-%m-%dT%H:%M:%S%z")
+
+@pytest.mark.asyncio
+async def test_when_consumption_added_multiple_times_then_slot_updated_in_place():
+  # Arrange
+  tracked_slots = ConsumptionSlots()
+  untracked_slots = ConsumptionSlots()
+
+  # Act
+  for minute in range(0, 60, 5):
+    current = get_date(f"2022-02-28T10:{str(minute).rjust(2, '0')}:00+00:00")
+    assert add_consumption_to_slots(current, tracked_slots, untracked_slots, 0.1, None, None, None, False, True) == True
+
+  # Assert
+  assert len(tracked_slots) == 2
+  assert len(untracked_slots) == 0
+
+  consumption_data = tracked_slots.to_consumption_data()
+  assert consumption_data[0]["start"] == get_date("2022-02-28T10:00:00+00:00")
+  assert consumption_data[0]["end"] == get_date("2022-02-28T10:30:00+00:00")
+  assert round(consumption_data[0]["consumption"], 8) == 0.6
+  assert consumption_data[1]["start"] == get_date("2022-02-28T10:30:00+00:00")
+  assert round(consumption_data[1]["consumption"], 8) == 0.6
+
+@pytest.mark.asyncio
+async def test_when_consumption_added_for_new_day_then_existing_slots_cleared():
+  # Arrange
+  tracked_slots = ConsumptionSlots([{ "start": get_date("2022-02-27T10:00:00+00:00"), "end": get_date("2022-02-27T10:30:00+00:00"), "consumption": 1 }])
+  untracked_slots = ConsumptionSlots([{ "start": get_date("2022-02-27T11:00:00+00:00"), "end": get_date("2022-02-27T11:30:00+00:00"), "consumption": 1 }])
+
+  # Act
+  add_consumption_to_slots(get_date("2022-02-28T00:10:00+00:00"), tracked_slots, untracked_slots, 0.5, None, None, None, False, True)
+
+  # Assert
+  assert tracked_slots.to_consumption_data() == [{ "start": get_date("2022-02-28T00:00:00+00:00"), "end": get_date("2022-02-28T00:30:00+00:00"), "consumption": 0.5 }]
+  assert len(untracked_slots) == 0
+
+def create_rates(start: datetime):
+  return RateTimeline.from_rates(list(map(lambda index: {
+    "start": start + timedelta(minutes=30 * index),
+    "end": start + timedelta(minutes=30 * (index + 1)),
+    "value_inc_vat": 10 if index < 14 else 30,
+    "tariff_code": "E-1R-SUPER-GREEN-24M-21-07-30-A",
+    "is_capped": False
+  }, range(48))))
+
+def assert_costs(slots: ConsumptionSlots, current: datetime, rates):
+  expected = calculate_electricity_consumption_and_cost(current, slots.to_consumption_data(), rates, 0, None, 0, False)
+
+  assert round(slots.total.consumption, 8) == round(expected["total_consumption"], 8)
+  assert round(slots.total.cost / 100, 8) == round(expected["total_cost"], 8)
+  assert round(slots.peak.consumption, 8) == round(expected["total_consumption_peak"], 8)
+  assert round(slots.peak.cost / 100, 8) == round(expected["total_cost_peak"], 8)
+  assert round(slots.off_peak.consumption, 8) == round(expected["total_consumption_off_peak"], 8)
+  assert round(slots.off_peak.cost / 100, 8) == round(expected["total_cost_off_peak"], 8)
+
+  for key, is_off_peak in [("charges", None), ("peak_charges", False), ("off_peak_charges", True)]:
+    charges = slots.to_charges(is_off_peak)
+    assert len(charges) == len(expected[key])
+    for charge, expected_charge in zip(charges, expected[key]):
+      assert charge["start"] == expected_charge["start"]
+      assert charge["end"] == expected_charge["end"]
+      assert charge["rate"] == expected_charge["rate"]
+      assert round(charge["cost"], 8) == round(expected_charge["cost"], 8)
+
+@pytest.mark.asyncio
+async def test_when_consumption_added_after_costing_then_costs_match_full_calculation():
+  generator = random.Random(3)
+  start = get_date("2022-02-28T00:00:00+00:00")
+  rates = create_rates(start)
+
+  # Arrange
+  slots = ConsumptionSlots()
+  slots.add(start, start + timedelta(minutes=30), 0.5)
+  slots.calculate_costs(start, rates)
+
+  for index in range(500):
+    # Act
+    current = start + timedelta(minutes=generator.randint(0, 24 * 60 - 1))
+    slot_start = current.replace(minute=(0 if current.minute < 30 else 30))
+    slots.add(slot_start, slot_start + timedelta(minutes=30), generator.uniform(0, 0.2))
+
+    # Assert
+    assert slots.is_costed_with(rates) == True
+    assert_costs(slots, current, rates)
+
+@pytest.mark.asyncio
+async def test_when_consumption_set_then_costs_need_calculating_again():
+  # Arrange
+  start = get_date("2022-02-28T00:00:00+00:00")
+  rates = create_rates(start)
+  slots = ConsumptionSlots()
+  slots.add(start, start + timedelta(minutes=30), 0.5)
+  slots.add(start + timedelta(hours=10), start + timedelta(hours=10, minutes=30), 0.5)
+  slots.calculate_costs(start, rates)
+
+  # Act
+  slots.set_consumption(start, 2)
+
+  # Assert
+  assert slots.is_costed_with(rates) == False
+
+  slots.calculate_costs(start, rates)
+  assert slots.is_costed_with(rates) == True
+  assert slots.has_charge(start, True) == True
+  assert slots.has_charge(start, False) == False
+  assert_costs(slots, start, rates)
+
+@pytest.mark.asyncio
+async def test_when_rates_do_not_cover_new_consumption_then_costs_need_calculating_again():
+  # Arrange
+  start = get_date("2022-02-28T00:00:00+00:00")
+  rates = create_rates(start)
+  slots = ConsumptionSlots()
+  slots.add(start, start + timedelta(minutes=30), 0.5)
+  slots.calculate_costs(start, rates)
+
+  # Act
+  slots.add(start + timedelta(days=1), start + timedelta(days=1, minutes=30), 0.5)
+
+  # Assert
+  assert slots.is_costed_with(rates) == False
+  assert len(slots) == 2
+
+@pytest.mark.asyncio
+async def test_when_serialised_then_restored_slots_produce_same_charges():
+  # Arrange
+  start = get_date("2022-02-28T00:00:00+00:00")
+  rates = create_rates(start)
+  slots = ConsumptionSlots()
+  for index in range(6):
+    slots.add(start + timedelta(hours=index * 3), start + timedelta(hours=index * 3, minutes=30), index + 1)
+  slots.calculate_costs(start, rates)
+
+  # Act
+  restored_slots = ConsumptionSlots(slots.to_charges())
+  restored_slots.calculate_costs(start, rates)
+
+  # Assert
+  assert restored_slots.to_charges() == slots.to_charges()
+
+@pytest.mark.asyncio
+async def test_when_restored_then_charges_available_without_calculating_costs():
+  # Arrange
+  start = get_date("2022-02-28T00:00:00+00:00")
+  rates = create_rates(start)
+  slots = ConsumptionSlots()
+  for index in range(6):
+    slots.add(start + timedelta(hours=index * 3), start + timedelta(hours=index * 3, minutes=30), index + 1)
+  slots.calculate_costs(start, rates)
+
+  # Act
+  restored_slots = ConsumptionSlots(slots.to_charges(), True)
+
+  # Assert
+  assert restored_slots.to_charges() == slots.to_charges()
+  assert restored_slots.to_charges(True) == slots.to_charges()
+  assert restored_slots.to_charges(False) == []
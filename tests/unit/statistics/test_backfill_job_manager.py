@@ -0,0 +1,300 @@
+import asyncio
+from datetime import datetime, timedelta
+import mock
+import pytest
+
+from homeassistant.util.dt import (now)
+
+from custom_components.octopus_energy.api_client import RequestException, ServerException
+from custom_components.octopus_energy.const import DATA_ACCOUNT, DOMAIN
+from custom_components.octopus_energy.statistics import backfill
+from custom_components.octopus_energy.statistics.backfill import BACKFILL_JOB_STATUS_COMPLETED, BACKFILL_JOB_STATUS_FAILED, BACKFILL_JOB_STATUS_RUNNING, BackfillJob, BackfillJobManager, get_retry_delay
+from custom_components.octopus_energy.statistics.refresh import TariffRange, get_tariff_ranges
+
+account_id = "A-123"
+
+class FakeHass:
+  def __init__(self):
+    self.data = { DOMAIN: { account_id: { DATA_ACCOUNT: FakeAccountResult() } } }
+
+  def async_create_background_task(self, target, name):
+    return asyncio.create_task(target)
+
+class FakeAccountResult:
+  account = {}
+  tariff_index = None
+
+class FakeStore:
+  def __init__(self, data = None):
+    self.data = data
+    self.saves = []
+
+  async def async_load(self):
+    return self.data
+
+  async def async_save(self, data):
+    self.data = data
+    self.saves.append(data)
+
+class FakeImport:
+  def __init__(self, sums: dict):
+    self.statistic_id = "octopus_energy:fake"
+    self.sums = sums
+
+def get_start_date(days_ago: int):
+  return (now() - timedelta(days=days_ago)).date().isoformat()
+
+class FakeJob(BackfillJob):
+  def __init__(self, start_date: str = None, max_concurrent_ranges: int = None, serial_number: str = "serial"):
+    # Our default start date results in 21 days (including today) to import, in ranges of 7 days
+    start_date = start_date if start_date is not None else get_start_date(20)
+    super().__init__("electricity", "mpan", serial_number, start_date, datetime.strptime(f"{start_date}T00:00:00Z", "%Y-%m-%dT%H:%M:%S%z"), max_concurrent_ranges)
+    self.failures = {}
+    self.in_flight = 0
+    self.max_in_flight = 0
+    self.imported_ranges = []
+
+  def get_tariff_ranges(self, account_result, period_from: datetime, period_to: datetime) -> list:
+    return get_tariff_ranges(period_from, period_to, lambda current: "E-1R-TEST-A", 7)
+
+  def create_imports(self) -> list:
+    return [FakeImport(self.sums.get("octopus_energy:fake"))]
+
+  async def async_fetch_range(self, client, tariff_range: TariffRange):
+    self.in_flight += 1
+    self.max_in_flight = max(self.max_in_flight, self.in_flight)
+    try:
+      await asyncio.sleep(0.01)
+      failures = self.failures.get(tariff_range.start, [])
+      if len(failures) > 0:
+        raise failures.pop(0)
+
+      return tariff_range.start
+    finally:
+      self.in_flight -= 1
+
+  async def async_import_range(self, hass, imports: list, tariff_range: TariffRange, data):
+    assert data == tariff_range.start
+    self.imported_ranges.append(tariff_range.start)
+
+    total = imports[0].sums["total"] if imports[0].sums is not None else 0
+    imports[0].sums = { "total": total + tariff_range.get_number_of_days(), "peak": 0, "off_peak": 0 }
+
+def create_job(data: dict):
+  job = FakeJob(data["start_date"], data["max_concurrent_ranges"], data["serial_number"])
+  job.restore_checkpoint(data)
+  return job
+
+async def async_wait_for_jobs(manager: BackfillJobManager):
+  while len(manager._tasks) > 0:
+    await asyncio.gather(*manager._tasks.values(), return_exceptions=True)
+
+@pytest.mark.asyncio
+async def test_when_job_started_then_ranges_imported_in_order_and_checkpoint_saved():
+  # Arrange
+  hass = FakeHass()
+  store = FakeStore()
+  manager = BackfillJobManager(hass, account_id, None, store, create_job, retry_delay_in_seconds=0)
+  job = FakeJob(max_concurrent_ranges=2)
+
+  # Act
+  with mock.patch.object(backfill.persistent_notification, "async_create"):
+    await manager.async_start_job(job)
+    await async_wait_for_jobs(manager)
+
+  # Assert
+  expected_starts = list(map(lambda day: job.period_from + timedelta(days=day), [0, 7, 14]))
+  assert job.imported_ranges == expected_starts
+  assert job.max_in_flight == 2
+  assert job.status == BACKFILL_JOB_STATUS_COMPLETED
+  assert job.days_refreshed == 21
+  assert job.total_days == 21
+  assert job.imported_to == job.period_from + timedelta(days=21)
+  assert job.sums == { "octopus_energy:fake": { "total": 21, "peak": 0, "off_peak": 0 } }
+
+  # One save when started, one per range and one when completed
+  assert len(store.saves) == 5
+  assert store.saves[1]["jobs"][0]["imported_to"] == (job.period_from + timedelta(days=7)).isoformat()
+  assert store.saves[1]["jobs"][0]["sums"] == { "octopus_energy:fake": { "total": 7, "peak": 0, "off_peak": 0 } }
+  assert store.data["jobs"][0]["status"] == BACKFILL_JOB_STATUS_COMPLETED
+
+@pytest.mark.asyncio
+async def test_when_range_fails_with_server_error_then_range_retried():
+  # Arrange
+  hass = FakeHass()
+  store = FakeStore()
+  manager = BackfillJobManager(hass, account_id, None, store, create_job, retry_delay_in_seconds=0)
+  job = FakeJob()
+  job.failures[job.period_from + timedelta(days=7)] = [ServerException(), ServerException()]
+
+  # Act
+  with mock.patch.object(backfill.persistent_notification, "async_create"):
+    await manager.async_start_job(job)
+    await async_wait_for_jobs(manager)
+
+  # Assert
+  assert job.status == BACKFILL_JOB_STATUS_COMPLETED
+  assert job.days_refreshed == 21
+  assert len(job.imported_ranges) == 3
+
+@pytest.mark.asyncio
+async def test_when_range_fails_with_request_error_then_job_fails_at_checkpoint():
+  # Arrange
+  hass = FakeHass()
+  store = FakeStore()
+  manager = BackfillJobManager(hass, account_id, None, store, create_job, retry_delay_in_seconds=0)
+  job = FakeJob(max_concurrent_ranges=1)
+  job.failures[job.period_from + timedelta(days=7)] = [RequestException("Failed", [])]
+
+  # Act
+  with mock.patch.object(backfill.persistent_notification, "async_create") as async_create:
+    await manager.async_start_job(job)
+    await async_wait_for_jobs(manager)
+
+  # Assert
+  assert job.status == BACKFILL_JOB_STATUS_FAILED
+  assert job.error == "Failed"
+  assert job.imported_to == job.period_from + timedelta(days=7)
+  assert job.days_refreshed == 7
+  assert store.data["jobs"][0]["status"] == BACKFILL_JOB_STATUS_FAILED
+  assert async_create.call_args.kwargs["title"] == "Consumption data refreshing failed"
+
+@pytest.mark.asyncio
+async def test_when_range_fails_then_pending_fetches_finished_before_job_completes():
+  # Arrange
+  hass = FakeHass()
+  store = FakeStore()
+  manager = BackfillJobManager(hass, account_id, None, store, create_job, retry_delay_in_seconds=0)
+  job = FakeJob(max_concurrent_ranges=3)
+  job.failures[job.period_from] = [RequestException("Failed", [])]
+
+  # Act
+  with mock.patch.object(backfill.persistent_notification, "async_create"):
+    await manager.async_start_job(job)
+    await async_wait_for_jobs(manager)
+
+  # Assert
+  assert job.status == BACKFILL_JOB_STATUS_FAILED
+  assert job.max_in_flight == 3
+  assert job.in_flight == 0
+  assert job.imported_ranges == []
+
+@pytest.mark.asyncio
+async def test_when_failed_job_started_again_then_job_continues_from_checkpoint():
+  # Arrange
+  hass = FakeHass()
+  store = FakeStore()
+  manager = BackfillJobManager(hass, account_id, None, store, create_job, retry_delay_in_seconds=0)
+  job = FakeJob(max_concurrent_ranges=1)
+  job.failures[job.period_from + timedelta(days=7)] = [RequestException("Failed", [])]
+
+  with mock.patch.object(backfill.persistent_notification, "async_create"):
+    await manager.async_start_job(job)
+    await async_wait_for_jobs(manager)
+
+    # Act
+    await manager.async_start_job(FakeJob())
+    await async_wait_for_jobs(manager)
+
+  # Assert
+  assert manager.get_jobs() == [job]
+  assert job.status == BACKFILL_JOB_STATUS_COMPLETED
+  assert job.error is None
+  assert job.imported_ranges == list(map(lambda day: job.period_from + timedelta(days=day), [0, 7, 14]))
+  assert job.sums == { "octopus_energy:fake": { "total": 21, "peak": 0, "off_peak": 0 } }
+
+@pytest.mark.asyncio
+async def test_when_job_started_with_different_start_date_then_job_starts_from_beginning():
+  # Arrange
+  hass = FakeHass()
+  store = FakeStore()
+  manager = BackfillJobManager(hass, account_id, None, store, create_job, retry_delay_in_seconds=0)
+  job = FakeJob(max_concurrent_ranges=1)
+  job.failures[job.period_from + timedelta(days=7)] = [RequestException("Failed", [])]
+
+  with mock.patch.object(backfill.persistent_notification, "async_create"):
+    await manager.async_start_job(job)
+    await async_wait_for_jobs(manager)
+
+    # Act
+    new_job = FakeJob(get_start_date(19))
+    await manager.async_start_job(new_job)
+    await async_wait_for_jobs(manager)
+
+  # Assert
+  assert manager.get_jobs() == [new_job]
+  assert new_job.status == BACKFILL_JOB_STATUS_COMPLETED
+  assert new_job.imported_ranges[0] == new_job.period_from
+  assert new_job.days_refreshed == 20
+  assert new_job.sums == { "octopus_energy:fake": { "total": 20, "peak": 0, "off_peak": 0 } }
+
+@pytest.mark.asyncio
+async def test_when_running_job_loaded_then_job_resumed_from_checkpoint():
+  # Arrange
+  hass = FakeHass()
+  checkpoint_job = FakeJob()
+  checkpoint_job.imported_to = checkpoint_job.period_from + timedelta(days=14)
+  checkpoint_job.sums = { "octopus_energy:fake": { "total": 14, "peak": 0, "off_peak": 0 } }
+  checkpoint_job.days_refreshed = 14
+  checkpoint_job.total_days = 21
+
+  completed_job = FakeJob(get_start_date(100), serial_number="other-serial")
+  completed_job.status = BACKFILL_JOB_STATUS_COMPLETED
+
+  store = FakeStore({ "jobs": [checkpoint_job.to_dict(), completed_job.to_dict()] })
+  manager = BackfillJobManager(hass, account_id, None, store, create_job, retry_delay_in_seconds=0)
+
+  # Act
+  with mock.patch.object(backfill.persistent_notification, "async_create"):
+    await manager.async_load()
+    assert len(manager._tasks) == 1
+    await async_wait_for_jobs(manager)
+
+  # Assert
+  job: FakeJob = manager.get_jobs()[0]
+  assert job.status == BACKFILL_JOB_STATUS_COMPLETED
+  assert job.imported_ranges == [job.period_from + timedelta(days=14)]
+  assert job.days_refreshed == 21
+  assert job.sums == { "octopus_energy:fake": { "total": 21, "peak": 0, "off_peak": 0 } }
+  assert job.run_days_refreshed == 7
+  assert manager.get_jobs()[1].status == BACKFILL_JOB_STATUS_COMPLETED
+  assert manager.get_jobs()[1].imported_ranges == []
+
+@pytest.mark.asyncio
+async def test_when_manager_closed_then_running_job_left_to_resume():
+  # Arrange
+  hass = FakeHass()
+  store = FakeStore()
+  manager = BackfillJobManager(hass, account_id, None, store, create_job, retry_delay_in_seconds=0)
+  job = FakeJob(max_concurrent_ranges=1)
+
+  with mock.patch.object(backfill.persistent_notification, "async_create"):
+    await manager.async_start_job(job)
+
+    # Act
+    await manager.async_close()
+
+  # Assert
+  assert len(manager._tasks) == 0
+  assert job.status == BACKFILL_JOB_STATUS_RUNNING
+  assert store.data["jobs"][0]["status"] == BACKFILL_JOB_STATUS_RUNNING
+
+@pytest.mark.parametrize("attempt,expected_delay",[
+  (1, 5),
+  (2, 10),
+  (3, 20),
+  (10, 300),
+])
+def test_when_get_retry_delay_called_then_delay_doubles_up_to_maximum(attempt: int, expected_delay: float):
+  assert get_retry_delay(attempt) == expected_delay
+
+@pytest.mark.asyncio
+async def test_when_job_does_not_implement_import_then_job_cannot_be_created():
+  # Arrange
+  class IncompleteJob(BackfillJob):
+    def get_tariff_ranges(self, account_result, period_from: datetime, period_to: datetime) -> list:
+      return []
+
+  # Act & Assert
+  with pytest.raises(TypeError):
+    IncompleteJob("electricity", "mpan", "serial", "2024-01-01", datetime.strptime("2024-01-01T00:00:00Z", "%Y-%m-%dT%H:%M:%S%z"))
@@ -0,0 +1,79 @@
+import pytest
+from datetime import datetime, timedelta
+
+from unit import (create_consumption_data, create_rate_data)
+
+from custom_components.octopus_energy.statistics import StatisticSeries, build_statistics
+
+def get_values(statistics: list, key: str) -> list:
+  return list(map(lambda statistic: statistic[key], statistics))
+
+@pytest.mark.asyncio
+async def test_when_multiple_series_provided_then_statistics_built_for_each_series():
+  # Arrange
+  period_from = datetime.strptime("2022-02-28T00:00:00Z", "%Y-%m-%dT%H:%M:%S%z")
+  period_to = datetime.strptime("2022-02-28T02:00:00Z", "%Y-%m-%dT%H:%M:%S%z")
+  current = datetime.strptime("2022-02-28T00:00:01Z", "%Y-%m-%dT%H:%M:%S%z")
+  consumptions = list(map(lambda item: {
+    "start": period_from + timedelta(minutes=30 * item[0]),
+    "end": period_from + timedelta(minutes=30 * (item[0] + 1)),
+    "consumption": item[1],
+    "consumption_kwh": item[1] * 10
+  }, enumerate([1, 2, 0.5, 1.5])))
+
+  # Our off peak rate is the lowest of the two rates
+  rates = create_rate_data(period_from, period_to, [10, 20])
+
+  # Act
+  result = build_statistics(current, consumptions, rates, [
+    StatisticSeries("consumption", False, 3, 2, 1),
+    StatisticSeries("consumption_kwh", False, 6, 4, 2),
+    StatisticSeries("consumption", True, 9, 6, 3)
+  ])
+
+  # Assert
+  assert len(result) == 3
+  expected_starts = [period_from, period_from + timedelta(hours=1)]
+  for statistics in result:
+    for key in ["total", "peak", "off_peak"]:
+      assert get_values(statistics[key], "start") == expected_starts
+      assert get_values(statistics[key], "last_reset") == [period_from, period_from]
+
+  # Consumption
+  assert get_values(result[0]["total"], "state") == [3, 5]
+  assert get_values(result[0]["total"], "sum") == [6, 8]
+  assert get_values(result[0]["peak"], "state") == [2, 3.5]
+  assert get_values(result[0]["peak"], "sum") == [4, 5.5]
+  assert get_values(result[0]["off_peak"], "state") == [1, 1.5]
+  assert get_values(result[0]["off_peak"], "sum") == [2, 2.5]
+
+  # Consumption of a different key
+  assert get_values(result[1]["total"], "state") == [30, 50]
+  assert get_values(result[1]["total"], "sum") == [36, 56]
+  assert get_values(result[1]["peak"], "state") == [20, 35]
+  assert get_values(result[1]["peak"], "sum") == [24, 39]
+  assert get_values(result[1]["off_peak"], "state") == [10, 15]
+  assert get_values(result[1]["off_peak"], "sum") == [12, 17]
+
+  # Cost in pounds, from rates in pence
+  assert get_values(result[2]["total"], "state") == pytest.approx([0.5, 0.85])
+  assert get_values(result[2]["total"], "sum") == pytest.approx([9.5, 9.85])
+  assert get_values(result[2]["peak"], "state") == pytest.approx([0.4, 0.7])
+  assert get_values(result[2]["peak"], "sum") == pytest.approx([6.4, 6.7])
+  assert get_values(result[2]["off_peak"], "state") == pytest.approx([0.1, 0.15])
+  assert get_values(result[2]["off_peak"], "sum") == pytest.approx([3.1, 3.15])
+
+@pytest.mark.asyncio
+async def test_when_no_series_provided_then_no_statistics_returned():
+  # Arrange
+  period_from = datetime.strptime("2022-02-28T00:00:00Z", "%Y-%m-%dT%H:%M:%S%z")
+  period_to = datetime.strptime("2022-03-01T00:00:00Z", "%Y-%m-%dT%H:%M:%S%z")
+  current = datetime.strptime("2022-02-28T00:00:01Z", "%Y-%m-%dT%H:%M:%S%z")
+  consumptions = create_consumption_data(period_from, period_to, False, "start", "end")
+  rates = create_rate_data(period_from, period_to, [2, 4])
+
+  # Act
+  result = build_statistics(current, consumptions, rates, [])
+
+  # Assert
+  assert result == []
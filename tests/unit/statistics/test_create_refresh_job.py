@@ -0,0 +1,56 @@
+from datetime import datetime, timedelta, timezone
+import pytest
+
+from custom_components.octopus_energy.statistics.backfill import BACKFILL_JOB_STATUS_FAILED
+from custom_components.octopus_energy.statistics.refresh import ElectricityConsumptionRefreshJob, GasConsumptionRefreshJob, create_refresh_job
+
+@pytest.mark.asyncio
+async def test_when_electricity_job_restored_then_checkpoint_and_options_restored():
+  # Arrange
+  period_from = datetime(2024, 1, 1, tzinfo=timezone.utc)
+  job = ElectricityConsumptionRefreshJob("mpan", "serial", "2024-01-01", period_from, True, False, 5)
+  job.status = BACKFILL_JOB_STATUS_FAILED
+  job.imported_to = period_from + timedelta(days=30)
+  job.sums = { "octopus_energy:electricity_serial_mpan_previous_accumulative_consumption": { "total": 1.5, "peak": 1, "off_peak": 0.5 } }
+  job.days_refreshed = 30
+  job.total_days = 60
+  job.error = "Failed"
+
+  # Act
+  restored_job = create_refresh_job(job.to_dict())
+
+  # Assert
+  assert isinstance(restored_job, ElectricityConsumptionRefreshJob)
+  assert restored_job.id == job.id
+  assert restored_job.is_same_request(job) == True
+  assert restored_job.period_from == period_from
+  assert restored_job.max_concurrent_ranges == 5
+  assert restored_job.is_smart_meter == True
+  assert restored_job.is_export == False
+  assert restored_job.status == BACKFILL_JOB_STATUS_FAILED
+  assert restored_job.imported_to == job.imported_to
+  assert restored_job.sums == job.sums
+  assert restored_job.days_refreshed == 30
+  assert restored_job.total_days == 60
+  assert restored_job.error == "Failed"
+
+  imports = restored_job.create_imports()
+  assert imports[0].statistic_id == "octopus_energy:electricity_serial_mpan_previous_accumulative_consumption"
+  assert imports[0].sums == { "total": 1.5, "peak": 1, "off_peak": 0.5 }
+  assert imports[1].sums is None
+
+@pytest.mark.asyncio
+async def test_when_gas_job_restored_then_options_restored():
+  # Arrange
+  period_from = datetime(2024, 1, 1, tzinfo=timezone.utc)
+  job = GasConsumptionRefreshJob("mprn", "serial", "2024-01-01", period_from, "m³", 40.1)
+
+  # Act
+  restored_job = create_refresh_job(job.to_dict())
+
+  # Assert
+  assert isinstance(restored_job, GasConsumptionRefreshJob)
+  assert restored_job.id == job.id
+  assert restored_job.consumption_units == "m³"
+  assert restored_job.calorific_value == 40.1
+  assert restored_job.is_same_request(GasConsumptionRefreshJob("mprn", "serial", "2024-01-01", period_from, "m³", 40.2)) == False
@@ -0,0 +1,71 @@
+from datetime import datetime, timedelta
+import pytest
+
+from custom_components.octopus_energy.statistics.refresh import get_tariff_ranges
+
+def get_tariff_code_from_schedule(schedule: list):
+  def get_tariff_code(current: datetime):
+    for (start, end, tariff_code) in schedule:
+      if current >= start and (end is None or current < end):
+        return tariff_code
+
+    return None
+
+  return get_tariff_code
+
+@pytest.mark.asyncio
+async def test_when_tariff_changes_then_ranges_split_on_change():
+  # Arrange
+  period_from = datetime.strptime("2023-01-01T00:00:00Z", "%Y-%m-%dT%H:%M:%S%z")
+  period_to = datetime.strptime("2023-01-10T12:00:00Z", "%Y-%m-%dT%H:%M:%S%z")
+  change = datetime.strptime("2023-01-04T00:00:00Z", "%Y-%m-%dT%H:%M:%S%z")
+  get_tariff_code = get_tariff_code_from_schedule([
+    (period_from, change, "E-1R-VAR-22-11-01-C"),
+    (change, None, "E-1R-AGILE-FLEX-22-11-25-C"),
+  ])
+
+  # Act
+  result = get_tariff_ranges(period_from, period_to, get_tariff_code)
+
+  # Assert
+  assert len(result) == 2
+  assert result[0].start == period_from
+  assert result[0].end == change
+  assert result[0].tariff_code == "E-1R-VAR-22-11-01-C"
+  assert result[1].start == change
+  assert result[1].end == datetime.strptime("2023-01-11T00:00:00Z", "%Y-%m-%dT%H:%M:%S%z")
+  assert result[1].tariff_code == "E-1R-AGILE-FLEX-22-11-25-C"
+  assert result[1].get_number_of_days() == 7
+
+@pytest.mark.asyncio
+async def test_when_range_exceeds_max_days_then_range_split():
+  # Arrange
+  period_from = datetime.strptime("2023-01-01T00:00:00Z", "%Y-%m-%dT%H:%M:%S%z")
+  period_to = period_from + timedelta(days=25)
+  get_tariff_code = get_tariff_code_from_schedule([(period_from, None, "E-1R-VAR-22-11-01-C")])
+
+  # Act
+  result = get_tariff_ranges(period_from, period_to, get_tariff_code, 10)
+
+  # Assert
+  assert list(map(lambda tariff_range: tariff_range.get_number_of_days(), result)) == [10, 10, 5]
+  for index in range(1, len(result)):
+    assert result[index].start == result[index - 1].end
+
+@pytest.mark.asyncio
+async def test_when_tariff_not_available_then_ranges_stop():
+  # Arrange
+  period_from = datetime.strptime("2023-01-01T00:00:00Z", "%Y-%m-%dT%H:%M:%S%z")
+  gap_start = datetime.strptime("2023-01-03T00:00:00Z", "%Y-%m-%dT%H:%M:%S%z")
+  gap_end = datetime.strptime("2023-01-05T00:00:00Z", "%Y-%m-%dT%H:%M:%S%z")
+  get_tariff_code = get_tariff_code_from_schedule([
+    (period_from, gap_start, "E-1R-VAR-22-11-01-C"),
+    (gap_end, None, "E-1R-VAR-22-11-01-C"),
+  ])
+
+  # Act
+  result = get_tariff_ranges(period_from, period_from + timedelta(days=10), get_tariff_code)
+
+  # Assert
+  assert len(result) == 1
+  assert result[0].end == gap_start
@@ -0,0 +1,44 @@
+from datetime import datetime, timedelta
+import pytest
+
+from unit import (create_consumption_data)
+from custom_components.octopus_energy.statistics.refresh import split_consumption_by_day
+
+@pytest.mark.asyncio
+async def test_when_consumption_spans_multiple_days_then_consumption_split_by_day():
+  # Arrange
+  period_from = datetime.strptime("2023-01-01T00:00:00Z", "%Y-%m-%dT%H:%M:%S%z")
+  period_to = datetime.strptime("2023-01-04T00:00:00Z", "%Y-%m-%dT%H:%M:%S%z")
+  consumption = create_consumption_data(period_from - timedelta(hours=1), period_to + timedelta(hours=1))
+
+  # Act
+  result = split_consumption_by_day(period_from, period_to, consumption)
+
+  # Assert
+  assert len(result) == 3
+  for index, (day_from, day_consumption) in enumerate(result):
+    assert day_from == period_from + timedelta(days=index)
+    assert len(day_consumption) == 48
+    assert day_consumption[0]["start"] == day_from
+    assert day_consumption[-1]["end"] == day_from + timedelta(days=1)
+
+@pytest.mark.asyncio
+async def test_when_day_has_no_consumption_then_day_skipped():
+  # Arrange
+  period_from = datetime.strptime("2023-01-01T00:00:00Z", "%Y-%m-%dT%H:%M:%S%z")
+  period_to = datetime.strptime("2023-01-04T00:00:00Z", "%Y-%m-%dT%H:%M:%S%z")
+  consumption = create_consumption_data(period_from, period_from + timedelta(days=1)) + create_consumption_data(period_from + timedelta(days=2), period_to)
+
+  # Act
+  result = split_consumption_by_day(period_from, period_to, consumption)
+
+  # Assert
+  assert list(map(lambda day: day[0], result)) == [period_from, period_from + timedelta(days=2)]
+
+@pytest.mark.asyncio
+async def test_when_consumption_is_none_then_empty_list_returned():
+  # Act
+  result = split_consumption_by_day(datetime.strptime("2023-01-01T00:00:00Z", "%Y-%m-%dT%H:%M:%S%z"), datetime.strptime("2023-01-02T00:00:00Z", "%Y-%m-%dT%H:%M:%S%z"), None)
+
+  # Assert
+  assert result == []
@@ -0,0 +1,167 @@
+from datetime import datetime, timedelta, timezone
+import pytest
+
+from homeassistant.components.recorder.models import StatisticData
+
+from custom_components.octopus_energy.statistics.import_tracker import StatisticImportTracker
+
+statistic_id = "octopus_energy:electricity_123_456_previous_accumulative_consumption"
+period_from = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+def create_statistics(period_from: datetime, hours: int, consumptions: dict = None):
+  """Creates statistics in the shape built by build_consumption_statistics, with each hour consuming 1 unless overridden"""
+  consumptions = consumptions if consumptions is not None else {}
+  statistics = { "total": [], "peak": [], "off_peak": [] }
+  total_sum = 0
+  for hour in range(hours):
+    start = period_from + timedelta(hours=hour)
+    total_sum += consumptions.get(hour, 1)
+    statistics["total"].append(StatisticData(start=start, last_reset=period_from, sum=total_sum, state=total_sum))
+    statistics["peak"].append(StatisticData(start=start, last_reset=period_from, sum=total_sum / 2, state=total_sum / 2))
+    statistics["off_peak"].append(StatisticData(start=start, last_reset=period_from, sum=total_sum / 2, state=total_sum / 2))
+
+  return statistics
+
+def import_statistics(tracker: StatisticImportTracker, statistic_id: str, statistics):
+  changed_statistics = tracker.get_changed_statistics(statistic_id, statistics)
+  tracker.add_imported_statistics(statistic_id, statistics)
+  return changed_statistics
+
+def get_starts(statistics) -> list:
+  return list(map(lambda statistic: statistic["start"], statistics["total"]))
+
+def test_when_statistics_not_imported_then_all_statistics_returned():
+  # Arrange
+  tracker = StatisticImportTracker()
+  statistics = create_statistics(period_from, 24)
+
+  # Act
+  result = tracker.get_changed_statistics(statistic_id, statistics)
+
+  # Assert
+  assert result == statistics
+
+def test_when_same_statistics_imported_again_then_nothing_returned():
+  # Arrange
+  tracker = StatisticImportTracker()
+  import_statistics(tracker, statistic_id, create_statistics(period_from, 48))
+
+  # Act
+  result = tracker.get_changed_statistics(statistic_id, create_statistics(period_from, 48))
+
+  # Assert
+  assert result == { "total": [], "peak": [], "off_peak": [] }
+
+def test_when_new_hours_available_then_only_new_hours_returned():
+  # Arrange
+  tracker = StatisticImportTracker()
+  import_statistics(tracker, statistic_id, create_statistics(period_from, 10))
+
+  # Act
+  result = tracker.get_changed_statistics(statistic_id, create_statistics(period_from, 24))
+
+  # Assert
+  assert get_starts(result) == list(map(lambda hour: period_from + timedelta(hours=hour), range(10, 24)))
+  assert len(result["peak"]) == 14
+  assert len(result["off_peak"]) == 14
+
+def test_when_hour_corrected_then_affected_days_returned():
+  # Arrange
+  tracker = StatisticImportTracker()
+  import_statistics(tracker, statistic_id, create_statistics(period_from, 72))
+
+  # Act
+  result = tracker.get_changed_statistics(statistic_id, create_statistics(period_from, 72, { 30: 2 }))
+
+  # Assert
+  # The corrected day, and the following day whose sums have moved, are imported again
+  assert get_starts(result) == list(map(lambda hour: period_from + timedelta(hours=hour), range(24, 72)))
+
+def test_when_correction_does_not_change_later_sums_then_only_corrected_day_returned():
+  # Arrange
+  tracker = StatisticImportTracker()
+  import_statistics(tracker, statistic_id, create_statistics(period_from, 72))
+
+  # Act
+  result = tracker.get_changed_statistics(statistic_id, create_statistics(period_from, 72, { 30: 2, 31: 0 }))
+
+  # Assert
+  assert get_starts(result) == list(map(lambda hour: period_from + timedelta(hours=hour), range(24, 48)))
+
+def test_when_other_statistic_imported_then_statistics_tracked_separately():
+  # Arrange
+  tracker = StatisticImportTracker()
+  import_statistics(tracker, statistic_id, create_statistics(period_from, 24))
+
+  # Act
+  result = tracker.get_changed_statistics(f"{statistic_id}_other", create_statistics(period_from, 24))
+
+  # Assert
+  assert len(result["total"]) == 24
+
+@pytest.mark.asyncio
+async def test_when_tracker_loaded_then_imported_days_restored():
+  # Arrange
+  class FakeStore:
+    def __init__(self):
+      self.data = None
+
+    def async_delay_save(self, data_func, delay: float):
+      self.data = data_func()
+
+    async def async_load(self):
+      return self.data
+
+  store = FakeStore()
+  import_statistics(StatisticImportTracker(store), statistic_id, create_statistics(period_from, 30))
+  tracker = StatisticImportTracker(store)
+
+  # Act
+  await tracker.async_load()
+  result = tracker.get_changed_statistics(statistic_id, create_statistics(period_from, 48))
+
+  # Assert
+  assert get_starts(result) == list(map(lambda hour: period_from + timedelta(hours=hour), range(30, 48)))
+
+def test_when_statistics_not_recorded_as_imported_then_all_statistics_returned():
+  # Arrange
+  tracker = StatisticImportTracker()
+  statistics = create_statistics(period_from, 24)
+  tracker.get_changed_statistics(statistic_id, statistics)
+
+  # Act
+  result = tracker.get_changed_statistics(statistic_id, statistics)
+
+  # Assert
+  assert result == statistics
+
+def test_when_recorder_last_statistic_matches_then_imported_days_kept():
+  # Arrange
+  tracker = StatisticImportTracker()
+  statistics = create_statistics(period_from, 24)
+  import_statistics(tracker, statistic_id, statistics)
+
+  # Act
+  tracker.validate_last_statistic(statistic_id, statistics["total"][-1]["start"].timestamp(), statistics["total"][-1]["sum"])
+  result = tracker.get_changed_statistics(statistic_id, statistics)
+
+  # Assert
+  assert result == { "total": [], "peak": [], "off_peak": [] }
+
+@pytest.mark.parametrize("last_hour,last_sum",[
+  (None, None),
+  (22, 23),
+  (23, 25),
+])
+def test_when_recorder_last_statistic_does_not_match_then_all_statistics_returned(last_hour: int, last_sum: float):
+  # Arrange
+  tracker = StatisticImportTracker()
+  statistics = create_statistics(period_from, 24)
+  import_statistics(tracker, statistic_id, statistics)
+
+  # Act
+  tracker.validate_last_statistic(statistic_id, (period_from + timedelta(hours=last_hour)).timestamp() if last_hour is not None else None, last_sum)
+  result = tracker.get_changed_statistics(statistic_id, statistics)
+
+  # Assert
+  assert result == statistics
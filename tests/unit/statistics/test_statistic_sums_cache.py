@@ -0,0 +1,221 @@
+from datetime import datetime, timedelta, timezone
+import random
+import mock
+import pytest
+
+from homeassistant.components.recorder.models import StatisticData
+
+from custom_components.octopus_energy import statistics
+from custom_components.octopus_energy.const import DATA_STATISTIC_SUMS_CACHE, DOMAIN
+from custom_components.octopus_energy.statistics import add_statistics, async_get_last_sum
+from custom_components.octopus_energy.statistics.last_sums import StatisticSums, StatisticSumsCache
+
+statistic_id = "octopus_energy:electricity_123_456_previous_accumulative_consumption"
+period_from = datetime(2024, 1, 1, tzinfo=timezone.utc)
+
+def create_statistics(day_from: datetime, initial_sum: float, hours: int = 24):
+  return list(map(lambda hour: StatisticData(start=day_from + timedelta(hours=hour), last_reset=day_from, sum=initial_sum + hour + 1, state=hour + 1), range(hours)))
+
+class FakeHass:
+  def __init__(self, cache: StatisticSumsCache = None):
+    self.data = { DOMAIN: { DATA_STATISTIC_SUMS_CACHE: cache } } if cache is not None else {}
+
+class FakeRecorder:
+  """Stores hourly statistics, matching how the recorder responds to the queries we make"""
+
+  def __init__(self):
+    self.statistics: dict[str, dict[float, float]] = {}
+    self.queries = 0
+
+  async def async_add_executor_job(self, target, *args):
+    self.queries += 1
+    return target(*args)
+
+  def add(self, hass, metadata, statistics: list):
+    existing = self.statistics.setdefault(metadata["statistic_id"], {})
+    for statistic in statistics:
+      existing[statistic["start"].timestamp()] = statistic["sum"]
+
+  def get_last_statistics(self, hass, number_of_stats: int, statistic_id: str, convert_units: bool, types: set):
+    existing = self.statistics.get(statistic_id, {})
+    starts = sorted(existing.keys())[-number_of_stats:]
+    return { statistic_id: list(map(lambda start: { "start": start, "sum": existing[start] }, starts)) } if len(starts) > 0 else {}
+
+  def statistics_during_period(self, hass, start_time: datetime, end_time: datetime, statistic_ids: set, period: str, units, types: set):
+    result = {}
+    for statistic_id in statistic_ids:
+      existing = self.statistics.get(statistic_id, {})
+      starts = sorted(filter(lambda start: start >= start_time.timestamp() and start < end_time.timestamp(), existing.keys()))
+      if len(starts) > 0:
+        result[statistic_id] = list(map(lambda start: { "start": start, "sum": existing[start] }, starts))
+
+    return result
+
+class FakeStore:
+  def __init__(self, data: dict = None):
+    self.data = data
+
+  async def async_load(self):
+    return self.data
+
+  def async_delay_save(self, data_func, delay: float):
+    self.data = data_func()
+
+def patch_recorder(recorder: FakeRecorder):
+  return mock.patch.multiple(
+    statistics,
+    get_instance=lambda hass: recorder,
+    async_add_external_statistics=recorder.add,
+    get_last_statistics=recorder.get_last_statistics,
+    statistics_during_period=recorder.statistics_during_period
+  )
+
+def test_when_last_statistic_known_then_sum_returned_for_later_imports():
+  # Arrange
+  last_start = period_from.timestamp()
+  statistic = StatisticSums(last_start, [[last_start, 10]])
+
+  # Act & Assert
+  assert statistic.try_get_last_sum(last_start - 3600, last_start + 3600) == (True, 10)
+  assert statistic.try_get_last_sum(last_start + 3600, last_start + 7200) == (True, 0)
+  assert statistic.try_get_last_sum(last_start - 7200, last_start) == (False, None)
+
+def test_when_period_added_that_joins_complete_from_then_complete_from_extended():
+  # Arrange
+  last_start = period_from.timestamp()
+  statistic = StatisticSums(last_start, [[last_start, 10]])
+
+  # Act
+  statistic.add_period(last_start - 7200, last_start, [[last_start - 7200, 8]])
+
+  # Assert
+  assert statistic.complete_from == last_start - 7200
+  assert statistic.try_get_last_sum(last_start - 7200, last_start) == (True, 8)
+  assert statistic.try_get_last_sum(last_start - 3600, last_start) == (True, 0)
+
+def test_when_pruned_then_old_points_removed():
+  # Arrange
+  statistic = StatisticSums(0)
+  statistic.add(list(map(lambda hour: [(period_from + timedelta(hours=hour)).timestamp(), hour], range(24 * 10))))
+
+  # Act
+  statistic.prune()
+
+  # Assert
+  assert statistic.starts[0] > (period_from + timedelta(days=1)).timestamp()
+  assert statistic.complete_from == statistic.starts[-1] - timedelta(days=8).total_seconds()
+
+@pytest.mark.asyncio
+async def test_when_same_day_imported_multiple_times_then_recorder_queried_once():
+  # Arrange
+  recorder = FakeRecorder()
+  recorder.add(None, { "statistic_id": statistic_id }, create_statistics(period_from - timedelta(days=1), 0))
+  hass = FakeHass(StatisticSumsCache())
+
+  with patch_recorder(recorder):
+    for day in range(3):
+      for attempt in range(2):
+        # Act
+        day_from = period_from + timedelta(days=day)
+        last_sum = await async_get_last_sum(hass, day_from, statistic_id)
+
+        # Assert
+        assert last_sum == 24 + (day * 24)
+        add_statistics(hass, statistic_id, "Test", "kWh", { "total": create_statistics(day_from, last_sum) }, False)
+
+  assert recorder.queries == 1
+
+@pytest.mark.asyncio
+async def test_when_cache_not_available_then_recorder_queried():
+  # Arrange
+  recorder = FakeRecorder()
+  recorder.add(None, { "statistic_id": statistic_id }, create_statistics(period_from - timedelta(days=1), 0))
+  hass = FakeHass()
+
+  with patch_recorder(recorder):
+    # Act
+    last_sum = await async_get_last_sum(hass, period_from, statistic_id)
+
+  # Assert
+  assert last_sum == 24
+  assert recorder.queries == 1
+
+@pytest.mark.asyncio
+async def test_when_imports_are_random_then_sums_match_recorder():
+  generator = random.Random(7)
+  for iteration in range(20):
+    # Arrange
+    recorder = FakeRecorder()
+    cache = StatisticSumsCache()
+    hass = FakeHass(cache)
+    uncached_hass = FakeHass()
+
+    # Seed the recorder with some history before the cache is aware of the statistic
+    for day in range(generator.randint(0, 3)):
+      recorder.add(None, { "statistic_id": statistic_id }, create_statistics(period_from + timedelta(days=day), generator.uniform(0, 100), generator.randint(1, 24)))
+
+    with patch_recorder(recorder):
+      for operation in range(30):
+        day_from = period_from + timedelta(days=generator.randint(-5, 25), hours=generator.choice([0, 0, 0, 5]))
+
+        # Act
+        expected_sum = await async_get_last_sum(uncached_hass, day_from, statistic_id)
+        actual_sum = await async_get_last_sum(hass, day_from, statistic_id)
+
+        # Assert
+        assert actual_sum == expected_sum, f"iteration {iteration}, operation {operation}, {day_from}"
+
+        if generator.random() < 0.7:
+          add_statistics(hass, statistic_id, "Test", "kWh", { "total": create_statistics(day_from, actual_sum, generator.randint(1, 24)) }, False)
+
+def create_persisted_data(statistics: list):
+  return {
+    statistic_id: {
+      "complete_from": (period_from - timedelta(days=8)).timestamp(),
+      "points": list(map(lambda statistic: [statistic["start"].timestamp(), statistic["sum"]], statistics))
+    }
+  }
+
+@pytest.mark.asyncio
+async def test_when_persisted_sums_match_recorder_then_sums_used_after_validation():
+  # Arrange
+  recorder = FakeRecorder()
+  statistics = create_statistics(period_from - timedelta(days=1), 0)
+  recorder.add(None, { "statistic_id": statistic_id }, statistics)
+  cache = StatisticSumsCache(FakeStore(create_persisted_data(statistics)))
+  await cache.async_load()
+  hass = FakeHass(cache)
+
+  with patch_recorder(recorder):
+    # Act
+    latest_sum = await async_get_last_sum(hass, period_from, statistic_id)
+    earlier_sum = await async_get_last_sum(hass, period_from - timedelta(hours=12), statistic_id)
+
+  # Assert
+  assert latest_sum == 24
+  assert earlier_sum == 12
+
+  # Only the last statistic is retrieved to validate our persisted sums
+  assert recorder.queries == 1
+
+@pytest.mark.asyncio
+async def test_when_persisted_sums_are_behind_recorder_then_recorder_sums_used():
+  # Arrange
+  recorder = FakeRecorder()
+  persisted_statistics = create_statistics(period_from - timedelta(days=2), 0)
+  recorder.add(None, { "statistic_id": statistic_id }, persisted_statistics)
+
+  # Simulate the latest import not being persisted before we stopped
+  recorder.add(None, { "statistic_id": statistic_id }, create_statistics(period_from - timedelta(days=1), 24))
+  cache = StatisticSumsCache(FakeStore(create_persisted_data(persisted_statistics)))
+  await cache.async_load()
+  hass = FakeHass(cache)
+
+  with patch_recorder(recorder):
+    # Act
+    latest_sum = await async_get_last_sum(hass, period_from, statistic_id)
+    earlier_sum = await async_get_last_sum(hass, period_from - timedelta(hours=12), statistic_id)
+
+  # Assert
+  assert latest_sum == 48
+  assert earlier_sum == 36
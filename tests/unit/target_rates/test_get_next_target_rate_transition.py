@@ -0,0 +1,58 @@
+from datetime import datetime
+import pytest
+
+from custom_components.octopus_energy.target_rates import get_next_target_rate_transition
+
+def create_target_rates():
+  return [
+    {
+      "start": datetime.strptime("2022-02-09T10:00:00Z", "%Y-%m-%dT%H:%M:%S%z"),
+      "end":  datetime.strptime("2022-02-09T10:30:00Z", "%Y-%m-%dT%H:%M:%S%z"),
+      "value_inc_vat": 10
+    },
+    {
+      "start": datetime.strptime("2022-02-09T10:30:00Z", "%Y-%m-%dT%H:%M:%S%z"),
+      "end":  datetime.strptime("2022-02-09T11:00:00Z", "%Y-%m-%dT%H:%M:%S%z"),
+      "value_inc_vat": 5
+    },
+    {
+      "start": datetime.strptime("2022-02-09T12:00:00Z", "%Y-%m-%dT%H:%M:%S%z"),
+      "end":  datetime.strptime("2022-02-09T12:30:00Z", "%Y-%m-%dT%H:%M:%S%z"),
+      "value_inc_vat": 15
+    }
+  ]
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("current_date,offset,expected_transition",[
+  (datetime.strptime("2022-02-09T00:00:00Z", "%Y-%m-%dT%H:%M:%S%z"), None, datetime.strptime("2022-02-09T10:00:00Z", "%Y-%m-%dT%H:%M:%S%z")),
+  (datetime.strptime("2022-02-09T10:00:00Z", "%Y-%m-%dT%H:%M:%S%z"), None, datetime.strptime("2022-02-09T11:00:00Z", "%Y-%m-%dT%H:%M:%S%z")),
+  (datetime.strptime("2022-02-09T10:45:01Z", "%Y-%m-%dT%H:%M:%S%z"), None, datetime.strptime("2022-02-09T11:00:00Z", "%Y-%m-%dT%H:%M:%S%z")),
+  (datetime.strptime("2022-02-09T11:00:00Z", "%Y-%m-%dT%H:%M:%S%z"), None, datetime.strptime("2022-02-09T12:00:00Z", "%Y-%m-%dT%H:%M:%S%z")),
+  (datetime.strptime("2022-02-09T12:00:00Z", "%Y-%m-%dT%H:%M:%S%z"), None, datetime.strptime("2022-02-09T12:30:00Z", "%Y-%m-%dT%H:%M:%S%z")),
+  (datetime.strptime("2022-02-09T00:00:00Z", "%Y-%m-%dT%H:%M:%S%z"), "-00:15:00", datetime.strptime("2022-02-09T09:45:00Z", "%Y-%m-%dT%H:%M:%S%z")),
+  (datetime.strptime("2022-02-09T09:45:00Z", "%Y-%m-%dT%H:%M:%S%z"), "-00:15:00", datetime.strptime("2022-02-09T10:45:00Z", "%Y-%m-%dT%H:%M:%S%z")),
+  # Once the final block has finished with the offset applied, we still need to know when the target rates have passed
+  (datetime.strptime("2022-02-09T12:15:00Z", "%Y-%m-%dT%H:%M:%S%z"), "-00:15:00", datetime.strptime("2022-02-09T12:30:00Z", "%Y-%m-%dT%H:%M:%S%z")),
+  (datetime.strptime("2022-02-09T12:30:00Z", "%Y-%m-%dT%H:%M:%S%z"), "00:15:00", datetime.strptime("2022-02-09T12:45:00Z", "%Y-%m-%dT%H:%M:%S%z")),
+  (datetime.strptime("2022-02-09T12:30:00Z", "%Y-%m-%dT%H:%M:%S%z"), None, None),
+])
+async def test_when_target_rates_provided_then_next_transition_returned(current_date: datetime, offset: str, expected_transition: datetime):
+  # Arrange
+  rates = create_target_rates()
+
+  # Act
+  result = get_next_target_rate_transition(current_date, rates, offset)
+
+  # Assert
+  assert result == expected_transition
+
+@pytest.mark.asyncio
+async def test_when_no_target_rates_then_none_returned():
+  # Arrange
+  current_date = datetime.strptime("2022-02-09T00:00:00Z", "%Y-%m-%dT%H:%M:%S%z")
+
+  # Act
+  result = get_next_target_rate_transition(current_date, [])
+
+  # Assert
+  assert result is None
@@ -0,0 +1,113 @@
+from datetime import datetime, timedelta
+import pytest
+
+from unit import (create_rate_data)
+from custom_components.octopus_energy.target_rates import calculate_continuous_times, calculate_intermittent_times, get_applicable_rates
+from custom_components.octopus_energy.target_rates.planner import MAX_CACHED_RESULTS, TargetRatePlanner, TargetRateRequest
+from custom_components.octopus_energy.utils.rate_timeline import RateTimeline
+
+def create_config(target_type: str, target_hours: str, start_time: str = None, end_time: str = None, is_rolling_target = True, find_last_rates = False):
+  config = {
+    "name": "test",
+    "type": target_type,
+    "hours": target_hours,
+    "rolling_target": is_rolling_target,
+    "last_rates": find_last_rates
+  }
+
+  if start_time is not None:
+    config["start_time"] = start_time
+
+  if end_time is not None:
+    config["end_time"] = end_time
+
+  return config
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("current_date,target_type,target_hours,start_time,end_time,is_rolling_target,find_last_rates,is_export",[
+  (datetime.strptime("2022-02-09T00:00:00Z", "%Y-%m-%dT%H:%M:%S%z"), "Continuous", "1.5", "10:00", "18:00", True, False, False),
+  (datetime.strptime("2022-02-09T12:10:00Z", "%Y-%m-%dT%H:%M:%S%z"), "Continuous", "1.5", "10:00", "18:00", True, True, False),
+  (datetime.strptime("2022-02-09T19:00:00Z", "%Y-%m-%dT%H:%M:%S%z"), "Continuous", "3", None, None, False, False, True),
+  (datetime.strptime("2022-02-09T00:00:00Z", "%Y-%m-%dT%H:%M:%S%z"), "Intermittent", "1.5", "10:00", "18:00", True, False, False),
+  (datetime.strptime("2022-02-09T12:10:00Z", "%Y-%m-%dT%H:%M:%S%z"), "Intermittent", "2", "22:00", "02:00", True, True, False),
+  (datetime.strptime("2022-02-09T19:00:00Z", "%Y-%m-%dT%H:%M:%S%z"), "Intermittent", "3", None, None, False, True, True),
+])
+async def test_when_request_provided_then_result_matches_individual_calculation(current_date: datetime, target_type: str, target_hours: str, start_time: str, end_time: str, is_rolling_target: bool, find_last_rates: bool, is_export: bool):
+  # Arrange
+  period_from = datetime.strptime("2022-02-09T00:00:00Z", "%Y-%m-%dT%H:%M:%S%z")
+  period_to = datetime.strptime("2022-02-11T00:00:00Z", "%Y-%m-%dT%H:%M:%S%z")
+  rates = RateTimeline.from_rates(create_rate_data(period_from, period_to, [19.1, 18.9, 19.5, 17.9, 35.2, 19.1, 18.9]))
+  request = TargetRateRequest(create_config(target_type, target_hours, start_time, end_time, is_rolling_target, find_last_rates), is_export)
+  planner = TargetRatePlanner()
+
+  # Act
+  result = planner.get_target_rates(rates, current_date, request)
+
+  # Assert
+  applicable_rates = get_applicable_rates(current_date, start_time, end_time, rates, is_rolling_target)
+  if target_type == "Continuous":
+    expected_result = calculate_continuous_times(applicable_rates, float(target_hours), is_export, find_last_rates)
+  else:
+    expected_result = calculate_intermittent_times(applicable_rates, float(target_hours), is_export, find_last_rates)
+
+  assert len(expected_result) > 0
+  assert result == expected_result
+
+@pytest.mark.asyncio
+async def test_when_not_enough_rates_then_none_returned():
+  # Arrange
+  period_from = datetime.strptime("2022-02-09T00:00:00Z", "%Y-%m-%dT%H:%M:%S%z")
+  period_to = datetime.strptime("2022-02-09T12:00:00Z", "%Y-%m-%dT%H:%M:%S%z")
+  current_date = datetime.strptime("2022-02-09T00:00:00Z", "%Y-%m-%dT%H:%M:%S%z")
+  rates = create_rate_data(period_from, period_to, [19.1, 18.9, 19.5])
+  request = TargetRateRequest(create_config("Continuous", "1", "10:00", "18:00"), False)
+  planner = TargetRatePlanner()
+
+  # Act
+  result = planner.get_target_rates(rates, current_date, request)
+
+  # Assert
+  assert result is None
+
+@pytest.mark.asyncio
+async def test_when_requests_registered_then_results_are_shared():
+  # Arrange
+  period_from = datetime.strptime("2022-02-09T00:00:00Z", "%Y-%m-%dT%H:%M:%S%z")
+  period_to = datetime.strptime("2022-02-11T00:00:00Z", "%Y-%m-%dT%H:%M:%S%z")
+  current_date = datetime.strptime("2022-02-09T00:00:00Z", "%Y-%m-%dT%H:%M:%S%z")
+  rates = create_rate_data(period_from, period_to, [19.1, 18.9, 19.5, 17.9, 35.2])
+  planner = TargetRatePlanner()
+  planner.register("binary_sensor.one", TargetRateRequest(create_config("Continuous", "1", "10:00", "18:00"), False))
+  planner.register("binary_sensor.two", TargetRateRequest(create_config("Continuous", "1", "10:00", "18:00"), False))
+
+  # Act
+  first_result = planner.get_target_rates(rates, current_date, TargetRateRequest(create_config("Continuous", "1", "10:00", "18:00"), False))
+  second_result = planner.get_target_rates(rates, current_date, TargetRateRequest(create_config("Continuous", "1", "10:00", "18:00"), False))
+
+  # Assert
+  assert len(first_result) == 2
+  assert first_result == second_result
+  assert first_result is not second_result
+  for index in range(len(first_result)):
+    assert first_result[index] is second_result[index]
+
+@pytest.mark.asyncio
+async def test_when_rolling_target_moves_then_cached_results_are_limited():
+  # Arrange
+  period_from = datetime.strptime("2022-02-09T00:00:00Z", "%Y-%m-%dT%H:%M:%S%z")
+  period_to = datetime.strptime("2022-02-12T00:00:00Z", "%Y-%m-%dT%H:%M:%S%z")
+  rates = RateTimeline.from_rates(create_rate_data(period_from, period_to, [19.1, 18.9, 19.5, 17.9, 35.2]))
+  request = TargetRateRequest(create_config("Continuous", "1"), False)
+  planner = TargetRatePlanner()
+
+  # Act
+  results = []
+  for period in range(MAX_CACHED_RESULTS + 10):
+    results.append(planner.get_target_rates(rates, period_from + timedelta(minutes=30 * period), request))
+
+  # Assert
+  assert len(planner._results) == MAX_CACHED_RESULTS
+  for result in results:
+    assert result is not None
+    assert len(result) == 2
+    assert isinstance(result[0], dict)
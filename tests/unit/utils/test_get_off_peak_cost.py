@@ -6,6 +6,7 @@ import zoneinfo
 from homeassistant.util.dt import (set_default_time_zone)
 
 from custom_components.octopus_energy.utils import get_off_peak_cost
+from custom_components.octopus_energy.utils.rate_timeline import RateTimeline
 from tests.unit import create_rate_data
 
 @pytest.mark.asyncio
@@ -128,4 +129,19 @@ async def test_when_rates_available_and_bst_then_off_peak_cost_returned():
   result = get_off_peak_cost(current, rate_data)
 
   # Assert
-  assert result == 7.49994
\ No newline at end of file
+  assert result == 7.49994
+
+@pytest.mark.asyncio
+async def test_when_rate_timeline_provided_then_timeline_used():
+  # Arrange
+  period_from = datetime.strptime("2023-10-14T00:00:00Z", "%Y-%m-%dT%H:%M:%S%z")
+  period_to = datetime.strptime("2023-10-15T00:00:00Z", "%Y-%m-%dT%H:%M:%S%z")
+  current = datetime.strptime("2023-10-14T00:00:01Z", "%Y-%m-%dT%H:%M:%S%z")
+  rate_data = create_rate_data(period_from, period_to, [1, 2])
+  rate_timeline = RateTimeline.from_rates(create_rate_data(period_from, period_to, [3, 4]))
+
+  # Act
+  result = get_off_peak_cost(current, rate_data, rate_timeline)
+
+  # Assert
+  assert result == 3
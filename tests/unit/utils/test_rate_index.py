@@ -0,0 +1,71 @@
+import pytest
+from datetime import datetime, timedelta
+
+from custom_components.octopus_energy.utils.rate_index import RateIndex, find_rate
+from tests.unit import create_rate_data
+
+@pytest.mark.asyncio
+async def test_when_rate_exists_then_rate_returned():
+  # Arrange
+  period_from = datetime.strptime("2023-10-14T00:00:00Z", "%Y-%m-%dT%H:%M:%S%z")
+  period_to = datetime.strptime("2023-10-15T00:00:00Z", "%Y-%m-%dT%H:%M:%S%z")
+  rate_data = create_rate_data(period_from, period_to, [1, 2, 3])
+  rate_index = RateIndex(rate_data)
+
+  # Act
+  result = rate_index.get_rate(period_from + timedelta(hours=1), period_from + timedelta(hours=1, minutes=30))
+
+  # Assert
+  assert result is not None
+  assert result == rate_data[2]
+
+@pytest.mark.asyncio
+async def test_when_rate_in_different_timezone_then_rate_returned():
+  # Arrange
+  period_from = datetime.strptime("2023-10-14T00:00:00Z", "%Y-%m-%dT%H:%M:%S%z")
+  period_to = datetime.strptime("2023-10-15T00:00:00Z", "%Y-%m-%dT%H:%M:%S%z")
+  rate_data = create_rate_data(period_from, period_to, [1, 2, 3])
+  rate_index = RateIndex(rate_data)
+
+  # Act
+  result = rate_index.get_rate(datetime.strptime("2023-10-14T02:00:00+01:00", "%Y-%m-%dT%H:%M:%S%z"), datetime.strptime("2023-10-14T02:30:00+01:00", "%Y-%m-%dT%H:%M:%S%z"))
+
+  # Assert
+  assert result == rate_data[2]
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("start_offset_in_minutes,end_offset_in_minutes",[
+  (15, 45),
+  (0, 60),
+  (24 * 60, 24 * 60 + 30),
+])
+async def test_when_rate_does_not_match_period_then_none_returned(start_offset_in_minutes: int, end_offset_in_minutes: int):
+  # Arrange
+  period_from = datetime.strptime("2023-10-14T00:00:00Z", "%Y-%m-%dT%H:%M:%S%z")
+  period_to = datetime.strptime("2023-10-15T00:00:00Z", "%Y-%m-%dT%H:%M:%S%z")
+  rate_data = create_rate_data(period_from, period_to, [1, 2, 3])
+  rate_index = RateIndex(rate_data)
+
+  # Act
+  result = rate_index.get_rate(period_from + timedelta(minutes=start_offset_in_minutes), period_from + timedelta(minutes=end_offset_in_minutes))
+
+  # Assert
+  assert result is None
+
+@pytest.mark.asyncio
+async def test_when_rate_not_found_then_exception_raised():
+  # Arrange
+  period_from = datetime.strptime("2023-10-14T00:00:00Z", "%Y-%m-%dT%H:%M:%S%z")
+  period_to = datetime.strptime("2023-10-15T00:00:00Z", "%Y-%m-%dT%H:%M:%S%z")
+  rate_index = RateIndex(create_rate_data(period_from, period_to, [1, 2, 3]))
+
+  # Act
+  exception_raised = False
+  try:
+    find_rate(rate_index, period_to, period_to + timedelta(minutes=30))
+  except Exception as e:
+    exception_raised = True
+    assert str(e) == f"Failed to find rate for consumption between {period_to} and {period_to + timedelta(minutes=30)}"
+
+  # Assert
+  assert exception_raised == True
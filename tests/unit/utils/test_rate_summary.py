@@ -0,0 +1,81 @@
+from datetime import datetime
+import pytest
+
+from unit import (create_rate_data)
+from custom_components.octopus_energy.utils.rate_information import get_current_rate_information, get_next_rate_information, get_previous_rate_information
+from custom_components.octopus_energy.utils.rate_summary import RateSummary
+from .. import agile_rates
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("now",[
+  (datetime.strptime("2022-10-21T00:00:00Z", "%Y-%m-%dT%H:%M:%S%z")),
+  (datetime.strptime("2022-10-21T09:10:01+01:00", "%Y-%m-%dT%H:%M:%S%z")),
+  (datetime.strptime("2022-10-21T10:30:00Z", "%Y-%m-%dT%H:%M:%S%z")),
+  (datetime.strptime("2022-10-22T17:59:59Z", "%Y-%m-%dT%H:%M:%S%z")),
+  (datetime.strptime("2022-10-22T23:00:00Z", "%Y-%m-%dT%H:%M:%S%z")),
+])
+async def test_when_agile_rates_provided_then_summary_matches_rate_information(now: datetime):
+  # Arrange
+  rate_summary = RateSummary(agile_rates)
+
+  # Act
+  current_rate_information = rate_summary.get_current_rate_information(now)
+  previous_rate_information = rate_summary.get_previous_rate_information(now)
+  next_rate_information = rate_summary.get_next_rate_information(now)
+
+  # Assert
+  expected_current_rate_information = get_current_rate_information(agile_rates, now)
+  assert current_rate_information is not None
+  assert current_rate_information["current_rate"] == expected_current_rate_information["current_rate"]
+  assert current_rate_information["min_rate_today"] == expected_current_rate_information["min_rate_today"]
+  assert current_rate_information["max_rate_today"] == expected_current_rate_information["max_rate_today"]
+  assert current_rate_information["average_rate_today"] == expected_current_rate_information["average_rate_today"]
+
+  expected_previous_rate_information = get_previous_rate_information(agile_rates, now)
+  if expected_previous_rate_information is None:
+    assert previous_rate_information is None
+  else:
+    assert previous_rate_information["previous_rate"] == expected_previous_rate_information["previous_rate"]
+
+  expected_next_rate_information = get_next_rate_information(agile_rates, now)
+  if expected_next_rate_information is None:
+    assert next_rate_information is None
+  else:
+    assert next_rate_information["next_rate"] == expected_next_rate_information["next_rate"]
+
+@pytest.mark.asyncio
+async def test_when_target_has_no_rates_then_no_rate_information_is_returned():
+  # Arrange
+  now = datetime.strptime("2022-03-01T00:00:01Z", "%Y-%m-%dT%H:%M:%S%z")
+  rate_summary = RateSummary(agile_rates)
+
+  # Act
+  current_rate_information = rate_summary.get_current_rate_information(now)
+  previous_rate_information = rate_summary.get_previous_rate_information(now)
+  next_rate_information = rate_summary.get_next_rate_information(now)
+
+  # Assert
+  assert current_rate_information is None
+  assert previous_rate_information is None
+  assert next_rate_information is None
+
+@pytest.mark.asyncio
+async def test_when_rates_are_flat_then_current_rate_covers_all_rates():
+  # Arrange
+  period_from = datetime.strptime("2022-02-28T23:00:00Z", "%Y-%m-%dT%H:%M:%S%z")
+  period_to = datetime.strptime("2022-03-01T23:00:00Z", "%Y-%m-%dT%H:%M:%S%z")
+  now = datetime.strptime("2022-03-01T00:12:01+01:00", "%Y-%m-%dT%H:%M:%S%z")
+  rate_summary = RateSummary(create_rate_data(period_from, period_to, [10]))
+
+  # Act
+  current_rate_information = rate_summary.get_current_rate_information(now)
+  previous_rate_information = rate_summary.get_previous_rate_information(now)
+  next_rate_information = rate_summary.get_next_rate_information(now)
+
+  # Assert
+  assert current_rate_information is not None
+  assert current_rate_information["current_rate"]["start"] == period_from
+  assert current_rate_information["current_rate"]["end"] == period_to
+  assert current_rate_information["current_rate"]["value_inc_vat"] == 0.1
+  assert previous_rate_information is None
+  assert next_rate_information is None
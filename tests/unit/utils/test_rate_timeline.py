@@ -0,0 +1,159 @@
+import pytest
+from datetime import datetime, timedelta
+
+from custom_components.octopus_energy.api_client import rates_to_rate_timeline, rates_to_thirty_minute_increments
+from custom_components.octopus_energy.utils.rate_timeline import RateTimeline
+from tests.unit import create_rate_data
+
+@pytest.mark.asyncio
+async def test_when_rates_provided_then_timeline_matches_original_rates():
+  # Arrange
+  period_from = datetime.strptime("2023-10-14T00:00:00Z", "%Y-%m-%dT%H:%M:%S%z")
+  period_to = datetime.strptime("2023-10-15T00:00:00Z", "%Y-%m-%dT%H:%M:%S%z")
+  rate_data = create_rate_data(period_from, period_to, [1.1, 2.2, 3.3])
+  rate_data[4]["is_capped"] = True
+  rate_data[5]["is_intelligent_adjusted"] = True
+
+  # Act
+  timeline = RateTimeline.from_rates(rate_data)
+
+  # Assert
+  assert len(timeline) == len(rate_data)
+  assert timeline == rate_data
+  assert timeline[-1] == rate_data[-1]
+  assert timeline.to_dicts() == rate_data
+  assert timeline[4]["is_capped"] == True
+  assert "is_intelligent_adjusted" not in timeline[4]
+  assert timeline[5]["is_intelligent_adjusted"] == True
+
+@pytest.mark.asyncio
+async def test_when_rates_unordered_then_timeline_is_ordered():
+  # Arrange
+  period_from = datetime.strptime("2023-10-14T00:00:00Z", "%Y-%m-%dT%H:%M:%S%z")
+  period_to = datetime.strptime("2023-10-15T00:00:00Z", "%Y-%m-%dT%H:%M:%S%z")
+  rate_data = create_rate_data(period_from, period_to, [1, 2, 3])
+  unordered_rate_data = rate_data.copy()
+  unordered_rate_data.sort(key=lambda rate: rate["start"], reverse=True)
+
+  # Act
+  timeline = RateTimeline.from_rates(unordered_rate_data)
+
+  # Assert
+  assert timeline == rate_data
+  assert timeline[0]["start"] == period_from
+  assert timeline[-1]["end"] == period_to
+
+@pytest.mark.asyncio
+async def test_when_rate_is_not_thirty_minutes_then_exception_raised():
+  # Arrange
+  period_from = datetime.strptime("2023-10-14T00:00:00Z", "%Y-%m-%dT%H:%M:%S%z")
+  rate_data = [{
+    "start": period_from,
+    "end": period_from + timedelta(hours=1),
+    "value_inc_vat": 1,
+    "tariff_code": "E-1R-Test-L",
+    "is_capped": False
+  }]
+
+  # Act
+  exception_raised = False
+  try:
+    RateTimeline.from_rates(rate_data)
+  except ValueError:
+    exception_raised = True
+
+  # Assert
+  assert exception_raised == True
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("start_offset_in_minutes,end_offset_in_minutes,expected_index",[
+  (60, 90, 2),
+  (15, 45, None),
+  (0, 60, None),
+  (24 * 60, 24 * 60 + 30, None),
+])
+async def test_when_get_rate_called_then_matching_rate_returned(start_offset_in_minutes: int, end_offset_in_minutes: int, expected_index: int):
+  # Arrange
+  period_from = datetime.strptime("2023-10-14T00:00:00Z", "%Y-%m-%dT%H:%M:%S%z")
+  period_to = datetime.strptime("2023-10-15T00:00:00Z", "%Y-%m-%dT%H:%M:%S%z")
+  rate_data = create_rate_data(period_from, period_to, [1, 2, 3])
+  timeline = RateTimeline.from_rates(rate_data)
+
+  # Act
+  result = timeline.get_rate(period_from + timedelta(minutes=start_offset_in_minutes), period_from + timedelta(minutes=end_offset_in_minutes))
+
+  # Assert
+  if expected_index is None:
+    assert result is None
+  else:
+    assert result == rate_data[expected_index]
+
+@pytest.mark.asyncio
+async def test_when_flat_rate_provided_then_single_segment_created():
+  # Arrange
+  period_from = datetime.strptime("2023-10-14T00:00:00Z", "%Y-%m-%dT%H:%M:%S%z")
+  period_to = datetime.strptime("2023-10-17T00:00:00Z", "%Y-%m-%dT%H:%M:%S%z")
+  data = {
+    "results": [
+      {
+        "value_exc_vat": 6.5,
+        "value_inc_vat": 6.825,
+        "valid_from": "2023-04-01T00:00:00Z",
+        "valid_to": None
+      }
+    ]
+  }
+
+  # Act
+  timeline = rates_to_rate_timeline(data, period_from, period_to, "G-1R-Test-L")
+
+  # Assert
+  segments = list(timeline.segments())
+  assert len(segments) == 1
+  assert segments[0].start == period_from
+  assert segments[0].end == period_to
+  assert segments[0].number_of_rates == 144
+  assert segments[0].value_inc_vat == 6.825
+
+  assert len(timeline) == 144
+  assert timeline[100]["start"] == period_from + timedelta(minutes=30 * 100)
+  assert timeline == rates_to_thirty_minute_increments(data, period_from, period_to, "G-1R-Test-L")
+
+@pytest.mark.asyncio
+async def test_when_get_rates_between_called_then_only_rates_within_period_returned():
+  # Arrange
+  period_from = datetime.strptime("2023-10-14T00:00:00Z", "%Y-%m-%dT%H:%M:%S%z")
+  period_to = datetime.strptime("2023-10-15T00:00:00Z", "%Y-%m-%dT%H:%M:%S%z")
+  rate_data = create_rate_data(period_from, period_to, [1, 1, 1, 2, 2])
+  timeline = RateTimeline.from_rates(rate_data)
+  target_from = period_from + timedelta(minutes=15)
+  target_to = period_from + timedelta(hours=5)
+
+  # Act
+  result = timeline.get_rates_between(target_from, target_to)
+
+  # Assert
+  expected_rates = list(filter(lambda rate: rate["start"] >= target_from and rate["end"] <= target_to, rate_data))
+  assert result == expected_rates
+  assert len(list(result.segments())) == 4
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("start_offset_in_minutes,end_offset_in_minutes,expected_start_index,expected_end_index",[
+  (0, 90, 0, 3),
+  (15, 75, 1, 2),
+  (-60, 24 * 60 + 60, 0, 48),
+  (24 * 60, 24 * 60, 48, 48),
+])
+async def test_when_start_and_end_index_found_then_index_matches_rates_within_period(start_offset_in_minutes: int, end_offset_in_minutes: int, expected_start_index: int, expected_end_index: int):
+  # Arrange
+  period_from = datetime.strptime("2023-10-14T00:00:00Z", "%Y-%m-%dT%H:%M:%S%z")
+  period_to = datetime.strptime("2023-10-15T00:00:00Z", "%Y-%m-%dT%H:%M:%S%z")
+  timeline = RateTimeline.from_rates(create_rate_data(period_from, period_to, [1, 1, 1, 2, 2]))
+
+  # Act
+  start_index = timeline.find_start_index(period_from + timedelta(minutes=start_offset_in_minutes))
+  end_index = timeline.find_end_index(period_from + timedelta(minutes=end_offset_in_minutes))
+
+  # Assert
+  assert start_index == expected_start_index
+  assert end_index == expected_end_index
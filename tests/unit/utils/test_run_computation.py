@@ -0,0 +1,88 @@
+from datetime import datetime, timezone
+from types import MappingProxyType
+import threading
+import pytest
+
+from custom_components.octopus_energy.const import DATA_COMPUTATION_STATISTICS, DOMAIN
+from custom_components.octopus_energy.utils.computation import ComputationStatistics, async_run_computation, snapshot
+
+class FakeHass:
+  def __init__(self):
+    self.data = { DOMAIN: { DATA_COMPUTATION_STATISTICS: ComputationStatistics() } }
+    self.executor_jobs = 0
+
+  async def async_add_executor_job(self, target, *args):
+    self.executor_jobs += 1
+    result = []
+    thread = threading.Thread(target=lambda: result.append(target(*args)))
+    thread.start()
+    thread.join()
+    return result[0]
+
+def get_thread_and_total(items: list):
+  return (threading.get_ident(), sum(map(lambda item: item["consumption"], items)))
+
+def test_when_snapshot_created_then_changes_to_original_not_reflected():
+  # Arrange
+  original = [{ "start": datetime(2024, 1, 1, tzinfo=timezone.utc), "consumption": 1, "tags": ["a"] }]
+
+  # Act
+  result = snapshot(original)
+  original[0]["consumption"] = 2
+  original[0]["tags"].append("b")
+  original.append({ "consumption": 3 })
+
+  # Assert
+  assert isinstance(result, tuple)
+  assert isinstance(result[0], MappingProxyType)
+  assert len(result) == 1
+  assert result[0]["consumption"] == 1
+  assert result[0]["tags"] == ("a",)
+
+  with pytest.raises(TypeError):
+    result[0]["consumption"] = 4
+
+@pytest.mark.asyncio
+async def test_when_size_below_threshold_then_run_inline():
+  # Arrange
+  hass = FakeHass()
+  items = [{ "consumption": 1 }, { "consumption": 2 }]
+
+  # Act
+  (thread_id, total) = await async_run_computation(hass, "test", len(items), get_thread_and_total, items, threshold=3)
+
+  # Assert
+  assert thread_id == threading.get_ident()
+  assert total == 3
+  assert hass.executor_jobs == 0
+
+  statistic = hass.data[DOMAIN][DATA_COMPUTATION_STATISTICS].to_dict()["test"]
+  assert statistic["inline_runs"] == 1
+  assert statistic["offloaded_runs"] == 0
+
+@pytest.mark.asyncio
+async def test_when_size_reaches_threshold_then_offloaded_with_snapshot_and_recorded():
+  # Arrange
+  hass = FakeHass()
+  items = [{ "consumption": 1 }, { "consumption": 2 }, { "consumption": 3 }]
+  received = []
+
+  def record_items(items):
+    received.append(items)
+    return get_thread_and_total(items)
+
+  # Act
+  (thread_id, total) = await async_run_computation(hass, "test", len(items), record_items, items, threshold=3)
+
+  # Assert
+  assert thread_id != threading.get_ident()
+  assert total == 6
+  assert hass.executor_jobs == 1
+  assert isinstance(received[0], tuple)
+  assert received[0] is not items
+
+  statistic = hass.data[DOMAIN][DATA_COMPUTATION_STATISTICS].to_dict()["test"]
+  assert statistic["inline_runs"] == 0
+  assert statistic["offloaded_runs"] == 1
+  assert statistic["total_run_time_in_seconds"] >= 0
+  assert statistic["max_queue_time_in_seconds"] >= 0
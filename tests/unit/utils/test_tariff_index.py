@@ -0,0 +1,113 @@
+import pytest
+import random
+from datetime import datetime, timedelta, timezone
+
+from custom_components.octopus_energy.utils import get_active_tariff_code
+from custom_components.octopus_energy.utils.tariff_index import AgreementTimeline, TariffIndex
+
+def create_account_info(electricity_agreements: list, gas_agreements: list):
+  return {
+    "id": "A-123",
+    "electricity_meter_points": [
+      {
+        "mpan": "mpan-1",
+        "meters": [{ "serial_number": "serial-1" }, { "serial_number": "serial-2" }],
+        "agreements": electricity_agreements
+      }
+    ],
+    "gas_meter_points": [
+      {
+        "mprn": "mprn-1",
+        "meters": [{ "serial_number": "serial-3" }],
+        "agreements": gas_agreements
+      }
+    ]
+  }
+
+agreements = [
+  { 'tariff_code': 'E-1R-FIX-12M-18-02-14-G', 'start': '2018-04-02T00:00:00+01:00', 'end': '2019-04-02T00:00:00+01:00' },
+  { 'tariff_code': 'E-1R-VAR-20-10-01-G', 'start': '2019-04-02T00:00:00+01:00', 'end': '2019-04-02T00:00:00+01:00' },
+  { 'tariff_code': 'E-1R-FIX-12M-18-12-21-G', 'start': '2019-04-02T00:00:00+01:00', 'end': '2020-04-02T00:00:00+01:00' },
+  { 'tariff_code': None, 'start': '2020-04-02T00:00:00+01:00', 'end': None },
+  { 'tariff_code': 'E-1R-AGILE-FLEX-22-11-25-G', 'start': '2020-04-02T00:00:00+01:00', 'end': None },
+]
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("current,expected_tariff_code",[
+  (datetime(2018, 1, 1, tzinfo=timezone.utc), None),
+  (datetime(2018, 4, 1, 23, 0, tzinfo=timezone.utc), 'E-1R-FIX-12M-18-02-14-G'),
+  (datetime(2019, 4, 1, 23, 0, tzinfo=timezone.utc), 'E-1R-VAR-20-10-01-G'),
+  (datetime(2019, 4, 1, 23, 30, tzinfo=timezone.utc), 'E-1R-FIX-12M-18-12-21-G'),
+  (datetime(2024, 1, 1, tzinfo=timezone.utc), 'E-1R-AGILE-FLEX-22-11-25-G'),
+])
+async def test_when_tariff_requested_then_matches_active_tariff_code(current: datetime, expected_tariff_code: str):
+  # Arrange
+  tariff_index = TariffIndex(create_account_info(agreements, agreements))
+
+  # Act
+  electricity_tariff_code = tariff_index.get_electricity_tariff_code(current, "mpan-1", "serial-2")
+  gas_tariff_code = tariff_index.get_gas_tariff_code(current, "mprn-1", "serial-3")
+
+  # Assert
+  assert electricity_tariff_code == expected_tariff_code
+  assert electricity_tariff_code == get_active_tariff_code(current, agreements)
+  assert gas_tariff_code == expected_tariff_code
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("identifier,serial_number",[
+  ("mpan-2", "serial-1"),
+  ("mpan-1", "serial-3"),
+  ("mprn-1", "serial-1"),
+])
+async def test_when_meter_not_found_then_none_returned(identifier: str, serial_number: str):
+  # Arrange
+  tariff_index = TariffIndex(create_account_info(agreements, agreements))
+
+  # Act
+  result = tariff_index.get_electricity_tariff_code(datetime(2024, 1, 1, tzinfo=timezone.utc), identifier, serial_number)
+
+  # Assert
+  assert result is None
+
+@pytest.mark.asyncio
+async def test_when_agreements_overlap_then_result_matches_active_tariff_code():
+  generator = random.Random(7)
+  period_from = datetime(2022, 1, 1, tzinfo=timezone.utc)
+  for _ in range(200):
+    # Arrange
+    random_agreements = []
+    for index in range(generator.randint(0, 6)):
+      start = period_from + timedelta(days=generator.randint(0, 30))
+      end = start + timedelta(days=generator.randint(0, 30)) if generator.random() > 0.2 else None
+      random_agreements.append({
+        "tariff_code": f"E-1R-TARIFF-{index}-C" if generator.random() > 0.1 else None,
+        "start": start.isoformat(),
+        "end": end.isoformat() if end is not None else None
+      })
+
+    timeline = AgreementTimeline(random_agreements)
+
+    for day in range(0, 70, 3):
+      current = period_from + timedelta(days=day)
+
+      # Act
+      result = timeline.get_active_tariff_code(current)
+
+      # Assert
+      assert result == get_active_tariff_code(current, random_agreements)
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("current,expected_tariff_codes",[
+  (datetime(2018, 1, 1, tzinfo=timezone.utc), {}),
+  (datetime(2019, 4, 1, 23, 30, tzinfo=timezone.utc), { "mpan-1": 'E-1R-FIX-12M-18-12-21-G' }),
+  (datetime(2024, 1, 1, tzinfo=timezone.utc), { "mpan-1": 'E-1R-AGILE-FLEX-22-11-25-G' }),
+])
+async def test_when_electricity_tariffs_requested_then_active_tariff_of_each_point_returned(current: datetime, expected_tariff_codes: dict):
+  # Arrange
+  tariff_index = TariffIndex(create_account_info(agreements, agreements))
+
+  # Act
+  result = tariff_index.get_electricity_tariff_codes(current)
+
+  # Assert
+  assert result == expected_tariff_codes
@@ -0,0 +1,69 @@
+from datetime import datetime, timedelta, timezone
+import pytest
+
+from homeassistant.util.dt import (as_utc, parse_datetime)
+
+from custom_components.octopus_energy.utils.timestamps import parse_timestamp, parse_timestamps
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("value",[
+  ("2023-10-01T00:30:00Z"),
+  ("2023-10-01T00:30:00+01:00"),
+  ("2023-03-26T01:00:00-05:30"),
+  ("2023-10-01T00:30:00.123Z"),
+  ("2023-10-01T00:30:00.123456+01:00"),
+  ("2023-10-01 00:30:00+00:00"),
+  ("2023-10-01T00:30:00"),
+  ("2023-10-01T00:30Z"),
+])
+async def test_when_timestamp_parsed_then_result_matches_parse_datetime(value: str):
+  # Act
+  result = parse_timestamp(value)
+
+  # Assert
+  expected_result = parse_datetime(value)
+  if expected_result.tzinfo is None:
+    expected_result = expected_result.replace(tzinfo=timezone.utc)
+
+  assert result == as_utc(expected_result)
+  assert result.tzinfo is timezone.utc
+
+@pytest.mark.asyncio
+async def test_when_timestamp_parsed_without_conversion_then_offset_kept():
+  # Act
+  result = parse_timestamp("2023-10-01T00:30:00+01:00", False)
+
+  # Assert
+  assert result == datetime(2023, 10, 1, 0, 30, tzinfo=timezone(timedelta(hours=1)))
+  assert result.utcoffset() == timedelta(hours=1)
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("value",[
+  ("not a timestamp"),
+  ("2023-13-01T00:30:00Z"),
+  ("2023-10-01T25:30:00+01:00"),
+])
+async def test_when_timestamp_invalid_then_exception_raised(value: str):
+  # Act
+  exception_raised = False
+  try:
+    parse_timestamp(value)
+  except ValueError:
+    exception_raised = True
+
+  # Assert
+  assert exception_raised == True
+
+@pytest.mark.asyncio
+async def test_when_timestamps_parsed_then_duplicates_share_result():
+  # Act
+  result = parse_timestamps(["2023-10-01T00:00:00+01:00", None, "2023-10-01T00:30:00+01:00", "2023-10-01T00:30:00+01:00"])
+
+  # Assert
+  assert result == [
+    datetime(2023, 9, 30, 23, 0, tzinfo=timezone.utc),
+    None,
+    datetime(2023, 9, 30, 23, 30, tzinfo=timezone.utc),
+    datetime(2023, 9, 30, 23, 30, tzinfo=timezone.utc)
+  ]
+  assert result[2] is result[3]